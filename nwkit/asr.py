@@ -17,6 +17,7 @@ from nwkit.util import (
     get_node_class,
     is_missing_table_value,
     is_rooted,
+    open_output_text,
     parse_table_missing_values,
     read_tip_table,
     read_tree,
@@ -753,7 +754,7 @@ def _write_annotated_tree(
     if tree_out == "-":
         print(tree_string)
     else:
-        with open(tree_out, "w") as handle:
+        with open_output_text(tree_out) as handle:
             handle.write(tree_string)
 
 
@@ -0,0 +1,203 @@
+import io
+import shlex
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any
+
+import pandas as pd
+
+from nwkit.conventions import get_stdin_input_options
+from nwkit.species_parser import SHARED_SPECIES_PARSERS
+from nwkit.tree_cache import MEMORY_TREE_CACHE
+from nwkit.util import (
+    RESIDENT_HTTP_SESSIONS,
+    SHARED_NCBITAXA,
+    get_process_pool_context,
+    read_input_text,
+    validate_threads,
+)
+
+BATCH_COLUMNS = ["job_id", "command", "exit_status", "elapsed_seconds", "error"]
+NON_BATCH_COMMANDS = ("batch", "serve")
+RESIDENT_CACHES = {
+    "parsed_trees": MEMORY_TREE_CACHE,
+    "ncbitaxa": SHARED_NCBITAXA,
+    "species_parsers": SHARED_SPECIES_PARSERS,
+    "http_sessions": RESIDENT_HTTP_SESSIONS,
+}
+
+
+def read_batch_jobs(path):
+    """Return ``(job_id, argv)`` for every job line of a batch manifest.
+
+    Each non-empty line that does not start with ``#`` is one command line whose
+    tab-separated fields are the arguments; a leading ``nwkit`` is optional.
+    The job ID is the line number.
+    """
+    jobs = []
+    for line_number, line in enumerate(read_input_text(path).splitlines(), start=1):
+        if line.strip() == "" or line.lstrip().startswith("#"):
+            continue
+        argv = line.split("\t")
+        if argv[0].strip() == "nwkit":
+            argv = argv[1:]
+        jobs.append((line_number, argv))
+    if not jobs:
+        raise ValueError("No jobs were found in --jobs.")
+    return jobs
+
+
+def _check_batch_job(args, stdin_text, allow_stdout):
+    if args.command in NON_BATCH_COMMANDS:
+        raise ValueError(
+            "'{}' cannot be run inside nwkit batch or serve.".format(args.command)
+        )
+    stdin_options = get_stdin_input_options(args)
+    if stdin_options and stdin_text is None:
+        raise ValueError(
+            "Standard input is not available to this job; set {} to a file.".format(
+                ", ".join(option for _, option in stdin_options)
+            )
+        )
+    if (not allow_stdout) and getattr(args, "outfile", "-") == "-":
+        raise ValueError("Batch jobs must write to a file; set --outfile.")
+
+
+def run_captured_command(argv, stdin_text=None, allow_stdout=False):
+    """Run one nwkit command line in this process with captured standard streams.
+
+    Returns ``(exit_status, elapsed_seconds, error, stdout, stderr)``. Commands
+    that read standard input need ``stdin_text``, and commands that write to
+    standard output need ``allow_stdout``.
+    """
+    from nwkit.cli import main, parser
+
+    stdin = None
+    if stdin_text is not None:
+        stdin = io.TextIOWrapper(io.BytesIO(str(stdin_text).encode("utf-8")))
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    error = ""
+    original_stdin = sys.stdin
+    start = time.perf_counter()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            _check_batch_job(parser.parse_args(argv), stdin_text, allow_stdout)
+            if stdin is not None:
+                sys.stdin = stdin
+            exit_status = main(argv) or 0
+        except SystemExit as exc:
+            # argparse reports usage errors on stderr and exits.
+            exit_status = exc.code if isinstance(exc.code, int) else 2
+            lines = stderr.getvalue().strip().splitlines()
+            error = lines[-1] if lines else ""
+        except Exception as exc:
+            exit_status = 2
+            error = str(exc)
+        finally:
+            sys.stdin = original_stdin
+    elapsed = time.perf_counter() - start
+    return exit_status, elapsed, error, stdout.getvalue(), stderr.getvalue()
+
+
+def _run_batch_job(argv):
+    exit_status, elapsed, error, _, stderr = run_captured_command(argv)
+    return exit_status, elapsed, error, stderr
+
+
+def enable_resident_caches():
+    for cache in RESIDENT_CACHES.values():
+        cache.enable()
+
+
+def disable_resident_caches():
+    for cache in RESIDENT_CACHES.values():
+        cache.disable()
+
+
+def _initialize_batch_worker():
+    # Pay the start-up imports once per worker rather than in the first job's timing.
+    import ete4  # noqa: F401
+
+    import nwkit.cli  # noqa: F401
+
+    enable_resident_caches()
+
+
+def _report_job(job_id, argv, result):
+    exit_status, elapsed, error, stderr_text = result
+    for line in stderr_text.splitlines():
+        sys.stderr.write("[job {}] {}\n".format(job_id, line))
+    if exit_status != 0:
+        sys.stderr.write(
+            "[job {}] exited with status {}: {}\n".format(job_id, exit_status, error)
+        )
+    return {
+        "job_id": job_id,
+        "command": shlex.join(argv),
+        "exit_status": exit_status,
+        "elapsed_seconds": round(elapsed, 6),
+        "error": error,
+    }
+
+
+def run_batch_jobs(jobs, threads=1):
+    """Run jobs with warm per-process caches and return status rows in job order.
+
+    Jobs run in-process when ``threads`` is 1; otherwise a pool of ``threads``
+    worker processes is reused, so parsed trees, NCBITaxa handles, species
+    parsers, and HTTP sessions built by one job serve the following jobs of
+    the same worker.
+    """
+    threads = validate_threads(threads)
+    rows_by_job = {}
+    if threads == 1:
+        enable_resident_caches()
+        try:
+            for job_id, argv in jobs:
+                rows_by_job[job_id] = _report_job(job_id, argv, _run_batch_job(argv))
+        finally:
+            disable_resident_caches()
+    else:
+        executor_kwargs: dict[str, Any] = {
+            "max_workers": threads,
+            "initializer": _initialize_batch_worker,
+        }
+        process_pool_context = get_process_pool_context()
+        if process_pool_context is not None:
+            executor_kwargs["mp_context"] = process_pool_context
+        pending_jobs = iter(jobs)
+        with ProcessPoolExecutor(**executor_kwargs) as executor:
+            futures: dict[Any, tuple[int, list[str]]] = {}
+            jobs_exhausted = False
+            while futures or not jobs_exhausted:
+                while len(futures) < threads * 2 and not jobs_exhausted:
+                    job = next(pending_jobs, None)
+                    if job is None:
+                        jobs_exhausted = True
+                        break
+                    futures[executor.submit(_run_batch_job, job[1])] = job
+                if not futures:
+                    continue
+                completed, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    job_id, argv = futures.pop(future)
+                    rows_by_job[job_id] = _report_job(job_id, argv, future.result())
+    return [rows_by_job[job_id] for job_id, _ in jobs]
+
+
+def batch_main(args):
+    jobs = read_batch_jobs(args.jobs)
+    rows = run_batch_jobs(jobs, threads=args.threads)
+    num_failed = sum(1 for row in rows if row["exit_status"] != 0)
+    sys.stderr.write(
+        "Batch finished: {:,} jobs, {:,} failed\n".format(len(rows), num_failed)
+    )
+    out = pd.DataFrame(rows, columns=BATCH_COLUMNS)
+    if args.outfile == "-":
+        print(out.to_csv(sep="\t", index=False), end="")
+    else:
+        out.to_csv(args.outfile, sep="\t", index=False)
+    return 1 if num_failed else 0
@@ -0,0 +1,55 @@
+import datetime
+import sys
+
+import pandas as pd
+
+from nwkit.tree_cache import (
+    TREE_CACHE_DIR_ENV,
+    list_tree_cache_entries,
+    prune_tree_cache,
+    resolve_tree_cache_dir,
+    resolve_tree_cache_max_bytes,
+)
+
+CACHE_COLUMNS = ["entry", "size_bytes", "last_used", "status"]
+
+
+def _entry_row(entry, status):
+    path, size, last_used = entry
+    timestamp = datetime.datetime.fromtimestamp(last_used, tz=datetime.timezone.utc)
+    return {
+        "entry": path,
+        "size_bytes": size,
+        "last_used": timestamp.isoformat(timespec="seconds"),
+        "status": status,
+    }
+
+
+def cache_main(args):
+    cache_dir = resolve_tree_cache_dir(args.cache_dir)
+    if cache_dir is None:
+        raise ValueError(
+            "No parsed-tree cache directory. Specify --cache-dir or set {}.".format(
+                TREE_CACHE_DIR_ENV
+            )
+        )
+    if args.clear:
+        max_bytes = 0
+    elif args.max_size_mb is not None:
+        max_bytes = resolve_tree_cache_max_bytes(args.max_size_mb)
+    else:
+        max_bytes = None
+    removed = [] if max_bytes is None else prune_tree_cache(cache_dir, max_bytes)
+    rows = [_entry_row(entry, "kept") for entry in list_tree_cache_entries(cache_dir)]
+    rows += [_entry_row(entry, "removed") for entry in removed]
+    total_bytes = sum(row["size_bytes"] for row in rows if row["status"] == "kept")
+    sys.stderr.write(
+        "Parsed-tree cache {}: {:,} entries, {:,} bytes, {:,} removed\n".format(
+            cache_dir, len(rows) - len(removed), total_bytes, len(removed)
+        )
+    )
+    out = pd.DataFrame(rows, columns=CACHE_COLUMNS)
+    if args.outfile == "-":
+        print(out.to_csv(sep="\t", index=False), end="")
+    else:
+        out.to_csv(args.outfile, sep="\t", index=False)
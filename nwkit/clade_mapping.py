@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import Any
 
+from nwkit.split_table import WIDE_SPLIT_MIN_LEAVES, LeafBitsets
 from nwkit.util import (
     get_node_class,
     get_subtree_leaf_name_sets,
@@ -89,6 +90,51 @@ def _mask_mapping_key(node_class, mask, all_mask, match_basis):
     return (min(mask, complement), max(mask, complement))
 
 
+def _projected_match_keys(tree, shared_taxa, match_basis):
+    """Return ``{node: (match_key, num_shared_taxa)}`` for the shared taxa.
+
+    Match keys are integer masks, or for wide trees the bytes of
+    ``LeafBitsets`` rows. Split keys are the side without the last taxon,
+    which is the smaller of the two integer masks.
+    """
+    taxon_to_index = {taxon: index for index, taxon in enumerate(sorted(shared_taxa))}
+    num_taxa = len(taxon_to_index)
+    if num_taxa < WIDE_SPLIT_MIN_LEAVES:
+        all_shared_mask = (1 << num_taxa) - 1
+        masks = _projected_masks(
+            tree, {taxon: 1 << index for taxon, index in taxon_to_index.items()}
+        )
+        return {
+            node: (
+                _mask_mapping_key(
+                    get_node_class(node), mask, all_shared_mask, match_basis
+                ),
+                mask.bit_count(),
+            )
+            for node, mask in masks.items()
+        }
+    nodes, bitsets = LeafBitsets.from_ete(tree, taxon_to_index, missing_leaf_bit=-1)
+    counts = bitsets.counts().tolist()
+    words = bitsets.words.copy()
+    if match_basis == "split":
+        has_last_taxon = bitsets.contains_bit(num_taxa - 1)
+        words[has_last_taxon] ^= bitsets.all_words()
+    row_size = words.shape[1] * 8
+    mask_bytes = bitsets.words.tobytes()
+    split_bytes = words.tobytes()
+    keys = dict()
+    for row, node in enumerate(nodes):
+        start = row * row_size
+        if get_node_class(node) in ("root", "leaf") or match_basis == "clade":
+            match_key: Any = mask_bytes[start : start + row_size]
+        elif counts[row] in (0, num_taxa):
+            match_key = None
+        else:
+            match_key = split_bytes[start : start + row_size]
+        keys[node] = (match_key, counts[row])
+    return keys
+
+
 def build_clade_mapping(target, source, taxon_mode="exact", match_basis="clade"):
     if taxon_mode not in SUPPORTED_TAXON_MODES:
         raise ValueError(
@@ -132,31 +178,15 @@ def build_clade_mapping(target, source, taxon_mode="exact", match_basis="clade")
     target_taxa_by_node = _node_taxon_sets(target)
     source_taxa_by_node = _node_taxon_sets(source)
     same_leaf_set = target_leaf_set == source_leaf_set
-    taxon_to_bit = {
-        taxon: 1 << index for index, taxon in enumerate(sorted(shared_taxa))
-    }
-    all_shared_mask = (1 << len(taxon_to_bit)) - 1
-    target_masks = _projected_masks(target, taxon_to_bit)
-    source_masks = _projected_masks(source, taxon_to_bit)
+    target_keys = _projected_match_keys(target, shared_taxa, match_basis)
+    source_keys = _projected_match_keys(source, shared_taxa, match_basis)
     target_groups: dict[Any, list[Any]] = {}
     source_groups: dict[Any, list[Any]] = {}
-    for node, _taxa in target_taxa_by_node.items():
-        node_class = get_node_class(node)
-        key = (
-            node_class,
-            _mask_mapping_key(
-                node_class, target_masks[node], all_shared_mask, match_basis
-            ),
-        )
+    for node in target_taxa_by_node:
+        key = (get_node_class(node), target_keys[node][0])
         target_groups.setdefault(key, list()).append(node)
-    for node, _taxa in source_taxa_by_node.items():
-        node_class = get_node_class(node)
-        key = (
-            node_class,
-            _mask_mapping_key(
-                node_class, source_masks[node], all_shared_mask, match_basis
-            ),
-        )
+    for node in source_taxa_by_node:
+        key = (get_node_class(node), source_keys[node][0])
         source_groups.setdefault(key, list()).append(node)
 
     matches = list()
@@ -164,13 +194,10 @@ def build_clade_mapping(target, source, taxon_mode="exact", match_basis="clade")
     for target_node in target.traverse():
         node_class = get_node_class(target_node)
         target_taxa = target_taxa_by_node[target_node]
-        projected_mask = target_masks[target_node]
+        match_key, num_projected_taxa = target_keys[target_node]
         projected_taxa = (
             target_taxa if same_leaf_set else frozenset(target_taxa & shared_taxa)
         )
-        match_key = _mask_mapping_key(
-            node_class, projected_mask, all_shared_mask, match_basis
-        )
         key = (node_class, match_key)
         target_candidates = target_groups.get(key, [])
         source_candidates = source_groups.get(key, [])
@@ -179,19 +206,19 @@ def build_clade_mapping(target, source, taxon_mode="exact", match_basis="clade")
             source_node = source
             status = "exact_match" if same_leaf_set else "projected_match"
             reason = "root_to_root"
-        elif projected_mask == 0:
+        elif num_projected_taxa == 0:
             status = "unmatched"
             reason = "no_shared_descendant_taxa"
         elif (
             taxon_mode == "intersection"
             and node_class == "intnode"
-            and projected_mask.bit_count() < 2
+            and num_projected_taxa < 2
         ):
             status = "ambiguous"
             reason = "fewer_than_two_shared_descendant_taxa"
         elif node_class == "intnode" and (
             match_key is None
-            or (match_basis == "clade" and projected_mask == all_shared_mask)
+            or (match_basis == "clade" and num_projected_taxa == len(shared_taxa))
         ):
             status = "ambiguous"
             reason = (
@@ -1,25 +1,30 @@
 import math
 import sys
-from itertools import chain
+from collections import defaultdict
+from itertools import islice
 
+import numpy as np
 import pandas as pd
 
 from nwkit.consensus import (
     _collect_clade_stats_from_tree_strings,
+    _get_tree_sampling,
+    _open_input_tree_strings,
     _read_tree_weights,
     _scale_support,
 )
+from nwkit.tree_index import IndexedTreeStrings
 from nwkit.util import (
     count_set_bits,
     get_subtree_leaf_bitmasks,
     is_rooted,
-    iter_tree_strings,
     read_tree,
     support_is_missing,
     validate_unique_named_leaves,
 )
 
 CLADEFREQ_COLUMNS = ("descendant_taxa", "num_taxa", "weight_sum", "frequency")
+CONVERGENCE_COLUMNS = ("trees_per_run", "num_splits", "asdsf", "max_sdsf")
 
 
 def _mask_to_leaf_set(mask, leaf_names):
@@ -35,32 +40,67 @@ def _mask_to_leaf_set(mask, leaf_names):
     return names
 
 
-def cladefreq_main(args):
-    raw_tree_strings = iter(iter_tree_strings(args.infile))
-    try:
-        first_tree_string = next(raw_tree_strings)
-    except StopIteration:
-        raise ValueError("No input trees were found for cladefreq.") from None
-    tree_count = [0]
+def _get_heavy_hitter_options(args):
+    """Return ``(min_frequency, top_k, frequency_error)``, or None for exact mode."""
+    min_frequency = getattr(args, "min_frequency", 0.0)
+    top_k = getattr(args, "top_k", 0)
+    frequency_error = getattr(args, "frequency_error", None)
+    if not (0.0 <= min_frequency <= 1.0):
+        raise ValueError("'--min-frequency' must be between 0 and 1.")
+    if top_k < 0:
+        raise ValueError("'--top-k' must be zero or a positive integer.")
+    if (min_frequency == 0.0) and (top_k == 0):
+        return None
+    if frequency_error is None:
+        frequency_error = min(0.001, min_frequency / 10) if min_frequency else 0.001
+    if not (0.0 < frequency_error < 1.0):
+        raise ValueError("'--frequency-error' must be between 0 and 1.")
+    if min_frequency and (frequency_error >= min_frequency):
+        raise ValueError("'--frequency-error' must be smaller than '--min-frequency'.")
+    return min_frequency, top_k, frequency_error
+
+
+def _select_heavy_hitters(clade_summary, total_weight, min_frequency):
+    """Return reported clade weights and the frequency undercount bound.
+
+    A clade's true weight lies between its estimate and the estimate plus the
+    summary error, so every clade reaching ``min_frequency`` is kept.
+    """
+    clade_weights = clade_summary.estimates()
+    if min_frequency > 0.0:
+        min_weight = min_frequency * total_weight - clade_summary.error
+        clade_weights = {
+            mask: weight
+            for mask, weight in clade_weights.items()
+            if weight >= min_weight
+        }
+    return clade_weights, clade_summary.error / total_weight
 
-    def counted_tree_strings():
-        for tree_string in chain((first_tree_string,), raw_tree_strings):
-            tree_count[0] += 1
-            yield tree_string
 
+def _collect_infile_clade_weights(args, heavy_hitter_options):
+    """Return leaf names, bits, clade weights, total weight, and frequency error."""
+    tree_strings, count_trees = _open_input_tree_strings(
+        args.infile,
+        getattr(args, "collection_index", False),
+        "cladefreq",
+        _get_tree_sampling(args),
+    )
     tree_weights = _read_tree_weights(args.weight_tsv)
     leaf_names, leaf_name_to_bit, _, clade_weights, _ = (
         _collect_clade_stats_from_tree_strings(
-            tree_strings=counted_tree_strings(),
+            tree_strings=tree_strings,
             tree_weights=tree_weights,
             format=args.format,
             quoted_node_names=args.quoted_node_names,
             collect_branch_lengths=False,
             threads=getattr(args, "threads", 1),
             require_rooted=True,
+            clade_frequency_error=(
+                None if heavy_hitter_options is None else heavy_hitter_options[2]
+            ),
         )
     )
-    num_trees = tree_count[0]
+    num_trees = count_trees()
     if tree_weights is not None and len(tree_weights) != num_trees:
         raise ValueError("--weight-tsv must contain exactly one row per input tree.")
     sys.stderr.write("Number of input trees = {:,}\n".format(num_trees))
@@ -74,6 +114,203 @@ def cladefreq_main(args):
         ) from exc
     if not math.isfinite(total_weight):
         raise ValueError("The sum of tree weights must be finite.")
+    frequency_error = None
+    if heavy_hitter_options is not None:
+        clade_weights, frequency_error = _select_heavy_hitters(
+            clade_weights, total_weight, heavy_hitter_options[0]
+        )
+        sys.stderr.write(
+            "Heavy-hitter mode: reported frequencies may be low by at most {:.6g}\n".format(
+                _scale_support(frequency_error, args.support_scale)
+            )
+        )
+    return leaf_names, leaf_name_to_bit, clade_weights, total_weight, frequency_error
+
+
+def _validate_run_options(args, heavy_hitter_options):
+    run_files = args.run_files
+    if len(run_files) < 2:
+        raise ValueError("'--run-files' requires at least two MCMC runs.")
+    if "-" in run_files:
+        raise ValueError("'--run-files' requires file paths, not '-'.")
+    if args.weight_tsv not in ("", None):
+        raise ValueError("'--weight-tsv' cannot be combined with '--run-files'.")
+    if heavy_hitter_options is not None:
+        raise ValueError(
+            "'--min-frequency' and '--top-k' cannot be combined with '--run-files'."
+        )
+    if getattr(args, "convergence_window", 0) < 0:
+        raise ValueError("'--convergence-window' must be zero or a positive integer.")
+    if not (0.0 <= getattr(args, "asdsf_min_frequency", 0.1) <= 1.0):
+        raise ValueError("'--asdsf-min-frequency' must be between 0 and 1.")
+    if getattr(args, "convergence_tsv", None) == "-":
+        raise ValueError("'--convergence-tsv' requires a file path, not '-'.")
+
+
+def _iter_run_windows(tree_strings, window):
+    """Yield consecutive windows of ``window`` tree strings, or the whole run for 0."""
+    if window == 0:
+        yield tree_strings
+        return
+    if isinstance(tree_strings, IndexedTreeStrings):
+        for start in range(0, len(tree_strings), window):
+            yield tree_strings[start : start + window]
+        return
+    iterator = iter(tree_strings)
+    yield from iter(lambda: list(islice(iterator, window)), [])
+
+
+def _split_frequency_deviations(run_clade_weights, run_counts, min_frequency):
+    """Return per-clade SDSF and the ASDSF, max-SDSF, and number of counted clades.
+
+    SDSF is the sample standard deviation of a clade's frequency across runs.
+    As in MrBayes, ASDSF and max-SDSF only count clades whose frequency
+    reaches ``min_frequency`` in at least one run.
+    """
+    masks = sorted(set().union(*run_clade_weights))
+    frequencies = np.array(
+        [
+            [weights.get(mask, 0.0) / count for mask in masks]
+            for weights, count in zip(run_clade_weights, run_counts, strict=True)
+        ],
+        dtype=np.float64,
+    ).reshape(len(run_clade_weights), len(masks))
+    deviations = frequencies.std(axis=0, ddof=1)
+    counted = deviations[frequencies.max(axis=0) >= min_frequency]
+    sdsf = dict(zip(masks, deviations.tolist(), strict=True))
+    if len(counted) == 0:
+        return sdsf, 0.0, 0.0, 0
+    return sdsf, float(counted.mean()), float(counted.max()), len(counted)
+
+
+def _collect_run_clade_weights(args):
+    """Return per-run clade weights and tree counts with convergence diagnostics.
+
+    Runs are read in lockstep windows of ``--convergence-window`` trees, and
+    ASDSF and max-SDSF are recorded on the cumulative frequencies after each
+    window, so every tree is parsed once.
+    """
+    sampling = _get_tree_sampling(args)
+    window = getattr(args, "convergence_window", 0)
+    min_frequency = getattr(args, "asdsf_min_frequency", 0.1)
+    runs = [
+        _open_input_tree_strings(
+            path, getattr(args, "collection_index", False), "cladefreq", sampling
+        )
+        for path in args.run_files
+    ]
+    run_windows = [_iter_run_windows(tree_strings, window) for tree_strings, _ in runs]
+    run_clade_weights: list[defaultdict[int, float]] = [
+        defaultdict(float) for _ in runs
+    ]
+    run_counts = [0] * len(runs)
+    leaf_names = None
+    leaf_name_to_bit: dict[str, int] = {}
+    diagnostics = list()
+    while True:
+        advanced = False
+        for run_index, windows in enumerate(run_windows):
+            tree_strings = next(windows, None)
+            if tree_strings is None:
+                continue
+            leaf_names, leaf_name_to_bit, _, clade_weights, _ = (
+                _collect_clade_stats_from_tree_strings(
+                    tree_strings=tree_strings,
+                    tree_weights=None,
+                    format=args.format,
+                    quoted_node_names=args.quoted_node_names,
+                    collect_branch_lengths=False,
+                    threads=getattr(args, "threads", 1),
+                    require_rooted=True,
+                    reference_leaf_names=leaf_names,
+                )
+            )
+            for mask, weight in clade_weights.items():
+                run_clade_weights[run_index][mask] += weight
+            if window == 0:
+                run_counts[run_index] = runs[run_index][1]()
+            else:
+                run_counts[run_index] += len(tree_strings)
+            advanced = True
+        if not advanced:
+            break
+        _, asdsf, max_sdsf, num_splits = _split_frequency_deviations(
+            run_clade_weights, run_counts, min_frequency
+        )
+        diagnostics.append(
+            {
+                "trees_per_run": max(run_counts),
+                "num_splits": num_splits,
+                "asdsf": asdsf,
+                "max_sdsf": max_sdsf,
+            }
+        )
+    return leaf_names, leaf_name_to_bit, run_clade_weights, run_counts, diagnostics
+
+
+def _collect_run_frequencies(args):
+    """Return pooled clade weights with per-run frequency and SDSF columns."""
+    leaf_names, leaf_name_to_bit, run_clade_weights, run_counts, diagnostics = (
+        _collect_run_clade_weights(args)
+    )
+    num_trees = sum(run_counts)
+    sys.stderr.write(
+        "Number of input trees = {:,} in {:,} runs\n".format(num_trees, len(run_counts))
+    )
+    sys.stderr.write(
+        "ASDSF = {:.6g}, max SDSF = {:.6g} over {:,} clades\n".format(
+            diagnostics[-1]["asdsf"],
+            diagnostics[-1]["max_sdsf"],
+            diagnostics[-1]["num_splits"],
+        )
+    )
+    convergence_tsv = getattr(args, "convergence_tsv", None)
+    if convergence_tsv not in ("", None):
+        pd.DataFrame(diagnostics, columns=CONVERGENCE_COLUMNS).to_csv(
+            convergence_tsv, sep="\t", index=False
+        )
+    clade_weights: defaultdict[int, float] = defaultdict(float)
+    for weights in run_clade_weights:
+        for mask, weight in weights.items():
+            clade_weights[mask] += weight
+    run_columns = {
+        "frequency_run{}".format(run_index): {
+            mask: _scale_support(weight / count, args.support_scale)
+            for mask, weight in weights.items()
+        }
+        for run_index, (weights, count) in enumerate(
+            zip(run_clade_weights, run_counts, strict=True), start=1
+        )
+    }
+    run_columns["sdsf"] = _split_frequency_deviations(
+        run_clade_weights, run_counts, getattr(args, "asdsf_min_frequency", 0.1)
+    )[0]
+    return (
+        leaf_names,
+        leaf_name_to_bit,
+        dict(clade_weights),
+        float(num_trees),
+        run_columns,
+    )
+
+
+def cladefreq_main(args):
+    heavy_hitter_options = _get_heavy_hitter_options(args)
+    run_columns: dict[str, dict[int, float]] = dict()
+    frequency_error = None
+    if getattr(args, "run_files", None):
+        _validate_run_options(args, heavy_hitter_options)
+        leaf_names, leaf_name_to_bit, clade_weights, total_weight, run_columns = (
+            _collect_run_frequencies(args)
+        )
+    else:
+        (
+            leaf_names,
+            leaf_name_to_bit,
+            clade_weights,
+            total_weight,
+            frequency_error,
+        ) = _collect_infile_clade_weights(args, heavy_hitter_options)
     reference_mask_to_node = dict()
     if args.reference not in ["", None]:
         reference_tree = read_tree(
@@ -99,10 +336,13 @@ def cladefreq_main(args):
                 continue
             reference_mask_to_node[mask] = node
     rows = list()
-    for mask, weight_sum in sorted(
+    sorted_clade_weights = sorted(
         clade_weights.items(),
         key=lambda item: (-item[1], -count_set_bits(item[0]), int(item[0])),
-    ):
+    )
+    if (heavy_hitter_options is not None) and (heavy_hitter_options[1] > 0):
+        sorted_clade_weights = sorted_clade_weights[: heavy_hitter_options[1]]
+    for mask, weight_sum in sorted_clade_weights:
         leaf_set = _mask_to_leaf_set(mask, leaf_names)
         row = {
             "descendant_taxa": ",".join(leaf_set),
@@ -110,6 +350,10 @@ def cladefreq_main(args):
             "weight_sum": weight_sum,
             "frequency": _scale_support(weight_sum / total_weight, args.support_scale),
         }
+        if frequency_error is not None:
+            row["frequency_error"] = _scale_support(frequency_error, args.support_scale)
+        for column, values in run_columns.items():
+            row[column] = values.get(mask, 0.0)
         if args.reference not in ["", None]:
             reference_node = reference_mask_to_node.get(mask)
             row["in_reference"] = reference_node is not None
@@ -119,6 +363,9 @@ def cladefreq_main(args):
                 row["reference_support"] = float(reference_node.support)
         rows.append(row)
     columns = list(CLADEFREQ_COLUMNS)
+    if frequency_error is not None:
+        columns.append("frequency_error")
+    columns.extend(run_columns)
     if args.reference not in ["", None]:
         columns.extend(("in_reference", "reference_support"))
     out = pd.DataFrame(rows, columns=columns)
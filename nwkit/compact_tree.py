@@ -0,0 +1,526 @@
+import math
+import re
+import sys
+from typing import Any
+
+import numpy as np
+
+from nwkit.split_table import LeafBitsets
+from nwkit.util import (
+    MISSING_SUPPORT_VALUE,
+    NUMERIC_NODE_NAME_PATTERN,
+    TREE_FORMAT_PROP,
+    _auto_format_ambiguity_message,
+    _contains_quoted_node_names,
+    normalize_phylogenetic_tree_text,
+    read_input_text,
+    read_tree,
+    support_is_missing,
+)
+
+_NAME = "name"
+_DIST = "dist"
+_SUPPORT = "support"
+_EMPTY = ""
+# (leaf fields, internal fields) of each ETE integer parser; every field is a
+# (property, required) pair for the "p0:p1" content of a node.
+_PARSER_FIELDS = {
+    0: (((_NAME, False), (_DIST, False)), ((_SUPPORT, False), (_DIST, False))),
+    1: (((_NAME, False), (_DIST, False)), ((_NAME, False), (_DIST, False))),
+    2: (((_NAME, True), (_DIST, True)), ((_SUPPORT, True), (_DIST, True))),
+    3: (((_NAME, True), (_DIST, True)), ((_NAME, True), (_DIST, True))),
+    4: (((_NAME, True), (_DIST, True)), ((_EMPTY, False), (_EMPTY, False))),
+    5: (((_NAME, True), (_DIST, True)), ((_EMPTY, False), (_DIST, True))),
+    6: (((_NAME, True), (_EMPTY, False)), ((_EMPTY, False), (_DIST, True))),
+    7: (((_NAME, True), (_DIST, True)), ((_NAME, True), (_EMPTY, False))),
+    8: (((_NAME, True), (_EMPTY, False)), ((_NAME, True), (_EMPTY, False))),
+    9: (((_NAME, True), (_EMPTY, False)), ((_EMPTY, False), (_EMPTY, False))),
+    100: (((_EMPTY, False), (_EMPTY, False)), ((_EMPTY, False), (_EMPTY, False))),
+}
+_AUTO_FORMAT = -1
+_WHITESPACE_PATTERN = re.compile(r"[ \t\r\n]*")
+# Mirrors ETE's newick reader for comment-free content: a raw "p0" label that
+# keeps leading whitespace, an optional ":p1" field, and an optional NHX block.
+_NODE_CONTENT_PATTERN = re.compile(
+    r"(?P<label>[ \t\r\n]*(?:'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|(?!['\"]))[^:\[,();]*)"
+    r"(?::[ \t\r\n]*(?P<dist>[^\[ ,);]*))?"
+    r"[ \t\r\n]*(?:\[&&NHX:(?P<nhx>[^\]]*)\][ \t\r\n]*)?"
+)
+_INTERNAL_LABEL_TOKEN_PATTERN = re.compile(r"[^\s:,();\[\]]*")
+
+
+class _CompactParseFallback(Exception):
+    """Raised when text needs ETE's parser to reproduce its exact semantics."""
+
+
+def _unquote_node_name(text):
+    name = text.strip()
+    if name.startswith("'") and name.endswith("'"):
+        return name[1:-1].replace("''", "'")
+    if name.startswith('"') and name.endswith('"'):
+        return name[1:-1].replace('""', '"')
+    return name
+
+
+def _finite_float(text):
+    try:
+        value = float(text)
+    except ValueError:
+        raise _CompactParseFallback() from None
+    if not math.isfinite(value):
+        raise _CompactParseFallback()
+    return value
+
+
+def _parse_nhx_props(text):
+    props = dict()
+    for pair in text.split(":"):
+        fields = pair.split("=")
+        if len(fields) != 2:
+            raise _CompactParseFallback()
+        props[fields[0]] = fields[1]
+    if {_NAME, _DIST, _SUPPORT}.intersection(props):
+        raise _CompactParseFallback()
+    return props
+
+
+def _internal_label_kind(label):
+    stripped = label.lstrip(" \t\r\n")
+    if stripped == "":
+        return None
+    if stripped[0] in ("'", '"'):
+        return "quoted"
+    token_match = _INTERNAL_LABEL_TOKEN_PATTERN.match(stripped)
+    token = "" if token_match is None else token_match.group(0)
+    if token == "":
+        return None
+    if NUMERIC_NODE_NAME_PATTERN.fullmatch(token) is not None:
+        return "numeric"
+    return "other"
+
+
+class CompactTree:
+    """Array-backed, read-only view of a parsed Newick tree.
+
+    Nodes are numbered in preorder, so node 0 is the root and every parent
+    precedes its descendants. ``parent``, ``first_child``, and
+    ``next_sibling`` hold node indices (-1 when absent), ``dist`` and
+    ``support`` hold float64 values (NaN when absent), and ``name_id`` points
+    into the interned ``names`` table (-1 for unnamed nodes). NHX properties
+    are kept sparsely in ``props`` by node index.
+    """
+
+    __slots__ = (
+        "parent",
+        "first_child",
+        "next_sibling",
+        "dist",
+        "support",
+        "name_id",
+        "names",
+        "props",
+        "parser_format",
+    )
+
+    def __init__(
+        self,
+        parent,
+        first_child,
+        next_sibling,
+        dist,
+        support,
+        name_id,
+        names,
+        props,
+        parser_format,
+    ):
+        self.parent = np.asarray(parent, dtype=np.int64)
+        self.first_child = np.asarray(first_child, dtype=np.int64)
+        self.next_sibling = np.asarray(next_sibling, dtype=np.int64)
+        self.dist = np.asarray(dist, dtype=np.float64)
+        self.support = np.asarray(support, dtype=np.float64)
+        self.name_id = np.asarray(name_id, dtype=np.int64)
+        self.names = tuple(names)
+        self.props = props
+        self.parser_format = int(parser_format)
+
+    def __len__(self):
+        return len(self.parent)
+
+    @property
+    def num_leaves(self):
+        return int(np.count_nonzero(self.first_child < 0))
+
+    def is_leaf(self, index):
+        return self.first_child[index] < 0
+
+    def name(self, index):
+        name_id = self.name_id[index]
+        return None if name_id < 0 else self.names[name_id]
+
+    def children(self, index):
+        children = list()
+        child = int(self.first_child[index])
+        while child >= 0:
+            children.append(child)
+            child = int(self.next_sibling[child])
+        return children
+
+    def num_children(self):
+        return np.bincount(self.parent[1:], minlength=len(self))
+
+    def is_rooted(self):
+        return len(self.children(0)) <= 2
+
+    def leaf_indices(self):
+        return np.flatnonzero(self.first_child < 0)
+
+    def leaf_names(self):
+        names = self.names
+        for name_id in self.name_id[self.first_child < 0].tolist():
+            yield None if name_id < 0 else names[name_id]
+
+    def levelorder(self):
+        """Return node indices in ETE's default level-order traversal."""
+        parent = self.parent.tolist()
+        depth = [0] * len(parent)
+        for index in range(1, len(parent)):
+            depth[index] = depth[parent[index]] + 1
+        # Preorder already ranks nodes of equal depth from left to right.
+        return np.argsort(depth, kind="stable").tolist()
+
+    def postorder(self):
+        """Return node indices in ETE's left-to-right postorder."""
+        first_child = self.first_child.tolist()
+        next_sibling = self.next_sibling.tolist()
+        order = list()
+        stack = [0]
+        while stack:
+            index = stack.pop()
+            order.append(index)
+            child = first_child[index]
+            while child >= 0:
+                stack.append(child)
+                child = next_sibling[child]
+        # Pushing children left to right yields a right-to-left preorder;
+        # reversing it visits children left to right before their parent.
+        order.reverse()
+        return order
+
+    def subtree_leaf_bitmasks(self, leaf_name_to_bit):
+        """Return per-node descendant-tip bitmasks indexed like the node arrays."""
+        parent = self.parent.tolist()
+        first_child = self.first_child.tolist()
+        name_ids = self.name_id.tolist()
+        masks = [0] * len(parent)
+        for index in range(len(parent) - 1, -1, -1):
+            if first_child[index] < 0:
+                name = None if name_ids[index] < 0 else self.names[name_ids[index]]
+                if name not in leaf_name_to_bit:
+                    raise ValueError(
+                        "Leaf label not found in reference mapping: {}".format(name)
+                    )
+                masks[index] |= 1 << leaf_name_to_bit[name]
+            if index > 0:
+                masks[parent[index]] |= masks[index]
+        return masks
+
+    def subtree_leaf_bitsets(self, leaf_name_to_bit):
+        """Return per-node descendant-tip bitsets as ``LeafBitsets`` rows."""
+        leaf_bits = np.full(len(self), -1, dtype=np.intp)
+        for index in self.leaf_indices().tolist():
+            name = self.name(index)
+            if name not in leaf_name_to_bit:
+                raise ValueError(
+                    "Leaf label not found in reference mapping: {}".format(name)
+                )
+            leaf_bits[index] = leaf_name_to_bit[name]
+        return LeafBitsets.from_parents(self.parent, leaf_bits, len(leaf_name_to_bit))
+
+    @classmethod
+    def from_ete(cls, tree):
+        """Encode an ETE tree, mapping missing-support sentinels to NaN."""
+        nodes = list(tree.traverse(strategy="preorder"))
+        index_by_node = {node: index for index, node in enumerate(nodes)}
+        parent = [-1] * len(nodes)
+        first_child = [-1] * len(nodes)
+        next_sibling = [-1] * len(nodes)
+        dist = [math.nan] * len(nodes)
+        support = [math.nan] * len(nodes)
+        name_id = [-1] * len(nodes)
+        names: list[str] = []
+        name_index: dict[str, int] = {}
+        props = dict()
+        parser_format = tree.props.get(TREE_FORMAT_PROP, 0)
+        for index, node in enumerate(nodes):
+            previous = -1
+            for child in node.get_children():
+                child_index = index_by_node[child]
+                parent[child_index] = index
+                if previous < 0:
+                    first_child[index] = child_index
+                else:
+                    next_sibling[previous] = child_index
+                previous = child_index
+            if node.dist is not None:
+                if not math.isfinite(float(node.dist)):
+                    raise ValueError("Tree branch lengths must be finite.")
+                dist[index] = float(node.dist)
+            if not support_is_missing(node.support):
+                if not math.isfinite(float(node.support)):
+                    raise ValueError("Tree support values must be finite.")
+                support[index] = float(node.support)
+            if node.name is not None:
+                name_id[index] = name_index.setdefault(node.name, len(names))
+                if name_id[index] == len(names):
+                    names.append(node.name)
+            extra = {
+                key: value
+                for key, value in node.props.items()
+                if key not in (_NAME, _DIST, _SUPPORT, TREE_FORMAT_PROP)
+            }
+            if extra:
+                props[index] = extra
+        return cls(
+            parent,
+            first_child,
+            next_sibling,
+            dist,
+            support,
+            name_id,
+            names,
+            props,
+            parser_format,
+        )
+
+    def to_ete(self):
+        """Return the ETE tree that ``read_tree`` builds from the same text."""
+        from ete4 import Tree
+
+        parser_format = self.parser_format
+        fields = _PARSER_FIELDS.get(parser_format, _PARSER_FIELDS[0])
+        dist = self.dist.tolist()
+        support = self.support.tolist()
+        first_child = self.first_child.tolist()
+        parent = self.parent.tolist()
+        nodes: list[Any] = [None] * len(parent)
+        for index in range(len(parent) - 1, -1, -1):
+            is_leaf = first_child[index] < 0
+            first_field = fields[0 if is_leaf else 1][0][0]
+            props = dict()
+            name = self.name(index)
+            if first_field == _SUPPORT and not math.isnan(support[index]):
+                props[_SUPPORT] = support[index]
+            elif first_field != _SUPPORT and name is not None:
+                props[_NAME] = name
+            if not math.isnan(dist[index]):
+                props[_DIST] = dist[index]
+            if first_field == _SUPPORT and name is not None:
+                props[_NAME] = name
+            elif first_field != _SUPPORT and not math.isnan(support[index]):
+                props[_SUPPORT] = support[index]
+            props.update(self.props.get(index, {}))
+            props[TREE_FORMAT_PROP] = parser_format
+            is_root = parent[index] < 0
+            if _SUPPORT not in props and (
+                (parser_format == 0 and not is_root and not is_leaf)
+                or (parser_format == 1 and not is_root)
+            ):
+                props[_SUPPORT] = MISSING_SUPPORT_VALUE
+            nodes[index] = Tree(props, [nodes[child] for child in self.children(index)])
+        return nodes[0]
+
+
+def _parse_compact_newick(text, parser_format):
+    """Parse comment-free Newick text into a CompactTree.
+
+    ``parser_format`` is an ETE integer parser or ``_AUTO_FORMAT``. Anything
+    ETE would reject, or would read through a path this parser does not
+    mirror (comments, NHX overrides, non-finite values), raises
+    ``_CompactParseFallback``.
+    """
+    if not text.endswith(";"):
+        raise _CompactParseFallback()
+    match_content = _NODE_CONTENT_PATTERN.match
+    match_whitespace = _WHITESPACE_PATTERN.match
+    parent: list[int] = []
+    labels: list[str] = []
+    dist_texts: list[str | None] = []
+    nhx_texts: dict[int, str] = {}
+    stack: list[int] = []
+    end = len(text) - 1
+    pos = 0
+    while True:
+        whitespace = match_whitespace(text, pos)
+        assert whitespace is not None
+        pos = whitespace.end()
+        if pos >= end:
+            raise _CompactParseFallback()
+        index = len(parent)
+        parent.append(stack[-1] if stack else -1)
+        if text[pos] == "(":
+            stack.append(index)
+            labels.append("")
+            dist_texts.append(None)
+            pos += 1
+            continue
+        match = match_content(text, pos)
+        assert match is not None
+        label, dist_text, nhx = match.groups()
+        labels.append(label)
+        dist_texts.append(dist_text)
+        if nhx is not None:
+            nhx_texts[index] = nhx
+        pos = match.end()
+        while True:
+            char = text[pos] if pos <= end else ""
+            if char == "," and stack:
+                pos += 1
+                break
+            if char == ")" and stack:
+                index = stack.pop()
+                match = match_content(text, pos + 1)
+                assert match is not None
+                label, dist_text, nhx = match.groups()
+                labels[index] = label
+                dist_texts[index] = dist_text
+                if nhx is not None:
+                    nhx_texts[index] = nhx
+                pos = match.end()
+                continue
+            if char == ";" and pos == end and not stack:
+                return _build_compact_tree(
+                    parent, labels, dist_texts, nhx_texts, parser_format
+                )
+            raise _CompactParseFallback()
+
+
+def _resolve_auto_format(labels, is_leaf):
+    internal_labels = {
+        label for label, leaf in zip(labels, is_leaf, strict=True) if label and not leaf
+    }
+    kinds = {_internal_label_kind(label) for label in internal_labels}
+    if ("quoted" in kinds) or ("other" in kinds):
+        return 1, None
+    # ETE's support parser accepts a superset of the numeric pattern, so
+    # format 0 succeeds exactly when every internal label is float-readable.
+    try:
+        values = [float(label) for label in internal_labels]
+    except ValueError:
+        return 1, None
+    if not all(math.isfinite(value) for value in values):
+        raise _CompactParseFallback()
+    if "numeric" in kinds:
+        return 0, _auto_format_ambiguity_message()
+    return 0, None
+
+
+def _build_compact_tree(parent, labels, dist_texts, nhx_texts, parser_format):
+    num_nodes = len(parent)
+    parent_array = np.asarray(parent, dtype=np.int64)
+    is_leaf = (np.bincount(parent_array[1:], minlength=num_nodes) == 0).tolist()
+    ambiguity_message = None
+    if parser_format == _AUTO_FORMAT:
+        parser_format, ambiguity_message = _resolve_auto_format(labels, is_leaf)
+    leaf_fields, internal_fields = _PARSER_FIELDS[parser_format]
+    dist = [math.nan] * num_nodes
+    support = [math.nan] * num_nodes
+    name_id = [-1] * num_nodes
+    names: list[str] = []
+    name_index: dict[str, int] = {}
+    for index in range(num_nodes):
+        (p0, p0_required), (p1, p1_required) = (
+            leaf_fields if is_leaf[index] else internal_fields
+        )
+        check_required = index > 0
+        label = labels[index]
+        if label:
+            if p0 == _NAME:
+                name = _unquote_node_name(label)
+                node_name_id = name_index.setdefault(name, len(names))
+                if node_name_id == len(names):
+                    names.append(name)
+                name_id[index] = node_name_id
+            elif p0 == _SUPPORT:
+                support[index] = _finite_float(label)
+            else:
+                raise _CompactParseFallback()
+        elif check_required and p0_required:
+            raise _CompactParseFallback()
+        dist_text = dist_texts[index]
+        if dist_text is not None:
+            if p1 != _DIST:
+                raise _CompactParseFallback()
+            dist[index] = _finite_float(dist_text)
+        elif check_required and p1_required:
+            raise _CompactParseFallback()
+    props = {index: _parse_nhx_props(nhx) for index, nhx in nhx_texts.items()}
+    first_child, next_sibling = _sibling_links(parent_array)
+    tree = CompactTree(
+        parent_array,
+        first_child,
+        next_sibling,
+        dist,
+        support,
+        name_id,
+        names,
+        props,
+        parser_format,
+    )
+    return tree, ambiguity_message
+
+
+def _sibling_links(parent):
+    """Derive first-child and next-sibling links from preorder parent indices."""
+    num_nodes = len(parent)
+    first_child = np.full(num_nodes, -1, dtype=np.int64)
+    next_sibling = np.full(num_nodes, -1, dtype=np.int64)
+    if num_nodes < 2:
+        return first_child, next_sibling
+    # A stable sort groups children by parent while keeping preorder, which
+    # is their left-to-right order.
+    children = np.argsort(parent[1:], kind="stable") + 1
+    child_parents = parent[children]
+    same_parent = child_parents[1:] == child_parents[:-1]
+    next_sibling[children[:-1][same_parent]] = children[1:][same_parent]
+    is_first = np.ones(len(children), dtype=bool)
+    is_first[1:] = ~same_parent
+    first_child[child_parents[is_first]] = children[is_first]
+    return first_child, next_sibling
+
+
+def read_compact_tree(infile, format, quoted_node_names, quiet=False):
+    """Read one tree like ``read_tree`` without building ETE node objects.
+
+    Inputs that need ETE-specific handling (comments, NHX overrides of core
+    fields, parse errors) are read with ``read_tree`` and converted, so the
+    result and any error always match the ETE path.
+    """
+    text = normalize_phylogenetic_tree_text(
+        read_input_text(infile), collection=False
+    ).strip()
+    if text == "":
+        raise Exception("Failed to parse the input tree.")
+    if (not quoted_node_names) and _contains_quoted_node_names(text):
+        raise ValueError(
+            "Quoted node names were found in the input tree. Re-run with --quoted-node-names yes."
+        )
+    if format in ("auto", "auto-strict"):
+        parser_format = _AUTO_FORMAT
+    else:
+        parser_format = int(format)
+    try:
+        if parser_format != _AUTO_FORMAT and parser_format not in _PARSER_FIELDS:
+            raise _CompactParseFallback()
+        tree, ambiguity_message = _parse_compact_newick(text, parser_format)
+    except _CompactParseFallback:
+        return CompactTree.from_ete(read_tree(text, format, quoted_node_names, quiet))
+    if ambiguity_message is not None:
+        if format == "auto-strict":
+            raise ValueError(ambiguity_message)
+        if not quiet:
+            sys.stderr.write("Warning: {}\n".format(ambiguity_message))
+    if not quiet:
+        txt = "Number of leaves in input tree = {:,}, Input tree format = {}\n"
+        sys.stderr.write(txt.format(tree.num_leaves, tree.parser_format))
+    return tree
@@ -15,6 +15,7 @@ from nwkit.transfer import (
 )
 from nwkit.util import (
     get_tree_property_names,
+    open_input_text,
     read_tree,
     validate_distinct_output_paths,
     write_tree,
@@ -32,7 +33,7 @@ def _resolve_manifest_path(value, base_dir):
 def _load_manifest(path):
     if path in (None, ""):
         return {}
-    with open(path) as handle:
+    with open_input_text(path) as handle:
         manifest = json.load(handle)
     if not isinstance(manifest, dict):
         raise ValueError("Composition manifest must contain a JSON object.")
@@ -1,22 +1,44 @@
 import math
-import multiprocessing
+import re
 import sys
 from collections import defaultdict
 from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
 from itertools import chain, islice
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
+import numpy as np
 import pandas as pd
 from ete4 import Tree
 
+from nwkit.compact_tree import CompactTree, read_compact_tree
+from nwkit.frequent_items import FrequentItemSummary
+from nwkit.quantile_sketch import (
+    DEFAULT_QUANTILE_ERROR,
+    WeightedQuantileSketch,
+    weighted_quantile,
+)
+from nwkit.split_table import (
+    WIDE_SPLIT_MIN_LEAVES,
+    SplitTable,
+    SplitTableAccumulator,
+    num_mask_words,
+    split_fingerprints,
+    unique_split_words,
+)
+from nwkit.tree_index import IndexedTreeStrings, open_indexed_tree_strings
 from nwkit.util import (
     MISSING_SUPPORT_VALUE,
     TREE_FORMAT_PROP,
+    TreeSampling,
     count_set_bits,
+    get_process_pool_context,
     get_subtree_leaf_bitmasks,
     is_rooted,
     iter_tree_strings,
+    open_input_text,
     read_tree,
+    validate_threads,
     validate_unique_named_leaves,
     write_tree,
 )
@@ -72,8 +94,12 @@ def _mask_min_order(mask, bit_to_order):
 def _read_tree_weights(weight_tsv, num_trees=None):
     if weight_tsv in ["", None]:
         return None if num_trees is None else [1.0] * num_trees
-    weight_source = sys.stdin if weight_tsv == "-" else weight_tsv
-    weight_df = pd.read_csv(weight_source, sep="\t")
+    weight_source = open_input_text(weight_tsv)
+    try:
+        weight_df = pd.read_csv(weight_source, sep="\t")
+    finally:
+        if weight_source is not sys.stdin:
+            weight_source.close()
     if "weight" not in weight_df.columns:
         raise ValueError("--weight-tsv must contain a 'weight' column.")
     if weight_df["weight"].isna().any():
@@ -150,15 +176,36 @@ def _normalize_relative_weights(weights):
     return [weight / max_weight for weight in weights]
 
 
-def _weighted_median(values, weights):
-    sorted_pairs = sorted(zip(values, weights, strict=True), key=lambda pair: pair[0])
-    total_weight = math.fsum(weight for _, weight in sorted_pairs)
-    cumulative_weight = 0.0
-    for value, weight in sorted_pairs:
-        cumulative_weight += weight
-        if cumulative_weight >= (total_weight / 2.0):
-            return value
-    return sorted_pairs[-1][0]
+def _branch_length_quantile(statistic):
+    """Return the quantile of ``median`` or ``qNN`` (NN percent)."""
+    if statistic == "median":
+        return 0.5
+    match = re.fullmatch(r"q(\d+(?:\.\d*)?)", statistic)
+    if (match is None) or (float(match.group(1)) > 100.0):
+        raise ValueError("Unsupported '--branch-length': {}".format(statistic))
+    return float(match.group(1)) / 100.0
+
+
+def _parse_branch_length_spec(spec):
+    """Split ``--branch-length`` into its statistic and extra quantile labels.
+
+    ``q05,q95`` reports median branch lengths with a 5-95% interval, and
+    ``median,q25,q75`` does the same for an interquartile interval.
+    """
+    items = [item.strip() for item in str(spec).split(",")]
+    if items in (["none"], ["mean"], ["median"]):
+        return items[0], ()
+    statistics = [item for item in items if item in ("mean", "median")]
+    quantile_labels = tuple(item for item in items if item not in ("mean", "median"))
+    for label in quantile_labels:
+        _branch_length_quantile(label)
+    if "mean" in statistics:
+        raise ValueError(
+            "'--branch-length' quantiles can be combined with median only."
+        )
+    if len(statistics) > 1 or len(set(quantile_labels)) != len(quantile_labels):
+        raise ValueError("Duplicated '--branch-length' statistic: {}".format(spec))
+    return "median", quantile_labels
 
 
 def _aggregate_branch_lengths(observations, method):
@@ -170,6 +217,9 @@ def _aggregate_branch_lengths(observations, method):
             running_mean, weight_sum = records
             out[mask] = None if weight_sum == 0 else running_mean
             continue
+        if isinstance(records, WeightedQuantileSketch):
+            out[mask] = records.quantile(_branch_length_quantile(method))
+            continue
         values = [value for value, _ in records if value is not None]
         weights = [weight for value, weight in records if value is not None]
         if len(values) == 0:
@@ -179,30 +229,13 @@ def _aggregate_branch_lengths(observations, method):
             out[mask] = math.fsum(
                 value * weight for value, weight in zip(values, weights, strict=True)
             ) / math.fsum(weights)
-        elif method == "median":
-            out[mask] = _weighted_median(values, weights)
         else:
-            raise ValueError("Unsupported '--branch-length': {}".format(method))
+            out[mask] = weighted_quantile(
+                values, weights, _branch_length_quantile(method)
+            )
     return out
 
 
-def _validate_threads(threads):
-    try:
-        threads = int(threads)
-    except (TypeError, ValueError) as exc:
-        raise ValueError("'--threads' must be an integer.") from exc
-    if threads <= 0:
-        raise ValueError("'--threads' must be positive.")
-    return threads
-
-
-def _get_process_pool_context():
-    try:
-        return multiprocessing.get_context("forkserver")
-    except ValueError:
-        return None
-
-
 def _initialize_clade_collection(first_tree):
     validate_unique_named_leaves(
         first_tree, option_name="--infile", context=" for 'consensus'"
@@ -213,6 +246,46 @@ def _initialize_clade_collection(first_tree):
     return leaf_names, leaf_name_to_bit, all_mask
 
 
+def _iter_node_masks(tree, leaf_name_to_bit):
+    """Yield postorder (mask, is_root, dist) records for ETE or compact trees."""
+    if isinstance(tree, CompactTree):
+        masks = tree.subtree_leaf_bitmasks(leaf_name_to_bit)
+        dists = tree.dist.tolist()
+        for index in tree.postorder():
+            dist_value = dists[index]
+            yield (
+                masks[index],
+                index == 0,
+                (None if math.isnan(dist_value) else dist_value),
+            )
+        return
+    subtree_masks = get_subtree_leaf_bitmasks(tree, leaf_name_to_bit)
+    for node, mask in subtree_masks.items():
+        yield mask, node.is_root, node.dist
+
+
+def _tree_is_rooted(tree):
+    if isinstance(tree, CompactTree):
+        return tree.is_rooted()
+    return is_rooted(tree)
+
+
+def _validate_collection_tree(tree, tree_index, leaf_names, require_rooted):
+    validate_unique_named_leaves(
+        tree, option_name="--infile", context=" for 'consensus'"
+    )
+    if require_rooted and not _tree_is_rooted(tree):
+        raise ValueError(
+            "Input tree {} is not rooted; cladefreq requires rooted trees.".format(
+                tree_index
+            )
+        )
+    if set(tree.leaf_names()) != set(leaf_names):
+        raise ValueError(
+            "Leaf labels must be identical across all input trees for consensus."
+        )
+
+
 def _collect_single_tree_clade_stats(
     tree,
     tree_weight,
@@ -232,32 +305,19 @@ def _collect_single_tree_clade_stats(
     branch_length_observations: dict[int, Any] = (
         {} if branch_length_method == "mean" else defaultdict(list)
     )
-    validate_unique_named_leaves(
-        tree, option_name="--infile", context=" for 'consensus'"
-    )
-    if require_rooted and not is_rooted(tree):
-        raise ValueError(
-            "Input tree {} is not rooted; cladefreq requires rooted trees.".format(
-                tree_index
-            )
-        )
-    if set(tree.leaf_names()) != set(leaf_names):
-        raise ValueError(
-            "Leaf labels must be identical across all input trees for consensus."
-        )
-    subtree_masks = get_subtree_leaf_bitmasks(tree, leaf_name_to_bit)
+    _validate_collection_tree(tree, tree_index, leaf_names, require_rooted)
     branch_length_by_mask = dict()
     clade_masks = set()
-    for node, mask in subtree_masks.items():
+    for mask, node_is_root, node_dist in _iter_node_masks(tree, leaf_name_to_bit):
         num_tips = count_set_bits(mask)
-        if branch_length_method != "none" and (not node.is_root):
+        if branch_length_method != "none" and (not node_is_root):
             observation_mask = _branch_observation_mask(
                 mask,
                 all_mask,
                 anchor_bit,
                 comparison,
             )
-            dist_value = None if (node.dist is None) else float(node.dist)
+            dist_value = None if (node_dist is None) else float(node_dist)
             if observation_mask not in branch_length_by_mask:
                 branch_length_by_mask[observation_mask] = dist_value
             else:
@@ -267,7 +327,7 @@ def _collect_single_tree_clade_stats(
                     if previous_value is None or dist_value is None
                     else previous_value + dist_value
                 )
-        if node.is_root:
+        if node_is_root:
             continue
         if comparison == "rooted":
             if (num_tips <= 1) or (num_tips >= len(leaf_names)):
@@ -296,6 +356,99 @@ def _collect_single_tree_clade_stats(
     )
 
 
+def _collect_single_tree_split_tables(
+    tree,
+    tree_weight,
+    tree_index,
+    leaf_names,
+    leaf_name_to_bit,
+    branch_length_method="none",
+    comparison="rooted",
+    require_rooted=False,
+):
+    """Return ``(clade_table, observation_table)`` split tables for one tree.
+
+    This is the vectorized counterpart of ``_collect_single_tree_clade_stats``
+    for trees with many tips: clades are ``LeafBitsets`` word rows rather
+    than integer masks. ``observation_table`` is None without branch lengths.
+    """
+    _validate_collection_tree(tree, tree_index, leaf_names, require_rooted)
+    if not isinstance(tree, CompactTree):
+        tree = CompactTree.from_ete(tree)
+    num_leaves = len(leaf_names)
+    bitsets = tree.subtree_leaf_bitsets(leaf_name_to_bit)
+    counts = bitsets.counts()[1:]
+    if comparison == "rooted":
+        is_clade = (counts > 1) & (counts < num_leaves)
+        flip = np.zeros(len(counts), dtype=bool)
+    else:
+        is_clade = np.minimum(counts, num_leaves - counts) > 1
+        # Pendant edges stay keyed by their single tip and every other split
+        # is oriented away from the anchor tip, as in _branch_observation_mask.
+        has_anchor = bitsets.contains_bit(leaf_name_to_bit[leaf_names[0]])[1:]
+        flip = (has_anchor & (counts != 1)) | (counts == num_leaves - 1)
+    if branch_length_method == "none":
+        rows = np.flatnonzero(is_clade) + 1
+        flip = flip[is_clade]
+    else:
+        rows = np.arange(1, len(bitsets))
+    words = bitsets.words[rows]
+    words[flip] ^= bitsets.all_words()
+    fingerprints = split_fingerprints(words)
+    clade_rows = slice(None) if branch_length_method == "none" else is_clade
+    clade_words, clade_fingerprints, _ = unique_split_words(
+        words[clade_rows], fingerprints[clade_rows]
+    )
+    clade_table = SplitTable(
+        words=clade_words,
+        weights=np.full(len(clade_words), tree_weight, dtype=np.float64),
+        fingerprints=clade_fingerprints,
+    )
+    if branch_length_method == "none":
+        return clade_table, None
+    words, fingerprints, inverse = unique_split_words(words, fingerprints)
+    # Edges sharing a split are summed, and a missing length (NaN) stays missing.
+    dists = np.bincount(inverse, weights=tree.dist[rows], minlength=len(words))
+    missing = np.isnan(dists)
+    if branch_length_method == "mean":
+        return clade_table, SplitTable(
+            words=words,
+            weights=np.where(missing, 0.0, tree_weight),
+            means=np.where(missing, 0.0, dists),
+            fingerprints=fingerprints,
+        )
+    return clade_table, SplitTable(
+        words=words,
+        weights=np.zeros(len(words), dtype=np.float64),
+        observation_rows=np.arange(len(words)),
+        observation_values=np.column_stack(
+            (dists, np.full(len(words), tree_weight, dtype=np.float64))
+        ),
+        fingerprints=fingerprints,
+    )
+
+
+def _new_branch_length_observations(branch_length_method, quantile_error):
+    """Return an empty mask-to-records dict for a branch-length method.
+
+    Without ``quantile_error`` every ``(dist, weight)`` record is kept for
+    exact quantiles; with it, records go into bounded-memory sketches.
+    """
+    if branch_length_method == "mean":
+        return dict()
+    if quantile_error is None:
+        return defaultdict(list)
+    return defaultdict(partial(WeightedQuantileSketch, quantile_error))
+
+
+def _add_split_tables(clade_tables, observation_tables, split_tables):
+    clade_table, observation_table = split_tables
+    if clade_table is not None:
+        clade_tables.add(clade_table)
+    if observation_table is not None:
+        observation_tables.add(observation_table)
+
+
 def _merge_clade_stats(target_clade_weights, target_branch_length_observations, source):
     source_clade_weights, source_branch_length_observations = source
     for mask, weight in source_clade_weights.items():
@@ -320,6 +473,8 @@ def _merge_clade_stats(target_clade_weights, target_branch_length_observations,
                 ),
                 combined_weight,
             )
+        elif isinstance(observations, WeightedQuantileSketch):
+            target_branch_length_observations[mask].merge(observations)
         else:
             target_branch_length_observations[mask].extend(observations)
 
@@ -334,14 +489,15 @@ def _collect_tree_string_chunk_clade_stats(payload):
         branch_length_method,
         comparison,
         require_rooted,
+        quantile_error,
     ) = payload
     leaf_name_to_bit = {leaf_name: index for index, leaf_name in enumerate(leaf_names)}
     clade_weights: defaultdict[int, float] = defaultdict(float)
-    branch_length_observations: dict[int, Any] = (
-        {} if branch_length_method == "mean" else defaultdict(list)
+    branch_length_observations: dict[int, Any] = _new_branch_length_observations(
+        branch_length_method, quantile_error
     )
     for tree_index, tree_string, tree_weight in records:
-        tree = read_tree(tree_string, format, quoted_node_names, quiet=True)
+        tree = read_compact_tree(tree_string, format, quoted_node_names, quiet=True)
         _, _, _, tree_clade_weights, tree_branch_length_observations = (
             _collect_single_tree_clade_stats(
                 tree=tree,
@@ -363,6 +519,150 @@ def _collect_tree_string_chunk_clade_stats(payload):
     return dict(clade_weights), dict(branch_length_observations)
 
 
+def _collect_tree_string_chunk_split_tables(payload):
+    """Return a worker chunk's clade and branch-length stats as split tables."""
+    (
+        records,
+        format,
+        quoted_node_names,
+        leaf_names,
+        _,
+        branch_length_method,
+        comparison,
+        require_rooted,
+        quantile_error,
+    ) = payload
+    if len(leaf_names) >= WIDE_SPLIT_MIN_LEAVES:
+        leaf_name_to_bit = {
+            leaf_name: index for index, leaf_name in enumerate(leaf_names)
+        }
+        clade_tables = SplitTableAccumulator()
+        observation_tables = SplitTableAccumulator(quantile_error)
+        for tree_index, tree_string, tree_weight in records:
+            tree = read_compact_tree(tree_string, format, quoted_node_names, quiet=True)
+            _add_split_tables(
+                clade_tables,
+                observation_tables,
+                _collect_single_tree_split_tables(
+                    tree=tree,
+                    tree_weight=tree_weight,
+                    tree_index=tree_index,
+                    leaf_names=leaf_names,
+                    leaf_name_to_bit=leaf_name_to_bit,
+                    branch_length_method=branch_length_method,
+                    comparison=comparison,
+                    require_rooted=require_rooted,
+                ),
+            )
+        return clade_tables.result(), observation_tables.result()
+    clade_weights, branch_length_observations = _collect_tree_string_chunk_clade_stats(
+        payload
+    )
+    num_words = num_mask_words(len(leaf_names))
+    if branch_length_method == "none":
+        observation_table = None
+    elif branch_length_method == "mean":
+        observation_table = SplitTable.from_means(branch_length_observations, num_words)
+    elif quantile_error is not None:
+        observation_table = SplitTable.from_sketches(
+            branch_length_observations, num_words
+        )
+    else:
+        observation_table = SplitTable.from_observations(
+            branch_length_observations, num_words
+        )
+    return SplitTable.from_weights(clade_weights, num_words), observation_table
+
+
+def _chunk_clade_weights(payload):
+    """Return the summed clade weights of one chunk of tree records."""
+    if len(payload[3]) >= WIDE_SPLIT_MIN_LEAVES:
+        return _collect_tree_string_chunk_split_tables(payload)[0].weight_by_mask()
+    return _collect_tree_string_chunk_clade_stats(payload)[0]
+
+
+def _split_table_clade_stats(clade_table, observation_table, branch_length_method):
+    if observation_table is None:
+        branch_length_observations = dict()
+    elif branch_length_method == "mean":
+        branch_length_observations = observation_table.mean_by_mask()
+    elif observation_table.sketches is not None:
+        branch_length_observations = observation_table.sketch_by_mask()
+    else:
+        branch_length_observations = observation_table.observations_by_mask()
+    return clade_table.weight_by_mask(), branch_length_observations
+
+
+class _IndexedRecordChunk:
+    """Records of one worker chunk, read from the indexed file in the worker."""
+
+    def __init__(self, tree_strings, first_tree_index, tree_weights):
+        self.tree_strings = tree_strings
+        self.first_tree_index = first_tree_index
+        self.tree_weights = tree_weights
+
+    def __iter__(self):
+        return zip(
+            range(
+                self.first_tree_index, self.first_tree_index + len(self.tree_strings)
+            ),
+            self.tree_strings,
+            self.tree_weights,
+            strict=True,
+        )
+
+
+def _iter_indexed_record_chunks(tree_strings, tree_weight, threads):
+    num_trees = len(tree_strings)
+    chunk_size = max(32, -(-(num_trees - 1) // (threads * 4)))
+    for start in range(1, num_trees, chunk_size):
+        stop = min(start + chunk_size, num_trees)
+        yield _IndexedRecordChunk(
+            tree_strings[start:stop],
+            start + 1,
+            [tree_weight(tree_index) for tree_index in range(start + 1, stop + 1)],
+        )
+
+
+def _get_tree_sampling(args):
+    """Return the requested ``TreeSampling``, or None to keep every input tree."""
+    sampling = TreeSampling.from_args(args)
+    if (sampling is not None) and (getattr(args, "weight_tsv", None) not in ("", None)):
+        raise ValueError(
+            "'--weight-tsv' cannot be combined with '--burnin', '--thin', or '--subsample'."
+        )
+    return sampling
+
+
+def _open_input_tree_strings(infile, collection_index, command_name, sampling=None):
+    """Return the input tree strings and a callable counting the trees read."""
+    no_tree_message = "No input trees were found for {}.".format(command_name)
+    if collection_index:
+        indexed_tree_strings = open_indexed_tree_strings(infile)
+        if indexed_tree_strings is not None:
+            if sampling is not None:
+                # Unselected records are never read from the memory-mapped file.
+                indexed_tree_strings = indexed_tree_strings.take(
+                    sampling.positions(len(indexed_tree_strings))
+                )
+            if len(indexed_tree_strings) == 0:
+                raise ValueError(no_tree_message)
+            return indexed_tree_strings, lambda: len(indexed_tree_strings)
+    raw_tree_strings = iter(iter_tree_strings(infile, sampling))
+    try:
+        first_tree_string = next(raw_tree_strings)
+    except StopIteration:
+        raise ValueError(no_tree_message) from None
+    tree_count = [0]
+
+    def counted_tree_strings():
+        for tree_string in chain((first_tree_string,), raw_tree_strings):
+            tree_count[0] += 1
+            yield tree_string
+
+    return counted_tree_strings(), lambda: tree_count[0]
+
+
 def _collect_clade_stats_from_tree_strings(
     tree_strings,
     tree_weights,
@@ -373,17 +673,40 @@ def _collect_clade_stats_from_tree_strings(
     branch_length_method=None,
     comparison="rooted",
     require_rooted=False,
+    quantile_error=None,
+    clade_frequency_error=None,
+    reference_leaf_names=None,
 ):
+    """Summarize clade weights and branch lengths over a tree collection.
+
+    With ``clade_frequency_error``, clade weights are streamed into a
+    ``FrequentItemSummary`` that is returned in place of the clade weight
+    dict. Its capacity keeps the undercount of every clade frequency below
+    that error, whatever the number of distinct clades. With
+    ``reference_leaf_names``, clade masks use that leaf order, so that the
+    results of separate collections can be combined.
+    """
     tree_string_iterator = iter(tree_strings)
     try:
         first_tree_string = next(tree_string_iterator)
     except StopIteration:
         raise ValueError("No input trees were found for consensus.") from None
-    threads = _validate_threads(threads)
+    threads = validate_threads(threads)
     if branch_length_method is None:
         branch_length_method = "median" if collect_branch_lengths else "none"
-    first_tree = read_tree(first_tree_string, format, quoted_node_names, quiet=True)
+    first_tree = read_compact_tree(
+        first_tree_string, format, quoted_node_names, quiet=True
+    )
     leaf_names, leaf_name_to_bit, all_mask = _initialize_clade_collection(first_tree)
+    if reference_leaf_names is not None:
+        if set(reference_leaf_names) != set(leaf_names):
+            raise ValueError(
+                "Leaf labels must be identical across all input trees for consensus."
+            )
+        leaf_names = list(reference_leaf_names)
+        leaf_name_to_bit = {
+            leaf_name: index for index, leaf_name in enumerate(leaf_names)
+        }
 
     def tree_weight(tree_index):
         if tree_weights is None:
@@ -394,58 +717,106 @@ def _collect_clade_stats_from_tree_strings(
             )
         return tree_weights[tree_index - 1]
 
-    _, _, _, first_clade_weights, first_branch_length_observations = (
-        _collect_single_tree_clade_stats(
-            tree=first_tree,
-            tree_weight=tree_weight(1),
-            tree_index=1,
-            leaf_names=leaf_names,
-            leaf_name_to_bit=leaf_name_to_bit,
-            collect_branch_lengths=collect_branch_lengths,
-            branch_length_method=branch_length_method,
-            comparison=comparison,
-            require_rooted=require_rooted,
-        )
-    )
-    clade_weights: defaultdict[int, float] = defaultdict(float, first_clade_weights)
-    branch_length_observations: dict[int, Any] = (
-        {} if branch_length_method == "mean" else defaultdict(list)
+    clade_weights: defaultdict[int, float] = defaultdict(float)
+    branch_length_observations: dict[int, Any] = _new_branch_length_observations(
+        branch_length_method, quantile_error
     )
-    for mask, observations in first_branch_length_observations.items():
-        if isinstance(observations, tuple):
-            branch_length_observations[mask] = observations
-        else:
-            branch_length_observations[mask].extend(observations)
+    # Workers, and wide trees in any mode, produce fixed-width split tables,
+    # so the parent merges arrays and builds each distinct split's dict entry
+    # only once at the end.
+    clade_tables = SplitTableAccumulator()
+    observation_tables = SplitTableAccumulator(quantile_error)
+    wide = len(leaf_names) >= WIDE_SPLIT_MIN_LEAVES
+    if wide:
+        _add_split_tables(
+            clade_tables,
+            observation_tables,
+            _collect_single_tree_split_tables(
+                tree=first_tree,
+                tree_weight=tree_weight(1),
+                tree_index=1,
+                leaf_names=leaf_names,
+                leaf_name_to_bit=leaf_name_to_bit,
+                branch_length_method=branch_length_method,
+                comparison=comparison,
+                require_rooted=require_rooted,
+            ),
+        )
+    else:
+        _, _, _, first_clade_weights, first_branch_length_observations = (
+            _collect_single_tree_clade_stats(
+                tree=first_tree,
+                tree_weight=tree_weight(1),
+                tree_index=1,
+                leaf_names=leaf_names,
+                leaf_name_to_bit=leaf_name_to_bit,
+                collect_branch_lengths=collect_branch_lengths,
+                branch_length_method=branch_length_method,
+                comparison=comparison,
+                require_rooted=require_rooted,
+            )
+        )
+        _merge_clade_stats(
+            target_clade_weights=clade_weights,
+            target_branch_length_observations=branch_length_observations,
+            source=(first_clade_weights, first_branch_length_observations),
+        )
     records: Iterable[tuple[int, Any, float]] = (
         (tree_index, tree_string, tree_weight(tree_index))
         for tree_index, tree_string in enumerate(tree_string_iterator, start=2)
     )
-    if threads > 1:
+    record_chunks: Iterator[Any] = iter(())
+    if threads > 1 and isinstance(tree_strings, IndexedTreeStrings):
+        # Workers read their own slices, so the parent never touches their bytes.
+        record_chunks = _iter_indexed_record_chunks(tree_strings, tree_weight, threads)
+        if len(tree_strings) <= 64:
+            threads = 1
+    elif threads > 1:
         prefetched_records = list(islice(records, 64))
         records = chain(prefetched_records, records)
+        record_chunks = iter(lambda: list(islice(records, 32)), [])
         if len(prefetched_records) < 64:
             threads = 1
-    if threads <= 1:
-        chunk_result = _collect_tree_string_chunk_clade_stats(
-            (
-                records,
-                format,
-                quoted_node_names,
-                leaf_names,
-                collect_branch_lengths,
-                branch_length_method,
-                comparison,
-                require_rooted,
-            )
+
+    def chunk_payload(chunk):
+        return (
+            chunk,
+            format,
+            quoted_node_names,
+            leaf_names,
+            collect_branch_lengths,
+            branch_length_method,
+            comparison,
+            require_rooted,
+            quantile_error,
         )
-        _merge_clade_stats(
-            target_clade_weights=clade_weights,
-            target_branch_length_observations=branch_length_observations,
-            source=chunk_result,
+
+    clade_summary = None
+    if clade_frequency_error is not None:
+        # Each rooted tree adds at most one weight to num_leaves - 2 clades.
+        clade_summary = FrequentItemSummary(
+            math.ceil(max(len(leaf_names) - 2, 1) / clade_frequency_error)
         )
+    if threads <= 1 and clade_summary is not None:
+        for record_chunk in iter(lambda: list(islice(records, 32)), []):
+            clade_summary.update(_chunk_clade_weights(chunk_payload(record_chunk)))
+    elif threads <= 1:
+        payload = chunk_payload(records)
+        if wide:
+            _add_split_tables(
+                clade_tables,
+                observation_tables,
+                _collect_tree_string_chunk_split_tables(payload),
+            )
+        else:
+            _merge_clade_stats(
+                target_clade_weights=clade_weights,
+                target_branch_length_observations=branch_length_observations,
+                source=_collect_tree_string_chunk_clade_stats(payload),
+            )
     else:
         executor_kwargs = {"max_workers": threads}
-        process_pool_context = _get_process_pool_context()
+        process_pool_context = get_process_pool_context()
         if process_pool_context is not None:
             executor_kwargs["mp_context"] = process_pool_context
         with ProcessPoolExecutor(**executor_kwargs) as executor:
@@ -453,33 +824,38 @@ def _collect_clade_stats_from_tree_strings(
             records_exhausted = False
             while futures or not records_exhausted:
                 while len(futures) < threads * 2 and not records_exhausted:
-                    chunk = list(islice(records, 32))
-                    if not chunk:
+                    chunk = next(record_chunks, None)
+                    if chunk is None:
                         records_exhausted = True
                         break
-                    payload = (
-                        chunk,
-                        format,
-                        quoted_node_names,
-                        leaf_names,
-                        collect_branch_lengths,
-                        branch_length_method,
-                        comparison,
-                        require_rooted,
-                    )
                     futures.add(
-                        executor.submit(_collect_tree_string_chunk_clade_stats, payload)
+                        executor.submit(
+                            _collect_tree_string_chunk_split_tables,
+                            chunk_payload(chunk),
+                        )
                     )
                 if not futures:
                     continue
                 completed, futures = wait(futures, return_when=FIRST_COMPLETED)
                 for future in completed:
-                    chunk_result = future.result()
-                    _merge_clade_stats(
-                        target_clade_weights=clade_weights,
-                        target_branch_length_observations=branch_length_observations,
-                        source=chunk_result,
-                    )
+                    if clade_summary is None:
+                        _add_split_tables(
+                            clade_tables, observation_tables, future.result()
+                        )
+                    else:
+                        clade_summary.update(future.result()[0].weight_by_mask())
+    clade_table = clade_tables.result()
+    if clade_table is not None:
+        _merge_clade_stats(
+            target_clade_weights=clade_weights,
+            target_branch_length_observations=branch_length_observations,
+            source=_split_table_clade_stats(
+                clade_table, observation_tables.result(), branch_length_method
+            ),
+        )
+    if clade_summary is not None:
+        clade_summary.update(clade_weights)
+        return (leaf_names, leaf_name_to_bit, all_mask, clade_summary, {})
     return (
         leaf_names,
         leaf_name_to_bit,
@@ -581,9 +957,12 @@ def _build_consensus_subtree(
     bit_to_name,
     bit_to_order,
     all_mask,
+    props_by_mask=None,
 ):
     node = Tree()
     node.dist = None if (parent_mask == all_mask) else dist_by_mask.get(parent_mask)
+    if props_by_mask and parent_mask != all_mask:
+        node.props.update(props_by_mask.get(parent_mask, {}))
     if parent_mask == all_mask:
         node.support = None
     else:
@@ -610,18 +989,26 @@ def _build_consensus_subtree(
                 bit_to_name=bit_to_name,
                 bit_to_order=bit_to_order,
                 all_mask=all_mask,
+                props_by_mask=props_by_mask,
             )
         else:
             child = Tree()
             child.name = bit_to_name[child_value]
             child.dist = dist_by_mask.get(child_value)
             child.support = MISSING_SUPPORT_VALUE
+            if props_by_mask:
+                child.props.update(props_by_mask.get(child_value, {}))
         node.add_child(child=child)
     return node
 
 
 def _build_consensus_tree(
-    leaf_names, all_mask, selected_masks, support_by_mask, dist_by_mask
+    leaf_names,
+    all_mask,
+    selected_masks,
+    support_by_mask,
+    dist_by_mask,
+    props_by_mask=None,
 ):
     bit_to_name = {1 << index: leaf_name for index, leaf_name in enumerate(leaf_names)}
     bit_to_order = _bit_to_order_map(leaf_names)
@@ -633,6 +1020,7 @@ def _build_consensus_tree(
         bit_to_name=bit_to_name,
         bit_to_order=bit_to_order,
         all_mask=all_mask,
+        props_by_mask=props_by_mask,
     )
     for node in consensus_tree.traverse():
         node.props[TREE_FORMAT_PROP] = 0
@@ -672,27 +1060,43 @@ def _annotate_reference_tree(
     return reference_tree
 
 
+def _branch_length_interval_props(observations, quantile_labels):
+    """Return ``{mask: {"branch_length_qNN": value}}`` for quantile labels."""
+    props_by_mask: defaultdict[int, dict[str, float]] = defaultdict(dict)
+    for label in quantile_labels:
+        for mask, value in _aggregate_branch_lengths(observations, label).items():
+            if value is not None:
+                props_by_mask[mask]["branch_length_{}".format(label)] = value
+    return dict(props_by_mask)
+
+
+def _validate_quantile_error(quantile_error):
+    quantile_error = float(quantile_error)
+    if not (0.0 <= quantile_error < 1.0):
+        raise ValueError("'--quantile-error' must be at least 0 and below 1.")
+    return None if quantile_error == 0.0 else quantile_error
+
+
 def consensus_main(args):
     method = getattr(args, "method", "greedy")
-    branch_length = getattr(args, "branch_length", "none")
+    branch_length, quantile_labels = _parse_branch_length_spec(
+        getattr(args, "branch_length", "none")
+    )
+    quantile_error = _validate_quantile_error(
+        getattr(args, "quantile_error", DEFAULT_QUANTILE_ERROR)
+    )
     comparison = getattr(args, "comparison", "rooted")
     weight_tsv = getattr(args, "weight_tsv", None)
     if comparison not in ("rooted", "unrooted"):
         raise ValueError("Unsupported '--comparison': {}".format(comparison))
     if (args.min_freq < 0.0) or (args.min_freq > 1.0):
         raise ValueError("'--min-freq' must be between 0 and 1.")
-    raw_tree_strings = iter(iter_tree_strings(args.infile))
-    try:
-        first_tree_string = next(raw_tree_strings)
-    except StopIteration:
-        raise ValueError("No input trees were found for consensus.") from None
-    tree_count = [0]
-
-    def counted_tree_strings():
-        for tree_string in chain((first_tree_string,), raw_tree_strings):
-            tree_count[0] += 1
-            yield tree_string
-
+    tree_strings, count_trees = _open_input_tree_strings(
+        args.infile,
+        getattr(args, "collection_index", False),
+        "consensus",
+        _get_tree_sampling(args),
+    )
     raw_tree_weights = _read_tree_weights(weight_tsv)
     tree_weights = (
         None
@@ -706,7 +1110,7 @@ def consensus_main(args):
         clade_weights,
         branch_length_observations,
     ) = _collect_clade_stats_from_tree_strings(
-        tree_strings=counted_tree_strings(),
+        tree_strings=tree_strings,
         tree_weights=tree_weights,
         format=args.format,
         quoted_node_names=args.quoted_node_names,
@@ -714,8 +1118,9 @@ def consensus_main(args):
         threads=getattr(args, "threads", 1),
         branch_length_method=branch_length,
         comparison=comparison,
+        quantile_error=quantile_error,
     )
-    num_trees = tree_count[0]
+    num_trees = count_trees()
     if tree_weights is not None and len(tree_weights) != num_trees:
         raise ValueError("--weight-tsv must contain exactly one row per input tree.")
     sys.stderr.write("Number of input trees = {:,}\n".format(num_trees))
@@ -757,5 +1162,9 @@ def consensus_main(args):
             selected_masks=[mask for mask, _, _ in selected_masks],
             support_by_mask=support_by_mask,
             dist_by_mask=dist_by_mask,
+            props_by_mask=_branch_length_interval_props(
+                branch_length_observations, quantile_labels
+            ),
         )
-    write_tree(output_tree, args, format=0)
+    interval_props = ["branch_length_{}".format(label) for label in quantile_labels]
+    write_tree(output_tree, args, format=0, props=(interval_props or None))
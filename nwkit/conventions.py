@@ -58,6 +58,7 @@ STDIN_INPUT_DESTS = (
     "predictor_sampling_covariance",
     "species_traits",
     "species_tree",
+    "jobs",
     "root_source",
     "name_source",
     "support_source",
@@ -65,7 +66,12 @@ STDIN_INPUT_DESTS = (
     "tip_image_manifest",
     "mcmctree_posterior",
     "densitree_trees",
+    "collection",
 )
+# Inputs whose default "-" means "not given" while another input is set:
+# ``dist --collection`` compares collection trees to each other unless an
+# --infile reference tree is given.
+STDIN_INPUT_UNUSED_WITH = {"infile": "collection"}
 
 
 def get_stdin_input_options(args: Any) -> list[tuple[str, str]]:
@@ -73,6 +79,7 @@ def get_stdin_input_options(args: Any) -> list[tuple[str, str]]:
         (dest, "--{}".format(dest.replace("_", "-")))
         for dest in STDIN_INPUT_DESTS
         if getattr(args, dest, None) == "-"
+        and getattr(args, STDIN_INPUT_UNUSED_WITH.get(dest, ""), None) in (None, "")
     ]
     options.extend(
         ("property_source", "--property-source")
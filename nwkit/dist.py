@@ -1,13 +1,24 @@
 import csv
 import math
 import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from itertools import combinations
+from math import comb
 from typing import Any
 
+from nwkit.quartet import quartet_distance, triplet_distance
+from nwkit.rf import robinson_foulds
 from nwkit.util import (
+    TreeSampling,
+    get_process_pool_context,
     get_subtree_leaf_name_sets,
     is_rooted,
+    iter_tree_strings,
+    open_output_text,
     read_tree,
+    validate_threads,
     validate_unique_named_leaves,
 )
 
@@ -18,7 +29,12 @@ SUPPORTED_METRICS = (
     "branch-score",
     "path-topological",
     "path-length",
+    "triplet",
+    "quartet",
 )
+# Triplet and quartet distances take longer than the other metrics and must be
+# requested by name.
+DEFAULT_METRICS = SUPPORTED_METRICS[:6]
 DISTANCE_COLUMNS = (
     "metric",
     "comparison",
@@ -44,6 +60,23 @@ BRANCH_LENGTH_METRICS = frozenset(
 PATH_MATRIX_MAX_TAXA = 2000
 PATH_MATRIX_MAX_DYNAMIC_RANGE = 10**12
 PATH_MATRIX_ROUNDOFF_FACTOR = 16
+PATH_BLOCK_SIZE = 1024
+COLLECTION_DISTANCE_COLUMNS = ("tree1", "tree2") + DISTANCE_COLUMNS
+REFERENCE_DISTANCE_COLUMNS = ("tree",) + DISTANCE_COLUMNS
+REFERENCE_CHUNK_SIZE = 64
+MATRIX_FORMATS = ("long", "square")
+COLLECTION_TILE_SIZE = 64
+COLLECTION_PATH_TILE_BYTES = 256 * 1024 * 1024
+COLLECTION_PROGRESS_SECONDS = 10.0
+PATH_METRICS = frozenset({"path-topological", "path-length"})
+# Number of leaves in the sets whose induced topologies are compared.
+LEAF_SET_SIZES = {"triplet": 3, "quartet": 4}
+
+# LCA-depth indexes of the two trees used by path-block workers.
+_path_block_state: dict[str, Any] = {}
+# Encoded collection, or the --infile reference, used by the pair workers;
+# set per process by ``_initialize_collection_worker``.
+_collection_state: dict[str, Any] = {}
 
 
 def _parse_metric_values(values):
@@ -67,9 +100,11 @@ def _parse_metric_values(values):
             if metric not in metrics:
                 metrics.append(metric)
     if has_all:
-        return SUPPORTED_METRICS
+        return DEFAULT_METRICS + tuple(
+            metric for metric in metrics if metric not in DEFAULT_METRICS
+        )
     if not metrics:
-        return SUPPORTED_METRICS
+        return DEFAULT_METRICS
     return tuple(metrics)
 
 
@@ -83,7 +118,7 @@ def _resolve_metrics(args):
         legacy_output = metrics == ("rf",)
         return metrics, legacy_output
     if canonical_values is None:
-        return SUPPORTED_METRICS, False
+        return DEFAULT_METRICS, False
     if isinstance(canonical_values, str):
         canonical_values = [canonical_values]
     return _parse_metric_values(canonical_values), False
@@ -194,31 +229,50 @@ def _binary_root_sides(tree):
     return sides
 
 
-def _path_matrix_is_safe(tree1, tree2, num_taxa, topological):
+def _branch_length_summary(tree):
+    """Return ``(edge_count, max_length, min_positive_length)`` of a tree."""
+    max_length = 0.0
+    min_positive_length = math.inf
+    edge_count = 0
+    for node in tree.traverse():
+        if node.is_root:
+            continue
+        edge_count += 1
+        length = float(node.dist)
+        max_length = max(max_length, length)
+        if length > 0.0:
+            min_positive_length = min(min_positive_length, length)
+    return edge_count, max_length, min_positive_length
+
+
+def _path_summaries_are_safe(summary1, summary2, num_taxa, topological):
     if num_taxa > PATH_MATRIX_MAX_TAXA:
         return False
     if topological:
         return True
-    positive_lengths = list()
-    max_length = 0.0
-    edge_count = 0
-    for tree in (tree1, tree2):
-        for node in tree.traverse():
-            if node.is_root:
-                continue
-            edge_count += 1
-            length = float(node.dist)
-            max_length = max(max_length, length)
-            if length > 0.0:
-                positive_lengths.append(length)
+    edge_count = summary1[0] + summary2[0]
+    max_length = max(summary1[1], summary2[1])
     if max_length == 0.0:
         return True
     if max_length > (sys.float_info.max / max(4, edge_count * 2)):
         return False
-    min_length = min(positive_lengths)
+    min_length = min(summary1[2], summary2[2])
     return (max_length / min_length) <= PATH_MATRIX_MAX_DYNAMIC_RANGE
 
 
+def _path_matrix_is_safe(tree1, tree2, num_taxa, topological):
+    if num_taxa > PATH_MATRIX_MAX_TAXA:
+        return False
+    if topological:
+        return True
+    return _path_summaries_are_safe(
+        _branch_length_summary(tree1),
+        _branch_length_summary(tree2),
+        num_taxa,
+        topological,
+    )
+
+
 def _ordered_distance_matrix(tree, leaf_names, topological):
     import numpy as np
 
@@ -237,20 +291,25 @@ def _ordered_distance_matrix(tree, leaf_names, topological):
     return matrix[np.ix_(order, order)]
 
 
-def _path_distance_matrix(tree1, tree2, leaf_names, topological):
+def _path_upper_triangle(tree, leaf_names, topological):
     import numpy as np
 
-    matrix1 = _ordered_distance_matrix(tree1, leaf_names, topological)
-    matrix2 = _ordered_distance_matrix(tree2, leaf_names, topological)
-    upper = (matrix1 - matrix2)[np.triu_indices(len(leaf_names), 1)]
+    matrix = _ordered_distance_matrix(tree, leaf_names, topological)
+    return matrix[np.triu_indices(len(leaf_names), 1)]
+
+
+def _path_distance_from_upper(upper1, upper2, num_taxa):
+    import numpy as np
+
+    upper = upper1 - upper2
     if upper.size == 0:
         return 0.0
     scale = float(np.max(np.abs(upper)))
     if scale == 0.0:
         return 0.0
     matrix_scale = max(
-        float(np.max(matrix1)),
-        float(np.max(matrix2)),
+        float(np.max(upper1)),
+        float(np.max(upper2)),
     )
     # Subtracting independently accumulated path sums is ill-conditioned when
     # the trees are nearly identical. Fall back before roundoff can dominate
@@ -258,7 +317,7 @@ def _path_distance_matrix(tree1, tree2, leaf_names, topological):
     roundoff_bound = (
         PATH_MATRIX_ROUNDOFF_FACTOR
         * sys.float_info.epsilon
-        * max(4, 2 * len(leaf_names))
+        * max(4, 2 * num_taxa)
         * matrix_scale
     )
     if scale <= roundoff_bound:
@@ -269,7 +328,237 @@ def _path_distance_matrix(tree1, tree2, leaf_names, topological):
     return distance
 
 
-def _path_distance(tree1, tree2, leaf_names, topological):
+def _path_distance_matrix(tree1, tree2, leaf_names, topological):
+    return _path_distance_from_upper(
+        _path_upper_triangle(tree1, leaf_names, topological),
+        _path_upper_triangle(tree2, leaf_names, topological),
+        len(leaf_names),
+    )
+
+
+def _two_sum(a, b):
+    total = a + b
+    b_part = total - a
+    return total, (a - (total - b_part)) + (b - b_part)
+
+
+def _path_block_index(tree, leaf_names, topological):
+    """Return the arrays that give tip-to-tip path lengths of a tree by LCA depth.
+
+    Root depths are kept as unevaluated sums ``hi + lo`` so that differences
+    of nearly equal paths do not lose the low-order bits. Leaves are numbered
+    in preorder; the LCA of the leaves at positions ``p < q`` is the shallowest
+    of the LCAs of the adjacent leaf pairs between them, which a sparse table
+    answers in constant time.
+    """
+    import numpy as np
+
+    root_children = tree.get_children()
+    half_root_edges = topological and len(root_children) == 2
+    nodes = list(tree.traverse(strategy="preorder"))
+    position_by_node = {node: position for position, node in enumerate(nodes)}
+    hi = np.zeros(len(nodes))
+    lo = np.zeros(len(nodes))
+    steps = np.zeros(len(nodes), dtype=np.int64)
+    for position, node in enumerate(nodes):
+        if node.is_root:
+            continue
+        parent = position_by_node[node.up]
+        if topological:
+            # Paths between the two root sides cross one edge, not two.
+            length = 0.5 if half_root_edges and node.up.is_root else 1.0
+        else:
+            length = float(node.dist)
+        total, error = _two_sum(float(hi[parent]), length)
+        error += float(lo[parent])
+        hi[position] = total + error
+        lo[position] = error - (hi[position] - total)
+        steps[position] = steps[parent] + 1
+    leaf_positions = [position for position, node in enumerate(nodes) if node.is_leaf]
+    leaf_order = {
+        nodes[position].name: order for order, position in enumerate(leaf_positions)
+    }
+    last_leaf = np.zeros(len(nodes), dtype=np.int64)
+    for order, position in enumerate(leaf_positions):
+        last_leaf[position] = order
+    for position in range(len(nodes) - 1, -1, -1):
+        if not nodes[position].is_leaf:
+            last_leaf[position] = last_leaf[
+                position_by_node[nodes[position].children[-1]]
+            ]
+    adjacent_lca = np.zeros(max(1, len(leaf_positions) - 1), dtype=np.int64)
+    for position, node in enumerate(nodes):
+        for child in node.children[:-1]:
+            adjacent_lca[last_leaf[position_by_node[child]]] = position
+    # Keys order adjacent pairs by LCA edge depth; the low 32 bits keep the pair.
+    sparse_table = [(steps[adjacent_lca] << 32) | np.arange(adjacent_lca.size)]
+    width = 1
+    while 2 * width <= adjacent_lca.size:
+        previous = sparse_table[-1]
+        shifted = np.concatenate([previous[width:], previous[-width:]])
+        sparse_table.append(np.minimum(previous, shifted))
+        width *= 2
+    leaf_order_by_name = np.asarray([leaf_order[name] for name in leaf_names])
+    leaf_position_by_name = np.asarray(leaf_positions)[leaf_order_by_name]
+    return {
+        "order": leaf_order_by_name,
+        "leaf_hi": hi[leaf_position_by_name],
+        "leaf_lo": lo[leaf_position_by_name],
+        "lca_hi": hi[adjacent_lca],
+        "lca_lo": lo[adjacent_lca],
+        "sparse_table": np.vstack(sparse_table),
+        "max_depth": float(np.max(hi + lo)) if len(nodes) else 0.0,
+        "max_steps": int(np.max(steps)) if len(nodes) else 0,
+    }
+
+
+def _path_block_lca(index, rows, columns):
+    """Return the adjacent-pair indices holding the LCAs of a block of leaf pairs."""
+    import numpy as np
+
+    first = index["order"][rows][:, None]
+    second = index["order"][columns][None, :]
+    low = np.minimum(first, second)
+    high = np.maximum(first, second)
+    # Equal positions (the masked diagonal) are given any valid range.
+    last_pair = index["sparse_table"].shape[1] - 1
+    low = np.minimum(low, last_pair)
+    high = np.maximum(high, low + 1)
+    level = np.log2(high - low).astype(np.int64)
+    return (
+        np.minimum(
+            index["sparse_table"][level, low],
+            index["sparse_table"][level, high - (1 << level)],
+        )
+        & 0xFFFFFFFF
+    )
+
+
+def _leaf_depth_differences(indexes, leaves):
+    hi, error = _two_sum(indexes[0]["leaf_hi"][leaves], -indexes[1]["leaf_hi"][leaves])
+    return hi, error + (indexes[0]["leaf_lo"][leaves] - indexes[1]["leaf_lo"][leaves])
+
+
+def _path_block_norm(indexes, block):
+    """Return ``(scale, sum of squares / scale**2)`` of one block of differences."""
+    import numpy as np
+
+    start1, stop1, start2, stop2 = block
+    rows = np.arange(start1, stop1)
+    columns = np.arange(start2, stop2)
+    row_hi, row_lo = _leaf_depth_differences(indexes, rows)
+    column_hi, column_lo = _leaf_depth_differences(indexes, columns)
+    lca1 = _path_block_lca(indexes[0], rows, columns)
+    lca2 = _path_block_lca(indexes[1], rows, columns)
+    # d1(i, j) - d2(i, j) as a compensated sum (Ogita-Rump-Oishi Sum2) of the
+    # root-depth terms, matching the accuracy of _stable_component_difference.
+    total, compensation = _two_sum(row_hi[:, None], column_hi[None, :])
+    for term in (-2.0 * indexes[0]["lca_hi"][lca1], 2.0 * indexes[1]["lca_hi"][lca2]):
+        total, error = _two_sum(total, term)
+        compensation += error
+    compensation += row_lo[:, None] + column_lo[None, :]
+    compensation -= 2.0 * (indexes[0]["lca_lo"][lca1] - indexes[1]["lca_lo"][lca2])
+    difference = total + compensation
+    if start1 == start2:
+        difference[rows[:, None] >= columns[None, :]] = 0.0
+    scale = float(np.max(np.abs(difference))) if difference.size else 0.0
+    if scale == 0.0 or not math.isfinite(scale):
+        return scale, 0.0
+    return scale, float(np.sum((difference / scale) ** 2))
+
+
+def _path_blocks(num_taxa, block_size):
+    for start1 in range(0, num_taxa, block_size):
+        stop1 = min(start1 + block_size, num_taxa)
+        for start2 in range(start1, num_taxa, block_size):
+            yield start1, stop1, start2, min(start2 + block_size, num_taxa)
+
+
+def _initialize_path_block_worker(indexes):
+    _path_block_state["indexes"] = indexes
+
+
+def _path_block_worker_norm(block):
+    return _path_block_norm(_path_block_state["indexes"], block)
+
+
+def _block_norms(indexes, num_taxa, threads):
+    blocks = _path_blocks(num_taxa, PATH_BLOCK_SIZE)
+    if threads == 1:
+        for block in blocks:
+            yield _path_block_norm(indexes, block)
+        return
+    executor_kwargs: dict[str, Any] = {
+        "max_workers": threads,
+        "initializer": _initialize_path_block_worker,
+        "initargs": (indexes,),
+    }
+    process_pool_context = get_process_pool_context()
+    if process_pool_context is not None:
+        executor_kwargs["mp_context"] = process_pool_context
+    with ProcessPoolExecutor(**executor_kwargs) as executor:
+        futures: set[Any] = set()
+        blocks_exhausted = False
+        while futures or not blocks_exhausted:
+            while len(futures) < threads * 2 and not blocks_exhausted:
+                block = next(blocks, None)
+                if block is None:
+                    blocks_exhausted = True
+                    break
+                futures.add(executor.submit(_path_block_worker_norm, block))
+            if not futures:
+                continue
+            completed, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in completed:
+                yield future.result()
+
+
+def _blocked_path_distance(tree1, tree2, leaf_names, topological, threads=1):
+    """Return the path distance from LCA depths in blocks of leaf pairs.
+
+    Only ``PATH_BLOCK_SIZE``-square blocks of the path matrices exist at a time.
+    Returns None when the depths could overflow or the differences are not
+    clearly above the roundoff of the depth sums.
+    """
+    indexes = (
+        _path_block_index(tree1, leaf_names, topological),
+        _path_block_index(tree2, leaf_names, topological),
+    )
+    return _path_distance_from_indexes(indexes, len(leaf_names), threads=threads)
+
+
+def _path_distance_from_indexes(indexes, num_taxa, threads=1):
+    max_depth = max(index["max_depth"] for index in indexes)
+    if not math.isfinite(max_depth) or max_depth > sys.float_info.max / 8:
+        return None
+    scale = 0.0
+    sum_of_squares = 0.0
+    for block_scale, block_sum in _block_norms(indexes, num_taxa, threads):
+        if not math.isfinite(block_scale):
+            return None
+        if block_scale > scale:
+            sum_of_squares = sum_of_squares * (scale / block_scale) ** 2 + block_sum
+            scale = block_scale
+        elif block_scale > 0.0:
+            sum_of_squares += block_sum * (block_scale / scale) ** 2
+    if scale == 0.0:
+        return 0.0
+    max_steps = max(index["max_steps"] for index in indexes)
+    roundoff_bound = (
+        PATH_MATRIX_ROUNDOFF_FACTOR
+        * sys.float_info.epsilon**2
+        * (max_steps + 12) ** 2
+        * max_depth
+    )
+    if scale <= roundoff_bound:
+        return None
+    distance = scale * math.sqrt(sum_of_squares)
+    if not math.isfinite(distance):
+        raise ValueError("The path distance is too large to represent.")
+    return distance
+
+
+def _path_distance(tree1, tree2, leaf_names, topological, threads=1):
     if _path_matrix_is_safe(
         tree1,
         tree2,
@@ -284,6 +573,15 @@ def _path_distance(tree1, tree2, leaf_names, topological):
         )
         if matrix_distance is not None:
             return matrix_distance
+    blocked_distance = _blocked_path_distance(
+        tree1, tree2, leaf_names, topological, threads=threads
+    )
+    if blocked_distance is not None:
+        return blocked_distance
+    return _pairwise_path_distance(tree1, tree2, leaf_names, topological)
+
+
+def _pairwise_path_distance(tree1, tree2, leaf_names, topological):
     leaves1 = {leaf.name: leaf for leaf in tree1.leaves()}
     leaves2 = {leaf.name: leaf for leaf in tree2.leaves()}
     root_sides1 = _binary_root_sides(tree1) if topological else None
@@ -348,14 +646,17 @@ def _path_distance(tree1, tree2, leaf_names, topological):
     return distance
 
 
-def _calculate_distances(tree1, tree2, leaf_names, metrics, comparison):
+def _calculate_distances(
+    tree1, tree2, leaf_names, metrics, comparison, rf_engine="linear", threads=1
+):
     results = dict()
     if {"rf", "normalized-rf"}.intersection(metrics):
-        rf_result = tree1.robinson_foulds(
-            t2=tree2,
-            unrooted_trees=(comparison == "unrooted"),
+        rf_distance, max_rf_distance = robinson_foulds(
+            tree1,
+            tree2,
+            unrooted=(comparison == "unrooted"),
+            engine=rf_engine,
         )
-        rf_distance, max_rf_distance = rf_result[:2]
         # ETE reports -2 as the rooted maximum for two identical one-tip trees.
         # Mathematically, no split can differ, so the maximum is zero.
         max_rf_distance = max(0, max_rf_distance)
@@ -370,42 +671,669 @@ def _calculate_distances(tree1, tree2, leaf_names, metrics, comparison):
         results["branch-score"] = (branch_score, "")
     if "path-topological" in metrics:
         results["path-topological"] = (
-            _path_distance(tree1, tree2, leaf_names, topological=True),
+            _path_distance(tree1, tree2, leaf_names, topological=True, threads=threads),
             "",
         )
     if "path-length" in metrics:
         results["path-length"] = (
-            _path_distance(tree1, tree2, leaf_names, topological=False),
+            _path_distance(
+                tree1, tree2, leaf_names, topological=False, threads=threads
+            ),
             "",
         )
+    for metric in LEAF_SET_SIZES:
+        if metric in metrics:
+            results[metric] = _leaf_set_distance(metric, tree1, tree2)
     return results
 
 
+def _leaf_set_distance(metric, tree1, tree2):
+    if metric == "triplet":
+        return triplet_distance(tree1, tree2)
+    return quartet_distance(tree1, tree2)
+
+
+def _validate_triplet_rooting(tree, option_name, metrics):
+    if "triplet" in metrics and not is_rooted(tree):
+        raise ValueError(
+            "Triplet distance requires rooted trees; {} is unrooted. "
+            "Root the input trees first.".format(option_name)
+        )
+
+
+def _split_masks(tree, bit_by_name, all_mask, comparison):
+    """Yield ``(node, mask)`` for every non-root edge as a leaf bitmask.
+
+    Unrooted splits are oriented away from the first taxon, so both sides of a
+    bipartition map to the same mask.
+    """
+    mask_by_node: dict[Any, int] = {}
+    for node in tree.traverse(strategy="postorder"):
+        if node.is_leaf:
+            mask = bit_by_name[node.name]
+        else:
+            mask = 0
+            for child in node.children:
+                mask |= mask_by_node[child]
+        mask_by_node[node] = mask
+        if node.is_root:
+            continue
+        if comparison == "unrooted" and (mask & 1):
+            mask ^= all_mask
+        yield node, mask
+
+
+def _is_informative_split(mask, num_taxa, comparison):
+    size = mask.bit_count()
+    if comparison == "rooted":
+        return 1 < size < num_taxa
+    return 1 < size < num_taxa - 1
+
+
+def _encode_tree_splits(tree, bit_by_name, comparison, metrics):
+    """Return the informative split masks and per-split edge lengths of a tree."""
+    all_mask = (1 << len(bit_by_name)) - 1
+    informative = set()
+    lengths_by_split: dict[int, list[float]] = {}
+    collect_lengths = not {"weighted-rf", "branch-score"}.isdisjoint(metrics)
+    for node, mask in _split_masks(tree, bit_by_name, all_mask, comparison):
+        if _is_informative_split(mask, len(bit_by_name), comparison):
+            informative.add(mask)
+        if collect_lengths:
+            lengths_by_split.setdefault(mask, []).append(float(node.dist))
+    vector = {key: tuple(lengths) for key, lengths in lengths_by_split.items()}
+    return informative, vector
+
+
+def _encode_collection_tree(tree, split_ids, bit_by_name, comparison, metrics):
+    """Return the informative split IDs and per-split edge lengths of one tree."""
+    informative, vector = _encode_tree_splits(tree, bit_by_name, comparison, metrics)
+    split_set = sorted(
+        split_ids.setdefault(mask, len(split_ids)) for mask in informative
+    )
+    vector = {
+        split_ids.setdefault(mask, len(split_ids)): lengths
+        for mask, lengths in vector.items()
+    }
+    return split_set, vector
+
+
+def _validate_collection_tree(
+    tree, option_name, bit_by_name, compared_inputs, comparison, metrics
+):
+    validate_unique_named_leaves(tree, option_name=option_name, context=" for 'dist'")
+    if set(tree.leaf_names()) != bit_by_name.keys():
+        raise ValueError(
+            "Leaf name(s) did not match between {}.".format(compared_inputs)
+        )
+    if comparison == "rooted" and SPLIT_METRICS.intersection(metrics):
+        if not is_rooted(tree):
+            raise ValueError(
+                "Rooted comparison requires rooted trees for split metrics; "
+                "{} is unrooted. Root the input trees first or use "
+                "'--comparison unrooted'.".format(option_name)
+            )
+    _validate_triplet_rooting(tree, option_name, metrics)
+    _validate_branch_lengths(tree, option_name, metrics)
+
+
+def _read_collection(args, metrics, comparison):
+    """Parse and split-encode every tree of ``--collection`` exactly once."""
+    records = list()
+    trees = list()
+    split_ids: dict[int, int] = {}
+    split_sets = list()
+    vectors = list()
+    leaf_names = None
+    bit_by_name: dict[str, int] = {}
+    for index, record in enumerate(
+        iter_tree_strings(args.collection, TreeSampling.from_args(args)), start=1
+    ):
+        tree = read_tree(record, args.format, args.quoted_node_names, quiet=True)
+        option_name = "--collection tree {}".format(index)
+        if leaf_names is None:
+            leaf_names = sorted(tree.leaf_names())
+            bit_by_name = {name: 1 << bit for bit, name in enumerate(leaf_names)}
+        _validate_collection_tree(
+            tree,
+            option_name,
+            bit_by_name,
+            "--collection trees 1 and {}".format(index),
+            comparison,
+            metrics,
+        )
+        split_set, vector = _encode_collection_tree(
+            tree, split_ids, bit_by_name, comparison, metrics
+        )
+        records.append(record)
+        trees.append(tree)
+        split_sets.append(split_set)
+        vectors.append(vector)
+    if leaf_names is None:
+        raise ValueError("No trees were found in '--collection'.")
+    sys.stderr.write(
+        "Number of input trees = {:,}, distinct splits = {:,}\n".format(
+            len(trees), len(split_ids)
+        )
+    )
+    return records, trees, leaf_names, split_sets, vectors
+
+
+def _collection_rf_matrices(split_sets):
+    """Return all-pairs RF and maximum-RF matrices from one sparse product."""
+    import numpy as np
+    from scipy.sparse import csr_matrix
+
+    sizes = np.asarray([len(split_set) for split_set in split_sets], dtype=np.int64)
+    indptr = np.concatenate(([0], np.cumsum(sizes)))
+    indices = np.asarray(
+        [split_id for split_set in split_sets for split_id in split_set],
+        dtype=np.int64,
+    )
+    num_columns = int(indices.max()) + 1 if indices.size else 1
+    incidence = csr_matrix(
+        (np.ones(indices.size, dtype=np.int64), indices, indptr),
+        shape=(len(split_sets), num_columns),
+    )
+    shared = np.asarray((incidence @ incidence.T).todense(), dtype=np.int64)
+    max_rf = sizes[:, None] + sizes[None, :]
+    return max_rf - 2 * shared, max_rf
+
+
+def _initialize_collection_worker(state):
+    _collection_state.clear()
+    _collection_state.update(state)
+
+
+def _collection_tree(index):
+    trees = _collection_state["trees"]
+    if trees[index] is None:
+        trees[index] = read_tree(
+            _collection_state["records"][index],
+            _collection_state["format"],
+            _collection_state["quoted_node_names"],
+            quiet=True,
+        )
+    return trees[index]
+
+
+def _collection_path_distance(index1, index2, topological, uppers, summaries):
+    leaf_names = _collection_state["leaf_names"]
+    tree1 = _collection_tree(index1)
+    tree2 = _collection_tree(index2)
+    # Topological paths ignore branch lengths, which may then be missing.
+    for index, tree in ((index1, tree1), (index2, tree2)):
+        if not topological and index not in summaries:
+            summaries[index] = _branch_length_summary(tree)
+    if _path_summaries_are_safe(
+        summaries.get(index1), summaries.get(index2), len(leaf_names), topological
+    ):
+        for index, tree in ((index1, tree1), (index2, tree2)):
+            if (index, topological) not in uppers:
+                uppers[(index, topological)] = _path_upper_triangle(
+                    tree, leaf_names, topological
+                )
+        distance = _path_distance_from_upper(
+            uppers[(index1, topological)],
+            uppers[(index2, topological)],
+            len(leaf_names),
+        )
+        if distance is not None:
+            return distance
+    distance = _blocked_path_distance(tree1, tree2, leaf_names, topological)
+    if distance is not None:
+        return distance
+    return _pairwise_path_distance(tree1, tree2, leaf_names, topological)
+
+
+def _collection_tile_distances(tile):
+    """Return ``(index1, index2, results)`` for the tree pairs of one tile."""
+    rows, columns = tile
+    metrics = _collection_state["metrics"]
+    vectors = _collection_state["vectors"]
+    # Path matrices are kept only for the trees of this tile.
+    uppers: dict[tuple[int, bool], Any] = {}
+    summaries: dict[int, tuple[int, float, float] | None] = {}
+    tile_results = list()
+    for index1 in rows:
+        for index2 in columns:
+            if index2 <= index1:
+                continue
+            results = dict()
+            if {"weighted-rf", "branch-score"}.intersection(metrics):
+                weighted_rf, branch_score = _vector_distances(
+                    vectors[index1], vectors[index2]
+                )
+                results["weighted-rf"] = weighted_rf
+                results["branch-score"] = branch_score
+            for metric, topological in (
+                ("path-topological", True),
+                ("path-length", False),
+            ):
+                if metric in metrics:
+                    results[metric] = _collection_path_distance(
+                        index1, index2, topological, uppers, summaries
+                    )
+            for metric in LEAF_SET_SIZES:
+                if metric in metrics:
+                    results[metric] = _leaf_set_distance(
+                        metric, _collection_tree(index1), _collection_tree(index2)
+                    )[0]
+            tile_results.append((index1, index2, results))
+    return tile_results
+
+
+def _collection_tiles(num_trees, num_taxa, metrics):
+    tile_size = COLLECTION_TILE_SIZE
+    num_path_metrics = len(PATH_METRICS.intersection(metrics))
+    if num_path_metrics and num_taxa <= PATH_MATRIX_MAX_TAXA:
+        upper_bytes = 8 * num_taxa * (num_taxa - 1) // 2
+        budget = COLLECTION_PATH_TILE_BYTES // max(1, 2 * num_path_metrics)
+        tile_size = max(1, min(tile_size, budget // max(1, upper_bytes)))
+    for start1 in range(0, num_trees, tile_size):
+        for start2 in range(start1, num_trees, tile_size):
+            yield (
+                range(start1, min(start1 + tile_size, num_trees)),
+                range(start2, min(start2 + tile_size, num_trees)),
+            )
+
+
+class _PairProgress:
+    def __init__(self, num_pairs):
+        self.num_pairs = num_pairs
+        self.num_done = 0
+        self.last_report = time.monotonic()
+
+    def update(self, num_done):
+        self.num_done += num_done
+        now = time.monotonic()
+        if self.num_done == self.num_pairs or (
+            now - self.last_report >= COLLECTION_PROGRESS_SECONDS
+        ):
+            self.last_report = now
+            total = "" if self.num_pairs is None else "/{:,}".format(self.num_pairs)
+            sys.stderr.write(
+                "Tree pairs compared: {:,}{}\n".format(self.num_done, total)
+            )
+
+
+def _collection_pair_distances(state, threads):
+    """Return ``{(index1, index2): results}`` for the per-pair metrics."""
+    num_trees = len(state["records"])
+    pair_results: dict[tuple[int, int], dict[str, float]] = {}
+    if not {"weighted-rf", "branch-score"}.union(
+        PATH_METRICS, LEAF_SET_SIZES
+    ).intersection(state["metrics"]):
+        return pair_results
+    progress = _PairProgress(num_trees * (num_trees - 1) // 2)
+    tiles = _collection_tiles(num_trees, len(state["leaf_names"]), state["metrics"])
+
+    def collect(tile_results):
+        for index1, index2, results in tile_results:
+            pair_results[(index1, index2)] = results
+        progress.update(len(tile_results))
+
+    if threads == 1:
+        _initialize_collection_worker(state)
+        try:
+            for tile in tiles:
+                collect(_collection_tile_distances(tile))
+        finally:
+            _collection_state.clear()
+        return pair_results
+    # Workers re-parse only the trees their path tiles need.
+    worker_state = dict(state, trees=[None] * num_trees)
+    executor_kwargs: dict[str, Any] = {
+        "max_workers": threads,
+        "initializer": _initialize_collection_worker,
+        "initargs": (worker_state,),
+    }
+    process_pool_context = get_process_pool_context()
+    if process_pool_context is not None:
+        executor_kwargs["mp_context"] = process_pool_context
+    with ProcessPoolExecutor(**executor_kwargs) as executor:
+        futures: set[Any] = set()
+        tiles_exhausted = False
+        while futures or not tiles_exhausted:
+            while len(futures) < threads * 2 and not tiles_exhausted:
+                tile = next(tiles, None)
+                if tile is None:
+                    tiles_exhausted = True
+                    break
+                futures.add(executor.submit(_collection_tile_distances, tile))
+            if not futures:
+                continue
+            completed, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in completed:
+                collect(future.result())
+    return pair_results
+
+
+def _collection_results(args, metrics, comparison):
+    records, trees, leaf_names, split_sets, vectors = _read_collection(
+        args, metrics, comparison
+    )
+    threads = validate_threads(getattr(args, "threads", 1))
+    state = {
+        "records": records,
+        "trees": trees,
+        "format": args.format,
+        "quoted_node_names": args.quoted_node_names,
+        "leaf_names": leaf_names,
+        "metrics": tuple(metrics),
+        "vectors": vectors,
+    }
+    pair_results = _collection_pair_distances(state, threads)
+    rf_matrix = max_rf_matrix = None
+    if {"rf", "normalized-rf"}.intersection(metrics):
+        rf_matrix, max_rf_matrix = _collection_rf_matrices(split_sets)
+
+    def results_for(index1, index2):
+        if index2 < index1:
+            index1, index2 = index2, index1
+        pair = pair_results.get((index1, index2), {})
+        results: dict[str, tuple[Any, Any]] = {
+            metric: (pair.get(metric, 0.0), "") for metric in metrics
+        }
+        for metric, size in LEAF_SET_SIZES.items():
+            if metric in metrics:
+                results[metric] = (pair.get(metric, 0), comb(len(leaf_names), size))
+        if rf_matrix is not None and max_rf_matrix is not None:
+            rf_distance = int(rf_matrix[index1, index2])
+            max_rf_distance = int(max_rf_matrix[index1, index2])
+            results["rf"] = (rf_distance, max_rf_distance)
+            results["normalized-rf"] = (
+                0.0 if max_rf_distance == 0 else rf_distance / max_rf_distance,
+                1.0,
+            )
+        return results
+
+    return len(records), leaf_names, results_for
+
+
+def _metric_comparison(metric, comparison):
+    if metric == "triplet":
+        return "rooted"
+    if metric in PATH_METRICS or metric == "quartet":
+        return "root-independent"
+    return comparison
+
+
+def _distance_row(metric, comparison, num_taxa, distance, max_distance):
+    return {
+        "metric": metric,
+        "comparison": _metric_comparison(metric, comparison),
+        "num_taxa": num_taxa,
+        "distance": distance,
+        "max_distance": max_distance,
+    }
+
+
+def _long_collection_rows(num_trees, num_taxa, metrics, comparison, results_for):
+    for index1, index2 in combinations(range(num_trees), 2):
+        results = results_for(index1, index2)
+        for metric in metrics:
+            row = {"tree1": index1 + 1, "tree2": index2 + 1}
+            row.update(_distance_row(metric, comparison, num_taxa, *results[metric]))
+            yield row
+
+
+def _square_collection_rows(num_trees, metrics, results_for):
+    for metric in metrics:
+        for index1 in range(num_trees):
+            row: dict[str, Any] = {"metric": metric, "tree": index1 + 1}
+            for index2 in range(num_trees):
+                row[str(index2 + 1)] = results_for(index1, index2)[metric][0]
+            yield row
+
+
+def _write_collection_distances(args, metrics, comparison):
+    matrix_format = getattr(args, "matrix_format", "long")
+    if matrix_format not in MATRIX_FORMATS:
+        raise ValueError("'--matrix-format' must be 'long' or 'square'.")
+    num_trees, leaf_names, results_for = _collection_results(args, metrics, comparison)
+    fieldnames: tuple[str, ...]
+    if matrix_format == "long":
+        fieldnames = COLLECTION_DISTANCE_COLUMNS
+        rows = _long_collection_rows(
+            num_trees, len(leaf_names), metrics, comparison, results_for
+        )
+    else:
+        fieldnames = ("metric", "tree")
+        fieldnames += tuple(str(index + 1) for index in range(num_trees))
+        rows = _square_collection_rows(num_trees, metrics, results_for)
+    _write_distance_rows(args.outfile, rows, fieldnames=fieldnames)
+
+
+def _read_reference(args, metrics, comparison):
+    """Return the pair-worker state built once from the ``--infile`` reference."""
+    reference = read_tree(args.infile, args.format, args.quoted_node_names)
+    leaf_names = sorted(reference.leaf_names())
+    bit_by_name = {name: 1 << bit for bit, name in enumerate(leaf_names)}
+    _validate_collection_tree(
+        reference, "--infile", bit_by_name, "--infile", comparison, metrics
+    )
+    informative, vector = _encode_tree_splits(
+        reference, bit_by_name, comparison, metrics
+    )
+    return {
+        "reference": reference,
+        "reference_source": args.infile,
+        "format": args.format,
+        "quoted_node_names": args.quoted_node_names,
+        "leaf_names": leaf_names,
+        "bit_by_name": bit_by_name,
+        "metrics": tuple(metrics),
+        "comparison": comparison,
+        "splits": frozenset(informative),
+        "vector": vector,
+        # Path structures of the reference, built by each process on first use.
+        "paths": {},
+    }
+
+
+def _reference_tree():
+    state = _collection_state
+    if state["reference"] is None:
+        state["reference"] = read_tree(
+            state["reference_source"],
+            state["format"],
+            state["quoted_node_names"],
+            quiet=True,
+        )
+    return state["reference"]
+
+
+def _reference_path(key, build):
+    paths = _collection_state["paths"]
+    if key not in paths:
+        paths[key] = build()
+    return paths[key]
+
+
+def _reference_path_distance(tree, topological):
+    reference = _reference_tree()
+    leaf_names = _collection_state["leaf_names"]
+    num_taxa = len(leaf_names)
+    summary = None if topological else _branch_length_summary(tree)
+    reference_summary = _reference_path(
+        ("summary", topological),
+        lambda: None if topological else _branch_length_summary(reference),
+    )
+    if _path_summaries_are_safe(reference_summary, summary, num_taxa, topological):
+        distance = _path_distance_from_upper(
+            _reference_path(
+                ("upper", topological),
+                lambda: _path_upper_triangle(reference, leaf_names, topological),
+            ),
+            _path_upper_triangle(tree, leaf_names, topological),
+            num_taxa,
+        )
+        if distance is not None:
+            return distance
+    indexes = (
+        _reference_path(
+            ("index", topological),
+            lambda: _path_block_index(reference, leaf_names, topological),
+        ),
+        _path_block_index(tree, leaf_names, topological),
+    )
+    distance = _path_distance_from_indexes(indexes, num_taxa)
+    if distance is not None:
+        return distance
+    return _pairwise_path_distance(reference, tree, leaf_names, topological)
+
+
+def _reference_tree_rows(index, record):
+    state = _collection_state
+    metrics = state["metrics"]
+    comparison = state["comparison"]
+    tree = read_tree(record, state["format"], state["quoted_node_names"], quiet=True)
+    option_name = "--collection tree {}".format(index)
+    _validate_collection_tree(
+        tree,
+        option_name,
+        state["bit_by_name"],
+        "--infile and {}".format(option_name),
+        comparison,
+        metrics,
+    )
+    results: dict[str, tuple[Any, Any]] = {}
+    if SPLIT_METRICS.intersection(metrics):
+        informative, vector = _encode_tree_splits(
+            tree, state["bit_by_name"], comparison, metrics
+        )
+        max_rf_distance = len(state["splits"]) + len(informative)
+        rf_distance = len(state["splits"].symmetric_difference(informative))
+        results["rf"] = (rf_distance, max_rf_distance)
+        results["normalized-rf"] = (
+            0.0 if max_rf_distance == 0 else rf_distance / max_rf_distance,
+            1.0,
+        )
+        if {"weighted-rf", "branch-score"}.intersection(metrics):
+            weighted_rf, branch_score = _vector_distances(state["vector"], vector)
+            results["weighted-rf"] = (weighted_rf, "")
+            results["branch-score"] = (branch_score, "")
+    for metric, topological in (("path-topological", True), ("path-length", False)):
+        if metric in metrics:
+            results[metric] = (_reference_path_distance(tree, topological), "")
+    for metric in LEAF_SET_SIZES:
+        if metric in metrics:
+            results[metric] = _leaf_set_distance(metric, _reference_tree(), tree)
+    num_taxa = len(state["leaf_names"])
+    return [
+        dict(
+            tree=index, **_distance_row(metric, comparison, num_taxa, *results[metric])
+        )
+        for metric in metrics
+    ]
+
+
+def _reference_chunk_rows(chunk):
+    start, records = chunk
+    rows = list()
+    for offset, record in enumerate(records):
+        rows.extend(_reference_tree_rows(start + offset, record))
+    return rows
+
+
+def _reference_chunks(collection, sampling=None):
+    chunk: list[str] = []
+    start = 1
+    for index, record in enumerate(iter_tree_strings(collection, sampling), start=1):
+        chunk.append(record)
+        if len(chunk) == REFERENCE_CHUNK_SIZE:
+            yield start, chunk
+            chunk = []
+            start = index + 1
+    if chunk:
+        yield start, chunk
+
+
+def _reference_rows(state, collection, threads, sampling=None):
+    """Yield distance rows for each ``--collection`` tree in input order.
+
+    Trees are parsed and compared in chunks as they are read, so at most
+    ``threads * 2`` chunks of the collection are held at a time.
+    """
+    chunks = _reference_chunks(collection, sampling)
+    progress = _PairProgress(None)
+    if threads == 1:
+        _initialize_collection_worker(state)
+        try:
+            for start, records in chunks:
+                yield from _reference_chunk_rows((start, records))
+                progress.update(len(records))
+        finally:
+            _collection_state.clear()
+        return
+    # Deep trees do not pickle; workers re-read the reference for path metrics.
+    executor_kwargs: dict[str, Any] = {
+        "max_workers": threads,
+        "initializer": _initialize_collection_worker,
+        "initargs": (dict(state, reference=None),),
+    }
+    process_pool_context = get_process_pool_context()
+    if process_pool_context is not None:
+        executor_kwargs["mp_context"] = process_pool_context
+    with ProcessPoolExecutor(**executor_kwargs) as executor:
+        pending: deque[tuple[Any, int]] = deque()
+        chunks_exhausted = False
+        while pending or not chunks_exhausted:
+            while len(pending) < threads * 2 and not chunks_exhausted:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    chunks_exhausted = True
+                    break
+                pending.append(
+                    (executor.submit(_reference_chunk_rows, chunk), len(chunk[1]))
+                )
+            if not pending:
+                continue
+            future, num_records = pending.popleft()
+            yield from future.result()
+            progress.update(num_records)
+
+
+def _write_reference_distances(args, metrics, comparison):
+    if getattr(args, "matrix_format", "long") != "long":
+        raise ValueError(
+            "'--matrix-format square' needs an all-pairs '--collection'; "
+            "with '--infile' each collection tree is compared to the reference only."
+        )
+    state = _read_reference(args, metrics, comparison)
+    threads = validate_threads(getattr(args, "threads", 1))
+    rows = _reference_rows(
+        state, args.collection, threads, TreeSampling.from_args(args)
+    )
+    _write_distance_rows(args.outfile, rows, fieldnames=REFERENCE_DISTANCE_COLUMNS)
+
+
 def _write_legacy_rf(outfile, result):
     rf_distance, max_rf_distance = result
     text = "rf_dist\tmax_rf_dist\n{}\t{}\n".format(rf_distance, max_rf_distance)
     if outfile == "-":
         sys.stdout.write(text)
         return
-    with open(outfile, mode="w") as handle:
+    with open_output_text(outfile) as handle:
         handle.write(text)
 
 
-def _write_distance_rows(outfile, rows):
+def _write_distance_rows(outfile, rows, fieldnames=DISTANCE_COLUMNS):
     if outfile == "-":
         writer = csv.DictWriter(
             sys.stdout,
-            fieldnames=DISTANCE_COLUMNS,
+            fieldnames=fieldnames,
             delimiter="\t",
             lineterminator="\n",
         )
         writer.writeheader()
         writer.writerows(rows)
         return
-    with open(outfile, mode="w", newline="") as handle:
+    with open_output_text(outfile, newline="") as handle:
         writer = csv.DictWriter(
             handle,
-            fieldnames=DISTANCE_COLUMNS,
+            fieldnames=fieldnames,
             delimiter="\t",
             lineterminator="\n",
         )
@@ -415,11 +1343,20 @@ def _write_distance_rows(outfile, rows):
 
 def dist_main(args):
     metrics, legacy_output = _resolve_metrics(args)
-    if getattr(args, "infile2", None) in ["", None]:
-        raise ValueError("'--infile2' is required for 'dist'.")
     comparison = getattr(args, "comparison", "rooted")
     if comparison not in {"rooted", "unrooted"}:
         raise ValueError("'--comparison' must be 'rooted' or 'unrooted'.")
+    has_infile2 = getattr(args, "infile2", None) not in ["", None]
+    if getattr(args, "collection", None) not in ["", None]:
+        if has_infile2:
+            raise ValueError("Use either '--infile2' or '--collection', not both.")
+        if args.infile != "-":
+            _write_reference_distances(args, metrics, comparison)
+        else:
+            _write_collection_distances(args, metrics, comparison)
+        return
+    if not has_infile2:
+        raise ValueError("'--infile2' or '--collection' is required for 'dist'.")
 
     tree1 = read_tree(args.infile, args.format, args.quoted_node_names)
     tree2 = read_tree(args.infile2, args.format2, args.quoted_node_names)
@@ -436,6 +1373,8 @@ def dist_main(args):
                 "Rooted comparison requires rooted trees for split metrics. Root the input trees "
                 "first or use '--comparison unrooted'."
             )
+    _validate_triplet_rooting(tree1, "--infile", metrics)
+    _validate_triplet_rooting(tree2, "--infile2", metrics)
     _validate_branch_lengths(tree1, "--infile", metrics)
     _validate_branch_lengths(tree2, "--infile2", metrics)
 
@@ -445,25 +1384,15 @@ def dist_main(args):
         leaf_names1,
         metrics,
         comparison,
+        rf_engine=getattr(args, "rf_engine", "linear"),
+        threads=validate_threads(getattr(args, "threads", 1)),
     )
     if legacy_output:
         _write_legacy_rf(args.outfile, results["rf"])
         return
 
-    rows = list()
-    for metric in metrics:
-        distance, max_distance = results[metric]
-        rows.append(
-            {
-                "metric": metric,
-                "comparison": (
-                    "root-independent"
-                    if metric in {"path-topological", "path-length"}
-                    else comparison
-                ),
-                "num_taxa": len(leaf_names1),
-                "distance": distance,
-                "max_distance": max_distance,
-            }
-        )
+    rows = [
+        _distance_row(metric, comparison, len(leaf_names1), *results[metric])
+        for metric in metrics
+    ]
     _write_distance_rows(args.outfile, rows)
@@ -32,11 +32,12 @@ from nwkit.time_tree import (
     summarize_mcmctree_posterior,
 )
 from nwkit.util import (
+    TreeSampling,
     extract_species_label,
     is_rooted,
+    iter_tree_strings,
     read_tip_table,
     read_tree,
-    read_trees,
     validate_unique_named_leaves,
 )
 
@@ -4198,6 +4199,33 @@ def _validate_draw_paths(outfile, layout_report, input_paths):
                 )
 
 
+def _read_densitree_sample_trees(path, args):
+    """Parse the ``--densitree-trees`` records kept by burn-in, thinning, and subsampling."""
+    burnin = int(getattr(args, "posterior_burnin", 0))
+    thin = int(getattr(args, "posterior_thin", 1))
+    if burnin < 0:
+        raise ValueError("'--posterior-burnin' must be zero or greater.")
+    if thin < 1:
+        raise ValueError("'--posterior-thin' must be at least one.")
+    sampling = TreeSampling(
+        burnin=burnin,
+        thin=thin,
+        subsample=getattr(args, "subsample", None),
+        seed=getattr(args, "seed", None),
+    )
+    # Records dropped by the sampling are split from the stream but never parsed.
+    sample_trees = [
+        read_tree(record, args.format, args.quoted_node_names, quiet=True)
+        for record in iter_tree_strings(path, sampling)
+    ]
+    if not sample_trees:
+        raise ValueError(
+            "'--posterior-burnin' and '--posterior-thin' retained no "
+            "DensiTree sample trees."
+        )
+    return sample_trees
+
+
 def draw_main(args):
     if args.outfile == "-":
         raise ValueError("STDOUT is not supported for 'draw'. Use --outfile PATH.")
@@ -4274,24 +4302,7 @@ def draw_main(args):
             raise ValueError(
                 "'--infile' and '--densitree-trees' cannot both read from STDIN."
             )
-        burnin = int(getattr(args, "posterior_burnin", 0))
-        thin = int(getattr(args, "posterior_thin", 1))
-        if burnin < 0:
-            raise ValueError("'--posterior-burnin' must be zero or greater.")
-        if thin < 1:
-            raise ValueError("'--posterior-thin' must be at least one.")
-        all_sample_trees = read_trees(
-            densitree_tree_path,
-            args.format,
-            args.quoted_node_names,
-            quiet=True,
-        )
-        densitree_sample_trees = all_sample_trees[burnin::thin]
-        if not densitree_sample_trees:
-            raise ValueError(
-                "'--posterior-burnin' and '--posterior-thin' retained no "
-                "DensiTree sample trees."
-            )
+        densitree_sample_trees = _read_densitree_sample_trees(densitree_tree_path, args)
         validate_unique_named_leaves(
             tree,
             option_name="--infile",
@@ -0,0 +1,55 @@
+"""Bounded-memory summaries of heavily weighted items in a stream."""
+
+import numpy as np
+
+
+class FrequentItemSummary:
+    """Approximate item weights kept in a bounded number of counters.
+
+    This is the mergeable Misra-Gries summary, the counter-decrement form of
+    space-saving. Weights are added per item; whenever more than
+    ``2 * capacity`` items are tracked, the ``capacity + 1``-th largest
+    weight is subtracted from every counter and the counters that reach zero
+    are dropped. Each estimate is therefore a lower bound, and the true weight
+    of any item, tracked or not, exceeds its estimate by at most ``error``,
+    which never exceeds the total added weight divided by ``capacity + 1``.
+    """
+
+    __slots__ = ("capacity", "weights", "error")
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("Frequent-item summaries need at least one counter.")
+        self.capacity = int(capacity)
+        self.weights: dict[object, float] = {}
+        self.error = 0.0
+
+    def update(self, item_weights):
+        """Add a mapping of item weights, pruning when the counters overflow."""
+        weights = self.weights
+        for item, weight in item_weights.items():
+            weights[item] = weights.get(item, 0.0) + weight
+        if len(weights) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self):
+        if len(self.weights) <= self.capacity:
+            return
+        values = np.fromiter(
+            self.weights.values(), dtype=np.float64, count=len(self.weights)
+        )
+        cut = len(values) - self.capacity - 1
+        threshold = float(np.partition(values, cut)[cut])
+        # At least capacity + 1 counters hold the threshold or more, so each
+        # subtraction removes that much weight from as many distinct items.
+        self.weights = {
+            item: weight - threshold
+            for item, weight in self.weights.items()
+            if weight > threshold
+        }
+        self.error += threshold
+
+    def estimates(self):
+        """Return at most ``capacity`` items with their lower-bound weights."""
+        self._prune()
+        return dict(self.weights)
@@ -71,6 +71,8 @@ from nwkit.util import (
     acquire_exclusive_lock,
     extract_taxonomy_query,
     get_ete_ncbitaxa,
+    get_resident_http_session,
+    open_input_text,
     read_tree,
     resolve_download_dir,
     validate_distinct_output_paths,
@@ -689,7 +691,7 @@ def parse_sources(style, source_arg):
 
 
 def read_name_tsv(path):
-    handle = sys.stdin if path == "-" else open(path, newline="")
+    handle = open_input_text(path, newline="")
     try:
         reader = csv.DictReader(handle, delimiter="\t")
         if reader.fieldnames is None:
@@ -3572,7 +3574,9 @@ class NCBIProvider:
 
 
 def build_providers(args, sources, session=None):
-    session = session or build_http_session()
+    session = session or get_resident_http_session(
+        "image-providers", build_http_session
+    )
     ncbi = None
     if (
         ("phylopic" in sources)
@@ -1,41 +1,37 @@
+import math
 import os
 from contextlib import nullcontext
 
+import numpy as np
+
+from nwkit.compact_tree import read_compact_tree
 from nwkit.species_parser import DEFAULT_SPECIES_PARSER, DEFAULT_SPECIES_REGEX
-from nwkit.util import extract_species_label, read_tree
+from nwkit.util import extract_species_label, open_output_text
 
 
 def info_main(args):
-    tree = read_tree(args.infile, args.format, args.quoted_node_names)
-    tree_length = 0
-    num_leaves = 0
-    num_nodes = 0
-    num_singleton_node = 0
-    num_multifurcation_node = 0
-    num_zero_branch_nodes = 0
-    num_negative_branch_nodes = 0
+    tree = read_compact_tree(args.infile, args.format, args.quoted_node_names)
+    num_children = tree.num_children()
+    dists = tree.dist.tolist()
+    non_root_dists = [
+        dists[index]
+        for index in tree.levelorder()
+        if index != 0 and not math.isnan(dists[index])
+    ]
+    tree_length = sum(non_root_dists)
+    num_leaves = tree.num_leaves
+    num_nodes = len(tree)
+    num_singleton_node = int(np.count_nonzero(num_children == 1))
+    num_multifurcation_node = int(np.count_nonzero(num_children > 2))
+    num_zero_branch_nodes = sum(1 for dist in non_root_dists if dist == 0)
+    num_negative_branch_nodes = sum(1 for dist in dists if dist < 0)
     species_name_set = set()
-    for node in tree.traverse():
-        num_nodes += 1
-        if node.is_leaf:
-            num_leaves += 1
-            species_name = extract_species_label(node.name, args=args)
-            if species_name is None:
-                species_name = str(node.name or "").strip()
-            if species_name not in ["", None]:
-                species_name_set.add(species_name)
-        else:
-            num_children = len(node.get_children())
-            if num_children == 1:
-                num_singleton_node += 1
-            elif num_children > 2:
-                num_multifurcation_node += 1
-        if (not node.is_root) and (node.dist is not None):
-            tree_length += node.dist
-            if node.dist == 0:
-                num_zero_branch_nodes += 1
-        if (node.dist is not None) and (node.dist < 0):
-            num_negative_branch_nodes += 1
+    for leaf_name in tree.leaf_names():
+        species_name = extract_species_label(leaf_name, args=args)
+        if species_name is None:
+            species_name = str(leaf_name or "").strip()
+        if species_name not in ["", None]:
+            species_name_set.add(species_name)
     species_names = sorted(species_name_set)
     num_species = len(species_names)
     lines = [
@@ -68,7 +64,7 @@ def info_main(args):
         lines.append(f"Number of species parsed by --species-regex: {num_species}")
     lines.append(f"Species names: {', '.join(species_names)}")
     outfile = getattr(args, "outfile", "-")
-    output_context = nullcontext(None) if outfile == "-" else open(outfile, mode="w")
+    output_context = nullcontext(None) if outfile == "-" else open_output_text(outfile)
     with output_context as handle:
         text = "\n".join(lines) + "\n"
         if handle is None:
@@ -21,7 +21,9 @@ from nwkit.util import (
     get_species_group_records,
     get_subtree_leaf_name_sets,
     get_subtree_sci_name_sets,
+    open_output_text,
     read_tree,
+    validate_threads,
     warn_cleanup_failure,
     write_tree,
 )
@@ -92,16 +94,6 @@ def _validated_tail_probability(args, side):
     return _number_text(number)
 
 
-def _validate_threads(threads):
-    try:
-        threads = int(threads)
-    except (TypeError, ValueError) as exc:
-        raise ValueError("'--threads' must be an integer.") from exc
-    if threads <= 0:
-        raise ValueError("'--threads' must be positive.")
-    return threads
-
-
 def _read_limited_response_text(response):
     iter_content = getattr(response, "iter_content", None)
     if not callable(iter_content):
@@ -569,7 +561,7 @@ def are_two_lineage_rank_differentiated(
 def add_timetree_constraint(tree, args):
     endpoint_url = "https://timetree.org/api"
     search_ranks = SEARCH_RANKS if args.higher_rank_search else SEARCH_RANKS[:1]
-    threads = _validate_threads(getattr(args, "threads", 1))
+    threads = validate_threads(getattr(args, "threads", 1))
     unnamed_leaves = [leaf for leaf in tree.leaves() if not leaf.name]
     if unnamed_leaves:
         raise ValueError(
@@ -864,5 +856,5 @@ def mcmctree_main(args):
     if args.outfile == "-":
         print(nwk_text)
     else:
-        with open(args.outfile, mode="w") as f:
+        with open_output_text(args.outfile) as f:
             f.write(nwk_text)
@@ -1,7 +1,7 @@
 import re
 from contextlib import nullcontext
 
-from nwkit.util import get_target_nodes, read_tree
+from nwkit.util import get_target_nodes, open_output_text, read_tree
 
 
 def printlabel_main(args):
@@ -16,7 +16,7 @@ def printlabel_main(args):
             else:
                 lines.append(node.name or "")
     outfile = getattr(args, "outfile", "-")
-    output_context = nullcontext(None) if outfile == "-" else open(outfile, mode="w")
+    output_context = nullcontext(None) if outfile == "-" else open_output_text(outfile)
     with output_context as handle:
         text = "".join(f"{line}\n" for line in lines)
         if handle is None:
@@ -18,6 +18,7 @@ from nwkit.util import (
     inspect_tree_text,
     is_rooted,
     normalized_missing_path_key,
+    open_input_text,
     split_newick_stream,
     validate_distinct_output_paths,
 )
@@ -911,9 +912,14 @@ def run_with_audit(args, argv, handler):
     stdin_options = get_stdin_input_options(args)
     stdin_argument = stdin_options[0][0] if stdin_options else None
     if stdin_argument is not None:
-        stdin_spool, stdin_text, stdin_sha256, stdin_bytes = _spool_stdin(
-            original_stdin
-        )
+        stdin_source = open_input_text("-")
+        try:
+            stdin_spool, stdin_text, stdin_sha256, stdin_bytes = _spool_stdin(
+                stdin_source
+            )
+        finally:
+            if stdin_source is not original_stdin:
+                stdin_source.close()
     try:
         primary_input = _input_summary(_primary_input_text(args, stdin_text), args)
     except BaseException:
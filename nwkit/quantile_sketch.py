@@ -0,0 +1,168 @@
+"""Mergeable weighted quantile sketches for branch-length summaries."""
+
+import math
+
+import numpy as np
+
+DEFAULT_QUANTILE_ERROR = 0.01
+# Observations are kept exactly until a sketch holds more than this many.
+EXACT_CAPACITY = 64
+
+
+def weighted_quantile(values, weights, quantile):
+    """Return the first value whose cumulative weight reaches ``quantile``."""
+    sorted_pairs = sorted(zip(values, weights, strict=True), key=lambda pair: pair[0])
+    threshold = math.fsum(weight for _, weight in sorted_pairs) * quantile
+    cumulative_weight = 0.0
+    for value, weight in sorted_pairs:
+        cumulative_weight += weight
+        if cumulative_weight >= threshold:
+            return value
+    return sorted_pairs[-1][0]
+
+
+class WeightedQuantileSketch:
+    """Weighted values summarized with a relative error bound on quantiles.
+
+    Up to ``EXACT_CAPACITY`` observations are kept as they are. Beyond that,
+    weights are summed in logarithmic buckets (as in DDSketch) of width
+    ``gamma = (1 + relative_error) / (1 - relative_error)``, so memory grows
+    with the logarithm of the value range rather than with the number of
+    observations, and every quantile is within ``relative_error`` of a value
+    whose cumulative weight reaches it. Missing values (None or NaN) are
+    skipped. Merging two sketches gives the sketch of all their observations.
+    """
+
+    __slots__ = (
+        "relative_error",
+        "is_exact",
+        "values",
+        "weights",
+        "positive_buckets",
+        "negative_buckets",
+        "zero_weight",
+        "minimum",
+        "maximum",
+    )
+
+    def __init__(self, relative_error=DEFAULT_QUANTILE_ERROR):
+        if not (0.0 < relative_error < 1.0):
+            raise ValueError("'--quantile-error' must be between 0 and 1.")
+        self.relative_error = relative_error
+        self.is_exact = True
+        self.values: list[float] = []
+        self.weights: list[float] = []
+        self.positive_buckets: dict[int, float] = {}
+        self.negative_buckets: dict[int, float] = {}
+        self.zero_weight = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def _log_gamma(self):
+        return math.log1p(2.0 * self.relative_error / (1.0 - self.relative_error))
+
+    def _bucket_values(self, values, weights):
+        values = np.asarray(values, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(values):
+            self.minimum = min(self.minimum, float(values.min()))
+            self.maximum = max(self.maximum, float(values.max()))
+        self.zero_weight += math.fsum(weights[values == 0.0].tolist())
+        log_gamma = self._log_gamma()
+        for buckets, sign in (
+            (self.positive_buckets, 1.0),
+            (self.negative_buckets, -1.0),
+        ):
+            selected = (values * sign) > 0.0
+            keys = np.ceil(np.log(values[selected] * sign) / log_gamma)
+            unique_keys, inverse = np.unique(keys.astype(np.int64), return_inverse=True)
+            sums = np.bincount(inverse, weights=weights[selected])
+            for key, weight in zip(unique_keys.tolist(), sums.tolist(), strict=True):
+                buckets[key] = buckets.get(key, 0.0) + weight
+
+    def _switch_to_buckets(self):
+        self.is_exact = False
+        self._bucket_values(self.values, self.weights)
+        self.values = []
+        self.weights = []
+
+    def extend_arrays(self, values, weights):
+        """Add observations from float arrays, with NaN for missing values."""
+        values = np.asarray(values, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        observed = ~np.isnan(values)
+        values = values[observed]
+        weights = weights[observed]
+        if self.is_exact and len(self.values) + len(values) <= EXACT_CAPACITY:
+            self.values.extend(values.tolist())
+            self.weights.extend(weights.tolist())
+            return
+        if self.is_exact:
+            self._switch_to_buckets()
+        self._bucket_values(values, weights)
+
+    def extend(self, records):
+        """Add ``(value or None, weight)`` observations."""
+        records = [(value, weight) for value, weight in records if value is not None]
+        if self.is_exact and len(self.values) + len(records) <= EXACT_CAPACITY:
+            for value, weight in records:
+                if value == value:
+                    self.values.append(float(value))
+                    self.weights.append(float(weight))
+            return
+        self.extend_arrays(
+            [value for value, _ in records], [weight for _, weight in records]
+        )
+
+    def merge(self, other):
+        """Add every observation of ``other`` to this sketch."""
+        if self.relative_error != other.relative_error:
+            raise ValueError("Cannot merge sketches with different error bounds.")
+        self.extend_arrays(other.values, other.weights)
+        if other.is_exact:
+            return
+        if self.is_exact:
+            self._switch_to_buckets()
+        self.zero_weight += other.zero_weight
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        for buckets, other_buckets in (
+            (self.positive_buckets, other.positive_buckets),
+            (self.negative_buckets, other.negative_buckets),
+        ):
+            for key, weight in other_buckets.items():
+                buckets[key] = buckets.get(key, 0.0) + weight
+
+    def _bucket_center(self, key):
+        # Bucket ``key`` holds magnitudes in (gamma**(key - 1), gamma**key].
+        log_gamma = self._log_gamma()
+        log_center = key * log_gamma + math.log(2.0 / (1.0 + math.exp(log_gamma)))
+        return math.exp(min(log_center, math.log(np.finfo(np.float64).max)))
+
+    def _bucket_representatives(self):
+        """Yield ``(value, weight)`` bucket centers in increasing value order.
+
+        Centers are clamped to the observed range, so the extreme buckets
+        never report a value beyond the smallest or largest observation.
+        """
+        for key in sorted(self.negative_buckets, reverse=True):
+            center = max(-self._bucket_center(key), self.minimum)
+            yield min(center, self.maximum), self.negative_buckets[key]
+        if self.zero_weight > 0.0:
+            yield 0.0, self.zero_weight
+        for key in sorted(self.positive_buckets):
+            center = min(self._bucket_center(key), self.maximum)
+            yield max(center, self.minimum), self.positive_buckets[key]
+
+    def quantile(self, quantile):
+        """Return the weighted quantile, or None without observations."""
+        if self.is_exact:
+            if not self.values:
+                return None
+            return weighted_quantile(self.values, self.weights, quantile)
+        pairs = list(self._bucket_representatives())
+        if not pairs:
+            return None
+        return weighted_quantile(
+            [value for value, _ in pairs], [weight for _, weight in pairs], quantile
+        )
@@ -5,6 +5,7 @@ from typing import Any
 
 from nwkit.util import (
     get_target_nodes,
+    open_input_text,
     read_tree,
     support_is_missing,
     validate_unique_named_leaves,
@@ -13,7 +14,7 @@ from nwkit.util import (
 
 
 def read_name_tsv(path):
-    handle = sys.stdin if path == "-" else open(path, newline="")
+    handle = open_input_text(path, newline="")
     try:
         reader = csv.DictReader(handle, delimiter="\t")
         fieldnames = reader.fieldnames or list()
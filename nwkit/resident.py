@@ -0,0 +1,42 @@
+class ResidentCache:
+    """Process-level memo table that long-lived processes switch on.
+
+    While disabled, ``get`` builds a fresh value on every call, so one-shot
+    commands behave exactly as without the cache.
+    """
+
+    def __init__(self):
+        self.entries = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.entries is not None
+
+    def enable(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def disable(self):
+        self.entries = None
+
+    def get(self, key, factory):
+        if self.entries is None:
+            return factory()
+        if key in self.entries:
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        value = factory()
+        self.entries[key] = value
+        return value
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "entries": 0 if self.entries is None else len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
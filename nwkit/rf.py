@@ -0,0 +1,129 @@
+from typing import Any
+
+RF_ENGINES = ("linear", "ete")
+
+
+def _walk_from(start, unrooted):
+    """Return nodes in preorder from ``start`` with the position of each parent.
+
+    Unrooted walks also step to ``node.up``, so the tree is traversed as if it
+    were rooted at ``start``. They stop below a chain of single-child nodes at
+    the root, which would otherwise be walked into as a leaf without a name.
+    """
+    top = None
+    if unrooted:
+        top = start.root
+        while len(top.children) == 1:
+            top = top.children[0]
+    nodes: list[Any] = []
+    parents = []
+    stack = [(start, -1, None)]
+    while stack:
+        node, parent_position, came_from = stack.pop()
+        position = len(nodes)
+        nodes.append(node)
+        parents.append(parent_position)
+        for child in node.children:
+            if child is not came_from:
+                stack.append((child, position, node))
+        if (
+            unrooted
+            and (node is not top)
+            and (node.up is not None)
+            and (node.up is not came_from)
+        ):
+            stack.append((node.up, position, node))
+    return nodes, parents
+
+
+def _informative_clusters(nodes, parents, leaf_index, max_size):
+    """Yield ``(low, high, size)`` leaf-index ranges of informative clusters.
+
+    Positions are visited in reverse preorder, so every node follows all of its
+    descendants. Nodes with a single child repeat that child's cluster and are
+    skipped.
+    """
+    num_nodes = len(nodes)
+    low = [num_nodes] * num_nodes
+    high = [-1] * num_nodes
+    size = [0] * num_nodes
+    num_children = [0] * num_nodes
+    for position in range(num_nodes - 1, 0, -1):
+        if num_children[position] == 0:
+            index = leaf_index(nodes[position])
+            low[position] = index
+            high[position] = index
+            size[position] = 1
+        elif num_children[position] > 1 and 1 < size[position] < max_size:
+            yield low[position], high[position], size[position]
+        parent = parents[position]
+        if low[position] < low[parent]:
+            low[parent] = low[position]
+        if high[position] > high[parent]:
+            high[parent] = high[position]
+        size[parent] += size[position]
+        num_children[parent] += 1
+
+
+def _linear_robinson_foulds(tree1, tree2, unrooted):
+    leaves1 = list(tree1.leaves())
+    leaves2 = {leaf.name: leaf for leaf in tree2.leaves()}
+    names1 = {leaf.name for leaf in leaves1}
+    if (len(names1) != len(leaves1)) or (len(leaves2) != len(tree2)):
+        raise ValueError("Leaf names must be unique for RF calculation.")
+    if names1 != leaves2.keys():
+        raise ValueError("Leaf name(s) did not match.")
+    num_leaves = len(leaves1)
+    if unrooted:
+        # Rooting both walks at the same leaf turns every split into the
+        # cluster on the side away from that leaf.
+        start1 = leaves1[0]
+        start2 = leaves2[start1.name]
+        max_size = num_leaves - 1
+    else:
+        start1 = tree1
+        start2 = tree2
+        max_size = num_leaves
+
+    # Day's algorithm: number the leaves in tree 1 postorder so that every
+    # cluster of tree 1 is an index interval, then test each cluster of tree 2
+    # against that interval table.
+    index_by_name: dict[Any, int] = {}
+
+    def number_leaf(leaf):
+        index_by_name[leaf.name] = len(index_by_name)
+        return index_by_name[leaf.name]
+
+    clusters1 = set()
+    nodes1, parents1 = _walk_from(start1, unrooted)
+    for low, high, _ in _informative_clusters(nodes1, parents1, number_leaf, max_size):
+        clusters1.add(low * num_leaves + high)
+
+    num_clusters2 = 0
+    num_common = 0
+    nodes2, parents2 = _walk_from(start2, unrooted)
+    for low, high, size in _informative_clusters(
+        nodes2, parents2, lambda leaf: index_by_name[leaf.name], max_size
+    ):
+        num_clusters2 += 1
+        if (high - low + 1 == size) and (low * num_leaves + high in clusters1):
+            num_common += 1
+    max_rf = len(clusters1) + num_clusters2
+    return max_rf - 2 * num_common, max_rf
+
+
+def robinson_foulds(tree1, tree2, unrooted=False, engine="linear"):
+    """Return ``(rf_distance, max_rf_distance)`` for trees with the same leaves.
+
+    ``linear`` runs Day's algorithm in time linear in the number of nodes;
+    ``ete`` delegates to ``ete4.Tree.robinson_foulds``. Both count the
+    non-trivial clusters (rooted) or splits (unrooted) found in only one tree,
+    and the maximum is the total number of such clusters or splits.
+    """
+    if engine == "ete":
+        return tuple(tree1.robinson_foulds(t2=tree2, unrooted_trees=unrooted)[:2])
+    if engine != "linear":
+        raise ValueError(
+            "'--rf-engine' must be one of: {}.".format(", ".join(RF_ENGINES))
+        )
+    return _linear_robinson_foulds(tree1, tree2, unrooted)
@@ -1,14 +1,18 @@
+import copy
+import io
 import json
 import math
 import re
 import sys
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dataclasses import dataclass
 from decimal import Decimal, localcontext
 from fractions import Fraction
-from itertools import combinations
-from typing import Any
+from itertools import chain, islice
+from typing import Any, Iterator
 
+import numpy as np
 import requests
 from ete4 import Tree
 from requests.adapters import HTTPAdapter
@@ -25,21 +29,29 @@ from nwkit.constrain import (
     read_taxid_tsv,
     taxid2tree,
 )
+from nwkit.taxonomy_reference_cache import cached_taxonomy_lookups
 from nwkit.util import (
+    RESIDENT_HTTP_SESSIONS,
+    SHARED_NCBITAXA,
     TREE_FORMAT_PROP,
     copy_tree_iteratively,
     extract_taxonomy_query,
     get_ete_ncbitaxa,
+    get_process_pool_context,
+    get_resident_http_session,
     get_species_group_records,
     get_subtree_leaf_name_sets,
     get_tree_property_names,
     is_all_leaf_names_identical,
     is_rooted,
+    iter_tree_strings,
+    open_output_text,
     read_tree,
     remove_singleton,
     support_is_missing,
     validate_distinct_output_paths,
     validate_outputs_do_not_replace_inputs,
+    validate_threads,
     validate_unique_named_leaves,
     warn_cleanup_failure,
     write_tree,
@@ -47,6 +59,16 @@ from nwkit.util import (
 
 SUPPORTED_TAXONOMY_SOURCES = ("ncbi", "timetree", "opentree")
 DEFAULT_TAXONOMY_SOURCE_CHAIN = "ncbi,opentree,timetree"
+ROOT_METHODS = (
+    "midpoint",
+    "outgroup",
+    "transfer",
+    "mad",
+    "mv",
+    "reconciliation",
+    "taxonomy",
+)
+ROOT_COLLECTION_CHUNK_SIZE = 32
 TAXONOMY_HTTP_MAX_BYTES = 10 * 1024 * 1024
 TAXONOMY_HTTP_CHUNK_BYTES = 64 * 1024
 NCBI_PLACEHOLDER_NAME_PATTERNS = (
@@ -59,10 +81,24 @@ NCBI_PLACEHOLDER_NAME_PATTERNS = (
     re.compile(r"\bartificial sequences?\b", flags=re.I),
     re.compile(r"\bother sequences?\b", flags=re.I),
 )
-MAD_FLOAT_MAX_PATH_DYNAMIC_RANGE = 10**6
+MAD_PAIR_BLOCK_SIZE = 1024
+MAD_EXACT_CANDIDATE_LIMIT = 8
+MAD_FLOAT_ROOT_POSITION_RTOL = 10**-13
+MAD_UNIT_ROUNDOFF = sys.float_info.epsilon / 2
+MAD_SUM_SLICES = 4
+MAD_MIN_SLICE_EXPONENT = -1000
+# Every finite float is an integer multiple of 2**-1074.
+MAD_EXACT_SHIFT = 1074
+MAD_EXACT_UNIT = 1 << MAD_EXACT_SHIFT
+
+_root_collection_state: dict[str, Any] = {}
 
 
 def _new_taxonomy_http_session():
+    return get_resident_http_session("taxonomy", _build_taxonomy_http_session)
+
+
+def _build_taxonomy_http_session():
     session = requests.Session()
     mount = getattr(session, "mount", None)
     if callable(mount):
@@ -179,23 +215,30 @@ def _is_placeholder_ncbi_resolution(matched_name, lineage_names):
     return any(_is_placeholder_ncbi_name(name) for name in names_to_check)
 
 
-def _get_ncbi_lineage_record(label, ncbi, rank, args=None, taxid=None):
-    if taxid is None:
-        query_name = extract_taxonomy_query(label, args=args, out_delim=" ")
-        if query_name is None:
-            query_name = str(label)
-        name2taxid = name_to_taxid(query_name, ncbi)
+def _ncbi_lineage_query(label, rank, args=None, taxid=None):
+    if taxid is not None:
+        return ("taxid", int(taxid), rank)
+    query_name = extract_taxonomy_query(label, args=args, out_delim=" ")
+    if query_name is None:
+        query_name = str(label)
+    return ("name", query_name, rank)
+
+
+def _get_ncbi_lineage_record(query, ncbi):
+    query_type, query_value, rank = query
+    if query_type == "name":
+        name2taxid = name_to_taxid(query_value, ncbi)
         if len(name2taxid) == 0:
             return None, "Genus-level match was not found in the NCBI database"
         matched_query_name = (
-            query_name
-            if query_name in name2taxid.keys()
-            else re.sub(" .*", "", query_name)
+            query_value
+            if query_value in name2taxid.keys()
+            else re.sub(" .*", "", query_value)
         )
         taxid = int(name2taxid[matched_query_name][0])
     else:
         matched_query_name = None
-        taxid = int(taxid)
+        taxid = int(query_value)
     lineage = [int(t) for t in ncbi.get_lineage(taxid)]
     lineage_name_map = ncbi.get_taxid_translator(lineage + [taxid])
     lineage_names = [lineage_name_map.get(t) for t in lineage]
@@ -210,51 +253,55 @@ def _get_ncbi_lineage_record(label, ncbi, rank, args=None, taxid=None):
 
 
 def _resolve_ncbi_lineages(tree, taxid_tsv=None, rank="no", args=None, verbose=False):
-    ncbi = get_ete_ncbitaxa(args=args)
+    if taxid_tsv not in ["", None]:
+        taxid_df = read_taxid_tsv(taxid_tsv)
+        taxid_df = _order_taxid_tsv_to_match_tree(tree, taxid_df)
+        records = zip(taxid_df["leaf_name"], taxid_df["taxid"], strict=True)
+        label_queries = [
+            (label, _ncbi_lineage_query(label, rank, args=args, taxid=taxid))
+            for label, taxid in records
+        ]
+    else:
+        label_queries = [
+            (label, _ncbi_lineage_query(label, rank, args=args))
+            for label in tree.leaf_names()
+        ]
+    # The taxonomy database is opened only when a query is not cached.
+    ncbi_handles: list[Any] = list()
+
+    def lookup(queries):
+        if len(ncbi_handles) == 0:
+            ncbi_handles.append(get_ete_ncbitaxa(args=args))
+        return {
+            query: _get_ncbi_lineage_record(query, ncbi_handles[0]) for query in queries
+        }
+
     try:
-        lineages = dict()
-        unresolved_details = dict()
-        if taxid_tsv not in ["", None]:
-            taxid_df = read_taxid_tsv(taxid_tsv)
-            taxid_df = _order_taxid_tsv_to_match_tree(tree, taxid_df)
-            records = zip(taxid_df["leaf_name"], taxid_df["taxid"], strict=True)
-            for label, taxid in records:
-                record, reason = _get_ncbi_lineage_record(
-                    label=label,
-                    taxid=taxid,
-                    ncbi=ncbi,
-                    rank=rank,
-                    args=args,
-                )
-                if record is None:
-                    unresolved_details[label] = reason
-                    continue
-                lineages[label] = record["lineage"]
-        else:
-            for label in tree.leaf_names():
-                record, reason = _get_ncbi_lineage_record(
-                    label=label,
-                    ncbi=ncbi,
-                    rank=rank,
-                    args=args,
-                )
-                if record is None:
-                    unresolved_details[label] = reason
-                    continue
-                lineages[label] = record["lineage"]
-        if verbose and unresolved_details:
-            details = [
-                "{} ({})".format(label, unresolved_details[label])
-                for label in sorted(unresolved_details.keys())
-            ]
-            sys.stderr.write(
-                "Excluding NCBI-unresolved leaf label(s) from taxonomy rooting: {}\n".format(
-                    "; ".join(details)
-                )
-            )
-        return lineages, unresolved_details
+        lineage_records = cached_taxonomy_lookups(
+            "ncbi-lineage", [query for _, query in label_queries], lookup, args=args
+        )
     finally:
-        _close_ncbi_handle(ncbi)
+        for ncbi in ncbi_handles:
+            _close_ncbi_handle(ncbi)
+    lineages = dict()
+    unresolved_details = dict()
+    for label, query in label_queries:
+        record, reason = lineage_records[query]
+        if record is None:
+            unresolved_details[label] = reason
+            continue
+        lineages[label] = record["lineage"]
+    if verbose and unresolved_details:
+        details = [
+            "{} ({})".format(label, unresolved_details[label])
+            for label in sorted(unresolved_details.keys())
+        ]
+        sys.stderr.write(
+            "Excluding NCBI-unresolved leaf label(s) from taxonomy rooting: {}\n".format(
+                "; ".join(details)
+            )
+        )
+    return lineages, unresolved_details
 
 
 def _normalize_root_distance_for_reroot(tree):
@@ -290,6 +337,11 @@ _RESERVED_NODE_PROPERTIES = frozenset(
         TREE_FORMAT_PROP,
     )
 )
+# Property values of these types are immutable, so copied nodes share them.
+_SHARED_PROP_VALUE_TYPES = frozenset((str, int, float, bool))
+# Midpoint and MV rooting treat distances and variances that agree to this
+# relative tolerance as ties.
+_REROOT_ARRAY_TIE_RTOL = 1e-12
 
 
 def _reroot_leaf_mask_context(tree, leaf_name_to_bit=None):
@@ -871,13 +923,344 @@ def _restore_reroot_branch_length_scale(tree, branch_length_scale):
         node.dist = float(node.dist) * branch_length_scale
 
 
+def _preorder_path_sums(parent, values):
+    """Return, for each preorder node, the sum of ``values`` up to the root.
+
+    ``values[0]`` belongs to the root and must be 0. Each pointer-jumping pass
+    doubles the summed path, so a tree of height h takes about log2(h) passes.
+    """
+    sums = values.copy()
+    ancestor = parent.copy()
+    ancestor[0] = 0
+    while ancestor.any():
+        sums += sums[ancestor]
+        ancestor = ancestor[ancestor]
+    return sums
+
+
+def _reroot_tree_arrays(tree, method_name):
+    """Flatten ``tree`` into preorder arrays for midpoint and MV rooting.
+
+    The tree is read, not copied. Node 0 is the root, and the subtree of each
+    node occupies the index range ``[index, subtree_end[index])``. Branch
+    lengths are validated and scaled as ``_normalize_reroot_branch_lengths``
+    does, with missing lengths counted as 0 and flagged in ``missing``.
+    """
+    nodes = list()
+    parent_indices = list()
+    stack = [(tree, -1)]
+    while stack:
+        node, parent_index = stack.pop()
+        parent_indices.append(parent_index)
+        nodes.append(node)
+        children = node.children
+        if children:
+            index = len(nodes) - 1
+            stack.extend([(child, index) for child in reversed(children)])
+    node_count = len(nodes)
+    raw_lengths = [node.dist for node in nodes]
+    missing = np.fromiter(
+        (length is None for length in raw_lengths), dtype=bool, count=node_count
+    )
+    lengths = np.fromiter(
+        (0.0 if length is None else length for length in raw_lengths),
+        dtype=np.float64,
+        count=node_count,
+    )
+    if not np.all(np.isfinite(lengths[1:]) & (lengths[1:] >= 0.0)):
+        raise ValueError(
+            "{} rooting requires finite, non-negative branch lengths.".format(
+                method_name
+            )
+        )
+    missing[0] = False
+    lengths[0] = 0.0
+    branch_length_scale = float(lengths.max())
+    if branch_length_scale == 0.0:
+        branch_length_scale = 1.0
+    lengths /= branch_length_scale
+    parent = np.asarray(parent_indices, dtype=np.int64)
+    child_counts = np.bincount(parent[1:], minlength=node_count)
+    # Children follow their parent in increasing preorder, so the last child
+    # of the last child, and so on, is the end of each subtree.
+    last_descendant = np.arange(node_count)
+    np.maximum.at(last_descendant, parent[1:], np.arange(1, node_count))
+    while True:
+        jumped = last_descendant[last_descendant]
+        if np.array_equal(jumped, last_descendant):
+            break
+        last_descendant = jumped
+    return {
+        "nodes": nodes,
+        "parent": parent,
+        "parent_indices": parent_indices,
+        "raw_lengths": raw_lengths,
+        "missing": missing,
+        "lengths": lengths,
+        "branch_length_scale": branch_length_scale,
+        "is_leaf": child_counts == 0,
+        "has_single_child_nodes": bool(np.any(child_counts == 1)),
+        "subtree_end": last_descendant + 1,
+        "root_distances": _preorder_path_sums(parent, lengths),
+    }
+
+
+def _first_in_level_order(tree_arrays, indices, dissolved_child=None):
+    """Return the node of ``indices`` that ETE's level order visits first.
+
+    With ``dissolved_child``, the order is that of the tree whose root took
+    over the children of that root child, after the other root child.
+    """
+    parent = tree_arrays["parent"]
+    depths = _preorder_path_sums(parent, np.minimum(np.arange(len(parent)), 1))
+    depths = depths[indices]
+    moved = np.zeros(len(indices), dtype=np.int64)
+    if dissolved_child is not None:
+        moved = (indices > dissolved_child) & (
+            indices < tree_arrays["subtree_end"][dissolved_child]
+        )
+    order = np.lexsort((indices, moved, depths - moved))
+    return int(indices[order[0]])
+
+
+def _midpoint_outgroup_index(tree_arrays):
+    """Return the preorder index of ETE's midpoint outgroup, 0 for the root.
+
+    As ``get_midpoint_outgroup`` does, start from the first leaf farthest
+    from the root, measure the diameter from it, and walk up until the walked
+    distance exceeds half of the diameter. Leaves whose root distances tie
+    within rounding count as equally far.
+    """
+    root_distances = tree_arrays["root_distances"]
+    parent_indices = tree_arrays["parent_indices"]
+    leaf_indices = np.flatnonzero(tree_arrays["is_leaf"])
+    leaf_root_distances = root_distances[leaf_indices]
+    farthest = leaf_root_distances.max()
+    start = int(
+        leaf_indices[
+            np.argmax(leaf_root_distances >= farthest * (1.0 - _REROOT_ARRAY_TIE_RTOL))
+        ]
+    )
+    path = [start]
+    while parent_indices[path[-1]] >= 0:
+        path.append(parent_indices[path[-1]])
+    if len(path) == 1:
+        return 0
+    path_array = np.asarray(path, dtype=np.int64)
+    # walked[i] is the distance from the start leaf to path[i + 1], summed in
+    # the same order as ETE.
+    walked = np.cumsum(tree_arrays["lengths"][path_array[:-1]])
+    others = leaf_indices[leaf_indices != start]
+    # The last common ancestor of the start leaf and another leaf is path[j]:
+    # the lowest path node at or before an earlier leaf in preorder, or the
+    # lowest path node whose subtree ends after a later leaf.
+    common = np.empty(len(others), dtype=np.int64)
+    before = others < start
+    common[before] = len(path) - np.searchsorted(
+        path_array[:0:-1], others[before], side="right"
+    )
+    common[~before] = np.searchsorted(
+        tree_arrays["subtree_end"][path_array], others[~before], side="right"
+    )
+    diameter = float(
+        np.max(
+            walked[common - 1]
+            + root_distances[others]
+            - root_distances[path_array[common]]
+        )
+    )
+    exceeding = np.flatnonzero(walked > diameter / 2)
+    if len(exceeding) == 0:
+        return 0
+    return path[int(exceeding[0])]
+
+
+def _copied_node_props(node, memo, branch=True):
+    """Copy the non-None properties of ``node`` like ``copy_tree_iteratively``.
+
+    With ``branch``, an empty internal name and a missing support are dropped
+    as ``_finish_annotations_after_reroot`` does for internal branches.
+    """
+    props = {
+        key: value
+        if type(value) in _SHARED_PROP_VALUE_TYPES
+        else copy.deepcopy(value, memo)
+        for key, value in node.props.items()
+        if value is not None
+    }
+    if branch:
+        if node.name == "":
+            del props["name"]
+        if "support" in props and support_is_missing(node.support):
+            del props["support"]
+    return props
+
+
+def _set_branch_annotation(props, annotation, memo):
+    for prop in list(props):
+        if prop not in _RESERVED_NODE_PROPERTIES or prop in ("name", "support"):
+            del props[prop]
+    if "name" in annotation:
+        props["name"] = annotation["name"]
+    if "support" in annotation:
+        props["support"] = annotation["support"]
+    for prop, value in annotation["properties"].items():
+        props[prop] = (
+            value
+            if type(value) in _SHARED_PROP_VALUE_TYPES
+            else copy.deepcopy(value, memo)
+        )
+
+
+def _rerooted_tree_copy(
+    tree_arrays, outgroup, outgroup_length=None, dissolved_child=None
+):
+    """Copy the tree with its root on the branch above node ``outgroup``.
+
+    The result matches ``set_outgroup`` on a copy followed by
+    ``_finish_annotations_after_reroot``, but only the nodes on the path from
+    ``outgroup`` to the old root are rebuilt: the branch annotations, lengths,
+    and missing-length flags of that path move one node along it, and every
+    other node is copied as is. ``outgroup`` keeps ``outgroup_length`` of its
+    branch (half by default) and the other root child gets the rest, joined
+    with the other branch at a bifurcating old root. ``dissolved_child`` is the
+    old root child that MV rooting dissolves, whose copy then lists the other
+    old root child first. With ``outgroup`` 0 the root stays where it is.
+    """
+    nodes = tree_arrays["nodes"]
+    parent_indices = tree_arrays["parent_indices"]
+    raw_lengths = tree_arrays["raw_lengths"]
+    missing = tree_arrays["missing"]
+    path = [outgroup]
+    while path[-1] != 0:
+        path.append(parent_indices[path[-1]])
+    reversed_nodes = set(path[1:])
+    memo: dict[int, Any] = {}
+    stack: list[Any] = []
+    kept_children = dict()
+    outgroup_copy: Any = None
+    for index in range(len(nodes) - 1, -1, -1):
+        children = list()
+        while stack and stack[-1][0] == index:
+            children.append(stack.pop()[1])
+        if index in reversed_nodes:
+            kept_children[index] = children
+            continue
+        props = _copied_node_props(
+            nodes[index], memo, branch=bool(children) and index != 0
+        )
+        copied = Tree(props, children)
+        if index == outgroup:
+            outgroup_copy = copied
+        else:
+            stack.append((parent_indices[index], copied))
+
+    root_children = np.flatnonzero(tree_arrays["parent"] == 0).tolist()
+    pair = root_children if len(root_children) == 2 else []
+    pair_missing = any(missing[child] for child in pair)
+    pair_records = [
+        _nonempty_internal_branch_annotation(nodes[child])
+        for child in pair
+        if nodes[child].children
+    ]
+    pair_annotation = _resolve_internal_branch_annotation(
+        None, [record for record in pair_records if record is not None], set()
+    )
+
+    def split_annotation(index):
+        if index in pair:
+            return pair_annotation
+        record = None
+        if nodes[index].children:
+            record = _nonempty_internal_branch_annotation(nodes[index])
+        return _resolve_internal_branch_annotation(
+            None, [] if record is None else [record], set()
+        )
+
+    def rebuilt_node(source, branch_index, length, children):
+        props = {
+            prop: value
+            for prop, value in source.props.items()
+            if prop in _RESERVED_NODE_PROPERTIES
+            and prop not in ("name", "dist", "support")
+        }
+        _set_branch_annotation(props, split_annotation(branch_index), memo)
+        is_missing = pair_missing if branch_index in pair else missing[branch_index]
+        if not is_missing:
+            props["dist"] = length
+        return Tree(props, children)
+
+    if outgroup == 0:
+        for child in outgroup_copy.get_children():
+            if child.children and pair:
+                _set_branch_annotation(child.props, pair_annotation, memo)
+        return outgroup_copy
+
+    def length_of(index):
+        return 0.0 if raw_lengths[index] is None else raw_lengths[index]
+
+    if outgroup_length is None:
+        outgroup_length = length_of(outgroup) / 2
+    # chain_lengths[i] is the branch length above the rebuilt path[i + 1].
+    chain_lengths = [length_of(outgroup) - outgroup_length]
+    chain_lengths.extend(length_of(index) for index in path[1:-1])
+    remaining = kept_children[0]
+    joined = len(remaining) == 1
+    other_child = None
+    if joined:
+        # As ETE joins the branch of a one-child old root with its child.
+        (upper,) = remaining
+        other_child = pair[1] if pair[0] == path[-2] else pair[0]
+        if upper.children:
+            _set_branch_annotation(upper.props, pair_annotation, memo)
+        upper.dist = (
+            None if pair_missing else length_of(other_child) + chain_lengths[-1]
+        )
+    else:
+        upper = rebuilt_node(nodes[0], path[-2], chain_lengths[-1], remaining)
+    for position in range(len(path) - 2, 0, -1):
+        children = kept_children[path[position]]
+        if joined and position == len(path) - 2 and path[position] == dissolved_child:
+            children.insert(0, upper)
+        else:
+            children.append(upper)
+        upper = rebuilt_node(
+            nodes[path[position]],
+            path[position - 1],
+            chain_lengths[position - 1],
+            children,
+        )
+
+    old_root = nodes[0]
+    root_props = _copied_node_props(old_root, memo, branch=False)
+    for prop in _RESERVED_NODE_PROPERTIES.difference(("name", "dist", "support")):
+        root_props.pop(prop, None)
+    rerooted = Tree(root_props, [outgroup_copy, upper])
+    if outgroup_copy.children and outgroup in pair:
+        _set_branch_annotation(outgroup_copy.props, pair_annotation, memo)
+    outgroup_copy.dist = None if missing[outgroup] else outgroup_length
+    if outgroup in pair:
+        # The root split is unchanged, so each side keeps its own missing flag.
+        upper.dist = (
+            None if missing[other_child] else length_of(other_child) + chain_lengths[-1]
+        )
+    return rerooted
+
+
 def midpoint_rooting(tree):
-    tree = copy_tree_iteratively(tree)
     validate_unique_named_leaves(
         tree,
         option_name="--infile",
         context=" for midpoint rooting",
     )
+    tree_arrays = _reroot_tree_arrays(tree, "Midpoint")
+    if tree_arrays["has_single_child_nodes"]:
+        return _midpoint_rooting_by_node(tree)
+    return _rerooted_tree_copy(tree_arrays, _midpoint_outgroup_index(tree_arrays))
+
+
+def _midpoint_rooting_by_node(tree):
+    tree = copy_tree_iteratively(tree)
     annotation_backup = _prepare_annotations_for_reroot(tree)
     branch_length_scale = _normalize_reroot_branch_lengths(tree, "Midpoint")
     _normalize_root_distance_for_reroot(tree)
@@ -902,7 +1285,6 @@ def _prepare_mad_tree(tree):
     )
     positive_branch_count = 0
     branch_length_scale = 0.0
-    minimum_positive_branch_length = math.inf
     for node in tree.traverse():
         if node.is_root:
             continue
@@ -916,7 +1298,6 @@ def _prepare_mad_tree(tree):
         if length > 0:
             positive_branch_count += 1
             branch_length_scale = max(branch_length_scale, length)
-            minimum_positive_branch_length = min(minimum_positive_branch_length, length)
     if positive_branch_count < 3:
         raise ValueError("MAD rooting requires at least 3 positive branch lengths.")
 
@@ -950,10 +1331,6 @@ def _prepare_mad_tree(tree):
         "tree": tree,
         "annotation_backup": annotation_backup,
         "branch_length_scale": branch_length_scale,
-        "positive_branch_count": positive_branch_count,
-        "normalized_minimum_branch_length": (
-            minimum_positive_branch_length / branch_length_scale
-        ),
     }
 
 
@@ -1018,12 +1395,31 @@ def _mad_subtree_masks(tree, tips, all_tips):
     return effective_subtree_masks, all_subtree_masks, all_tips_by_name
 
 
-def _mad_tree_index(all_nodes, node_index_by_id, use_float_arithmetic):
+def _mad_exact_integer(value):
+    """Return a non-negative float as an integer in units of ``2**-MAD_EXACT_SHIFT``."""
+    numerator, denominator = value.as_integer_ratio()
+    return numerator << (MAD_EXACT_SHIFT + 1 - denominator.bit_length())
+
+
+def _mad_exact_weight(weight_distance_scale, exact_distance):
+    """Return the squared float weight of an exact distance as an integer.
+
+    The weight ratio is rounded from the correctly rounded distance, as in the
+    float engine, so both engines score the same weights. The result is in
+    units of ``2**(-2 * MAD_EXACT_SHIFT)``.
+    """
+    ratio = weight_distance_scale / (exact_distance / MAD_EXACT_UNIT)
+    return _mad_exact_integer(ratio) ** 2
+
+
+def _mad_tree_index(all_nodes, node_index_by_id):
     node_count = len(all_nodes)
     parent_indices = [0] * node_count
     topological_depths = [0] * node_count
-    zero = 0.0 if use_float_arithmetic else Fraction(0)
-    root_distances_by_index = [zero] * node_count
+    edge_lengths = [0.0] * node_count
+    root_distances = [0.0] * node_count
+    root_distance_lows = [0.0] * node_count
+    exact_root_distances = [0] * node_count
     for node in all_nodes:
         node_index = node_index_by_id[id(node)]
         if node.is_root:
@@ -1032,13 +1428,15 @@ def _mad_tree_index(all_nodes, node_index_by_id, use_float_arithmetic):
         parent_index = node_index_by_id[id(node.up)]
         parent_indices[node_index] = parent_index
         topological_depths[node_index] = topological_depths[parent_index] + 1
-        float_edge_length = float(node.dist)
-        edge_length: float | Fraction = float_edge_length
-        if not use_float_arithmetic:
-            edge_length = Fraction.from_float(float_edge_length)
-        root_distances_by_index[node_index] = (
-            root_distances_by_index[parent_index] + edge_length
-        )
+        edge_length = float(node.dist)
+        edge_lengths[node_index] = edge_length
+        root_distances[node_index], error = _two_sum(
+            root_distances[parent_index], edge_length
+        )
+        root_distance_lows[node_index] = root_distance_lows[parent_index] + error
+        exact_root_distances[node_index] = exact_root_distances[
+            parent_index
+        ] + _mad_exact_integer(edge_length)
     ancestor_levels = [parent_indices]
     while (1 << len(ancestor_levels)) <= max(topological_depths):
         previous = ancestor_levels[-1]
@@ -1048,9 +1446,11 @@ def _mad_tree_index(all_nodes, node_index_by_id, use_float_arithmetic):
     return {
         "parent_indices": parent_indices,
         "topological_depths": topological_depths,
-        "root_distances": root_distances_by_index,
+        "edge_lengths": edge_lengths,
+        "root_distances": root_distances,
+        "root_distance_lows": root_distance_lows,
+        "exact_root_distances": exact_root_distances,
         "ancestor_levels": ancestor_levels,
-        "zero": zero,
     }
 
 
@@ -1086,68 +1486,344 @@ def _mad_lowest_common_ancestor_index(first_index, second_index, tree_index):
     return tree_index["parent_indices"][first_index]
 
 
-def _iter_mad_pair_records(tips, node_index_by_id, tree_index):
-    effective_node_indices = [node_index_by_id[id(tip)] for tip in tips]
-    root_distances = tree_index["root_distances"]
-    for first_index, second_index in combinations(range(len(tips)), 2):
-        first_node_index = effective_node_indices[first_index]
-        second_node_index = effective_node_indices[second_index]
-        ancestor_index = _mad_lowest_common_ancestor_index(
-            first_node_index, second_node_index, tree_index
-        )
-        pair_distance = (
-            root_distances[first_node_index]
-            + root_distances[second_node_index]
-            - (2 * root_distances[ancestor_index])
-        )
-        if pair_distance <= 0:
-            raise ValueError("MAD rooting requires at least 3 effective leaves.")
-        yield (
-            first_node_index,
-            second_node_index,
-            ancestor_index,
-            pair_distance,
-            float(pair_distance),
-        )
+def _mad_pair_index(tips, node_index_by_id, tree_index):
+    """Return the arrays that give the LCA of any two effective tips.
+
+    Tips are numbered in preorder; the LCA of the tips at positions ``p < q``
+    is the shallowest of the LCAs of the adjacent tips between them, which a
+    sparse table answers in constant time.
+    """
+    tip_nodes = sorted(node_index_by_id[id(tip)] for tip in tips)
+    adjacent_lca = np.asarray(
+        [
+            _mad_lowest_common_ancestor_index(
+                tip_nodes[position], tip_nodes[position + 1], tree_index
+            )
+            for position in range(len(tip_nodes) - 1)
+        ],
+        dtype=np.int64,
+    )
+    depths = np.asarray(tree_index["topological_depths"], dtype=np.int64)
+    # Keys order adjacent pairs by LCA depth; the low 32 bits keep the pair.
+    sparse_table = [(depths[adjacent_lca] << 32) | np.arange(adjacent_lca.size)]
+    width = 1
+    while 2 * width <= adjacent_lca.size:
+        previous = sparse_table[-1]
+        shifted = np.concatenate([previous[width:], previous[-width:]])
+        sparse_table.append(np.minimum(previous, shifted))
+        width *= 2
+    return {
+        "tip_nodes": np.asarray(tip_nodes, dtype=np.int64),
+        "adjacent_lca": adjacent_lca,
+        "sparse_table": np.vstack(sparse_table),
+    }
 
 
-def _mad_objective_data(
-    tree, all_nodes, node_index_by_id, tips, tree_index, use_float_arithmetic
-):
-    def pair_records():
-        return _iter_mad_pair_records(tips, node_index_by_id, tree_index)
+def _iter_mad_pair_blocks(pair_index):
+    """Yield ``(first, second, ancestor)`` node-index arrays for blocks of tip pairs."""
+    tip_nodes = pair_index["tip_nodes"]
+    sparse_table = pair_index["sparse_table"]
+    tip_count = tip_nodes.size
+    for start1 in range(0, tip_count, MAD_PAIR_BLOCK_SIZE):
+        rows = np.arange(start1, min(start1 + MAD_PAIR_BLOCK_SIZE, tip_count))
+        for start2 in range(start1, tip_count, MAD_PAIR_BLOCK_SIZE):
+            columns = np.arange(start2, min(start2 + MAD_PAIR_BLOCK_SIZE, tip_count))
+            low, high = np.broadcast_arrays(rows[:, None], columns[None, :])
+            is_pair = low < high
+            low = low[is_pair]
+            high = high[is_pair]
+            level = np.log2(high - low).astype(np.int64)
+            adjacent = (
+                np.minimum(
+                    sparse_table[level, low],
+                    sparse_table[level, high - (1 << level)],
+                )
+                & 0xFFFFFFFF
+            )
+            yield tip_nodes[low], tip_nodes[high], pair_index["adjacent_lca"][adjacent]
+
 
+def _two_sum(a, b):
+    total = a + b
+    b_part = total - a
+    return total, (a - (total - b_part)) + (b - b_part)
+
+
+def _two_product(a, b):
+    """Return ``a * b`` as an unevaluated sum ``hi + lo`` (Dekker's product)."""
+    product = a * b
+    a_split = 134217729.0 * a
+    a_hi = a_split - (a_split - a)
+    a_lo = a - a_hi
+    b_split = 134217729.0 * b
+    b_hi = b_split - (b_split - b)
+    b_lo = b - b_hi
+    return product, ((a_hi * b_hi - product) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
+
+
+def _mad_accurate_bincount(nodes, terms, node_count):
+    """Return the bin sums of ``terms`` as unevaluated sums ``hi + lo``.
+
+    Terms are cut into slices on shrinking power-of-two grids, coarse enough
+    that every slice sums exactly, so the large weights of close tip pairs
+    cancel without swamping the small ones. Only the last remainder rounds.
+    """
+    hi = np.zeros(node_count)
+    lo = np.zeros(node_count)
+    remainder = terms
+    for _ in range(MAD_SUM_SLICES):
+        magnitude = float(np.max(np.abs(remainder)))
+        if magnitude == 0.0:
+            break
+        exponent = math.frexp(magnitude * remainder.size)[1] - 52
+        if exponent < MAD_MIN_SLICE_EXPONENT:
+            break
+        sliced = np.ldexp(np.round(np.ldexp(remainder, -exponent)), exponent)
+        remainder = remainder - sliced
+        hi, error = _two_sum(
+            hi, np.bincount(nodes, weights=sliced, minlength=node_count)
+        )
+        lo += error
+    lo += np.bincount(nodes, weights=remainder, minlength=node_count)
+    return hi, lo
+
+
+def _mad_float_pair_terms(tree_arrays, first, second, ancestor):
+    """Return pair distances and the weighted numerator terms of both tips.
+
+    Distances and ``distance - 2 * root distance`` are formed from the
+    unevaluated root distances, so only the final rounding remains.
+    """
+    hi, lo = tree_arrays
+    partial, error1 = _two_sum(hi[first], hi[second])
+    distances, error2 = _two_sum(partial, -2.0 * hi[ancestor])
+    distance_lows = error1 + error2 + (lo[first] + lo[second] - 2.0 * lo[ancestor])
+    tip_offsets = list()
+    for tip in (first, second):
+        offset, error = _two_sum(distances, -2.0 * hi[tip])
+        tip_offsets.append((offset, error + distance_lows - 2.0 * lo[tip]))
+    return distances + distance_lows, tip_offsets
+
+
+def _mad_float_pair_sums(pair_index, tree_index):
+    """Scatter the float pair terms of every node in NumPy blocks.
+
+    Returns None when a pair distance is not clearly above the roundoff of
+    the root distances.
+    """
+    tree_arrays = (
+        np.asarray(tree_index["root_distances"]),
+        np.asarray(tree_index["root_distance_lows"]),
+    )
+    node_count = tree_arrays[0].size
+    # Root distances carry at most one roundoff of u**2 per edge.
+    distance_roundoff = (
+        MAD_UNIT_ROUNDOFF * (max(tree_index["topological_depths"]) + 4) * 4.0
+    )
     minimum_pair_distance = math.inf
     maximum_pair_distance = 0.0
-    for _, _, _, _, pair_distance in pair_records():
-        minimum_pair_distance = min(minimum_pair_distance, pair_distance)
-        maximum_pair_distance = max(maximum_pair_distance, pair_distance)
+    for first, second, ancestor in _iter_mad_pair_blocks(pair_index):
+        distances, _ = _mad_float_pair_terms(tree_arrays, first, second, ancestor)
+        magnitudes = tree_arrays[0][first] + tree_arrays[0][second]
+        if np.any(distances <= distance_roundoff * magnitudes):
+            return None
+        minimum_pair_distance = min(minimum_pair_distance, float(distances.min()))
+        maximum_pair_distance = max(maximum_pair_distance, float(distances.max()))
     weight_distance_scale = math.sqrt(minimum_pair_distance) * math.sqrt(
         maximum_pair_distance
     )
-    weight_scale_number = (
-        weight_distance_scale
-        if use_float_arithmetic
-        else Fraction.from_float(weight_distance_scale)
+    sums = {
+        name: [np.zeros(node_count), np.zeros(node_count)]
+        for name in ("cut_weights", "constants", "moments")
+    }
+    magnitudes = {name: np.zeros(node_count) for name in ("cut_weights", "constants")}
+    root_objectives = list()
+
+    def scatter(name, nodes, *terms):
+        hi, lo = _mad_accurate_bincount(nodes, np.concatenate(terms), node_count)
+        sums[name][0], error = _two_sum(sums[name][0], hi)
+        sums[name][1] += error + lo
+
+    for first, second, ancestor in _iter_mad_pair_blocks(pair_index):
+        distances, tip_offsets = _mad_float_pair_terms(
+            tree_arrays, first, second, ancestor
+        )
+        ratios = weight_distance_scale / distances
+        weights = ratios * ratios
+        nodes = np.concatenate((first, second, ancestor))
+        scatter("cut_weights", nodes, weights, weights, -2.0 * weights)
+        moments = weights * distances
+        scatter("moments", nodes, moments, moments, -2.0 * moments)
+        constant_terms = list()
+        for offset, offset_low in tip_offsets:
+            product, product_low = _two_product(weights, offset)
+            constant_terms.append((product, product_low + weights * offset_low))
+        (first_hi, first_lo), (second_hi, second_lo) = constant_terms
+        # Each tip term is negated separately at the ancestor so pairs cancel exactly.
+        constant_nodes = np.concatenate((nodes, ancestor))
+        scatter("constants", constant_nodes, first_hi, second_hi, -first_hi, -second_hi)
+        scatter("constants", constant_nodes, first_lo, second_lo, -first_lo, -second_lo)
+        for name, first_terms, second_terms in (
+            ("cut_weights", weights, weights),
+            (
+                "constants",
+                weights * (distances + 2.0 * tree_arrays[0][first]),
+                weights * (distances + 2.0 * tree_arrays[0][second]),
+            ),
+        ):
+            magnitudes[name] += np.bincount(
+                nodes,
+                weights=np.concatenate(
+                    (first_terms, second_terms, first_terms + second_terms)
+                ),
+                minlength=node_count,
+            )
+        differences, difference_lows = _two_sum(
+            tree_arrays[0][first], -tree_arrays[0][second]
+        )
+        differences += difference_lows + (
+            tree_arrays[1][first] - tree_arrays[1][second]
+        )
+        root_objectives.append(float(np.sum(weights * differences * differences)))
+    if not all(np.all(np.isfinite(values[0])) for values in sums.values()):
+        return None
+    return {
+        "sums": {
+            name: (values[0].tolist(), values[1].tolist())
+            for name, values in sums.items()
+        },
+        "magnitudes": {name: values.tolist() for name, values in magnitudes.items()},
+        "root_objective": math.fsum(root_objectives),
+        "weight_scale": weight_distance_scale,
+    }
+
+
+def _mad_float_objective_data(pair_index, tree_index):
+    """Return float MAD objective terms for every node with rounding-error bounds.
+
+    Each term carries a bound on its distance from the value that exact
+    arithmetic gives for the same weights. Returns None when the pair
+    distances themselves are unreliable.
+    """
+    pair_sums = _mad_float_pair_sums(pair_index, tree_index)
+    if pair_sums is None:
+        return None
+    unit = MAD_UNIT_ROUNDOFF
+    sums = pair_sums["sums"]
+    magnitudes = pair_sums["magnitudes"]
+    parent_indices = tree_index["parent_indices"]
+    node_count = len(parent_indices)
+    # Nodes are numbered in preorder, so children follow their parents.
+    for node_index in range(node_count - 1, 0, -1):
+        parent_index = parent_indices[node_index]
+        for hi, lo in sums.values():
+            hi[parent_index], error = _two_sum(hi[parent_index], hi[node_index])
+            lo[parent_index] += lo[node_index] + error
+        for values in magnitudes.values():
+            values[parent_index] += values[node_index]
+    # Unevaluated sums round by at most u**2 per addition of pairs and nodes.
+    sum_roundoff = (
+        8 * unit * unit * (6 * len(pair_index["tip_nodes"]) ** 2 + node_count)
     )
-    node_count = len(all_nodes)
-    zero = tree_index["zero"]
-    cut_weights = [zero] * node_count
-    numerator_constants = [zero] * node_count
-    numerator_depths = [zero] * node_count
-    root_objective = zero
-    root_distances = tree_index["root_distances"]
-    for first, second, ancestor, pair_distance_number, pair_distance in pair_records():
-        weight_ratio = weight_distance_scale / pair_distance
-        weight_number = (
-            weight_ratio if use_float_arithmetic else Fraction.from_float(weight_ratio)
-        )
-        weight = weight_number * weight_number
+    cut_weights = [0.0] * node_count
+    cut_weight_errors = [0.0] * node_count
+    numerators = [0.0] * node_count
+    numerator_errors = [0.0] * node_count
+    objectives = [0.0] * node_count
+    objective_errors = [0.0] * node_count
+    objectives[0] = pair_sums["root_objective"]
+    objective_errors[0] = 40 * unit * objectives[0]
+    for node_index in range(1, node_count):
+        parent_index = parent_indices[node_index]
+        cut_hi = sums["cut_weights"][0][node_index]
+        cut_lo = sums["cut_weights"][1][node_index]
+        root_distance = tree_index["root_distances"][node_index]
+        root_distance_low = tree_index["root_distance_lows"][node_index]
+        product, product_low = _two_product(2.0 * cut_hi, root_distance)
+        product_low += 2.0 * (cut_hi * root_distance_low + cut_lo * root_distance)
+        numerator, numerator_low = _two_sum(sums["constants"][0][node_index], product)
+        numerator += numerator_low + sums["constants"][1][node_index] + product_low
+        cut_weight = cut_hi + cut_lo
+        cut_weight_slack = sum_roundoff * magnitudes["cut_weights"][node_index]
+        cut_weights[node_index] = cut_weight
+        # Float weights are within 11u of the weights of exact distances.
+        cut_weight_errors[node_index] = 12 * unit * abs(cut_weight) + cut_weight_slack
+        numerators[node_index] = numerator
+        numerator_errors[node_index] = (
+            12
+            * unit
+            * abs(sums["moments"][0][node_index] + sums["moments"][1][node_index])
+            + sum_roundoff * magnitudes["constants"][node_index]
+            + 2.0 * root_distance * cut_weight_slack
+            + 4 * unit * unit * (abs(product) + abs(numerator))
+        )
+        edge_length = tree_index["edge_lengths"][node_index]
+        numerator_term = 4.0 * edge_length * numerator
+        cut_term = 4.0 * edge_length * edge_length * cut_weight
+        objectives[node_index] = objectives[parent_index] + numerator_term - cut_term
+        objective_errors[node_index] = (
+            objective_errors[parent_index]
+            + 4.0 * edge_length * numerator_errors[node_index]
+            + 4.0 * edge_length * edge_length * cut_weight_errors[node_index]
+            + 3.0
+            * unit
+            * (abs(objectives[parent_index]) + abs(numerator_term) + abs(cut_term))
+        )
+    return {
+        "cut_weights": cut_weights,
+        "cut_weight_errors": cut_weight_errors,
+        "numerators": numerators,
+        "numerator_errors": numerator_errors,
+        "objectives": objectives,
+        "objective_errors": objective_errors,
+        "weight_scale": pair_sums["weight_scale"],
+    }
+
+
+def _mad_objective_data(pair_index, tree_index):
+    """Return exact MAD objective terms for every node.
+
+    Distances are integers in units of ``2**-MAD_EXACT_SHIFT`` and weights are
+    integer squares of floats, so every sum below is exact.
+    """
+    exact_root_distances = tree_index["exact_root_distances"]
+
+    def pair_records():
+        for block in _iter_mad_pair_blocks(pair_index):
+            for first, second, ancestor in zip(
+                *(nodes.tolist() for nodes in block), strict=True
+            ):
+                pair_distance = (
+                    exact_root_distances[first]
+                    + exact_root_distances[second]
+                    - 2 * exact_root_distances[ancestor]
+                )
+                if pair_distance <= 0:
+                    raise ValueError(
+                        "MAD rooting requires at least 3 effective leaves."
+                    )
+                yield first, second, ancestor, pair_distance
+
+    minimum_pair_distance: float | int = math.inf
+    maximum_pair_distance = 0
+    for _, _, _, pair_distance in pair_records():
+        minimum_pair_distance = min(minimum_pair_distance, pair_distance)
+        maximum_pair_distance = max(maximum_pair_distance, pair_distance)
+    weight_distance_scale = math.sqrt(
+        minimum_pair_distance / MAD_EXACT_UNIT
+    ) * math.sqrt(maximum_pair_distance / MAD_EXACT_UNIT)
+    node_count = len(exact_root_distances)
+    cut_weights = [0] * node_count
+    numerator_constants = [0] * node_count
+    numerator_depths = [0] * node_count
+    root_objective = 0
+    for first, second, ancestor, pair_distance in pair_records():
+        weight = _mad_exact_weight(weight_distance_scale, pair_distance)
         cut_weights[first] += weight
         cut_weights[second] += weight
         cut_weights[ancestor] -= 2 * weight
-        first_constant = weight * (pair_distance_number - 2 * root_distances[first])
-        second_constant = weight * (pair_distance_number - 2 * root_distances[second])
+        first_constant = weight * (pair_distance - 2 * exact_root_distances[first])
+        second_constant = weight * (pair_distance - 2 * exact_root_distances[second])
         numerator_constants[first] += first_constant
         numerator_constants[second] += second_constant
         numerator_constants[ancestor] -= first_constant + second_constant
@@ -1155,46 +1831,210 @@ def _mad_objective_data(
         numerator_depths[first] += depth_coefficient
         numerator_depths[second] += depth_coefficient
         numerator_depths[ancestor] -= 2 * depth_coefficient
-        root_difference = root_distances[first] - root_distances[second]
+        root_difference = exact_root_distances[first] - exact_root_distances[second]
         root_objective += weight * root_difference * root_difference
 
     parent_indices = tree_index["parent_indices"]
-    for node in tree.traverse(strategy="postorder"):
-        if node.is_root:
-            continue
-        node_index = node_index_by_id[id(node)]
+    for node_index in range(node_count - 1, 0, -1):
         parent_index = parent_indices[node_index]
         cut_weights[parent_index] += cut_weights[node_index]
         numerator_constants[parent_index] += numerator_constants[node_index]
         numerator_depths[parent_index] += numerator_depths[node_index]
 
-    objectives_by_index = [zero] * node_count
-    objectives_by_index[node_index_by_id[id(tree)]] = root_objective
-    numerators_by_index = [zero] * node_count
-    for node in tree.traverse(strategy="preorder"):
-        if node.is_root:
-            continue
-        node_index = node_index_by_id[id(node)]
+    objectives = [0] * node_count
+    objectives[0] = root_objective
+    numerators = [0] * node_count
+    for node_index in range(1, node_count):
         parent_index = parent_indices[node_index]
-        float_edge_length = float(node.dist)
-        edge_length: float | Fraction = float_edge_length
-        if not use_float_arithmetic:
-            edge_length = Fraction.from_float(float_edge_length)
+        edge_length = (
+            exact_root_distances[node_index] - exact_root_distances[parent_index]
+        )
         numerator = numerator_constants[node_index] + (
-            numerator_depths[node_index] * root_distances[node_index]
+            numerator_depths[node_index] * exact_root_distances[node_index]
         )
-        numerators_by_index[node_index] = numerator
-        objectives_by_index[node_index] = (
-            objectives_by_index[parent_index]
+        numerators[node_index] = numerator
+        objectives[node_index] = (
+            objectives[parent_index]
             + 4 * edge_length * numerator
             - 4 * edge_length * edge_length * cut_weights[node_index]
         )
+    weight_unit = MAD_EXACT_UNIT * MAD_EXACT_UNIT
     return {
-        "cut_weights": cut_weights,
-        "numerators": numerators_by_index,
-        "objectives": objectives_by_index,
-        "weight_scale": weight_scale_number,
+        "cut_weights": [Fraction(value, weight_unit) for value in cut_weights],
+        "numerators": [
+            Fraction(value, weight_unit * MAD_EXACT_UNIT) for value in numerators
+        ],
+        "objectives": [
+            Fraction(value, weight_unit * weight_unit) for value in objectives
+        ],
+        "weight_scale": Fraction.from_float(weight_distance_scale),
+    }
+
+
+def _mad_edge_distances(node_index, pair_index, tree_index):
+    """Return exact distances from one node to the tips below and beyond it."""
+    exact_root_distances = tree_index["exact_root_distances"]
+    node_distance = exact_root_distances[node_index]
+    inside_distances = list()
+    outside_distances = list()
+    for tip in pair_index["tip_nodes"].tolist():
+        ancestor = _mad_lowest_common_ancestor_index(tip, node_index, tree_index)
+        if ancestor == node_index:
+            inside_distances.append(exact_root_distances[tip] - node_distance)
+        else:
+            outside_distances.append(
+                exact_root_distances[tip]
+                + node_distance
+                - 2 * exact_root_distances[ancestor]
+            )
+    return inside_distances, outside_distances
+
+
+def _mad_edge_float_data(node_index, edge_distances, float_data):
+    """Return float terms of one edge summed over the tip pairs it separates.
+
+    Unlike the subtree sums of the float engine, these sums do not cancel, so
+    their bounds stay tight when pair weights span many orders of magnitude.
+    """
+    inside = np.asarray([value / MAD_EXACT_UNIT for value in edge_distances[0]])
+    outside = np.asarray([value / MAD_EXACT_UNIT for value in edge_distances[1]])
+    rows = max(1, MAD_PAIR_BLOCK_SIZE**2 // max(1, outside.size))
+    sums: dict[str, list[float]] = {"cut": [], "numerator": [], "magnitude": []}
+    for start in range(0, inside.size, rows):
+        block = inside[start : start + rows, None]
+        distances = block + outside[None, :]
+        ratios = float_data["weight_scale"] / distances
+        weights = ratios * ratios
+        sums["cut"].append(math.fsum(weights.ravel()))
+        sums["numerator"].append(
+            math.fsum((weights * (outside[None, :] - block)).ravel())
+        )
+        sums["magnitude"].append(math.fsum((weights * distances).ravel()))
+    cut_weight = math.fsum(sums["cut"])
+    numerator = math.fsum(sums["numerator"])
+    return {
+        "cut_weights": {node_index: cut_weight},
+        "cut_weight_errors": {node_index: 18 * MAD_UNIT_ROUNDOFF * cut_weight},
+        "numerators": {node_index: numerator},
+        "numerator_errors": {
+            node_index: 21 * MAD_UNIT_ROUNDOFF * math.fsum(sums["magnitude"])
+            + MAD_UNIT_ROUNDOFF * abs(numerator)
+        },
+        "objectives": {node_index: float_data["objectives"][node_index]},
+        "weight_scale": float_data["weight_scale"],
+    }
+
+
+def _mad_edge_exact_data(node_index, edge_distances, float_data):
+    """Return exact terms of one edge summed over the tip pairs it separates.
+
+    Only the cut weight and numerator, which fix the root position, are exact;
+    the objective keeps its float value.
+    """
+    weight_distance_scale = float_data["weight_scale"]
+    cut_weight = 0
+    numerator = 0
+    for inside_distance in edge_distances[0]:
+        for outside_distance in edge_distances[1]:
+            weight = _mad_exact_weight(
+                weight_distance_scale, inside_distance + outside_distance
+            )
+            cut_weight += weight
+            numerator += weight * (outside_distance - inside_distance)
+    weight_unit = MAD_EXACT_UNIT * MAD_EXACT_UNIT
+    return {
+        "cut_weights": {node_index: Fraction(cut_weight, weight_unit)},
+        "numerators": {node_index: Fraction(numerator, weight_unit * MAD_EXACT_UNIT)},
+        "objectives": {
+            node_index: Fraction.from_float(float_data["objectives"][node_index])
+        },
+        "weight_scale": Fraction.from_float(weight_distance_scale),
+    }
+
+
+def _mad_float_candidate_bounds(node_index, edge_length, float_data):
+    """Return lower and upper bounds on the best objective of one float edge."""
+    cut_weight = float_data["cut_weights"][node_index]
+    numerator = float_data["numerators"][node_index]
+    root_distance = 0.0 if cut_weight <= 0 else numerator / (2 * cut_weight)
+    root_distance = min(max(root_distance, 0.0), edge_length)
+
+    def error_at(distance):
+        return (
+            float_data["objective_errors"][node_index]
+            + 4 * distance * float_data["numerator_errors"][node_index]
+            + 4 * distance * distance * float_data["cut_weight_errors"][node_index]
+        )
+
+    objective_terms = (
+        float_data["objectives"][node_index],
+        -4 * root_distance * numerator,
+        4 * root_distance * root_distance * cut_weight,
+    )
+    objective = sum(objective_terms)
+    rounding = 4 * MAD_UNIT_ROUNDOFF * sum(abs(term) for term in objective_terms)
+    # The exact optimum lies somewhere on the edge, where the float objective
+    # is no lower than at the float optimum.
+    return (
+        objective - error_at(edge_length) - rounding,
+        objective + error_at(root_distance) + rounding,
+    )
+
+
+def _mad_float_shortlist(tree, tips, node_index_by_id, effective_subtree_masks, data):
+    """Return the edges whose score may be best or tied with the best.
+
+    Returns None when more than ``MAD_EXACT_CANDIDATE_LIMIT`` edges remain.
+    """
+    pair_count = len(tips) * (len(tips) - 1) // 2
+    normalizer = pair_count * data["weight_scale"] ** 2
+    all_effective_mask = (1 << len(tips)) - 1
+    score_bounds = dict()
+    for node in tree.traverse():
+        if node.is_root:
+            continue
+        edge_length = float(node.dist)
+        side_mask = effective_subtree_masks[node]
+        if edge_length == 0 or side_mask in (0, all_effective_mask):
+            continue
+        node_index = node_index_by_id[id(node)]
+        bounds = _mad_float_candidate_bounds(node_index, edge_length, data)
+        score_bounds[node_index] = [
+            math.sqrt(max(0.0, bound / normalizer)) for bound in bounds
+        ]
+    if not score_bounds:
+        return None
+    best_upper = min(upper for _, upper in score_bounds.values())
+    # Twice the tie tolerance of _select_mad_candidate keeps every near tie.
+    threshold = best_upper + 2 * max(10**-12 * best_upper, 10**-15)
+    shortlist = {
+        node_index
+        for node_index, (lower, _) in score_bounds.items()
+        if lower <= threshold
     }
+    return shortlist if len(shortlist) <= MAD_EXACT_CANDIDATE_LIMIT else None
+
+
+def _mad_float_root_position_is_accurate(node_index, edge_length, float_data):
+    cut_weight = float_data["cut_weights"][node_index]
+    cut_weight_error = float_data["cut_weight_errors"][node_index]
+    numerator = float_data["numerators"][node_index]
+    numerator_error = float_data["numerator_errors"][node_index]
+    if cut_weight <= cut_weight_error:
+        return False
+    if numerator + numerator_error <= 0:
+        return True
+    if numerator - numerator_error >= 2 * edge_length * (cut_weight + cut_weight_error):
+        return True
+    root_distance = numerator / (2 * cut_weight)
+    if not 0 < root_distance < edge_length:
+        return False
+    error = root_distance * (
+        numerator_error / numerator
+        + cut_weight_error / cut_weight
+        + 2 * MAD_UNIT_ROUNDOFF
+    )
+    return error <= MAD_FLOAT_ROOT_POSITION_RTOL * edge_length
 
 
 def _mad_candidate_key(node, all_subtree_masks, all_tips_by_name):
@@ -1224,9 +2064,9 @@ def _select_mad_candidate(
     effective_subtree_masks,
     all_subtree_masks,
     all_tips_by_name,
-    tree_index,
     objective_data,
     use_float_arithmetic,
+    candidate_indices=None,
 ):
     best: dict[str, Any] = {
         "score": math.inf,
@@ -1237,7 +2077,7 @@ def _select_mad_candidate(
         "key": None,
     }
     pair_count = len(tips) * (len(tips) - 1) // 2
-    zero = tree_index["zero"]
+    zero = 0.0 if use_float_arithmetic else Fraction(0)
     all_effective_mask = (1 << len(tips)) - 1
     for node in tree.traverse():
         if node.is_root:
@@ -1250,6 +2090,8 @@ def _select_mad_candidate(
         if edge_length == 0 or side_mask in (0, all_effective_mask):
             continue
         node_index = node_index_by_id[id(node)]
+        if candidate_indices is not None and node_index not in candidate_indices:
+            continue
         cut_weight = objective_data["cut_weights"][node_index]
         numerator = objective_data["numerators"][node_index]
         denominator = 2 * cut_weight
@@ -1312,8 +2154,60 @@ def _finish_mad_rooting(tree, best, branch_length_scale, annotation_backup):
     return tree
 
 
-def mad_rooting(tree):
-    """Root a tree by minimal ancestor deviation (Tria et al. 2017)."""
+def _choose_mad_candidate(
+    tree,
+    tips,
+    node_index_by_id,
+    effective_subtree_masks,
+    all_subtree_masks,
+    all_tips_by_name,
+    tree_index,
+    exact=False,
+):
+    """Return the best MAD root edge, scoring in floats where the bounds allow.
+
+    The float engine bounds the score of every edge. Exact arithmetic is used
+    only for the edges that the bounds cannot separate from the best, for a
+    root position whose float value is not accurate, or, with ``exact``, for
+    every edge.
+    """
+    pair_index = _mad_pair_index(tips, node_index_by_id, tree_index)
+    float_data = None if exact else _mad_float_objective_data(pair_index, tree_index)
+    shortlist = (
+        None
+        if float_data is None
+        else _mad_float_shortlist(
+            tree, tips, node_index_by_id, effective_subtree_masks, float_data
+        )
+    )
+
+    def select(objective_data, use_float_arithmetic):
+        return _select_mad_candidate(
+            tree,
+            tips,
+            node_index_by_id,
+            effective_subtree_masks,
+            all_subtree_masks,
+            all_tips_by_name,
+            objective_data,
+            use_float_arithmetic,
+            candidate_indices=shortlist,
+        )
+
+    if float_data is None or shortlist is None or len(shortlist) > 1:
+        return select(_mad_objective_data(pair_index, tree_index), False)
+    (node_index,) = shortlist
+    edge_length = tree_index["edge_lengths"][node_index]
+    if _mad_float_root_position_is_accurate(node_index, edge_length, float_data):
+        return select(float_data, True)
+    edge_distances = _mad_edge_distances(node_index, pair_index, tree_index)
+    edge_data = _mad_edge_float_data(node_index, edge_distances, float_data)
+    if _mad_float_root_position_is_accurate(node_index, edge_length, edge_data):
+        return select(edge_data, True)
+    return select(_mad_edge_exact_data(node_index, edge_distances, float_data), False)
+
+
+def _mad_rooting(tree, exact=False):
     prepared = _prepare_mad_tree(tree)
     tree = prepared["tree"]
     all_nodes, node_index_by_id, all_tips, tips = _mad_effective_tip_data(tree)
@@ -1322,28 +2216,15 @@ def mad_rooting(tree):
         all_subtree_masks,
         all_tips_by_name,
     ) = _mad_subtree_masks(tree, tips, all_tips)
-    use_float_arithmetic = prepared["positive_branch_count"] <= (
-        MAD_FLOAT_MAX_PATH_DYNAMIC_RANGE * prepared["normalized_minimum_branch_length"]
-    )
-    tree_index = _mad_tree_index(all_nodes, node_index_by_id, use_float_arithmetic)
-    objective_data = _mad_objective_data(
-        tree,
-        all_nodes,
-        node_index_by_id,
-        tips,
-        tree_index,
-        use_float_arithmetic,
-    )
-    best = _select_mad_candidate(
+    best = _choose_mad_candidate(
         tree,
         tips,
         node_index_by_id,
         effective_subtree_masks,
         all_subtree_masks,
         all_tips_by_name,
-        tree_index,
-        objective_data,
-        use_float_arithmetic,
+        _mad_tree_index(all_nodes, node_index_by_id),
+        exact=exact,
     )
     return _finish_mad_rooting(
         tree,
@@ -1353,66 +2234,164 @@ def mad_rooting(tree):
     )
 
 
-def _collect_leaf_distance_stats(tree):
-    # For each node, store (leaf_count, sum_dist_to_leaves, sumsq_dist_to_leaves).
-    subtree_stats = dict()
-    for node in tree.traverse(strategy="postorder"):
-        if node.is_leaf:
-            subtree_stats[node] = (1, 0.0, 0.0)
-            continue
-        leaf_count = 0
-        sum_dist = 0.0
-        sumsq_dist = 0.0
-        for child in node.get_children():
-            child_count, child_sum, child_sumsq = subtree_stats[child]
-            edge_length = float(child.dist) if (child.dist is not None) else 0.0
-            leaf_count += child_count
-            sum_dist += child_sum + (child_count * edge_length)
-            sumsq_dist += (
-                child_sumsq
-                + (2.0 * edge_length * child_sum)
-                + (child_count * edge_length * edge_length)
-            )
-        subtree_stats[node] = (leaf_count, sum_dist, sumsq_dist)
-    all_stats = {tree: subtree_stats[tree]}
-    for node in tree.traverse(strategy="preorder"):
-        parent_count, parent_sum, parent_sumsq = all_stats[node]
-        for child in node.get_children():
-            child_count, child_sum, child_sumsq = subtree_stats[child]
-            edge_length = float(child.dist) if (child.dist is not None) else 0.0
-            child_sum_from_parent = child_sum + (child_count * edge_length)
-            child_sumsq_from_parent = (
-                child_sumsq
-                + (2.0 * edge_length * child_sum)
-                + (child_count * edge_length * edge_length)
-            )
-            outside_count = parent_count - child_count
-            outside_sum_from_parent = parent_sum - child_sum_from_parent
-            outside_sumsq_from_parent = parent_sumsq - child_sumsq_from_parent
-            outside_sum_from_child = outside_sum_from_parent + (
-                outside_count * edge_length
-            )
-            outside_sumsq_from_child = (
-                outside_sumsq_from_parent
-                + (2.0 * edge_length * outside_sum_from_parent)
-                + (outside_count * edge_length * edge_length)
-            )
-            all_stats[child] = (
-                parent_count,
-                child_sum + outside_sum_from_child,
-                child_sumsq + outside_sumsq_from_child,
-            )
-    return subtree_stats, all_stats
+def mad_rooting(tree):
+    """Root a tree by minimal ancestor deviation (Tria et al. 2017)."""
+    return _mad_rooting(tree)
 
 
-def mv_rooting(tree):
+def _collect_leaf_distance_stats(tree_arrays):
+    """Return subtree and all-leaf distance stats of every preorder node.
+
+    Each is a ``(leaf_count, sum_dist, sumsq_dist)`` tuple of arrays over the
+    distances from a node to the leaves below it, or to all leaves. Subtree
+    sums are differences of prefix sums in the preorder leaf order, and the
+    all-leaf sums add up how each branch changes them from the root down.
+    """
+    parent = tree_arrays["parent"]
+    lengths = tree_arrays["lengths"]
+    is_leaf = tree_arrays["is_leaf"]
+    root_distances = tree_arrays["root_distances"]
+    starts = np.arange(len(parent))
+    ends = tree_arrays["subtree_end"]
+
+    def subtree_totals(values):
+        prefix = np.concatenate((np.zeros(1, dtype=values.dtype), np.cumsum(values)))
+        return prefix[ends] - prefix[starts]
+
+    leaf_root_distances = np.where(is_leaf, root_distances, 0.0)
+    leaf_counts = subtree_totals(is_leaf.astype(np.int64))
+    first_moments = subtree_totals(leaf_root_distances)
+    second_moments = subtree_totals(leaf_root_distances * leaf_root_distances)
+    subtree_sum = first_moments - (leaf_counts * root_distances)
+    subtree_sumsq = (
+        second_moments
+        - (2.0 * root_distances * first_moments)
+        + (leaf_counts * root_distances * root_distances)
+    )
+    # A leaf is at distance 0 from itself; keep that exact.
+    subtree_sum[is_leaf] = 0.0
+    subtree_sumsq[is_leaf] = 0.0
+
+    leaf_count = int(leaf_counts[0])
+    parent_of = parent.copy()
+    parent_of[0] = 0
+    # Crossing a branch of length L moves every leaf below it L closer and
+    # every other leaf L farther.
+    all_sum = subtree_sum[0] + _preorder_path_sums(
+        parent, lengths * (leaf_count - (2 * leaf_counts))
+    )
+    sum_from_parent = subtree_sum + (leaf_counts * lengths)
+    all_sumsq = subtree_sumsq[0] + _preorder_path_sums(
+        parent,
+        lengths
+        * (
+            (2.0 * (all_sum[parent_of] - (2.0 * sum_from_parent)))
+            + (leaf_count * lengths)
+        ),
+    )
+    all_counts = np.full(len(parent), leaf_count, dtype=np.int64)
+    return (leaf_counts, subtree_sum, subtree_sumsq), (all_counts, all_sum, all_sumsq)
+
+
+def _mv_dissolved_root_child(tree_arrays):
+    """Return the root child whose branch MV rooting merges into its sibling's.
+
+    Like the node-based unrooting, this is the first internal child of a
+    bifurcating root, so that each branch is an edge of the unrooted tree.
+    """
+    root_children = np.flatnonzero(tree_arrays["parent"] == 0).tolist()
+    if len(root_children) != 2:
+        return None
+    for child in root_children:
+        if not tree_arrays["is_leaf"][child]:
+            return child
+    return None
+
+
+def _choose_mv_edge(tree_arrays, dissolved_child=None):
+    """Return ``(node, x, variance)`` of the MV root, or None without an edge.
+
+    ``x`` is the root position above ``node`` in scaled branch lengths. The
+    branch of ``dissolved_child`` is merged into its sibling's. Variances
+    that agree with the smallest one to rounding are ties, which go to the
+    first edge in level order as they did in the node-based loop.
+    """
+    (subtree_count, subtree_sum, subtree_sumsq), (all_count, all_sum, all_sumsq) = (
+        _collect_leaf_distance_stats(tree_arrays)
+    )
+    lengths = tree_arrays["lengths"].copy()
+    candidates = tree_arrays["parent"] >= 0
+    if dissolved_child is not None:
+        root_children = np.flatnonzero(tree_arrays["parent"] == 0)
+        kept_child = root_children[root_children != dissolved_child][0]
+        lengths[kept_child] += lengths[dissolved_child]
+        candidates[dissolved_child] = False
+    other_count = all_count - subtree_count
+    candidates &= (subtree_count > 0) & (other_count > 0)
+    if not candidates.any():
+        return None
+    with np.errstate(divide="ignore", invalid="ignore"):
+        other_sum = all_sum - subtree_sum
+        other_sumsq = all_sumsq - subtree_sumsq
+        mean_a = subtree_sum / subtree_count
+        mean_b = (other_sum / other_count) - lengths
+        # Optimal root position x from node toward parent, constrained to [0, L]
+        x = np.clip((lengths + mean_b - mean_a) / 2.0, 0.0, lengths)
+        total_sum = all_sum + ((subtree_count - other_count) * x)
+        total_sumsq = (
+            subtree_sumsq
+            + (2.0 * x * subtree_sum)
+            + (subtree_count * x * x)
+            + other_sumsq
+            - (2.0 * x * other_sum)
+            + (other_count * x * x)
+        )
+        second_moment = total_sumsq / all_count
+        mean = total_sum / all_count
+        variance = second_moment - (mean * mean)
+    variance[(variance < 0) & (variance > -(10**-12))] = 0.0
+    variance[~candidates] = np.inf
+    best = int(np.argmin(variance))
+    tolerance = _REROOT_ARRAY_TIE_RTOL * max(1.0, float(second_moment[best]))
+    tied = np.flatnonzero(variance <= variance[best] + tolerance)
+    if len(tied) > 1:
+        best = _first_in_level_order(tree_arrays, tied, dissolved_child)
+    return best, float(x[best]), float(variance[best])
+
+
+def _report_mv_variance(variance, branch_length_scale):
+    reported_var = variance * branch_length_scale
+    reported_var *= branch_length_scale
+    sys.stderr.write("MV rooting variance: {:.6g}\n".format(reported_var))
+
+
+def mv_rooting(tree):
     """Minimum Variance rooting. Mai, Saeedian & Mirarab 2017, DOI:10.1371/journal.pone.0182238"""
-    tree = copy_tree_iteratively(tree)
     validate_unique_named_leaves(
         tree,
         option_name="--infile",
         context=" for MV rooting",
     )
+    tree_arrays = _reroot_tree_arrays(tree, "MV")
+    if tree_arrays["has_single_child_nodes"]:
+        return _mv_rooting_by_node(tree)
+    dissolved_child = _mv_dissolved_root_child(tree_arrays)
+    best = _choose_mv_edge(tree_arrays, dissolved_child)
+    if best is None:
+        return _rerooted_tree_copy(tree_arrays, 0)
+    best_node, best_x, best_var = best
+    branch_length_scale = tree_arrays["branch_length_scale"]
+    _report_mv_variance(best_var, branch_length_scale)
+    return _rerooted_tree_copy(
+        tree_arrays,
+        best_node,
+        outgroup_length=best_x * branch_length_scale,
+        dissolved_child=dissolved_child,
+    )
+
+
+def _mv_rooting_by_node(tree):
+    tree = copy_tree_iteratively(tree)
     annotation_backup = _prepare_annotations_for_reroot(tree)
     branch_length_scale = _normalize_reroot_branch_lengths(tree, "MV")
     # ete4.set_outgroup requires root.dist to be 0/None.
@@ -1430,54 +2409,20 @@ def mv_rooting(tree):
             for gc in list(to_dissolve.get_children()):
                 tree.add_child(gc)
             tree.remove_child(to_dissolve)
-    subtree_stats, all_stats = _collect_leaf_distance_stats(tree)
-    total_leaf_count = subtree_stats[tree][0]
-    best_var = float("inf")
-    best_node = None
-    best_x = 0.0
-    best_L = 0.0
-    for node in tree.traverse():
-        if node.is_root:
-            continue
-        L = float(node.dist) if (node.dist is not None) else 0.0
-        subtree_leaf_count, subtree_sum, subtree_sumsq = subtree_stats[node]
-        all_leaf_count, all_sum, all_sumsq = all_stats[node]
-        other_leaf_count = all_leaf_count - subtree_leaf_count
-        if (subtree_leaf_count == 0) or (other_leaf_count == 0):
-            continue
-        other_sum = all_sum - subtree_sum
-        other_sumsq = all_sumsq - subtree_sumsq
-        mean_a = subtree_sum / subtree_leaf_count
-        mean_b = (other_sum / other_leaf_count) - L
-        # Optimal root position x from node toward parent, constrained to [0, L]
-        x = (L + mean_b - mean_a) / 2.0
-        x = max(0.0, min(float(L), x))
-        # Root-to-tip distance variance at this x (computed from sums and sums of squares).
-        total_sum = all_sum + ((subtree_leaf_count - other_leaf_count) * x)
-        total_sumsq = (
-            subtree_sumsq
-            + (2.0 * x * subtree_sum)
-            + (subtree_leaf_count * x * x)
-            + other_sumsq
-            - (2.0 * x * other_sum)
-            + (other_leaf_count * x * x)
-        )
-        mean = total_sum / total_leaf_count
-        var = (total_sumsq / total_leaf_count) - (mean * mean)
-        if (var < 0) and (abs(var) < 10**-12):
-            var = 0.0
-        if var < best_var:
-            best_var = var
-            best_node = node
-            best_x = x
-            best_L = L
-    if best_node is None:
+    tree_arrays = _reroot_tree_arrays(tree, "MV")
+    best = _choose_mv_edge(tree_arrays)
+    if best is None:
         _restore_reroot_branch_length_scale(tree, branch_length_scale)
         _finish_annotations_after_reroot(tree, annotation_backup)
         return tree
-    reported_var = best_var * branch_length_scale
-    reported_var *= branch_length_scale
-    sys.stderr.write("MV rooting variance: {:.6g}\n".format(reported_var))
+    best_index, best_x, best_var = best
+    best_node = tree_arrays["nodes"][best_index]
+    # Merging the dissolved branch can lengthen the longest one, which the
+    # arrays rescale to 1 again.
+    array_scale = tree_arrays["branch_length_scale"]
+    best_x *= array_scale
+    best_L = tree_arrays["lengths"][best_index] * array_scale
+    _report_mv_variance(best_var * array_scale * array_scale, branch_length_scale)
     tree.set_outgroup(best_node)
     # Adjust branch lengths at root: best_x from root to best_node, (L - best_x) to sibling
     best_subtree_leaves = set(best_node.leaf_names())
@@ -1918,10 +2863,7 @@ def _get_timetree_name_mapping(tree, args=None):
     return query_names, query_label_to_species_labels, species_to_leaf_labels
 
 
-def _build_timetree_reference_tree(tree, args=None):
-    query_names, query_label_to_species_labels, species_to_leaf_labels = (
-        _get_timetree_name_mapping(tree, args=args)
-    )
+def _fetch_timetree_newick(query_names):
     session = _new_taxonomy_http_session()
     try:
         try:
@@ -1952,35 +2894,49 @@ def _build_timetree_reference_tree(tree, args=None):
             raise ValueError(
                 "Unexpected response format from TimeTree when downloading the guide tree."
             )
-        timetree_tree = Tree(timetree_newick, parser=1)
-        resolved_leaf_set, unresolved_leaf_set = _resolve_reference_query_sets(
-            timetree_tree,
-            query_label_to_species_labels,
-            species_to_leaf_labels,
-            source_name="TimeTree",
-        )
-        query_outgroup_set = _get_reference_root_outgroup_set(
-            timetree_tree, source_name="TimeTree"
-        )
-        if len(query_outgroup_set) == 0:
-            raise ValueError(
-                "TimeTree-derived root is ambiguous: failed to identify a root bipartition."
-            )
-        return (
-            _expand_query_label_set(
-                query_outgroup_set,
-                query_label_to_species_labels,
-                species_to_leaf_labels,
-            ),
-            resolved_leaf_set,
-            unresolved_leaf_set,
-        )
+        return timetree_newick
     finally:
         close = getattr(session, "close", None)
         if callable(close):
             close()
 
 
+def _build_timetree_reference_tree(tree, args=None):
+    query_names, query_label_to_species_labels, species_to_leaf_labels = (
+        _get_timetree_name_mapping(tree, args=args)
+    )
+    name_set = tuple(sorted(query_names))
+    timetree_newick = cached_taxonomy_lookups(
+        "timetree-prune",
+        [name_set],
+        lambda name_sets: {names: _fetch_timetree_newick(names) for names in name_sets},
+        args=args,
+    )[name_set]
+    timetree_tree = Tree(timetree_newick, parser=1)
+    resolved_leaf_set, unresolved_leaf_set = _resolve_reference_query_sets(
+        timetree_tree,
+        query_label_to_species_labels,
+        species_to_leaf_labels,
+        source_name="TimeTree",
+    )
+    query_outgroup_set = _get_reference_root_outgroup_set(
+        timetree_tree, source_name="TimeTree"
+    )
+    if len(query_outgroup_set) == 0:
+        raise ValueError(
+            "TimeTree-derived root is ambiguous: failed to identify a root bipartition."
+        )
+    return (
+        _expand_query_label_set(
+            query_outgroup_set,
+            query_label_to_species_labels,
+            species_to_leaf_labels,
+        ),
+        resolved_leaf_set,
+        unresolved_leaf_set,
+    )
+
+
 def _get_opentree_name_mapping(tree, args=None):
     _, species_to_leaf_labels, species_label_to_taxonomy_query = (
         get_species_group_records(
@@ -1996,10 +2952,8 @@ def _get_opentree_name_mapping(tree, args=None):
     return query_names, query_label_to_species_labels, species_to_leaf_labels
 
 
-def _extract_opentree_ott_ids(tree, args=None):
-    query_names, query_label_to_species_labels, species_to_leaf_labels = (
-        _get_opentree_name_mapping(tree, args=args)
-    )
+def _match_opentree_names(query_names):
+    """Return the exact OTT id of each name, or None when it is unresolved."""
     session = _new_taxonomy_http_session()
     try:
         try:
@@ -2023,8 +2977,7 @@ def _extract_opentree_ott_ids(tree, args=None):
             raise ValueError("Unexpected response format from Open Tree of Life TNRS.")
         if len(results) != len(query_names):
             raise ValueError("Unexpected response format from Open Tree of Life TNRS.")
-        ott_ids = list()
-        unresolved_labels = list()
+        ott_id_by_name: dict[str, int | None] = dict()
         for query_name, result in zip(query_names, results, strict=True):
             if not isinstance(result, dict):
                 raise ValueError(
@@ -2049,30 +3002,41 @@ def _extract_opentree_ott_ids(tree, args=None):
                 if taxon.get("ott_id") is None:
                     continue
                 valid_matches.append(match)
-            if len(valid_matches) == 0:
-                unresolved_labels.append(query_name.replace(" ", "_"))
-                continue
             if len(valid_matches) != 1:
-                unresolved_labels.append(query_name.replace(" ", "_"))
+                ott_id_by_name[query_name] = None
                 continue
-            ott_ids.append(int(valid_matches[0]["taxon"]["ott_id"]))
-        if len(ott_ids) == 0:
-            raise ValueError(
-                "Failed to resolve a usable OpenTree taxon for any leaf label: {}".format(
-                    "; ".join(unresolved_labels)
-                )
-            )
-        return ott_ids, query_label_to_species_labels, species_to_leaf_labels
+            ott_id_by_name[query_name] = int(valid_matches[0]["taxon"]["ott_id"])
+        return ott_id_by_name
     finally:
         close = getattr(session, "close", None)
         if callable(close):
             close()
 
 
-def _build_opentree_reference_tree(tree, args=None):
-    ott_ids, query_label_to_species_labels, species_to_leaf_labels = (
-        _extract_opentree_ott_ids(tree, args=args)
+def _extract_opentree_ott_ids(tree, args=None):
+    query_names, query_label_to_species_labels, species_to_leaf_labels = (
+        _get_opentree_name_mapping(tree, args=args)
+    )
+    ott_id_by_name = cached_taxonomy_lookups(
+        "opentree-tnrs", query_names, _match_opentree_names, args=args
     )
+    ott_ids = list()
+    unresolved_labels = list()
+    for query_name in query_names:
+        if ott_id_by_name[query_name] is None:
+            unresolved_labels.append(query_name.replace(" ", "_"))
+            continue
+        ott_ids.append(ott_id_by_name[query_name])
+    if len(ott_ids) == 0:
+        raise ValueError(
+            "Failed to resolve a usable OpenTree taxon for any leaf label: {}".format(
+                "; ".join(unresolved_labels)
+            )
+        )
+    return ott_ids, query_label_to_species_labels, species_to_leaf_labels
+
+
+def _fetch_opentree_induced_subtree(ott_ids):
     session = _new_taxonomy_http_session()
     try:
         try:
@@ -2103,38 +3067,54 @@ def _build_opentree_reference_tree(tree, args=None):
             raise ValueError(
                 "Unexpected response format from Open Tree of Life induced subtree."
             )
-        opentree_tree = Tree(newick, parser=1)
-        opentree_tree = remove_singleton(
-            opentree_tree, verbose=False, preserve_branch_length=True
-        )
-        resolved_leaf_set, unresolved_leaf_set = _resolve_reference_query_sets(
-            opentree_tree,
-            query_label_to_species_labels,
-            species_to_leaf_labels,
-            source_name="OpenTree",
-        )
-        query_outgroup_set = _get_reference_root_outgroup_set(
-            opentree_tree, source_name="OpenTree"
-        )
-        if len(query_outgroup_set) == 0:
-            raise ValueError(
-                "OpenTree-derived root is ambiguous: failed to identify a root bipartition."
-            )
-        return (
-            _expand_query_label_set(
-                query_outgroup_set,
-                query_label_to_species_labels,
-                species_to_leaf_labels,
-            ),
-            resolved_leaf_set,
-            unresolved_leaf_set,
-        )
+        return newick
     finally:
         close = getattr(session, "close", None)
         if callable(close):
             close()
 
 
+def _build_opentree_reference_tree(tree, args=None):
+    ott_ids, query_label_to_species_labels, species_to_leaf_labels = (
+        _extract_opentree_ott_ids(tree, args=args)
+    )
+    ott_id_set = tuple(sorted(set(ott_ids)))
+    newick = cached_taxonomy_lookups(
+        "opentree-induced-subtree",
+        [ott_id_set],
+        lambda id_sets: {
+            ids: _fetch_opentree_induced_subtree(list(ids)) for ids in id_sets
+        },
+        args=args,
+    )[ott_id_set]
+    opentree_tree = Tree(newick, parser=1)
+    opentree_tree = remove_singleton(
+        opentree_tree, verbose=False, preserve_branch_length=True
+    )
+    resolved_leaf_set, unresolved_leaf_set = _resolve_reference_query_sets(
+        opentree_tree,
+        query_label_to_species_labels,
+        species_to_leaf_labels,
+        source_name="OpenTree",
+    )
+    query_outgroup_set = _get_reference_root_outgroup_set(
+        opentree_tree, source_name="OpenTree"
+    )
+    if len(query_outgroup_set) == 0:
+        raise ValueError(
+            "OpenTree-derived root is ambiguous: failed to identify a root bipartition."
+        )
+    return (
+        _expand_query_label_set(
+            query_outgroup_set,
+            query_label_to_species_labels,
+            species_to_leaf_labels,
+        ),
+        resolved_leaf_set,
+        unresolved_leaf_set,
+    )
+
+
 def taxonomy_rooting(
     tree,
     taxonomy_source=DEFAULT_TAXONOMY_SOURCE_CHAIN,
@@ -2227,6 +3207,154 @@ class _ReconciliationRootingMessage:
     nearest_gene_leaf_name: str
 
 
+def _reconciliation_rooting_combiner(species_lca):
+    """Return a function that joins two subtree messages at a gene-tree node.
+
+    The joined message carries the LCA-reconciliation event of the new node
+    on top of the duplications and losses of both subtrees.
+    """
+    species_depth = species_lca.depth
+    species_ancestors = species_lca.ancestors
+
+    def common_ancestor_index(index1, index2):
+        if species_depth[index1] < species_depth[index2]:
+            index1, index2 = index2, index1
+        depth_difference = species_depth[index1] - species_depth[index2]
+        level = 0
+        while depth_difference:
+            if depth_difference & 1:
+                index1 = species_ancestors[level][index1]
+            depth_difference >>= 1
+            level += 1
+        if index1 == index2:
+            return index1
+        for ancestors in reversed(species_ancestors):
+            ancestor1 = ancestors[index1]
+            ancestor2 = ancestors[index2]
+            if ancestor1 != ancestor2:
+                index1 = ancestor1
+                index2 = ancestor2
+        return species_ancestors[0][index1]
+
+    def combine(message1, message2):
+        species_index1 = message1.species_index
+        species_index2 = message2.species_index
+        mapped_species_index = common_ancestor_index(species_index1, species_index2)
+        event_duplications = int(
+            species_index1 == mapped_species_index
+            or species_index2 == mapped_species_index
+        )
+        event_losses = (
+            species_depth[species_index1]
+            + species_depth[species_index2]
+            - 2 * species_depth[mapped_species_index]
+            - (0 if event_duplications else 2)
+        )
+        nearest_distance, nearest_name = min(
+            (message1.nearest_gene_leaf_distance, message1.nearest_gene_leaf_name),
+            (message2.nearest_gene_leaf_distance, message2.nearest_gene_leaf_name),
+        )
+        return _ReconciliationRootingMessage(
+            species_index=mapped_species_index,
+            duplications=event_duplications
+            + message1.duplications
+            + message2.duplications,
+            losses=event_losses + message1.losses + message2.losses,
+            gene_leaf_count=message1.gene_leaf_count + message2.gene_leaf_count,
+            nearest_gene_leaf_distance=nearest_distance + 1,
+            nearest_gene_leaf_name=nearest_name,
+        )
+
+    return combine
+
+
+def _reconciliation_rooting_messages(adjacency, anchor, leaf_message, combine):
+    """Return the subtree messages on both sides of every gene-tree edge.
+
+    This is a two-pass rerooting dynamic program over the unrooted topology
+    hung from the leaf ``anchor``. Nodes are numbered breadth-first, so
+    ``parents[index] < index``. The postorder pass builds ``down[index]`` for
+    the side of the parent edge that contains node ``index``; the preorder
+    pass builds ``up[index]`` for the opposite side from the parent's ``up``
+    and the sibling's ``down``. Every message costs one species-tree LCA
+    query, so all edges are scored in linear time.
+    """
+    nodes = [anchor]
+    parents = [-1]
+    children: list[list[int]] = [[]]
+    for index, node in enumerate(nodes):
+        parent = nodes[parents[index]] if index else None
+        for neighbor in adjacency[node]:
+            if neighbor is parent:
+                continue
+            children[index].append(len(nodes))
+            nodes.append(neighbor)
+            parents.append(index)
+            children.append([])
+    down: list[Any] = [None] * len(nodes)
+    for index in range(len(nodes) - 1, 0, -1):
+        if children[index]:
+            child1, child2 = children[index]
+            down[index] = combine(down[child1], down[child2])
+        else:
+            down[index] = leaf_message(nodes[index])
+    up: list[Any] = [None] * len(nodes)
+    up[children[0][0]] = leaf_message(anchor)
+    for index in range(1, len(nodes)):
+        if children[index]:
+            child1, child2 = children[index]
+            up[child1] = combine(up[index], down[child2])
+            up[child2] = combine(up[index], down[child1])
+    return nodes, parents, down, up
+
+
+def _reconciliation_rooting_edge_costs(
+    adjacency,
+    gene_leaves,
+    normalized_mapping,
+    species_leaf_by_name,
+    species_lca,
+):
+    """Yield ``(left, right, left_message, right_message, root_message)`` per edge.
+
+    ``root_message`` holds the total duplications and losses of the gene tree
+    rooted on the edge between ``left`` and ``right``.
+    """
+    species_index_by_name = {
+        name: species_lca.index_by_node[node]
+        for name, node in species_leaf_by_name.items()
+    }
+
+    def leaf_message(node):
+        gene_name = str(node.name)
+        species_name = normalized_mapping.get(gene_name)
+        if species_name is None or species_name == "":
+            raise ValueError(
+                "Gene tip '{}' has no resolved species mapping.".format(gene_name)
+            )
+        return _ReconciliationRootingMessage(
+            species_index=species_index_by_name[species_name],
+            duplications=0,
+            losses=0,
+            gene_leaf_count=1,
+            nearest_gene_leaf_distance=0,
+            nearest_gene_leaf_name=gene_name,
+        )
+
+    combine = _reconciliation_rooting_combiner(species_lca)
+    nodes, parents, down, up = _reconciliation_rooting_messages(
+        adjacency, gene_leaves[0], leaf_message, combine
+    )
+    for index in range(1, len(nodes)):
+        yield (
+            nodes[parents[index]],
+            nodes[index],
+            up[index],
+            down[index],
+            combine(up[index], down[index]),
+        )
+
+
 def _reconciliation_rooting_graph(tree):
     """Return the physical unrooted graph represented by an ETE tree."""
     validate_unique_named_leaves(
@@ -2351,12 +3479,14 @@ def reconciliation_rooting(
     species_label_by_gene_leaf,
     duplication_cost=1.0,
     loss_cost=1.0,
+    species_lca=None,
 ):
     """Root a gene tree by minimizing weighted LCA-reconciliation D/L cost.
 
-    Every physical edge of the unrooted gene topology is evaluated with a
-    linear number of directed component messages and indexed species-tree LCA
-    queries.
+    Every physical edge of the unrooted gene topology is scored by one
+    rerooting dynamic program over directed subtree messages, so the work is
+    linear in the gene-tree size times the cost of a species-tree LCA query. A ``species_lca`` already built for the validated
+    ``species_tree`` is reused instead of being rebuilt for each gene tree.
     """
     from nwkit.clade_index import LcaIndex
     from nwkit.reconcile import _validate_rooted_binary_tree
@@ -2366,7 +3496,8 @@ def reconciliation_rooting(
         loss_cost,
     )
 
-    _validate_rooted_binary_tree(species_tree, "--species-tree")
+    if species_lca is None:
+        _validate_rooted_binary_tree(species_tree, "--species-tree")
     analysis_tree, adjacency = _reconciliation_rooting_graph(tree)
     (
         gene_leaves,
@@ -2379,115 +3510,8 @@ def reconciliation_rooting(
         species_label_by_gene_leaf,
     )
 
-    species_lca = LcaIndex(species_tree)
-    species_index_by_name = {
-        name: species_lca.index_by_node[node]
-        for name, node in species_leaf_by_name.items()
-    }
-    species_depth = species_lca.depth
-    species_ancestors = species_lca.ancestors
-
-    def common_ancestor_index(index1, index2):
-        if species_depth[index1] < species_depth[index2]:
-            index1, index2 = index2, index1
-        depth_difference = species_depth[index1] - species_depth[index2]
-        level = 0
-        while depth_difference:
-            if depth_difference & 1:
-                index1 = species_ancestors[level][index1]
-            depth_difference >>= 1
-            level += 1
-        if index1 == index2:
-            return index1
-        for ancestors in reversed(species_ancestors):
-            ancestor1 = ancestors[index1]
-            ancestor2 = ancestors[index2]
-            if ancestor1 != ancestor2:
-                index1 = ancestor1
-                index2 = ancestor2
-        return species_ancestors[0][index1]
-
-    messages: dict[tuple[Any, Any], _ReconciliationRootingMessage] = dict()
-
-    def build_message(source, target):
-        if target.is_leaf:
-            gene_name = str(target.name)
-            species_name = normalized_mapping.get(gene_name)
-            if species_name is None or species_name == "":
-                raise ValueError(
-                    "Gene tip '{}' has no resolved species mapping.".format(gene_name)
-                )
-            return _ReconciliationRootingMessage(
-                species_index=species_index_by_name[species_name],
-                duplications=0,
-                losses=0,
-                gene_leaf_count=1,
-                nearest_gene_leaf_distance=0,
-                nearest_gene_leaf_name=gene_name,
-            )
-
-        neighbors = adjacency[target]
-        if neighbors[0] is source:
-            child1, child2 = neighbors[1], neighbors[2]
-        elif neighbors[1] is source:
-            child1, child2 = neighbors[0], neighbors[2]
-        else:
-            child1, child2 = neighbors[0], neighbors[1]
-        message1 = messages[(target, child1)]
-        message2 = messages[(target, child2)]
-        species_index1 = message1.species_index
-        species_index2 = message2.species_index
-        mapped_species_index = common_ancestor_index(species_index1, species_index2)
-        event_duplications = int(
-            species_index1 == mapped_species_index
-            or species_index2 == mapped_species_index
-        )
-        event_losses = (
-            species_depth[species_index1]
-            + species_depth[species_index2]
-            - 2 * species_depth[mapped_species_index]
-            - (0 if event_duplications else 2)
-        )
-        nearest1 = (
-            message1.nearest_gene_leaf_distance,
-            message1.nearest_gene_leaf_name,
-        )
-        nearest2 = (
-            message2.nearest_gene_leaf_distance,
-            message2.nearest_gene_leaf_name,
-        )
-        nearest_distance, nearest_name = min(nearest1, nearest2)
-        return _ReconciliationRootingMessage(
-            species_index=mapped_species_index,
-            duplications=event_duplications
-            + message1.duplications
-            + message2.duplications,
-            losses=event_losses + message1.losses + message2.losses,
-            gene_leaf_count=message1.gene_leaf_count + message2.gene_leaf_count,
-            nearest_gene_leaf_distance=nearest_distance + 1,
-            nearest_gene_leaf_name=nearest_name,
-        )
-
-    anchor = gene_leaves[0]
-    parent: dict[Any, Any | None] = {anchor: None}
-    traversal_order: list[Any] = list()
-    stack = [anchor]
-    while stack:
-        node = stack.pop()
-        traversal_order.append(node)
-        for neighbor in adjacency[node]:
-            if neighbor is parent[node]:
-                continue
-            parent[neighbor] = node
-            stack.append(neighbor)
-
-    for target in reversed(traversal_order[1:]):
-        source = parent[target]
-        messages[(source, target)] = build_message(source, target)
-    for child in traversal_order[1:]:
-        target = parent[child]
-        messages[(child, target)] = build_message(child, target)
-
+    if species_lca is None:
+        species_lca = LcaIndex(species_tree)
     score_denominator, duplication_score_unit, loss_score_unit = (
         _integer_reconciliation_score_units(weight_fractions)
     )
@@ -2500,31 +3524,22 @@ def reconciliation_rooting(
     )
     tied_best_count = 0
     candidate_count = 0
-    for right in traversal_order[1:]:
-        left = parent[right]
+    for (
+        left,
+        right,
+        left_message,
+        right_message,
+        root_message,
+    ) in _reconciliation_rooting_edge_costs(
+        adjacency,
+        gene_leaves,
+        normalized_mapping,
+        species_leaf_by_name,
+        species_lca,
+    ):
         candidate_count += 1
-        left_message = messages[(right, left)]
-        right_message = messages[(left, right)]
-        left_species_index = left_message.species_index
-        right_species_index = right_message.species_index
-        mapped_species_index = common_ancestor_index(
-            left_species_index,
-            right_species_index,
-        )
-        root_duplications = int(
-            left_species_index == mapped_species_index
-            or right_species_index == mapped_species_index
-        )
-        root_losses = (
-            species_depth[left_species_index]
-            + species_depth[right_species_index]
-            - 2 * species_depth[mapped_species_index]
-            - (0 if root_duplications else 2)
-        )
-        duplications = (
-            left_message.duplications + right_message.duplications + root_duplications
-        )
-        losses = left_message.losses + right_message.losses + root_losses
+        duplications = root_message.duplications
+        losses = root_message.losses
         score_numerator = (
             duplications * duplication_score_unit + losses * loss_score_unit
         )
@@ -2621,25 +3636,31 @@ def reconciliation_rooting(
     return _root_by_outgroup_set(output_tree, outgroup_names, verbose=False)
 
 
-def root_main(args):
-    if args.method == "reconciliation":
-        if getattr(args, "species_tree", None) in (None, ""):
-            raise ValueError(
-                "'--species-tree' is required when '--method reconciliation' is used."
-            )
-        outputs = [("--outfile", args.outfile)]
-        validate_distinct_output_paths(outputs)
-        validate_outputs_do_not_replace_inputs(
-            [
-                ("--infile", args.infile),
-                ("--species-tree", args.species_tree),
-                ("--species-map-tsv", getattr(args, "species_map_tsv", None)),
-            ],
-            outputs,
-            label="Rooted tree output",
-        )
-    tree = read_tree(args.infile, args.format, args.quoted_node_names)
-    output_properties = set(get_tree_property_names(tree))
+def _validate_root_outputs(args):
+    if args.method != "reconciliation":
+        return
+    if getattr(args, "species_tree", None) in (None, ""):
+        raise ValueError(
+            "'--species-tree' is required when '--method reconciliation' is used."
+        )
+    outputs = [("--outfile", args.outfile)]
+    validate_distinct_output_paths(outputs)
+    validate_outputs_do_not_replace_inputs(
+        [
+            ("--infile", args.infile),
+            ("--species-tree", args.species_tree),
+            ("--species-map-tsv", getattr(args, "species_map_tsv", None)),
+        ],
+        outputs,
+        label="Rooted tree output",
+    )
+
+
+def _prepare_root_reference(args):
+    """Read and validate the reference input of ``--method`` once.
+
+    The returned state is shared by every tree of a multi-tree ``--infile``.
+    """
     if args.method == "transfer":
         if args.infile2 in ["", None]:
             raise ValueError(
@@ -2654,59 +3675,212 @@ def root_main(args):
             raise ValueError(
                 "'--infile2' root must have exactly two children for '--method transfer'."
             )
-        validate_unique_named_leaves(
-            tree, option_name="--infile", context=" for root transfer"
-        )
         validate_unique_named_leaves(
             tree2, option_name="--infile2", context=" for root transfer"
         )
-        taxon_mode = getattr(args, "taxon_mode", "exact")
-        if taxon_mode == "exact" and not is_all_leaf_names_identical(
-            tree, tree2, verbose=True
-        ):
-            raise ValueError("Leaf labels must match exactly when --taxon-mode exact.")
-        if (len(list(tree.leaves())) > 1) and (len(list(tree2.leaves())) > 1):
-            tree = transfer_root_with_taxon_mode(
-                tree_to=tree,
-                tree_from=tree2,
-                taxon_mode=taxon_mode,
-                verbose=True,
-            )
-    elif args.method == "midpoint":
-        tree = midpoint_rooting(tree=tree)
-    elif args.method == "outgroup":
-        tree = outgroup_rooting(tree=tree, outgroup_str=args.outgroup)
-    elif args.method == "mad":
-        tree = mad_rooting(tree=tree)
-    elif args.method == "mv":
-        tree = mv_rooting(tree=tree)
-    elif args.method == "reconciliation":
-        from nwkit.reconcile import _parsed_species_labels
+        return {"tree2": tree2}
+    if args.method == "reconciliation":
+        from nwkit.clade_index import LcaIndex
+        from nwkit.reconcile import _validate_rooted_binary_tree
 
         species_tree = read_tree(
             args.species_tree,
             getattr(args, "species_tree_format", "auto"),
             args.quoted_node_names,
         )
-        tree = reconciliation_rooting(
+        _validate_rooted_binary_tree(species_tree, "--species-tree")
+        return {"species_tree": species_tree, "species_lca": LcaIndex(species_tree)}
+    if args.method not in ROOT_METHODS:
+        raise ValueError("Unknown rooting method: {}".format(args.method))
+    return {}
+
+
+def _transfer_root_from_reference(tree, args, tree2):
+    validate_unique_named_leaves(
+        tree, option_name="--infile", context=" for root transfer"
+    )
+    taxon_mode = getattr(args, "taxon_mode", "exact")
+    if taxon_mode == "exact" and not is_all_leaf_names_identical(
+        tree, tree2, verbose=True
+    ):
+        raise ValueError("Leaf labels must match exactly when --taxon-mode exact.")
+    if (len(list(tree.leaves())) > 1) and (len(list(tree2.leaves())) > 1):
+        tree = transfer_root_with_taxon_mode(
+            tree_to=tree,
+            tree_from=tree2,
+            taxon_mode=taxon_mode,
+            verbose=True,
+        )
+    return tree
+
+
+def _root_tree(tree, args, reference):
+    """Root one input tree with ``--method`` and its prepared ``reference``."""
+    if args.method == "transfer":
+        return _transfer_root_from_reference(tree, args, reference["tree2"])
+    if args.method == "midpoint":
+        return midpoint_rooting(tree=tree)
+    if args.method == "outgroup":
+        return outgroup_rooting(tree=tree, outgroup_str=args.outgroup)
+    if args.method == "mad":
+        return mad_rooting(tree=tree)
+    if args.method == "mv":
+        return mv_rooting(tree=tree)
+    if args.method == "reconciliation":
+        from nwkit.reconcile import _parsed_species_labels
+
+        return reconciliation_rooting(
             tree,
-            species_tree,
+            reference["species_tree"],
             _parsed_species_labels(tree, args),
             duplication_cost=getattr(args, "duplication_cost", 1.0),
             loss_cost=getattr(args, "loss_cost", 1.0),
+            species_lca=reference["species_lca"],
         )
-    elif args.method == "taxonomy":
-        tree = taxonomy_rooting(
-            tree=tree,
-            taxonomy_source=getattr(
-                args, "taxonomy_source", DEFAULT_TAXONOMY_SOURCE_CHAIN
-            ),
-            taxid_tsv=getattr(args, "taxid_tsv", None),
-            rank=getattr(args, "rank", "no"),
-            verbose=True,
-            args=args,
+    return taxonomy_rooting(
+        tree=tree,
+        taxonomy_source=getattr(args, "taxonomy_source", DEFAULT_TAXONOMY_SOURCE_CHAIN),
+        taxid_tsv=getattr(args, "taxid_tsv", None),
+        rank=getattr(args, "rank", "no"),
+        verbose=True,
+        args=args,
+    )
+
+
+def _root_tree_string(tree_string, args, reference):
+    """Return one rooted tree of a collection as a Newick string."""
+    tree = read_tree(tree_string, args.format, args.quoted_node_names, quiet=True)
+    output_properties = set(get_tree_property_names(tree))
+    tree = _root_tree(tree, args, reference)
+    output_properties.update(get_tree_property_names(tree))
+    tree_args = copy.copy(args)
+    tree_args.outfile = io.StringIO()
+    write_tree(
+        tree, tree_args, format=args.outformat, quiet=True, props=output_properties
+    )
+    return tree_args.outfile.getvalue()
+
+
+def _initialize_root_collection_worker(args):
+    # NCBI taxonomy handles and HTTP sessions are opened once per worker.
+    enabled_caches = [
+        cache
+        for cache in (SHARED_NCBITAXA, RESIDENT_HTTP_SESSIONS)
+        if not cache.enabled
+    ]
+    for cache in enabled_caches:
+        cache.enable()
+    _root_collection_state.clear()
+    _root_collection_state.update(
+        args=args,
+        reference=_prepare_root_reference(args),
+        enabled_caches=enabled_caches,
+    )
+
+
+def _finish_root_collection_worker():
+    for cache in _root_collection_state.get("enabled_caches", []):
+        cache.disable()
+    _root_collection_state.clear()
+
+
+def _root_tree_string_chunk(tree_strings):
+    return [
+        _root_tree_string(
+            tree_string,
+            _root_collection_state["args"],
+            _root_collection_state["reference"],
         )
-    else:
-        raise ValueError("Unknown rooting method: {}".format(args.method))
+        for tree_string in tree_strings
+    ]
+
+
+def _iter_rooted_collection(tree_strings, args, threads):
+    """Yield the rooted trees of ``tree_strings`` as Newick strings in input order.
+
+    With more than one thread, chunks of trees are rooted by worker processes
+    that each prepare the reference input once; finished chunks wait until
+    every earlier chunk has been yielded.
+    """
+    chunks: Iterator[Any] = iter(
+        lambda: list(islice(tree_strings, ROOT_COLLECTION_CHUNK_SIZE)), []
+    )
+    if threads == 1:
+        _initialize_root_collection_worker(args)
+        try:
+            for chunk in chunks:
+                yield from _root_tree_string_chunk(chunk)
+        finally:
+            _finish_root_collection_worker()
+        return
+    executor_kwargs: dict[str, Any] = {
+        "max_workers": threads,
+        "initializer": _initialize_root_collection_worker,
+        "initargs": (args,),
+    }
+    process_pool_context = get_process_pool_context()
+    if process_pool_context is not None:
+        executor_kwargs["mp_context"] = process_pool_context
+    with ProcessPoolExecutor(**executor_kwargs) as executor:
+        futures: dict[Any, int] = {}
+        finished_chunks: dict[int, list[str]] = {}
+        num_submitted = 0
+        num_yielded = 0
+        chunks_exhausted = False
+        while futures or not chunks_exhausted:
+            while (
+                len(futures) + len(finished_chunks) < threads * 2
+                and not chunks_exhausted
+            ):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    chunks_exhausted = True
+                    break
+                futures[executor.submit(_root_tree_string_chunk, chunk)] = num_submitted
+                num_submitted += 1
+            if not futures:
+                continue
+            completed, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in completed:
+                finished_chunks[futures.pop(future)] = future.result()
+            while num_yielded in finished_chunks:
+                yield from finished_chunks.pop(num_yielded)
+                num_yielded += 1
+
+
+def _write_rooted_collection(tree_strings, args, threads):
+    handle = sys.stdout if args.outfile == "-" else open_output_text(args.outfile)
+    num_trees = 0
+    try:
+        for tree_string in _iter_rooted_collection(tree_strings, args, threads):
+            handle.write(tree_string + "\n")
+            num_trees += 1
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+    sys.stderr.write("Number of rooted trees = {:,}\n".format(num_trees))
+
+
+def root_main(args):
+    _validate_root_outputs(args)
+    threads = validate_threads(getattr(args, "threads", 1))
+    tree_strings = iter(iter_tree_strings(args.infile))
+    try:
+        first_tree_strings = list(islice(tree_strings, 2))
+    except ValueError:
+        if args.infile == "-":
+            raise
+        # Let read_tree report why the single input tree cannot be parsed.
+        first_tree_strings = list()
+    if len(first_tree_strings) == 2:
+        _write_rooted_collection(chain(first_tree_strings, tree_strings), args, threads)
+        return
+    tree = read_tree(
+        args.infile if args.infile != "-" else "".join(first_tree_strings),
+        args.format,
+        args.quoted_node_names,
+    )
+    output_properties = set(get_tree_property_names(tree))
+    tree = _root_tree(tree, args, _prepare_root_reference(args))
     output_properties.update(get_tree_property_names(tree))
     write_tree(tree, args, format=args.outformat, props=output_properties)
@@ -0,0 +1,208 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import time
+
+from nwkit.batch import (
+    RESIDENT_CACHES,
+    disable_resident_caches,
+    enable_resident_caches,
+    run_captured_command,
+)
+
+SERVE_OPERATIONS = ("run", "stats", "shutdown")
+
+
+def _memory_usage():
+    usage: dict[str, int | None] = {"rss_bytes": None, "max_rss_bytes": None}
+    try:
+        with open("/proc/self/statm") as handle:
+            usage["rss_bytes"] = int(handle.read().split()[1]) * os.sysconf(
+                "SC_PAGE_SIZE"
+            )
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return usage
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    usage["max_rss_bytes"] = max_rss * (1 if sys.platform == "darwin" else 1024)
+    return usage
+
+
+def resident_cache_stats():
+    return {name: cache.stats() for name, cache in RESIDENT_CACHES.items()}
+
+
+def _parse_run_request(request):
+    argv = request.get("argv")
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        raise ValueError('"argv" must be a list of strings.')
+    stdin_text = request.get("stdin")
+    if stdin_text is not None and not isinstance(stdin_text, str):
+        raise ValueError('"stdin" must be a string.')
+    return argv, stdin_text
+
+
+class _ServeRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        assert isinstance(server, NwkitServer)
+        for line in self.rfile:
+            if line.strip() == b"":
+                continue
+            response = server.respond(line)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            if server.stopping:
+                break
+
+
+class NwkitServer(socketserver.UnixStreamServer):
+    """Unix-socket server answering JSON-lines requests with nwkit commands.
+
+    Requests are handled one at a time in this process, so the resident caches
+    filled by one command serve the next.
+    """
+
+    def __init__(self, socket_path):
+        self.started = time.perf_counter()
+        self.num_requests = 0
+        self.num_failed = 0
+        self.total_seconds = 0.0
+        self.stopping = False
+        super().__init__(socket_path, _ServeRequestHandler)
+
+    def server_bind(self):
+        # Anyone who can connect can run commands as this user.
+        previous_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous_umask)
+
+    def respond(self, line):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Each request must be a JSON object.")
+            operation = request.get("op", "run")
+            if operation not in SERVE_OPERATIONS:
+                raise ValueError(
+                    '"op" must be one of: {}.'.format(", ".join(SERVE_OPERATIONS))
+                )
+        except ValueError as exc:
+            return {"id": None, "ok": False, "error": "Invalid request: {}".format(exc)}
+        response = {"id": request.get("id"), "op": operation, "ok": True}
+        if operation == "run":
+            try:
+                argv, stdin_text = _parse_run_request(request)
+            except ValueError as exc:
+                response.update(ok=False, error="Invalid request: {}".format(exc))
+                return response
+            response.update(self.run(argv, stdin_text))
+        elif operation == "stats":
+            response.update(self.stats())
+        else:
+            self.stopping = True
+        return response
+
+    def run(self, argv, stdin_text=None):
+        exit_status, elapsed, error, stdout, stderr = run_captured_command(
+            argv, stdin_text=stdin_text, allow_stdout=True
+        )
+        self.num_requests += 1
+        self.num_failed += int(exit_status != 0)
+        self.total_seconds += elapsed
+        return {
+            "ok": exit_status == 0,
+            "exit_status": exit_status,
+            "elapsed_seconds": elapsed,
+            "error": error,
+            "stdout": stdout,
+            "stderr": stderr,
+            "caches": resident_cache_stats(),
+            "memory": _memory_usage(),
+        }
+
+    def stats(self):
+        return {
+            "requests": self.num_requests,
+            "failed": self.num_failed,
+            "uptime_seconds": time.perf_counter() - self.started,
+            "total_command_seconds": self.total_seconds,
+            "mean_command_seconds": (
+                self.total_seconds / self.num_requests if self.num_requests else None
+            ),
+            "caches": resident_cache_stats(),
+            "memory": _memory_usage(),
+        }
+
+    def serve_until_shutdown(self):
+        while not self.stopping:
+            self.handle_request()
+
+
+def _remove_stale_socket(socket_path):
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError("--socket exists and is not a socket: {}".format(socket_path))
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.remove(socket_path)
+        return
+    finally:
+        probe.close()
+    raise ValueError("Another server is listening on --socket: {}".format(socket_path))
+
+
+def send_serve_requests(socket_path, requests, timeout=None):
+    """Send requests to a running ``nwkit serve`` and return its responses in order.
+
+    This is a plain-socket client for notebooks, workflow engines, and tests.
+    """
+    responses = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        with client.makefile("rwb") as stream:
+            for request in requests:
+                stream.write(json.dumps(request).encode("utf-8") + b"\n")
+                stream.flush()
+                line = stream.readline()
+                if line == b"":
+                    raise ConnectionError("nwkit serve closed the connection.")
+                responses.append(json.loads(line))
+    return responses
+
+
+def serve_main(args):
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError("nwkit serve requires Unix domain sockets.")
+    socket_path = os.path.abspath(args.socket)
+    _remove_stale_socket(socket_path)
+    enable_resident_caches()
+    try:
+        with NwkitServer(socket_path) as server:
+            sys.stderr.write("nwkit serve: listening on {}\n".format(socket_path))
+            try:
+                server.serve_until_shutdown()
+            finally:
+                if os.path.exists(socket_path):
+                    os.remove(socket_path)
+    finally:
+        disable_resident_caches()
+    sys.stderr.write(
+        "nwkit serve: stopped after {:,} requests, {:,} failed\n".format(
+            server.num_requests, server.num_failed
+        )
+    )
@@ -3,6 +3,7 @@ import sys
 
 import ete4
 
+from nwkit.rf import robinson_foulds
 from nwkit.util import copy_tree_iteratively, is_rooted, read_tree, write_tree
 
 
@@ -12,7 +13,7 @@ def get_shuffled_branch_lengths(nodes):
     return branch_lengths
 
 
-def print_rf_dist(tree1, tree2):
+def print_rf_dist(tree1, tree2, engine="linear"):
     leaf_names1 = list(tree1.leaf_names())
     leaf_names2 = list(tree2.leaf_names())
     all_leaf_names = leaf_names1 + leaf_names2
@@ -29,16 +30,7 @@ def print_rf_dist(tree1, tree2):
         )
         return
     use_unrooted_rf = (not is_rooted(tree1)) or (not is_rooted(tree2))
-    out = tree1.robinson_foulds(t2=tree2, unrooted_trees=use_unrooted_rf)
-    (
-        rf,
-        rf_max,
-        common_attrs,
-        edges_t1,
-        edges_t2,
-        discarded_edges_t1,
-        discarded_edges_t2,
-    ) = out
+    rf, rf_max = robinson_foulds(tree1, tree2, unrooted=use_unrooted_rf, engine=engine)
     sys.stderr.write(
         "Robinson-Foulds distance = {:,} (max = {:,})\n".format(rf, rf_max)
     )
@@ -82,7 +74,11 @@ def shuffle_main(args):
             random.shuffle(leaf_names)
             for leaf, new_name in zip(leaf_nodes, leaf_names, strict=True):
                 leaf.name = new_name
-        print_rf_dist(tree1=tree_original, tree2=tree)
+        print_rf_dist(
+            tree1=tree_original,
+            tree2=tree,
+            engine=getattr(args, "rf_engine", "linear"),
+        )
         write_tree(tree, args, format=args.outformat)
     finally:
         if random_state is not None:
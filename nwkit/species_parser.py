@@ -1,13 +1,18 @@
 import csv
+import os
 import re
 import sys
 from dataclasses import dataclass
 
+from nwkit.resident import ResidentCache
+
 DEFAULT_SPECIES_REGEX = r"^([^_]+_[^_]+)(?:_|$)"
 DEFAULT_SPECIES_PARSER = "legacy"
 SUPPORTED_SPECIES_PARSERS = ("legacy", "taxonomic")
 TAXONOMIC_SPECIES_SUFFIX_TOKENS = {"cf", "aff", "nr"}
 GENUS_ONLY_PLACEHOLDER_TOKENS = {"sp", "sp.", "spp", "spp."}
+# Compiled parsers kept by long-lived batch/serve processes.
+SHARED_SPECIES_PARSERS = ResidentCache()
 TAXONOMIC_RANK_ALIASES = {
     "subsp": "subsp",
     "ssp": "subsp",
@@ -121,7 +126,9 @@ def _extract_species_label_with_regex(label, species_pattern):
 def read_species_map_tsv(species_map_tsv):
     if species_map_tsv in ["", None]:
         return dict()
-    handle = sys.stdin if species_map_tsv == "-" else open(species_map_tsv, newline="")
+    from nwkit.util import open_input_text
+
+    handle = open_input_text(species_map_tsv, newline="")
     try:
         reader = csv.DictReader(handle, delimiter="\t")
         fieldnames = reader.fieldnames or list()
@@ -265,6 +272,25 @@ class SpeciesParser:
         return self._apply_overrides(label=label, parsed_species=parsed_species)
 
 
+def _get_shared_species_parser(cache_key):
+    preset, species_regex, species_map_tsv = cache_key
+
+    def build_parser():
+        return SpeciesParser(
+            preset=preset, species_regex=species_regex, species_map_tsv=species_map_tsv
+        )
+
+    if (not SHARED_SPECIES_PARSERS.enabled) or (species_map_tsv == "-"):
+        return build_parser()
+    try:
+        map_mtime_ns = (
+            None if species_map_tsv is None else os.stat(species_map_tsv).st_mtime_ns
+        )
+    except OSError:
+        return build_parser()  # SpeciesParser reports the unreadable map.
+    return SHARED_SPECIES_PARSERS.get(cache_key + (map_mtime_ns,), build_parser)
+
+
 def get_species_parser(
     args=None, species_parser=None, species_regex=None, species_map_tsv=None
 ):
@@ -283,11 +309,7 @@ def get_species_parser(
         cached_parser = getattr(args, "_nwkit_species_parser_cache", None)
         if (cached_key == cache_key) and (cached_parser is not None):
             return cached_parser
-        parser = SpeciesParser(
-            preset=cache_key[0],
-            species_regex=cache_key[1],
-            species_map_tsv=cache_key[2],
-        )
+        parser = _get_shared_species_parser(cache_key)
         args._nwkit_species_parser_cache_key = cache_key
         args._nwkit_species_parser_cache = parser
         return parser
@@ -0,0 +1,437 @@
+"""Fixed-width leaf bitsets and split tables.
+
+``LeafBitsets`` stores the descendant leaves of every node of a tree as a row
+of uint64 words, built with vectorized ORs instead of Python integers, for
+trees with at least ``WIDE_SPLIT_MIN_LEAVES`` leaves. In a ``SplitTable``, each split is stored as a row of little-endian uint64 words holding its leaf
+bitmask, keyed by a 128-bit fingerprint of those words. Tables are merged by
+sorting fingerprints, and every group is checked against its exact words, so
+a fingerprint collision can never merge two different splits.
+"""
+
+from typing import Any
+
+import numpy as np
+
+from nwkit.quantile_sketch import WeightedQuantileSketch
+
+_WORD_DTYPE = np.dtype("<u8")
+_FINGERPRINT_SEEDS = (0x9E3779B97F4A7C15, 0xD1B54A32D192ED03)
+# Below this many leaves, Python integer masks are as fast as word rows.
+WIDE_SPLIT_MIN_LEAVES = 1024
+# np.bitwise_count needs NumPy 2.0; older releases look up bytes instead.
+_BYTE_BIT_COUNTS = np.asarray([bin(byte).count("1") for byte in range(256)], np.uint8)
+
+
+def num_mask_words(num_leaves):
+    return max(1, -(-int(num_leaves) // 64))
+
+
+def _word_row_bit_counts(words):
+    """Return the number of set bits in each row of a uint64 word array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    row_bytes = np.ascontiguousarray(words, dtype=_WORD_DTYPE).view(np.uint8)
+    return _BYTE_BIT_COUNTS[row_bytes].sum(axis=1, dtype=np.int64)
+
+
+def masks_to_words(masks, num_words):
+    """Return an ``(len(masks), num_words)`` uint64 array of integer bitmasks."""
+    num_bytes = num_words * 8
+    buffer = b"".join(int(mask).to_bytes(num_bytes, "little") for mask in masks)
+    return np.frombuffer(buffer, dtype=_WORD_DTYPE).reshape(len(masks), num_words)
+
+
+def words_to_masks(words):
+    """Return the integer bitmasks of the rows of a uint64 word array."""
+    words = np.ascontiguousarray(words, dtype=_WORD_DTYPE)
+    num_bytes = words.shape[1] * 8
+    buffer = words.tobytes()
+    return [
+        int.from_bytes(buffer[start : start + num_bytes], "little")
+        for start in range(0, len(buffer), num_bytes)
+    ]
+
+
+def _preorder_subtree_ends(parent):
+    """Return the preorder index just past the subtree of every node."""
+    sizes = [1] * len(parent)
+    parent_list = parent.tolist()
+    for index in range(len(parent_list) - 1, 0, -1):
+        sizes[parent_list[index]] += sizes[index]
+    return np.arange(len(parent_list)) + np.asarray(sizes, dtype=np.intp)
+
+
+class LeafBitsets:
+    """Descendant-leaf bitsets of preorder nodes, one uint64 word row per node.
+
+    Bit ``b`` of a row lives in word ``b // 64`` at position ``b % 64``, so a
+    row read as little-endian bytes is the matching Python integer mask.
+    """
+
+    __slots__ = ("words", "num_leaves")
+
+    def __init__(self, words, num_leaves):
+        self.words = words
+        self.num_leaves = num_leaves
+
+    def __len__(self):
+        return self.words.shape[0]
+
+    @classmethod
+    def from_parents(cls, parent, leaf_bits, num_leaves):
+        """Build bitsets from preorder ``parent`` indices (-1 for the root).
+
+        ``leaf_bits`` holds the bit of every node that sets one and -1
+        elsewhere. A subtree is a contiguous preorder range and distinct
+        leaves set distinct bits, so the OR over a subtree equals the XOR of
+        two rows of a running XOR over the preorder leaf bits.
+        """
+        parent = np.asarray(parent, dtype=np.intp)
+        leaf_bits = np.asarray(leaf_bits, dtype=np.intp)
+        prefix = np.zeros(
+            (len(parent) + 1, num_mask_words(num_leaves)), dtype=_WORD_DTYPE
+        )
+        leaves = np.flatnonzero(leaf_bits >= 0)
+        bits = leaf_bits[leaves]
+        prefix[leaves + 1, bits // 64] = np.left_shift(
+            np.uint64(1), (bits % 64).astype(np.uint64)
+        )
+        np.bitwise_xor.accumulate(prefix, axis=0, out=prefix)
+        words = prefix[_preorder_subtree_ends(parent)]
+        words ^= prefix[:-1]
+        return cls(words, num_leaves)
+
+    @classmethod
+    def from_ete(cls, tree, leaf_name_to_bit, missing_leaf_bit=None):
+        """Return ``(nodes, bitsets)`` for an ETE tree in preorder.
+
+        Leaves missing from ``leaf_name_to_bit`` raise ``ValueError`` unless
+        ``missing_leaf_bit`` is given; -1 leaves them without a bit.
+        """
+        nodes = list(tree.traverse(strategy="preorder"))
+        position_by_node = {node: position for position, node in enumerate(nodes)}
+        parent = [-1] + [position_by_node[node.up] for node in nodes[1:]]
+        leaf_bits = []
+        for node in nodes:
+            if not node.is_leaf:
+                leaf_bits.append(-1)
+            elif node.name in leaf_name_to_bit:
+                leaf_bits.append(leaf_name_to_bit[node.name])
+            elif missing_leaf_bit is not None:
+                leaf_bits.append(missing_leaf_bit)
+            else:
+                raise ValueError(
+                    "Leaf label not found in reference mapping: {}".format(node.name)
+                )
+        return nodes, cls.from_parents(parent, leaf_bits, len(leaf_name_to_bit))
+
+    def counts(self):
+        """Return the number of leaves below every node."""
+        return _word_row_bit_counts(self.words)
+
+    def contains_bit(self, bit):
+        return ((self.words[:, bit // 64] >> np.uint64(bit % 64)) & np.uint64(1)) == 1
+
+    def all_words(self):
+        """Return the word row with every leaf bit set."""
+        return masks_to_words([(1 << self.num_leaves) - 1], self.words.shape[1])[0]
+
+    def masks(self):
+        return words_to_masks(self.words)
+
+
+def _mix64(values):
+    # SplitMix64 finalizer; uint64 arithmetic wraps modulo 2**64.
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def split_fingerprints(words):
+    """Return an ``(n, 2)`` uint64 array of 128-bit fingerprints of word rows."""
+    columns = np.arange(1, words.shape[1] + 1, dtype=np.uint64)
+    mixed = _mix64(words ^ (columns * np.uint64(_FINGERPRINT_SEEDS[0])))
+    fingerprints = np.empty((words.shape[0], 2), dtype=np.uint64)
+    fingerprints[:, 0] = _mix64(mixed.sum(axis=1, dtype=np.uint64))
+    # Odd multipliers keep the second lane a different function of each word.
+    multipliers = (columns * np.uint64(_FINGERPRINT_SEEDS[1])) | np.uint64(1)
+    fingerprints[:, 1] = _mix64((mixed * multipliers).sum(axis=1, dtype=np.uint64))
+    return fingerprints
+
+
+def _group_rows(fingerprints, words):
+    """Return ``(first_rows, inverse)`` grouping rows with identical words."""
+    order = np.lexsort((fingerprints[:, 1], fingerprints[:, 0]))
+    sorted_fingerprints = fingerprints[order]
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = np.any(sorted_fingerprints[1:] != sorted_fingerprints[:-1], axis=1)
+    group_of_sorted = np.cumsum(starts) - 1
+    first_rows = order[starts]
+    # Only rows that repeat an earlier fingerprint need their words checked.
+    repeats = np.flatnonzero(~starts)
+    if not np.array_equal(
+        words[order[repeats]], words[first_rows[group_of_sorted[repeats]]]
+    ):
+        # Two different splits share a fingerprint; group by the words instead.
+        _, first_rows, inverse = np.unique(
+            words, axis=0, return_index=True, return_inverse=True
+        )
+        return first_rows, inverse.reshape(-1)
+    inverse = np.empty(len(order), dtype=np.intp)
+    inverse[order] = group_of_sorted
+    return first_rows, inverse
+
+
+def unique_split_words(words, fingerprints=None):
+    """Return ``(unique_words, fingerprints, inverse)`` for rows of split words."""
+    if fingerprints is None:
+        fingerprints = split_fingerprints(words)
+    first_rows, inverse = _group_rows(fingerprints, words)
+    return words[first_rows], fingerprints[first_rows], inverse
+
+
+class SplitTable:
+    """Unique splits with summed weights and optional branch-length records.
+
+    ``means`` holds weight-averaged values per split. ``observation_rows``
+    and ``observation_values`` hold individual ``(value, weight)`` records,
+    with NaN for a missing value, that point at rows of the table.
+    ``sketches`` instead holds one ``WeightedQuantileSketch`` per row.
+    """
+
+    __slots__ = (
+        "words",
+        "fingerprints",
+        "weights",
+        "means",
+        "observation_rows",
+        "observation_values",
+        "sketches",
+    )
+
+    def __init__(
+        self,
+        words,
+        weights,
+        means=None,
+        observation_rows=None,
+        observation_values=None,
+        fingerprints=None,
+        sketches=None,
+    ):
+        self.words = words
+        self.fingerprints = (
+            split_fingerprints(words) if fingerprints is None else fingerprints
+        )
+        self.weights = weights
+        self.means = means
+        self.observation_rows = observation_rows
+        self.observation_values = observation_values
+        self.sketches = sketches
+
+    def __len__(self):
+        return self.words.shape[0]
+
+    @classmethod
+    def from_weights(cls, weight_by_mask, num_words):
+        return cls(
+            words=masks_to_words(weight_by_mask.keys(), num_words),
+            weights=np.fromiter(weight_by_mask.values(), dtype=np.float64),
+        )
+
+    @classmethod
+    def from_means(cls, mean_by_mask, num_words):
+        """Build a table from ``mask -> (mean, weight)`` records."""
+        records = np.array(list(mean_by_mask.values()), dtype=np.float64)
+        records = records.reshape(len(mean_by_mask), 2)
+        return cls(
+            words=masks_to_words(mean_by_mask.keys(), num_words),
+            weights=records[:, 1].copy(),
+            means=records[:, 0].copy(),
+        )
+
+    @classmethod
+    def from_observations(cls, observations_by_mask, num_words):
+        """Build a table from ``mask -> [(value or None, weight), ...]`` records."""
+        rows = []
+        values = []
+        for row, records in enumerate(observations_by_mask.values()):
+            for value, weight in records:
+                rows.append(row)
+                values.append((np.nan if value is None else value, weight))
+        return cls(
+            words=masks_to_words(observations_by_mask.keys(), num_words),
+            weights=np.zeros(len(observations_by_mask), dtype=np.float64),
+            observation_rows=np.asarray(rows, dtype=np.intp),
+            observation_values=np.asarray(values, dtype=np.float64).reshape(-1, 2),
+        )
+
+    @classmethod
+    def from_sketches(cls, sketch_by_mask, num_words):
+        return cls(
+            words=masks_to_words(sketch_by_mask.keys(), num_words),
+            weights=np.zeros(len(sketch_by_mask), dtype=np.float64),
+            sketches=list(sketch_by_mask.values()),
+        )
+
+    def weight_by_mask(self):
+        return dict(zip(words_to_masks(self.words), self.weights.tolist(), strict=True))
+
+    def mean_by_mask(self):
+        records = [
+            (0.0, 0.0) if weight == 0.0 else (mean, weight)
+            for mean, weight in zip(
+                self.means.tolist(), self.weights.tolist(), strict=True
+            )
+        ]
+        return dict(zip(words_to_masks(self.words), records, strict=True))
+
+    def sketch_by_mask(self):
+        return dict(zip(words_to_masks(self.words), self.sketches, strict=True))
+
+    def observations_by_mask(self):
+        order = np.argsort(self.observation_rows, kind="stable")
+        rows = self.observation_rows[order]
+        values = self.observation_values[order].tolist()
+        bounds = np.searchsorted(rows, np.arange(len(self) + 1)).tolist()
+        out = dict()
+        for row, mask in enumerate(words_to_masks(self.words)):
+            out[mask] = [
+                (None if value != value else value, weight)
+                for value, weight in values[bounds[row] : bounds[row + 1]]
+            ]
+        return out
+
+
+def _merged_sketches(tables, inverse, num_groups, quantile_error):
+    """Fold the sketches and observation records of tables into group sketches.
+
+    Sketches of the input tables are merged in place.
+    """
+    sketches: list[Any] = [None] * num_groups
+    start = 0
+    for table in tables:
+        groups = inverse[start : start + len(table)]
+        start += len(table)
+        if table.sketches is not None:
+            for group, sketch in zip(groups.tolist(), table.sketches, strict=True):
+                if sketches[group] is None:
+                    sketches[group] = sketch
+                else:
+                    sketches[group].merge(sketch)
+            continue
+        rows = groups[table.observation_rows]
+        if len(rows) == 0:
+            continue
+        order = np.argsort(rows, kind="stable")
+        rows = rows[order]
+        values = table.observation_values[order]
+        bounds = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1], True]).tolist()
+        for bound_start, bound_end in zip(bounds[:-1], bounds[1:], strict=True):
+            group = int(rows[bound_start])
+            if sketches[group] is None:
+                sketches[group] = WeightedQuantileSketch(quantile_error)
+            sketches[group].extend_arrays(
+                values[bound_start:bound_end, 0], values[bound_start:bound_end, 1]
+            )
+    return [
+        WeightedQuantileSketch(quantile_error) if sketch is None else sketch
+        for sketch in sketches
+    ]
+
+
+def merge_split_tables(tables, quantile_error=None):
+    """Merge split tables into one table with a single row per split.
+
+    With ``quantile_error``, observation records and sketches are folded into
+    one ``WeightedQuantileSketch`` per split.
+    """
+    tables = list(tables)
+    words = np.concatenate([table.words for table in tables])
+    fingerprints = np.concatenate([table.fingerprints for table in tables])
+    weights = np.concatenate([table.weights for table in tables])
+    first_rows, inverse = _group_rows(fingerprints, words)
+    num_groups = len(first_rows)
+    merged_weights = np.bincount(inverse, weights=weights, minlength=num_groups)
+    merged_means = None
+    if tables[0].means is not None:
+        means = np.concatenate([table.means for table in tables])
+        # Scale each weight by its group total before summing so that means
+        # near the float maximum cannot overflow.
+        group_weights = merged_weights[inverse]
+        fractions = np.divide(
+            weights,
+            group_weights,
+            out=np.zeros_like(weights),
+            where=(group_weights != 0.0),
+        )
+        merged_means = np.bincount(
+            inverse, weights=means * fractions, minlength=num_groups
+        )
+    observation_rows = None
+    observation_values = None
+    sketches = None
+    has_records = any(
+        (table.observation_rows is not None) or (table.sketches is not None)
+        for table in tables
+    )
+    if has_records and quantile_error is not None:
+        sketches = _merged_sketches(tables, inverse, num_groups, quantile_error)
+    elif tables[0].observation_rows is not None:
+        offsets = np.cumsum([0] + [len(table) for table in tables[:-1]])
+        observation_rows = inverse[
+            np.concatenate(
+                [
+                    table.observation_rows + offset
+                    for table, offset in zip(tables, offsets.tolist(), strict=True)
+                ]
+            )
+        ]
+        observation_values = np.concatenate(
+            [table.observation_values for table in tables]
+        )
+    return SplitTable(
+        words=words[first_rows],
+        weights=merged_weights,
+        means=merged_means,
+        observation_rows=observation_rows,
+        observation_values=observation_values,
+        fingerprints=fingerprints[first_rows],
+        sketches=sketches,
+    )
+
+
+class SplitTableAccumulator:
+    """Collect split tables and merge them once pending rows outgrow the total.
+
+    Merging only when the pending rows reach the size of the merged table
+    keeps the total merge work proportional to the rows received. With
+    ``quantile_error``, each merge folds branch-length records into sketches.
+    """
+
+    def __init__(self, quantile_error=None):
+        self.quantile_error = quantile_error
+        self.merged = None
+        self.pending = []
+        self.num_pending_rows = 0
+
+    def add(self, table):
+        self.pending.append(table)
+        self.num_pending_rows += len(table)
+        merged_rows = 0 if self.merged is None else len(self.merged)
+        if self.num_pending_rows >= merged_rows:
+            self._merge_pending()
+
+    def _merge_pending(self):
+        tables = self.pending if self.merged is None else [self.merged] + self.pending
+        self.merged = merge_split_tables(tables, self.quantile_error)
+        self.pending = []
+        self.num_pending_rows = 0
+
+    def result(self):
+        """Return the merged table, or None if no table was added."""
+        if self.pending:
+            self._merge_pending()
+        return self.merged
@@ -9,14 +9,18 @@ from nwkit.util import (
     MISSING_SUPPORT_VALUE,
     TREE_FORMAT_PROP,
     is_missing_table_value,
+    open_input_text,
     write_tree,
 )
 
 
 def _read_table(path):
-    if path == "-":
-        return pd.read_csv(sys.stdin, sep="\t", dtype=object, keep_default_na=False)
-    return pd.read_csv(path, sep="\t", dtype=object, keep_default_na=False)
+    handle = open_input_text(path)
+    try:
+        return pd.read_csv(handle, sep="\t", dtype=object, keep_default_na=False)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
 
 
 def _is_empty(value):
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import math
+import os
+import tempfile
+import time
+
+from nwkit.util import (
+    _taxonomy_cache_max_age_seconds,
+    acquire_exclusive_lock,
+    resolve_download_dir,
+)
+
+TAXONOMY_REFERENCE_CACHE_SUFFIX = ".json"
+_TAXONOMY_REFERENCE_CACHE_FORMAT_VERSION = 1
+
+
+def resolve_taxonomy_reference_cache_dir(args=None):
+    """Return the cache directory, or None when no download directory is set."""
+    download_dir = resolve_download_dir(args)
+    if download_dir is None:
+        return None
+    return os.path.join(download_dir, "nwkit", "taxonomy-reference-cache")
+
+
+def taxonomy_reference_cache_key(kind, query):
+    """Return the content address of one lookup of ``query`` from ``kind``."""
+    payload = json.dumps(
+        [_TAXONOMY_REFERENCE_CACHE_FORMAT_VERSION, kind, query],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_path(cache_dir, kind, key):
+    return os.path.join(cache_dir, kind, key[:2], key + TAXONOMY_REFERENCE_CACHE_SUFFIX)
+
+
+def _normalized_query(query):
+    # Tuples and lists are stored alike, so compare queries after a JSON round trip.
+    return json.loads(json.dumps(query))
+
+
+def load_taxonomy_reference_entry(cache_dir, kind, query, max_age_seconds):
+    """Return ``(True, value)`` for a fresh entry, or ``(False, None)`` on a miss."""
+    path = _entry_path(cache_dir, kind, taxonomy_reference_cache_key(kind, query))
+    try:
+        with open(path) as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return False, None
+    if not isinstance(payload, dict):
+        return False, None
+    if payload.get("version") != _TAXONOMY_REFERENCE_CACHE_FORMAT_VERSION:
+        return False, None
+    if payload.get("kind") != kind or payload.get("query") != _normalized_query(query):
+        return False, None
+    cached_at = payload.get("cached_at")
+    if not isinstance(cached_at, (int, float)):
+        return False, None
+    age_seconds = time.time() - cached_at
+    if not (math.isfinite(age_seconds) and age_seconds < max_age_seconds):
+        return False, None
+    return True, payload.get("value")
+
+
+def store_taxonomy_reference_entry(cache_dir, kind, query, value):
+    """Atomically write the looked-up ``value`` of ``query`` from ``kind``."""
+    path = _entry_path(cache_dir, kind, taxonomy_reference_cache_key(kind, query))
+    payload = {
+        "version": _TAXONOMY_REFERENCE_CACHE_FORMAT_VERSION,
+        "kind": kind,
+        "query": query,
+        "cached_at": time.time(),
+        "value": value,
+    }
+    temporary = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temporary = tempfile.mkstemp(
+            prefix=".{}.".format(os.path.basename(path)), dir=os.path.dirname(path)
+        )
+        with os.fdopen(fd, "w") as handle:
+            json.dump(payload, handle, sort_keys=True)
+        os.replace(temporary, path)
+    except OSError:
+        # The cache is an optimization; an unwritable directory only costs speed.
+        return
+    finally:
+        if temporary is not None and os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def cached_taxonomy_lookups(kind, queries, fetch, args=None):
+    """Return ``{query: value}``, calling ``fetch`` only for uncached queries.
+
+    ``queries`` are JSON-serializable and hashable. ``fetch`` receives the
+    missing queries in first-seen order and returns a value for each of them.
+    Entries older than ``--taxonomy-cache-max-age-days`` are fetched again, and
+    ``--refresh-taxonomy-cache`` ignores every entry. Misses are fetched under
+    an exclusive lock per ``kind``, so concurrent runs look each query up once.
+    """
+    queries = list(dict.fromkeys(queries))
+    if len(queries) == 0:
+        return dict()
+    cache_dir = resolve_taxonomy_reference_cache_dir(args)
+    if cache_dir is None:
+        return dict(fetch(queries))
+    values: dict = {}
+    refresh = bool(getattr(args, "refresh_taxonomy_cache", False))
+    max_age_seconds = _taxonomy_cache_max_age_seconds(args)
+
+    def split_cached(pending):
+        missing = list()
+        for query in pending:
+            found, value = (
+                (False, None)
+                if refresh
+                else load_taxonomy_reference_entry(
+                    cache_dir, kind, query, max_age_seconds
+                )
+            )
+            if found:
+                values[query] = value
+            else:
+                missing.append(query)
+        return missing
+
+    missing = split_cached(queries)
+    if len(missing) == 0:
+        return values
+    lock_path = os.path.join(cache_dir, ".{}.lock".format(kind))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        values.update(fetch(missing))
+        return values
+    with acquire_exclusive_lock(
+        lock_path, lock_label="taxonomy reference cache ({})".format(kind)
+    ):
+        if not refresh:
+            missing = split_cached(missing)
+        if missing:
+            fetched = fetch(missing)
+            for query in missing:
+                store_taxonomy_reference_entry(cache_dir, kind, query, fetched[query])
+                values[query] = fetched[query]
+    return values
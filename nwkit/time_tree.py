@@ -11,7 +11,7 @@ from io import StringIO
 import numpy as np
 import pandas as pd
 
-from nwkit.util import read_input_text
+from nwkit.util import open_input_text, read_input_text
 
 AGE_PROPERTY_NAMES = (
     "age",
@@ -216,7 +216,8 @@ def _read_mcmctree_dataframe(source):
     if is_file:
         if os.path.getsize(source) == 0:
             raise ValueError("MCMCtree posterior file is empty.")
-        table_source = source
+        # pandas picks compression by suffix; this also reads unsuffixed gzip.
+        table_source = open_input_text(source)
     else:
         text = read_input_text(source)
         if text.strip() == "":
@@ -224,8 +225,12 @@ def _read_mcmctree_dataframe(source):
         table_source = StringIO(text)
     try:
         dataframe = pd.read_csv(table_source, sep=r"\s+", comment="#")
+    except pd.errors.EmptyDataError as exc:
+        raise ValueError("MCMCtree posterior file is empty.") from exc
     except Exception as exc:
         raise ValueError("Failed to parse the MCMCtree posterior table.") from exc
+    finally:
+        table_source.close()
     if dataframe.empty:
         raise ValueError("MCMCtree posterior table contains no samples.")
     if dataframe.columns.duplicated().any():
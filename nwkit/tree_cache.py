@@ -0,0 +1,248 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+from nwkit import __version__
+from nwkit.resident import ResidentCache
+
+TREE_CACHE_DIR_ENV = "NWKIT_TREE_CACHE_DIR"
+TREE_CACHE_MAX_MB_ENV = "NWKIT_TREE_CACHE_MAX_MB"
+DEFAULT_TREE_CACHE_MAX_MB = 1024.0
+TREE_CACHE_SUFFIX = ".nwktree"
+DEFAULT_MEMORY_TREE_CACHE_NODES = 2_000_000
+_TREE_CACHE_FORMAT_VERSION = 1
+
+
+class _SafeTreeCacheUnpickler(pickle.Unpickler):
+    """Load cached node properties without resolving globals."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError("Global objects are not allowed in a tree cache.")
+
+
+def resolve_tree_cache_dir(cache_dir=None):
+    """Return the cache directory, or None when the parsed-tree cache is off."""
+    if cache_dir is None:
+        cache_dir = os.environ.get(TREE_CACHE_DIR_ENV, "")
+    cache_dir = str(cache_dir).strip()
+    if cache_dir == "":
+        return None
+    return os.path.realpath(cache_dir)
+
+
+def resolve_tree_cache_max_bytes(max_mb=None):
+    if max_mb is None:
+        max_mb = os.environ.get(TREE_CACHE_MAX_MB_ENV, DEFAULT_TREE_CACHE_MAX_MB)
+    try:
+        value = float(max_mb)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(
+            "{} must be a non-negative number.".format(TREE_CACHE_MAX_MB_ENV)
+        ) from exc
+    if not value >= 0:
+        raise ValueError(
+            "{} must be a non-negative number.".format(TREE_CACHE_MAX_MB_ENV)
+        )
+    return int(value * 1024 * 1024)
+
+
+def _encoded_num_nodes(encoded_trees):
+    return sum(len(parents) for parents, _ in encoded_trees)
+
+
+class MemoryTreeCache(ResidentCache):
+    """In-process tier of the parsed-tree cache for long-lived processes.
+
+    Entries are encoded trees evicted least recently used first once they hold
+    more than ``max_nodes`` nodes in total. The on-disk cache is still used
+    when configured.
+    """
+
+    def __init__(self, max_nodes=DEFAULT_MEMORY_TREE_CACHE_NODES):
+        super().__init__()
+        self.max_nodes = int(max_nodes)
+        self.num_nodes = 0
+
+    def enable(self):
+        super().enable()
+        self.num_nodes = 0
+
+    def load(self, key):
+        if self.entries is None:
+            return None
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries[key] = entry
+        self.hits += 1
+        message, encoded_trees = entry
+        return _decode_trees(encoded_trees, copy_props=True), message
+
+    def store(self, key, message, encoded_trees):
+        if self.entries is None:
+            return
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.num_nodes -= _encoded_num_nodes(previous[1])
+        self.entries[key] = (message, encoded_trees)
+        self.num_nodes += _encoded_num_nodes(encoded_trees)
+        while self.entries and self.num_nodes > self.max_nodes:
+            oldest = next(iter(self.entries))
+            self.num_nodes -= _encoded_num_nodes(self.entries.pop(oldest)[1])
+
+    def stats(self):
+        stats = super().stats()
+        stats["nodes"] = self.num_nodes
+        return stats
+
+
+MEMORY_TREE_CACHE = MemoryTreeCache()
+
+
+def tree_cache_key(kind, text, format, quoted_node_names, allow_non_finite=False):
+    """Return the cache key of parsing ``text``, or None when caching is off."""
+    if (not MEMORY_TREE_CACHE.enabled) and resolve_tree_cache_dir() is None:
+        return None
+    import ete4
+
+    digest = hashlib.sha256()
+    header = (
+        _TREE_CACHE_FORMAT_VERSION,
+        __version__,
+        ete4.__version__,
+        kind,
+        str(format),
+        bool(quoted_node_names),
+        bool(allow_non_finite),
+    )
+    digest.update(repr(header).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(str(text).encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def _encode_tree(tree):
+    nodes = list(tree.traverse(strategy="preorder"))
+    index_by_node = {node: index for index, node in enumerate(nodes)}
+    parents = [-1] + [index_by_node[node.up] for node in nodes[1:]]
+    return parents, [dict(node.props) for node in nodes]
+
+
+def _decode_tree(parents, props):
+    # Node objects are assembled directly: routing every child through
+    # Tree.add_child makes rebuilding slower than parsing the Newick text.
+    from ete4 import Tree
+
+    nodes = []
+    for node_props in props:
+        node = Tree.__new__(Tree)
+        node.props = node_props
+        node._children = []
+        nodes.append(node)
+    for node, parent in zip(nodes[1:], parents[1:], strict=True):
+        parent_node = nodes[parent]
+        node.up = parent_node
+        parent_node._children.append(node)
+    return nodes[0]
+
+
+def _decode_trees(encoded_trees, copy_props):
+    # Decoded trees adopt their props dicts; entries kept in memory are copied.
+    if copy_props:
+        encoded_trees = [
+            (parents, [dict(node_props) for node_props in props])
+            for parents, props in encoded_trees
+        ]
+    return [_decode_tree(parents, props) for parents, props in encoded_trees]
+
+
+def _entry_path(cache_dir, key):
+    return os.path.join(cache_dir, key + TREE_CACHE_SUFFIX)
+
+
+def load_cached_trees(key):
+    """Return ``(trees, message)`` stored under ``key``, or None on a miss."""
+    if key is None:
+        return None
+    cached = MEMORY_TREE_CACHE.load(key)
+    if cached is not None:
+        return cached
+    cache_dir = resolve_tree_cache_dir()
+    if cache_dir is None:
+        return None
+    path = _entry_path(cache_dir, key)
+    try:
+        with open(path, "rb") as handle:
+            version, message, encoded_trees = _SafeTreeCacheUnpickler(handle).load()
+        if version != _TREE_CACHE_FORMAT_VERSION:
+            return None
+        MEMORY_TREE_CACHE.store(key, message, encoded_trees)
+        trees = _decode_trees(encoded_trees, copy_props=MEMORY_TREE_CACHE.enabled)
+        os.utime(path)
+    except (OSError, EOFError, pickle.PickleError, ValueError, TypeError):
+        return None
+    return trees, message
+
+
+def store_cached_trees(key, trees, message=None):
+    """Store parsed trees under ``key`` and evict least recently used entries."""
+    if key is None:
+        return
+    encoded_trees = [_encode_tree(tree) for tree in trees]
+    MEMORY_TREE_CACHE.store(key, message, encoded_trees)
+    cache_dir = resolve_tree_cache_dir()
+    if cache_dir is None:
+        return
+    payload = (_TREE_CACHE_FORMAT_VERSION, message, encoded_trees)
+    temporary = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(prefix=".{}.".format(key), dir=cache_dir)
+        with os.fdopen(fd, "wb") as handle:
+            pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, _entry_path(cache_dir, key))
+        prune_tree_cache(cache_dir, resolve_tree_cache_max_bytes())
+    except OSError:
+        # The cache is an optimization; an unwritable directory only costs speed.
+        return
+    finally:
+        if temporary is not None and os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def list_tree_cache_entries(cache_dir):
+    """Return ``(path, size, last_used)`` for every entry, most recent first."""
+    entries: list[tuple[str, int, float]] = []
+    try:
+        names = os.listdir(cache_dir)
+    except FileNotFoundError:
+        return entries
+    for name in names:
+        if not name.endswith(TREE_CACHE_SUFFIX):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat_result = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((path, stat_result.st_size, stat_result.st_mtime))
+    entries.sort(key=lambda entry: (entry[2], entry[0]), reverse=True)
+    return entries
+
+
+def prune_tree_cache(cache_dir, max_bytes):
+    """Delete least recently used entries until the cache fits ``max_bytes``."""
+    removed: list[tuple[str, int, float]] = []
+    total = 0
+    for path, size, last_used in list_tree_cache_entries(cache_dir):
+        if not removed and total + size <= max_bytes:
+            total += size
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        removed.append((path, size, last_used))
+    return removed
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import mmap
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from nwkit.util import (
+    _is_tree_container_prefix,
+    _NewickRecordScanner,
+    is_compressed_file,
+)
+
+INDEX_SUFFIX = ".idx"
+_INDEX_MAGIC = b"NWKIDX\n"
+_INDEX_VERSION = 1
+_SCAN_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def _record_bounds(buffer, start, end):
+    """Return ``(offset, length)`` of a record without its leading whitespace."""
+    record = buffer[start:end]
+    stripped = record.lstrip()
+    return start + len(record) - len(stripped), len(stripped)
+
+
+def scan_newick_record_spans(buffer, block_size=_SCAN_BLOCK_SIZE):
+    """Return ``(offsets, lengths)`` of semicolon-terminated records in UTF-8 bytes.
+
+    Quoted names and bracket comments are skipped as in ``iter_newick_stream``,
+    and malformed endings raise the same errors.
+    """
+    scanner = _NewickRecordScanner()
+    offsets = []
+    lengths = []
+    record_start = 0
+    for block_start in range(0, len(buffer), block_size):
+        block = buffer[block_start : block_start + block_size]
+        for record_end in scanner.scan(block):
+            offset, length = _record_bounds(
+                buffer, record_start, block_start + record_end
+            )
+            offsets.append(offset)
+            lengths.append(length)
+            record_start = block_start + record_end
+    scanner.finish(buffer[record_start:].decode("utf-8"))
+    return np.asarray(offsets, dtype=np.int64), np.asarray(lengths, dtype=np.int64)
+
+
+class IndexedTreeStrings:
+    """Random-access sequence of the Newick records in an indexed file.
+
+    Records are read lazily from a memory map, so slices are cheap and can be
+    sent to worker processes, which reopen the file and parse only their part.
+    """
+
+    __slots__ = ("path", "offsets", "lengths", "_buffer")
+
+    def __init__(self, path, offsets, lengths):
+        self.path = path
+        self.offsets = offsets
+        self.lengths = lengths
+        self._buffer = None
+
+    def __getstate__(self):
+        return self.path, self.offsets, self.lengths
+
+    def __setstate__(self, state):
+        self.path, self.offsets, self.lengths = state
+        self._buffer = None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return IndexedTreeStrings(
+                self.path, self.offsets[index], self.lengths[index]
+            )
+        offset = int(self.offsets[index])
+        if self._buffer is None:
+            with open(self.path, "rb") as handle:
+                self._buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        text = self._buffer[offset : offset + int(self.lengths[index])].decode("utf-8")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text.strip()
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def take(self, positions):
+        """Return the records at ``positions`` without reading any of them."""
+        positions = np.asarray(positions, dtype=np.int64)
+        return IndexedTreeStrings(
+            self.path, self.offsets[positions], self.lengths[positions]
+        )
+
+
+def _source_signature(path):
+    stat_result = os.stat(path)
+    return stat_result.st_size, stat_result.st_mtime_ns
+
+
+def _source_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(_SCAN_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_index_file(index_path, source_path, source_size, source_mtime_ns):
+    """Return the arrays of a sidecar that matches the source, or None.
+
+    Size and modification time reject most stale sidecars cheaply; the
+    content hash then catches same-size rewrites that kept or restored the
+    modification time.
+    """
+    try:
+        with open(index_path, "rb") as handle:
+            if handle.readline() != _INDEX_MAGIC:
+                return None
+            header = json.loads(handle.readline())
+            if (
+                header.get("version") != _INDEX_VERSION
+                or header.get("source_size") != source_size
+                or header.get("source_mtime_ns") != source_mtime_ns
+            ):
+                return None
+            num_records = int(header["num_records"])
+            arrays = np.frombuffer(handle.read(), dtype="<i8")
+        if header.get("sha256") != _source_sha256(source_path):
+            return None
+    except (OSError, ValueError, KeyError):
+        return None
+    if len(arrays) != 2 * num_records:
+        return None
+    return arrays[:num_records].astype(np.int64), arrays[num_records:].astype(np.int64)
+
+
+def _write_index_file(index_path, header, offsets, lengths):
+    index_dir = os.path.dirname(os.path.abspath(index_path))
+    fd, temporary = tempfile.mkstemp(
+        prefix=".{}.".format(os.path.basename(index_path)), dir=index_dir
+    )
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(_INDEX_MAGIC)
+            handle.write(json.dumps(header, sort_keys=True).encode("ascii") + b"\n")
+            handle.write(offsets.astype("<i8").tobytes())
+            handle.write(lengths.astype("<i8").tobytes())
+        os.replace(temporary, index_path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def build_tree_index(path, index_path=None):
+    """Scan a Newick collection once and write its ``.idx`` sidecar.
+
+    The sidecar stores record byte offsets and lengths together with the
+    source size, modification time, and SHA-256 content hash.
+    """
+    index_path = path + INDEX_SUFFIX if index_path is None else index_path
+    source_size, source_mtime_ns = _source_signature(path)
+    if source_size == 0:
+        offsets = lengths = np.zeros(0, dtype=np.int64)
+        content_hash = hashlib.sha256(b"").hexdigest()
+    else:
+        with open(path, "rb") as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                offsets, lengths = scan_newick_record_spans(buffer)
+                content_hash = hashlib.sha256(buffer).hexdigest()
+    header = {
+        "version": _INDEX_VERSION,
+        "source_size": source_size,
+        "source_mtime_ns": source_mtime_ns,
+        "sha256": content_hash,
+        "num_records": len(offsets),
+    }
+    try:
+        _write_index_file(index_path, header, offsets, lengths)
+    except OSError as exc:
+        sys.stderr.write(
+            "Warning: could not write tree index {}: {}\n".format(index_path, exc)
+        )
+    return offsets, lengths
+
+
+def open_indexed_tree_strings(infile):
+    """Return indexed records of a plain Newick file, or None if it cannot be indexed.
+
+    A ``<infile>.idx`` whose size, modification time, and SHA-256 hash match
+    the file is reused; a missing or stale one is rebuilt.
+    Standard input, compressed files, and NEXUS/PAML containers are not indexed.
+    """
+    if infile == "-" or not os.path.isfile(infile) or is_compressed_file(infile):
+        return None
+    with open(infile) as handle:
+        if _is_tree_container_prefix(handle.read(4096)):
+            return None
+    source_size, source_mtime_ns = _source_signature(infile)
+    arrays = _read_index_file(
+        infile + INDEX_SUFFIX, infile, source_size, source_mtime_ns
+    )
+    if arrays is None:
+        arrays = build_tree_index(infile)
+    return IndexedTreeStrings(infile, *arrays)
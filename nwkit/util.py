@@ -1,10 +1,14 @@
 import copy
 import csv
 import errno
+import functools
+import gzip
 import hashlib
+import io
 import math
 import os
 import pickle
+import random
 import re
 import secrets
 import shutil
@@ -24,20 +28,29 @@ from itertools import islice
 from typing import Any
 from urllib.parse import quote, urljoin, urlparse
 
-import ete4
-from ete4 import Tree
-
 from nwkit import __version__
 from nwkit.conventions import DEFAULT_TABLE_MISSING_VALUES
 from nwkit.fasta import parse_fasta, write_fasta
+from nwkit.resident import ResidentCache
 from nwkit.species_parser import (
     extract_parsed_species,
     get_species_parser,
 )
+from nwkit.tree_cache import load_cached_trees, store_cached_trees, tree_cache_key
 
 NUMERIC_NODE_NAME_PATTERN = re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
 UNQUOTED_NODE_NAME_PATTERN = re.compile(r"""^[^\s\(\)\[\]'":;,]+$""")
+_INTERNAL_LABEL_TOKEN_PATTERN = re.compile(r"\)\s*([^\s:,();\[\]]*)")
+_INTERNAL_LABEL_SCAN_PATTERN = re.compile(
+    r"'(?:[^']|'')*(?:'|\Z)"
+    r'|"(?:[^"]|"")*(?:"|\Z)'
+    r"|\[(?P<comment>[^\]]*)(?:\]|\Z)"
+    r"|\)(?=(?:\s|\[[^\[\]]*\])*(?P<label>['\"]|[^\s:,();\[\]]*))"
+)
 TREE_FORMAT_PROP = "_nwkit_parser_format"
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+COMPRESSED_OUTPUT_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
 MISSING_SUPPORT_VALUE = -999999.0
 DOWNLOAD_LOCK_POLL_SECONDS = 1
 DOWNLOAD_LOCK_TIMEOUT_SECONDS = 3600
@@ -51,6 +64,9 @@ ETE_DOWNLOAD_HEADERS = {
     "User-Agent": "nwkit/{} (+https://github.com/kfuku52/nwkit)".format(__version__),
 }
 ETE_TAXONOMY_DEFAULT_MAX_AGE_DAYS = 30.0
+# NCBITaxa handles and HTTP sessions kept by long-lived batch/serve processes.
+SHARED_NCBITAXA = ResidentCache()
+RESIDENT_HTTP_SESSIONS = ResidentCache()
 
 _PAML_TREEFILE_HEADER_PATTERN = re.compile(r"^\s*\d+\s+\d+\s*$")
 _PAML_FIGTREE_INTERVAL_PATTERN = re.compile(
@@ -72,6 +88,8 @@ COMMON_ETE_CACHE_DIRS = (
 
 def copy_tree_iteratively(tree):
     """Return a topology-and-properties copy without recursing over the tree."""
+    from ete4 import Tree
+
     copied_values: dict[int, Any] = {}
 
     def copy_node(source):
@@ -93,13 +111,109 @@ def copy_tree_iteratively(tree):
     return copied_root
 
 
-def read_input_text(infile):
+def _detect_compression(prefix):
+    if prefix.startswith(GZIP_MAGIC):
+        return "gzip"
+    if prefix.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+
+def _load_zstd_module():
+    try:
+        from compression import zstd  # Python 3.14+
+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError(
+            "zstd-compressed files require Python 3.14+ or the zstandard package. "
+            'Install it with: pip install "nwkit[zstd]"'
+        ) from exc
+    return zstandard
+
+
+def _open_decompressed_binary(source, compression, closefd=True):
+    """Open a decompressing binary reader over a path or a binary file object."""
+    if compression == "gzip":
+        return gzip.open(source, "rb")
+    zstd = _load_zstd_module()
+    if hasattr(zstd, "ZstdFile"):
+        return zstd.ZstdFile(source, "rb")
+    if isinstance(source, str):
+        source = open(source, "rb")
+    return zstd.ZstdDecompressor().stream_reader(
+        source, read_across_frames=True, closefd=closefd
+    )
+
+
+def open_input_text(infile, newline=None):
+    """Open a file path or "-" as text, decompressing gzip or zstd input.
+
+    Compression is recognized by magic bytes, not by file name. Plain standard
+    input is returned as ``sys.stdin`` itself; any other handle is owned by the
+    caller, and closing a decompressing standard-input handle leaves
+    ``sys.stdin`` open.
+    """
     if infile == "-":
-        return sys.stdin.read()
-    if os.path.isfile(infile):
-        with open(infile) as handle:
-            return handle.read()
-    return str(infile)
+        raw = getattr(sys.stdin, "buffer", None)
+        if raw is None or not hasattr(raw, "peek"):
+            return sys.stdin
+        compression = _detect_compression(raw.peek(len(ZSTD_MAGIC)))
+        if compression is None:
+            return sys.stdin
+        binary = _open_decompressed_binary(raw, compression, closefd=False)
+        return io.TextIOWrapper(binary, newline=newline)
+    with open(infile, "rb") as raw:
+        compression = _detect_compression(raw.peek(len(ZSTD_MAGIC)))
+    if compression is None:
+        return open(infile, newline=newline)
+    return io.TextIOWrapper(
+        _open_decompressed_binary(infile, compression), newline=newline
+    )
+
+
+def is_compressed_file(path):
+    """Return True when ``path`` starts with gzip or zstd magic bytes."""
+    with open(path, "rb") as handle:
+        return _detect_compression(handle.peek(len(ZSTD_MAGIC))) is not None
+
+
+def open_output_text(outfile, newline=None):
+    """Open ``outfile`` for writing text, compressing by its suffix.
+
+    Paths ending in ``.gz`` or ``.zst`` are written gzip- or zstd-compressed,
+    as pandas already does for TSV output; other paths are written as plain
+    text.
+    """
+    compression = COMPRESSED_OUTPUT_SUFFIXES.get(os.path.splitext(outfile)[1].lower())
+    if compression is None:
+        return open(outfile, "w", newline=newline)
+    if compression == "gzip":
+        binary = gzip.open(outfile, "wb")
+    else:
+        zstd = _load_zstd_module()
+        if hasattr(zstd, "ZstdFile"):
+            binary = zstd.ZstdFile(outfile, "wb")
+        else:
+            binary = zstd.ZstdCompressor().stream_writer(
+                open(outfile, "wb"), closefd=True
+            )
+    return io.TextIOWrapper(binary, newline=newline)
+
+
+def read_input_text(infile):
+    if infile != "-" and not os.path.isfile(infile):
+        return str(infile)
+    handle = open_input_text(infile)
+    try:
+        return handle.read()
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
 
 
 def _convert_paml_figtree_intervals(text):
@@ -602,6 +716,40 @@ def _contains_quoted_internal_node_names(newick_text):
 def _internal_node_label_kinds(newick_text):
     """Return flags for quoted, numeric, and other internal labels."""
     text = str(newick_text)
+    if not any(char in text for char in "'\"["):
+        return _label_token_kinds(
+            frozenset(_INTERNAL_LABEL_TOKEN_PATTERN.findall(text))
+        )
+    labels = set()
+    for match in _INTERNAL_LABEL_SCAN_PATTERN.finditer(text):
+        comment = match.group("comment")
+        if comment is not None and "[" in comment:
+            # Nested comments need bracket counting, which a regex cannot do.
+            return _scan_internal_node_label_kinds(text)
+        label = match.group("label")
+        if label is not None:
+            labels.add(label)
+    return _label_token_kinds(frozenset(labels))
+
+
+@functools.lru_cache(maxsize=1024)
+def _label_token_kinds(labels):
+    # Posterior and bootstrap collections repeat the same few label sets, so
+    # the classification is cached across records rather than redone per tree.
+    has_quoted = any(label[:1] in ("'", '"') for label in labels)
+    has_numeric = False
+    has_other = False
+    for label in labels:
+        if label == "" or label[0] in ("'", '"'):
+            continue
+        if _is_numeric_node_name(label):
+            has_numeric = True
+        else:
+            has_other = True
+    return has_quoted, has_numeric, has_other
+
+
+def _scan_internal_node_label_kinds(text):
     has_quoted = False
     has_numeric = False
     has_other = False
@@ -722,12 +870,17 @@ def _auto_format_ambiguity_message():
 
 
 def _read_tree_auto(infile):
+    from ete4 import Tree
+
     quoted_internal_names, numeric_internal_names, other_internal_names = (
         _internal_node_label_kinds(infile)
     )
     preferred_formats = (
         (1, 0) if quoted_internal_names or other_internal_names else (0, 1)
     )
+    # Parsers 2-9 and 100 read every field at least as strictly as parser 0
+    # or 1, so they can never accept a tree that both of these reject. The
+    # sniffed order makes the first attempt succeed for well-formed input.
     for candidate_format in preferred_formats:
         try:
             tree = Tree(infile, parser=candidate_format)
@@ -739,11 +892,6 @@ def _read_tree_auto(infile):
             else None
         )
         return candidate_format, tree, ambiguity_message
-    for candidate_format in [2, 3, 4, 5, 6, 7, 8, 9, 100]:
-        try:
-            return candidate_format, Tree(infile, parser=candidate_format), None
-        except Exception:
-            pass
     raise Exception("Failed to parse the input tree.")
 
 
@@ -1321,6 +1469,32 @@ def _taxonomy_cache_is_stale(dbfile, args):
 
 
 def get_ete_ncbitaxa(args=None):
+    if bool(getattr(args, "refresh_taxonomy_cache", False)):
+        return _open_ete_ncbitaxa(args)
+    key = (resolve_ete_data_dir(args), _taxonomy_cache_max_age_seconds(args))
+    return SHARED_NCBITAXA.get(key, lambda: _open_ete_ncbitaxa(args))
+
+
+def get_resident_http_session(name, factory):
+    """Return a session from ``factory``, kept open for later commands when resident.
+
+    Commands close their sessions when they finish; a resident session ignores
+    ``close`` so its pooled connections survive until the process exits.
+    """
+
+    def build_resident_session():
+        session = factory()
+        session.close = lambda: None
+        return session
+
+    if not RESIDENT_HTTP_SESSIONS.enabled:
+        return factory()
+    return RESIDENT_HTTP_SESSIONS.get(name, build_resident_session)
+
+
+def _open_ete_ncbitaxa(args):
+    import ete4
+
     ete_data_dir = resolve_ete_data_dir(args)
     if ete_data_dir is None:
         from ete4.ncbi_taxonomy.ncbiquery import DEFAULT_TAXADB
@@ -1363,28 +1537,28 @@ def get_ete_ncbitaxa(args=None):
         return ete4.NCBITaxa(dbfile=dbfile, update=False)
 
 
-def read_tree(infile, format, quoted_node_names, quiet=False, allow_non_finite=False):
-    infile = normalize_phylogenetic_tree_text(
-        read_input_text(infile), collection=False
-    ).strip()
-    if infile == "":
+def _read_tree_text(text, format, quoted_node_names, allow_non_finite=False):
+    """Parse one tree and return ``(tree, ambiguity_message)``."""
+    # ete4 is imported where trees are built: importing it also loads SciPy,
+    # which array-based commands such as info never need.
+    from ete4 import Tree
+
+    text = normalize_phylogenetic_tree_text(text, collection=False).strip()
+    if text == "":
         raise Exception("Failed to parse the input tree.")
-    if (not quoted_node_names) and _contains_quoted_node_names(infile):
+    if (not quoted_node_names) and _contains_quoted_node_names(text):
         raise ValueError(
             "Quoted node names were found in the input tree. Re-run with --quoted-node-names yes."
         )
+    ambiguity_message = None
     if format in ("auto", "auto-strict"):
         format_original = format
-        format, tree, ambiguity_message = _read_tree_auto(infile)
-        if ambiguity_message is not None:
-            if format_original == "auto-strict":
-                raise ValueError(ambiguity_message)
-            if not quiet:
-                sys.stderr.write("Warning: {}\n".format(ambiguity_message))
+        format, tree, ambiguity_message = _read_tree_auto(text)
+        if ambiguity_message is not None and format_original == "auto-strict":
+            raise ValueError(ambiguity_message)
     else:
-        format_original = format
         format = int(format)
-        tree = Tree(infile, parser=format)
+        tree = Tree(text, parser=format)
     parser_format = int(format)
     # Keep per-node format metadata so writing a subtree keeps the original parser.
     for node in tree.traverse():
@@ -1408,10 +1582,28 @@ def read_tree(infile, format, quoted_node_names, quiet=False, allow_non_finite=F
                 raise ValueError("Tree branch lengths must be finite.")
             if node.support is not None and not math.isfinite(float(node.support)):
                 raise ValueError("Tree support values must be finite.")
+    return tree, ambiguity_message
+
+
+def read_tree(infile, format, quoted_node_names, quiet=False, allow_non_finite=False):
+    text = read_input_text(infile)
+    cache_key = tree_cache_key(
+        "tree", text, format, quoted_node_names, allow_non_finite
+    )
+    cached = load_cached_trees(cache_key)
+    if cached is None:
+        tree, ambiguity_message = _read_tree_text(
+            text, format, quoted_node_names, allow_non_finite
+        )
+        store_cached_trees(cache_key, [tree], ambiguity_message)
+    else:
+        (tree,), ambiguity_message = cached
+    if ambiguity_message is not None and not quiet:
+        sys.stderr.write("Warning: {}\n".format(ambiguity_message))
     if not quiet:
         num_leaves = len(list(tree.leaves()))
         txt = "Number of leaves in input tree = {:,}, Input tree format = {}\n"
-        sys.stderr.write(txt.format(num_leaves, format))
+        sys.stderr.write(txt.format(num_leaves, tree.props[TREE_FORMAT_PROP]))
     return tree
 
 
@@ -1509,151 +1701,255 @@ def write_tree(tree, args, format, quiet=False, props=None, name_quote=None):
     elif hasattr(args.outfile, "write"):
         args.outfile.write(tree_str)
     else:
-        with open(args.outfile, mode="w") as f:
+        with open_output_text(args.outfile) as f:
             f.write(tree_str)
 
 
-def split_newick_stream(newick_text):
-    trees = list()
-    buffer = list()
-    quote_char = None
-    comment_depth = 0
-    text = str(newick_text)
-    i = 0
-    while i < len(text):
-        char = text[i]
-        buffer.append(char)
-        if quote_char is not None:
-            if char == quote_char and (i + 1 < len(text) and text[i + 1] == quote_char):
-                buffer.append(text[i + 1])
-                i += 1
-            elif char == quote_char:
-                quote_char = None
-        elif comment_depth > 0:
-            if char == "[":
-                comment_depth += 1
-            elif char == "]":
-                comment_depth -= 1
-        elif char in ("'", '"'):
-            quote_char = char
-        elif char == "[":
-            comment_depth = 1
-        elif char == ";":
-            tree_text = "".join(buffer).strip()
-            if tree_text != "":
-                trees.append(tree_text)
-            buffer = list()
-        i += 1
-    if comment_depth > 0:
-        raise ValueError(
-            "Input tree collection ended inside an unterminated Newick comment."
-        )
-    if quote_char is not None or "".join(buffer).strip() != "":
-        raise ValueError("Input tree collection ended before a terminal semicolon.")
-    return trees
+class _NewickRecordScanner:
+    """Find record-ending semicolons in consecutive blocks of UTF-8 bytes.
 
+    NumPy locates the few delimiter bytes of each block, and only those are
+    walked in Python, so plain text between delimiters costs no Python work.
+    Quote and comment state carries across blocks.
+    """
 
-def iter_newick_stream(handle, chunk_size=1024 * 1024):
-    """Yield semicolon-terminated Newick records without loading the stream at once."""
-    buffer = list()
-    quote_char = None
-    possible_closing_quote = False
-    comment_depth = 0
-    while True:
-        chunk = handle.read(chunk_size)
-        if chunk == "":
-            break
-        for char in chunk:
-            if possible_closing_quote:
-                if char == quote_char:
-                    buffer.append(char)
-                    possible_closing_quote = False
+    def __init__(self):
+        self.quote = 0
+        self.possible_closing_quote = False
+        self.comment_depth = 0
+
+    def scan(self, block):
+        """Return the offsets just past each record-ending semicolon in ``block``."""
+        import numpy as np
+
+        codes = np.frombuffer(block, dtype=np.uint8)
+        positions = np.flatnonzero(
+            (codes == 0x3B)
+            | (codes == 0x27)
+            | (codes == 0x22)
+            | (codes == 0x5B)
+            | (codes == 0x5D)
+        )
+        quote = self.quote
+        comment_depth = self.comment_depth
+        escaped_position = -1
+        if self.possible_closing_quote:
+            self.possible_closing_quote = False
+            if block[:1] == bytes((quote,)):
+                escaped_position = 0
+            else:
+                quote = 0
+        last_position = len(block) - 1
+        record_ends = list()
+        for position, code in zip(
+            positions.tolist(), codes[positions].tolist(), strict=True
+        ):
+            if position == escaped_position:
+                continue
+            if quote:
+                if code != quote:
                     continue
-                quote_char = None
-                possible_closing_quote = False
-            buffer.append(char)
-            if quote_char is not None:
-                if char == quote_char:
-                    possible_closing_quote = True
+                if position == last_position:
+                    self.possible_closing_quote = True
+                elif block[position + 1] == quote:
+                    escaped_position = position + 1
+                else:
+                    quote = 0
             elif comment_depth > 0:
-                if char == "[":
+                if code == 0x5B:
                     comment_depth += 1
-                elif char == "]":
+                elif code == 0x5D:
                     comment_depth -= 1
-            elif char in ("'", '"'):
-                quote_char = char
-            elif char == "[":
+            elif code == 0x3B:
+                record_ends.append(position + 1)
+            elif code == 0x5B:
                 comment_depth = 1
-            elif char == ";":
-                tree_text = "".join(buffer).strip()
-                if tree_text:
-                    yield tree_text
-                buffer = list()
-    if possible_closing_quote:
-        quote_char = None
-    if comment_depth > 0:
-        raise ValueError(
-            "Input tree collection ended inside an unterminated Newick comment."
+            elif code != 0x5D:
+                quote = code
+        self.quote = quote
+        self.comment_depth = comment_depth
+        return record_ends
+
+    def finish(self, remainder):
+        """Raise if the input ended inside a record; ``remainder`` is its text."""
+        if self.comment_depth > 0:
+            raise ValueError(
+                "Input tree collection ended inside an unterminated Newick comment."
+            )
+        if (self.quote and not self.possible_closing_quote) or remainder.strip():
+            raise ValueError("Input tree collection ended before a terminal semicolon.")
+
+
+def _iter_newick_records(chunks):
+    """Yield semicolon-terminated records from consecutive pieces of Newick text."""
+    scanner = _NewickRecordScanner()
+    pieces = list()
+    for chunk in chunks:
+        # surrogatepass keeps undecodable stdin bytes round-tripping exactly.
+        block = chunk.encode("utf-8", "surrogatepass")
+        record_start = 0
+        for record_end in scanner.scan(block):
+            pieces.append(block[record_start:record_end])
+            yield b"".join(pieces).decode("utf-8", "surrogatepass").strip()
+            pieces = list()
+            record_start = record_end
+        pieces.append(block[record_start:])
+    scanner.finish(b"".join(pieces).decode("utf-8", "surrogatepass"))
+
+
+def split_newick_stream(newick_text):
+    return list(_iter_newick_records((str(newick_text),)))
+
+
+def iter_newick_stream(handle, chunk_size=1024 * 1024):
+    """Yield semicolon-terminated Newick records without loading the stream at once."""
+    yield from _iter_newick_records(iter(lambda: handle.read(chunk_size), ""))
+
+
+def _is_tree_container_prefix(prefix):
+    """Return whether text starts like a NEXUS or PAML tree file."""
+    first_content_line = next(
+        (line.strip() for line in prefix.splitlines() if line.strip()),
+        "",
+    )
+    return first_content_line.upper().startswith("#NEXUS") or (
+        _PAML_TREEFILE_HEADER_PATTERN.fullmatch(first_content_line) is not None
+    )
+
+
+class TreeSampling:
+    """Burn-in, thinning, and seeded subsampling of tree collection records.
+
+    Records are selected by position before they are parsed: the first
+    ``burnin`` records are dropped, every ``thin``-th remaining record is
+    kept, and ``subsample`` of those are drawn without replacement by
+    reservoir sampling and returned in input order. The same seed selects
+    the same positions whether records are streamed or read from an index.
+    """
+
+    __slots__ = ("burnin", "thin", "subsample", "seed")
+
+    def __init__(self, burnin=0, thin=1, subsample=None, seed=None):
+        if burnin < 0:
+            raise ValueError("'--burnin' must be zero or greater.")
+        if thin < 1:
+            raise ValueError("'--thin' must be at least one.")
+        if (subsample is not None) and (subsample < 1):
+            raise ValueError("'--subsample' must be at least one.")
+        self.burnin = int(burnin)
+        self.thin = int(thin)
+        self.subsample = None if subsample is None else int(subsample)
+        self.seed = seed
+
+    @classmethod
+    def from_args(cls, args):
+        """Return the sampling requested by ``args``, or None to keep every tree."""
+        sampling = cls(
+            burnin=getattr(args, "burnin", 0),
+            thin=getattr(args, "thin", 1),
+            subsample=getattr(args, "subsample", None),
+            seed=getattr(args, "seed", None),
         )
-    if quote_char is not None or "".join(buffer).strip():
-        raise ValueError("Input tree collection ended before a terminal semicolon.")
+        if (sampling.burnin, sampling.thin, sampling.subsample) == (0, 1, None):
+            return None
+        return sampling
+
+    def _draw(self, items, sample_size):
+        reservoir: list[tuple[int, Any]] = []
+        rng = random.Random(self.seed)
+        for index, item in enumerate(items):
+            if index < sample_size:
+                reservoir.append((index, item))
+                continue
+            slot = rng.randrange(index + 1)
+            if slot < sample_size:
+                reservoir[slot] = (index, item)
+        reservoir.sort(key=lambda entry: entry[0])
+        return [item for _, item in reservoir]
+
+    def select(self, records):
+        """Yield the selected items of an iterable of records."""
+        kept = islice(records, self.burnin, None, self.thin)
+        if self.subsample is None:
+            yield from kept
+            return
+        yield from self._draw(kept, self.subsample)
 
+    def positions(self, num_records):
+        """Return the selected 0-based positions among ``num_records`` records."""
+        return list(self.select(range(num_records)))
 
-def iter_tree_strings(infile):
-    if infile == "-":
-        yield from iter_newick_stream(sys.stdin)
+
+def iter_tree_strings(infile, sampling=None):
+    """Yield the Newick records of ``infile``, selected by ``sampling`` if given.
+
+    Records skipped by ``sampling`` are split from the stream but never parsed.
+    """
+    records = _iter_all_tree_strings(infile)
+    if sampling is None:
+        return records
+    return sampling.select(records)
+
+
+def _iter_all_tree_strings(infile):
+    if (infile != "-") and not os.path.isfile(infile):
+        yield from split_newick_stream(str(infile))
         return
-    if os.path.isfile(infile):
-        with open(infile) as handle:
-            prefix = handle.read(4096)
-            first_content_line = next(
-                (line.strip() for line in prefix.splitlines() if line.strip()),
-                "",
-            )
-            is_paml_container = first_content_line.upper().startswith(
-                "#NEXUS"
-            ) or _PAML_TREEFILE_HEADER_PATTERN.fullmatch(first_content_line)
-            if is_paml_container:
-                normalized = normalize_phylogenetic_tree_text(
-                    prefix + handle.read(),
-                    collection=True,
-                )
-                yield from split_newick_stream(normalized)
-                return
-
-            class _PrefixedReader:
-                def __init__(self, initial, remainder):
-                    self.initial = initial
-                    self.remainder = remainder
-
-                def read(self, size=-1):
-                    if size is None or size < 0:
-                        value = self.initial + self.remainder.read()
-                        self.initial = ""
-                        return value
-                    value = self.initial[:size]
-                    self.initial = self.initial[len(value) :]
-                    if len(value) < size:
-                        value += self.remainder.read(size - len(value))
-                    return value
-
-            yield from iter_newick_stream(_PrefixedReader(prefix, handle))
+    handle = open_input_text(infile)
+    try:
+        yield from _iter_handle_tree_strings(handle)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+class _PrefixedReader:
+    def __init__(self, initial, remainder):
+        self.initial = initial
+        self.remainder = remainder
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            value = self.initial + self.remainder.read()
+            self.initial = ""
+            return value
+        value = self.initial[:size]
+        self.initial = self.initial[len(value) :]
+        if len(value) < size:
+            value += self.remainder.read(size - len(value))
+        return value
+
+
+def _iter_handle_tree_strings(handle):
+    # NEXUS and PAML containers are normalized whole; plain Newick streams.
+    prefix = handle.read(4096)
+    if _is_tree_container_prefix(prefix):
+        normalized = normalize_phylogenetic_tree_text(
+            prefix + handle.read(),
+            collection=True,
+        )
+        yield from split_newick_stream(normalized)
         return
-    yield from split_newick_stream(str(infile))
+    yield from iter_newick_stream(_PrefixedReader(prefix, handle))
 
 
 def read_trees(infile, format, quoted_node_names, quiet=False):
-    tree_text = normalize_phylogenetic_tree_text(
-        read_input_text(infile),
-        collection=True,
-    )
-    tree_strings = split_newick_stream(tree_text)
-    if len(tree_strings) == 0:
-        raise Exception("Failed to parse the input trees.")
-    trees = [
-        read_tree(tree_string, format, quoted_node_names, quiet=True)
-        for tree_string in tree_strings
-    ]
+    text = read_input_text(infile)
+    cache_key = tree_cache_key("trees", text, format, quoted_node_names)
+    cached = load_cached_trees(cache_key)
+    if cached is not None:
+        trees = cached[0]
+    else:
+        tree_strings = split_newick_stream(
+            normalize_phylogenetic_tree_text(text, collection=True)
+        )
+        if len(tree_strings) == 0:
+            raise Exception("Failed to parse the input trees.")
+        trees = [
+            _read_tree_text(tree_string, format, quoted_node_names)[0]
+            for tree_string in tree_strings
+        ]
+        store_cached_trees(cache_key, trees)
     if not quiet:
         sys.stderr.write("Number of input trees = {:,}\n".format(len(trees)))
     return trees
@@ -1668,6 +1964,8 @@ def read_tree_strings(infile):
 
 
 def inspect_tree_text(newick_text, format="auto", quoted_node_names=True):
+    from ete4 import Tree
+
     text = normalize_phylogenetic_tree_text(str(newick_text), collection=False).strip()
     if text == "":
         return {
@@ -1795,11 +2093,12 @@ def read_seqs(seqfile, seqformat, quiet):
                 seqformat
             )
         )
-    if seqfile == "-":
-        records = parse_fasta(sys.stdin)
-    else:
-        with open(seqfile, newline="") as fh:
-            records = parse_fasta(fh)
+    handle = open_input_text(seqfile, newline="")
+    try:
+        records = parse_fasta(handle)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
     if not quiet:
         sys.stderr.write("Number of input sequences: {:,}\n".format(len(records)))
     return records
@@ -1819,7 +2118,7 @@ def write_seqs(records, outfile, seqformat="fasta", quiet=False):
     elif hasattr(outfile, "write"):
         write_fasta(records, outfile)
     else:
-        with open(outfile, "w", newline="") as fh:
+        with open_output_text(outfile, newline="") as fh:
             write_fasta(records, fh)
 
 
@@ -2183,6 +2482,26 @@ def get_subtree_leaf_bitmasks(tree, leaf_name_to_bit):
     return subtree_leaf_bitmasks
 
 
+def validate_threads(threads):
+    try:
+        threads = int(threads)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("'--threads' must be an integer.") from exc
+    if threads <= 0:
+        raise ValueError("'--threads' must be positive.")
+    return threads
+
+
+def get_process_pool_context():
+    """Return the forkserver context, or None where it is unavailable."""
+    import multiprocessing
+
+    try:
+        return multiprocessing.get_context("forkserver")
+    except ValueError:
+        return None
+
+
 def validate_unique_named_leaves(tree, option_name, context=""):
     leaf_names = list(tree.leaf_names())
     if len(leaf_names) != len(set(leaf_names)):
@@ -2201,11 +2520,12 @@ def validate_unique_named_leaves(tree, option_name, context=""):
 
 
 def read_item_per_line_file(file):
-    if file == "-":
-        out = sys.stdin.read().splitlines()
-    else:
-        with open(file, "r") as f:
-            out = f.read().splitlines()
+    handle = open_input_text(file)
+    try:
+        out = handle.read().splitlines()
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
     out = [o.strip() for o in out if o.strip() != ""]
     return out
 
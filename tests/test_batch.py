@@ -0,0 +1,153 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from nwkit import util
+from nwkit.batch import BATCH_COLUMNS, batch_main, read_batch_jobs, run_batch_jobs
+from nwkit.species_parser import SHARED_SPECIES_PARSERS, get_species_parser
+from nwkit.tree_cache import MEMORY_TREE_CACHE
+from tests.helpers import make_args
+
+
+def _write_manifest(tmp_path, jobs):
+    path = tmp_path / "jobs.tsv"
+    path.write_text("".join("\t".join(argv) + "\n" for argv in jobs))
+    return str(path)
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    path = tmp_path / "tree.nwk"
+    path.write_text("((A:1,B:2):1,(C:3,D:4):1);\n")
+    return str(path)
+
+
+def _info_jobs(tmp_path, tree_file, job_ids):
+    return [
+        (job_id, ["info", "-i", tree_file, "-o", str(tmp_path / f"{job_id}.tsv")])
+        for job_id in job_ids
+    ]
+
+
+def test_manifest_skips_comments_and_optional_program_name(tmp_path):
+    path = tmp_path / "jobs.tsv"
+    path.write_text("# comment\nnwkit\tinfo\t-i\tx.nwk\n\ninfo\t-i\ty.nwk\n")
+
+    assert read_batch_jobs(str(path)) == [
+        (2, ["info", "-i", "x.nwk"]),
+        (4, ["info", "-i", "y.nwk"]),
+    ]
+
+
+def test_empty_manifest_is_rejected(tmp_path):
+    path = tmp_path / "jobs.tsv"
+    path.write_text("# nothing to run\n")
+
+    with pytest.raises(ValueError, match="No jobs"):
+        read_batch_jobs(str(path))
+
+
+def test_batch_reports_status_per_job(tmp_path, tree_file, capsys):
+    out = str(tmp_path / "out.tsv")
+    manifest = _write_manifest(
+        tmp_path,
+        [
+            ["info", "-i", tree_file, "-o", out],
+            ["info", "-i", tree_file],
+            ["info", "-i", str(tmp_path / "missing.nwk"), "-o", out + ".2"],
+            ["info", "--no-such-option"],
+            ["batch", "--jobs", str(tmp_path / "jobs.tsv"), "-o", out + ".3"],
+        ],
+    )
+    status = str(tmp_path / "status.tsv")
+
+    exit_status = batch_main(make_args(jobs=manifest, threads=1, outfile=status))
+
+    with open(status) as handle:
+        rows = [line.rstrip("\n").split("\t") for line in handle]
+    assert rows[0] == BATCH_COLUMNS
+    assert [row[0] for row in rows[1:]] == ["1", "2", "3", "4", "5"]
+    assert [row[2] for row in rows[1:]] == ["0", "2", "2", "2", "2"]
+    assert "set --outfile" in rows[2][4]
+    assert "unrecognized arguments" in rows[4][4]
+    assert "cannot be run inside nwkit batch" in rows[5][4]
+    assert exit_status == 1
+    assert os.path.getsize(out) > 0
+    assert "[job 3]" in capsys.readouterr().err
+
+
+def test_jobs_reading_stdin_are_rejected(tmp_path):
+    rows = run_batch_jobs([(1, ["info", "-i", "-", "-o", str(tmp_path / "o.tsv")])])
+
+    assert rows[0]["exit_status"] == 2
+    assert "--infile" in rows[0]["error"]
+
+
+def test_threaded_batch_keeps_manifest_order(tmp_path, tree_file):
+    jobs = _info_jobs(tmp_path, tree_file, range(1, 6))
+
+    serial = run_batch_jobs(jobs, threads=1)
+    threaded = run_batch_jobs(jobs, threads=2)
+
+    assert [row["job_id"] for row in threaded] == [1, 2, 3, 4, 5]
+    assert [row["exit_status"] for row in threaded] == [0] * 5
+    assert [row["command"] for row in threaded] == [row["command"] for row in serial]
+
+
+def test_parsed_trees_are_shared_only_during_the_batch(tmp_path, tree_file):
+    jobs = [
+        (
+            job_id,
+            ["rescale", "--factor", "2", "-i", tree_file, "-o", f"{tmp_path}/{job_id}"],
+        )
+        for job_id in (1, 2)
+    ]
+    with patch(
+        "nwkit.util._read_tree_text", wraps=util._read_tree_text
+    ) as read_tree_text:
+        run_batch_jobs(jobs, threads=1)
+        calls_in_batch = read_tree_text.call_count
+        util.read_tree("(A,B);", "auto", True, quiet=True)
+        util.read_tree("(A,B);", "auto", True, quiet=True)
+
+    assert calls_in_batch == 1
+    assert read_tree_text.call_count == 3
+    assert not MEMORY_TREE_CACHE.enabled
+
+
+def test_shared_species_parsers_follow_map_changes(tmp_path):
+    species_map = tmp_path / "map.tsv"
+    species_map.write_text("leaf_name\tspecies_label\nx\tHomo sapiens\n")
+
+    def parse():
+        return get_species_parser(make_args(species_map_tsv=str(species_map)))
+
+    SHARED_SPECIES_PARSERS.enable()
+    try:
+        first = parse()
+        second = parse()
+        species_map.write_text("leaf_name\tspecies_label\nx\tMus musculus\n")
+        later_ns = species_map.stat().st_mtime_ns + 1_000_000_000
+        os.utime(species_map, ns=(later_ns, later_ns))
+        third = parse()
+    finally:
+        SHARED_SPECIES_PARSERS.disable()
+
+    assert first is second
+    assert third is not first
+    assert parse() is not parse()
+
+
+def test_collection_jobs_do_not_need_infile_stdin(tmp_path):
+    collection = tmp_path / "trees.nwk"
+    collection.write_text("((A,B),(C,D));\n((A,C),(B,D));\n")
+    out = str(tmp_path / "dist.tsv")
+
+    rows = run_batch_jobs(
+        [(1, ["dist", "--collection", str(collection), "--metric", "rf", "-o", out])]
+    )
+
+    assert rows[0]["exit_status"] == 0
+    with open(out) as handle:
+        assert "\n1\t2\trf\t" in handle.read()
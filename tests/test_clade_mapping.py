@@ -79,3 +79,22 @@ def test_partial_root_transfer_matches_projected_split_and_preserves_tips():
     shared = frozenset({"A", "B", "C", "D"})
     assert projected_root_split(result, shared) == projected_root_split(source, shared)
     assert set(result.leaf_names()) == {"A", "B", "C", "D", "X"}
+
+
+@pytest.mark.parametrize("match_basis", ["clade", "split"])
+def test_wide_tree_bitsets_match_integer_masks(monkeypatch, match_basis):
+    target = Tree("((A:1,(B:1,X:1):1):1,((C:1,D:1):1,(E:1,F:1):1):1);", parser=1)
+    source = Tree("(((A:1,B:1):1,Y:1):1,(C:1,(D:1,(E:1,F:1):1):1):1);", parser=1)
+
+    def summarize():
+        mapping = build_clade_mapping(
+            target, source, taxon_mode="intersection", match_basis=match_basis
+        )
+        return [
+            (match.target, match.source, match.status, match.reason)
+            for match in mapping.matches
+        ]
+
+    expected = summarize()
+    monkeypatch.setattr("nwkit.clade_mapping.WIDE_SPLIT_MIN_LEAVES", 1)
+    assert summarize() == expected
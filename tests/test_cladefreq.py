@@ -1,7 +1,11 @@
+import random
+
+import numpy as np
 import pandas as pd
 import pytest
 
 from nwkit.cladefreq import cladefreq_main
+from nwkit.util import TreeSampling
 from tests.helpers import make_args
 from tests.helpers import write_tree_collection as _write_tree_collection
 
@@ -60,6 +64,287 @@ class TestCladefreqMain:
             pd.read_csv(threaded_out, sep="\t"),
         )
 
+    def test_worker_split_tables_match_single_thread(self, tmp_path):
+        # More than 64 trees so that the collection is split across workers.
+        topologies = [
+            "((A:1,B:2):1,((C:1,D:1):1,(E:1,F:1):1):1);",
+            "((A:1,C:1):1,((B:1,D:1):2,(E:1,F:3):1):1);",
+            "(((A:1,B:1):1,C:1):1,(D:1,(E:2,F:1):1):1);",
+            "((A:1,B:1):1,(C:1,(D:1,(E:1,F:1):1):1):1);",
+        ]
+        infile = _write_tree_collection(
+            tmp_path, topologies * 20 + topologies[:1], name="many.nwk"
+        )
+        single_out = tmp_path / "single.tsv"
+        threaded_out = tmp_path / "threaded.tsv"
+        common = dict(
+            infile=infile,
+            reference=None,
+            reference_format="auto",
+            weight_tsv=None,
+            support_scale="percent",
+        )
+
+        cladefreq_main(make_args(outfile=str(single_out), threads=1, **common))
+        cladefreq_main(make_args(outfile=str(threaded_out), threads=2, **common))
+
+        pd.testing.assert_frame_equal(
+            pd.read_csv(single_out, sep="\t"),
+            pd.read_csv(threaded_out, sep="\t"),
+        )
+
+    @pytest.mark.parametrize("threads", [1, 2])
+    def test_heavy_hitter_mode_bounds_reported_frequencies(self, tmp_path, threads):
+        rng = random.Random(3)
+        topologies = ["((A,B),((C,D),(E,F)));"] * 60
+        for _ in range(60):
+            taxa = list("ABCDEF")
+            rng.shuffle(taxa)
+            topologies.append("(({},{}),({},({},({},{}))));".format(*taxa))
+        infile = _write_tree_collection(tmp_path, topologies, name="heavy.nwk")
+        common = dict(
+            infile=infile,
+            reference=None,
+            reference_format="auto",
+            weight_tsv=None,
+            support_scale="proportion",
+            threads=threads,
+        )
+        exact_out = tmp_path / "exact.tsv"
+        heavy_out = tmp_path / "heavy.tsv"
+        cladefreq_main(make_args(outfile=str(exact_out), **common))
+        # Four clades per tree and a 0.4 error bound leave only ten counters.
+        cladefreq_main(
+            make_args(
+                outfile=str(heavy_out),
+                min_frequency=0.45,
+                top_k=0,
+                frequency_error=0.4,
+                **common,
+            )
+        )
+
+        exact = pd.read_csv(exact_out, sep="\t").set_index("descendant_taxa")
+        heavy = pd.read_csv(heavy_out, sep="\t").set_index("descendant_taxa")
+        assert set(exact.index[exact["frequency"] >= 0.45]) <= set(heavy.index)
+        error = heavy["frequency_error"].iloc[0]
+        assert 0.0 < error < 0.4
+        for clade, row in heavy.iterrows():
+            assert row["frequency"] <= exact.loc[clade, "frequency"] + 1e-12
+            assert exact.loc[clade, "frequency"] <= row["frequency"] + error + 1e-12
+
+    def test_top_k_reports_the_most_frequent_clades(self, tmp_path):
+        infile = _write_tree_collection(
+            tmp_path,
+            [
+                "((A:1,B:1):1,(C:1,D:1):1);",
+                "((A:1,B:1):1,(C:1,D:1):1);",
+                "((A:1,B:1):1,(C:1,D:1):1);",
+                "((A:1,C:1):1,(B:1,D:1):1);",
+            ],
+            name="top_k.nwk",
+        )
+        outfile = tmp_path / "top_k.tsv"
+        cladefreq_main(
+            make_args(
+                infile=infile,
+                outfile=str(outfile),
+                reference=None,
+                reference_format="auto",
+                weight_tsv=None,
+                support_scale="percent",
+                min_frequency=0.0,
+                top_k=1,
+                frequency_error=None,
+            )
+        )
+        out = pd.read_csv(outfile, sep="\t")
+        assert out["descendant_taxa"].tolist() == ["A,B"]
+        assert out["frequency"].tolist() == [75.0]
+        assert out["frequency_error"].tolist() == [0.0]
+
+    @pytest.mark.parametrize(
+        ("options", "message"),
+        [
+            (dict(min_frequency=1.5), "'--min-frequency' must be between 0 and 1"),
+            (dict(top_k=-1), "'--top-k' must be zero or a positive integer"),
+            (
+                dict(min_frequency=0.1, frequency_error=0.2),
+                "must be smaller than '--min-frequency'",
+            ),
+        ],
+    )
+    def test_rejects_invalid_heavy_hitter_options(self, tmp_path, options, message):
+        infile = _write_tree_collection(
+            tmp_path, ["((A:1,B:1):1,(C:1,D:1):1);"], name="invalid_heavy.nwk"
+        )
+        args = make_args(
+            infile=infile,
+            outfile=str(tmp_path / "invalid_heavy.tsv"),
+            reference=None,
+            reference_format="auto",
+            weight_tsv=None,
+            support_scale="percent",
+            **options,
+        )
+        with pytest.raises(ValueError, match=message):
+            cladefreq_main(args)
+
+    def test_sampled_trees_match_between_streamed_and_indexed_input(self, tmp_path):
+        rng = random.Random(11)
+        topologies = []
+        for _ in range(40):
+            taxa = list("ABCDE")
+            rng.shuffle(taxa)
+            topologies.append("(({},{}),({},({},{})));".format(*taxa))
+        infile = _write_tree_collection(tmp_path, topologies, name="sampled.nwk")
+        outputs = []
+        for collection_index in (False, True):
+            outfile = tmp_path / "sampled_{}.tsv".format(collection_index)
+            cladefreq_main(
+                make_args(
+                    infile=infile,
+                    outfile=str(outfile),
+                    reference=None,
+                    reference_format="auto",
+                    weight_tsv=None,
+                    support_scale="percent",
+                    collection_index=collection_index,
+                    burnin=10,
+                    thin=2,
+                    subsample=6,
+                    seed=5,
+                )
+            )
+            outputs.append(pd.read_csv(outfile, sep="\t"))
+
+        pd.testing.assert_frame_equal(outputs[0], outputs[1])
+        positions = [10 + 2 * index for index in range(15)]
+        selected = [
+            topologies[position]
+            for position in TreeSampling(subsample=6, seed=5).select(positions)
+        ]
+        expected = _write_tree_collection(tmp_path, selected, name="selected.nwk")
+        expected_out = tmp_path / "selected.tsv"
+        cladefreq_main(
+            make_args(
+                infile=expected,
+                outfile=str(expected_out),
+                reference=None,
+                reference_format="auto",
+                weight_tsv=None,
+                support_scale="percent",
+            )
+        )
+        pd.testing.assert_frame_equal(outputs[0], pd.read_csv(expected_out, sep="\t"))
+
+    def test_tree_sampling_rejects_tree_weights(self, tmp_path):
+        infile = _write_tree_collection(
+            tmp_path, ["((A:1,B:1):1,(C:1,D:1):1);"] * 2, name="weighted_sampled.nwk"
+        )
+        weight_tsv = tmp_path / "weights.tsv"
+        weight_tsv.write_text("weight\n1\n2\n")
+        with pytest.raises(ValueError, match="cannot be combined with '--burnin'"):
+            cladefreq_main(
+                make_args(
+                    infile=infile,
+                    outfile=str(tmp_path / "weighted_sampled.tsv"),
+                    reference=None,
+                    reference_format="auto",
+                    weight_tsv=str(weight_tsv),
+                    support_scale="percent",
+                    burnin=1,
+                )
+            )
+
+    @pytest.mark.parametrize("collection_index", [False, True])
+    def test_run_files_report_split_frequency_deviations(
+        self, tmp_path, collection_index
+    ):
+        run1 = _write_tree_collection(
+            tmp_path,
+            ["((A,B),(C,D));"] * 4 + ["((A,C),(B,D));"] * 2,
+            name="run1.t",
+        )
+        # Leaf order differs between runs; clades are matched by leaf set.
+        run2 = _write_tree_collection(
+            tmp_path,
+            ["((D,C),(B,A));"] * 2 + ["((A,C),(B,D));"] * 4,
+            name="run2.t",
+        )
+        outfile = tmp_path / "runs.tsv"
+        convergence_tsv = tmp_path / "convergence.tsv"
+        cladefreq_main(
+            make_args(
+                infile="-",
+                outfile=str(outfile),
+                reference=None,
+                reference_format="auto",
+                weight_tsv=None,
+                support_scale="proportion",
+                collection_index=collection_index,
+                run_files=[run1, run2],
+                convergence_window=3,
+                asdsf_min_frequency=0.1,
+                convergence_tsv=str(convergence_tsv),
+            )
+        )
+
+        out = pd.read_csv(outfile, sep="\t").set_index("descendant_taxa")
+        assert out.loc["A,B", "frequency"] == 0.5
+        assert out.loc["A,B", "frequency_run1"] == pytest.approx(4 / 6)
+        assert out.loc["A,B", "frequency_run2"] == pytest.approx(2 / 6)
+        assert out.loc["A,B", "sdsf"] == pytest.approx(np.std([4 / 6, 2 / 6], ddof=1))
+        convergence = pd.read_csv(convergence_tsv, sep="\t")
+        assert convergence["trees_per_run"].tolist() == [3, 6]
+        # After three trees per run, A,B and C,D are at 1 and 2/3 in the runs,
+        # and A,C and B,D at 0 and 1/3; after all trees every clade differs
+        # by 1/3.
+        first_sdsf = np.std([1.0, 2 / 3], ddof=1)
+        assert convergence["asdsf"].tolist() == pytest.approx(
+            [first_sdsf, np.std([4 / 6, 2 / 6], ddof=1)]
+        )
+        assert convergence["num_splits"].tolist() == [4, 4]
+        assert convergence["max_sdsf"].tolist()[0] == pytest.approx(first_sdsf)
+
+    @pytest.mark.parametrize(
+        ("options", "message"),
+        [
+            (dict(run_files=["run1.t"]), "at least two MCMC runs"),
+            (dict(run_files=["run1.t", "-"]), "requires file paths"),
+            (
+                dict(run_files=["run1.t", "run2.t"], weight_tsv="weights.tsv"),
+                "cannot be combined with '--run-files'",
+            ),
+        ],
+    )
+    def test_rejects_invalid_run_files(self, tmp_path, options, message):
+        args = make_args(
+            outfile=str(tmp_path / "runs.tsv"),
+            reference=None,
+            reference_format="auto",
+            weight_tsv=None,
+            support_scale="percent",
+        )
+        vars(args).update(options)
+        with pytest.raises(ValueError, match=message):
+            cladefreq_main(args)
+
+    def test_run_files_reject_different_leaf_sets(self, tmp_path):
+        run1 = _write_tree_collection(tmp_path, ["((A,B),(C,D));"], name="run1.t")
+        run2 = _write_tree_collection(tmp_path, ["((A,B),(C,E));"], name="run2.t")
+        with pytest.raises(ValueError, match="Leaf labels must be identical"):
+            cladefreq_main(
+                make_args(
+                    outfile=str(tmp_path / "runs.tsv"),
+                    reference=None,
+                    reference_format="auto",
+                    weight_tsv=None,
+                    support_scale="percent",
+                    run_files=[run1, run2],
+                )
+            )
+
     def test_reports_internal_clade_frequencies(self, tmp_path):
         infile = _write_tree_collection(
             tmp_path,
@@ -146,6 +146,33 @@ def test_python_module_entry_point():
     assert result.stdout.strip() == f"nwkit {__version__}"
 
 
+@pytest.mark.integration
+def test_info_startup_builds_one_parser_without_heavy_imports(tmp_path):
+    tree_path = tmp_path / "tree.nwk"
+    tree_path.write_text("((A:1,B:2):1,C:1);\n")
+    code = """
+import sys
+from nwkit.cli import _PendingParser, main, subparsers
+
+main(["info", "-i", sys.argv[1], "-o", sys.argv[2]])
+heavy = ("ete4", "matplotlib", "pandas", "scipy")
+print(",".join(name for name in heavy if name in sys.modules))
+entries = dict.items(subparsers.choices)
+print(",".join(n for n, p in entries if not isinstance(p, _PendingParser)))
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", code, str(tree_path), str(tmp_path / "info.txt")],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        check=False,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ["", "info"]
+    assert "Number of leaves: 3" in (tmp_path / "info.txt").read_text()
+
+
 @pytest.mark.parametrize(
     "arguments",
     [
@@ -0,0 +1,118 @@
+import math
+
+import pytest
+from ete4 import Tree
+
+from nwkit.compact_tree import CompactTree, _parse_compact_newick, read_compact_tree
+from nwkit.util import get_subtree_leaf_bitmasks, read_tree
+
+PARITY_TREES = (
+    "((A:1,B:2)90:1,(C:3,D:4)0.5:2)1;",
+    "((A,B)X:1,(C,D)'Y z':2)R;",
+    "((A:1,B:2)90:1[&&NHX:foo=bar:x=1],C:3);",
+    "(A, B ,(C ,D)  ) ;",
+    '(\'A b\':1,"C""d":2);',
+    "((A,B),());",
+    "((A,B)10 x:1,C);",
+    "((A[comment],B),C);",
+    "A;",
+)
+
+
+def _ete_snapshot(tree):
+    return (
+        tree.write(parser=1, format_root_node=True),
+        [dict(node.props) for node in tree.traverse()],
+    )
+
+
+def _read_outcome(reader, text, format):
+    try:
+        tree = reader(text, format, True, quiet=True)
+    except Exception as exc:
+        return type(exc).__name__, str(exc)
+    if isinstance(tree, CompactTree):
+        tree = tree.to_ete()
+    return _ete_snapshot(tree)
+
+
+@pytest.mark.parametrize("text", PARITY_TREES)
+@pytest.mark.parametrize("format", ["auto", "0", "1", "5", "9"])
+def test_compact_reader_matches_read_tree(text, format):
+    assert _read_outcome(read_compact_tree, text, format) == _read_outcome(
+        read_tree, text, format
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["((A,B)1e999,C);", "((A:1,B:1),C:nan);", "(A,B)", "((A,B);", "((A:,B),C);"],
+)
+def test_errors_and_non_finite_values_match_read_tree(text):
+    assert _read_outcome(read_compact_tree, text, "auto") == _read_outcome(
+        read_tree, text, "auto"
+    )
+
+
+def test_arrays_use_preorder_links_and_missing_value_markers():
+    tree, _ = _parse_compact_newick("((A:1,B:2)90:3,C);", -1)
+
+    assert tree.parser_format == 0
+    assert tree.parent.tolist() == [-1, 0, 1, 1, 0]
+    assert tree.first_child.tolist() == [1, 2, -1, -1, -1]
+    assert tree.next_sibling.tolist() == [-1, 4, 3, -1, -1]
+    assert tree.support[1] == 90.0
+    assert math.isnan(tree.support[0])
+    assert math.isnan(tree.dist[4])
+    assert list(tree.leaf_names()) == ["A", "B", "C"]
+
+
+def test_repeated_names_share_one_table_entry():
+    tree = read_compact_tree("((A,A)A,A);", "1", True, quiet=True)
+
+    assert tree.names == ("A",)
+    assert tree.name_id.tolist() == [-1, 0, 0, 0, 0]
+
+
+def test_auto_format_warns_and_auto_strict_rejects_numeric_labels(capsys):
+    tree = read_compact_tree("((A,B)90,C);", "auto", True)
+
+    assert tree.parser_format == 0
+    assert "Ambiguous tree format" in capsys.readouterr().err
+    with pytest.raises(ValueError, match="Ambiguous tree format"):
+        read_compact_tree("((A,B)90,C);", "auto-strict", True)
+
+
+def test_traversals_match_ete_order():
+    text = "(((A,B),C),(D,(E,F)));"
+    tree = read_compact_tree(text, "auto", True, quiet=True)
+    ete_tree = tree.to_ete()
+
+    def labels(order):
+        return [tree.name(index) for index in order]
+
+    assert labels(tree.postorder()) == [
+        node.name for node in ete_tree.traverse(strategy="postorder")
+    ]
+    assert labels(tree.levelorder()) == [node.name for node in ete_tree.traverse()]
+
+
+def test_subtree_leaf_bitmasks_match_ete_helper():
+    text = "(((A,B),C),(D,(E,F)));"
+    leaf_name_to_bit = {name: index for index, name in enumerate("ABCDEF")}
+    tree = read_compact_tree(text, "auto", True, quiet=True)
+    ete_masks = get_subtree_leaf_bitmasks(Tree(text, parser=1), leaf_name_to_bit)
+
+    assert sorted(tree.subtree_leaf_bitmasks(leaf_name_to_bit)) == sorted(
+        ete_masks.values()
+    )
+    with pytest.raises(ValueError, match="Leaf label not found"):
+        tree.subtree_leaf_bitmasks({"A": 0})
+
+
+def test_from_ete_round_trips_read_tree_output():
+    ete_tree = read_tree("((A:1,B:2)X:1[&&NHX:foo=bar],C:3);", "1", True, quiet=True)
+
+    assert _ete_snapshot(CompactTree.from_ete(ete_tree).to_ete()) == _ete_snapshot(
+        ete_tree
+    )
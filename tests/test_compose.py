@@ -1,3 +1,4 @@
+import gzip
 import json
 
 import pandas as pd
@@ -59,14 +60,18 @@ def test_compose_combines_root_names_support_lengths_and_property(tmp_nwk, tmp_p
     assert (rows["status"] == "transferred").any()
 
 
-def test_compose_json_manifest_resolves_relative_paths(tmp_path):
+@pytest.mark.parametrize("compressed", [False, True])
+def test_compose_json_manifest_resolves_relative_paths(tmp_path, compressed):
     topology = tmp_path / "topology.nwk"
     names = tmp_path / "names.nwk"
     manifest = tmp_path / "compose.json"
     outfile = tmp_path / "output.nwk"
     topology.write_text("((A:1,B:1):1,C:1);")
     names.write_text("((A:1,B:1)AB:1,C:1)ROOT;")
-    manifest.write_text('{"name": "names.nwk"}')
+    manifest_bytes = b'{"name": "names.nwk"}'
+    manifest.write_bytes(
+        gzip.compress(manifest_bytes) if compressed else manifest_bytes
+    )
     args = make_args(
         infile=str(topology),
         outfile=str(outfile),
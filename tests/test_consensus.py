@@ -48,6 +48,43 @@ class TestConsensusMain:
             ).write()
         )
 
+    @pytest.mark.parametrize("comparison", ["rooted", "unrooted"])
+    @pytest.mark.parametrize("branch_length", ["mean", "median"])
+    def test_wide_tree_bitsets_match_integer_masks(
+        self, tmp_path, monkeypatch, comparison, branch_length
+    ):
+        infile = _write_tree_collection(
+            tmp_path,
+            [
+                "((A:1,B:2):1,((C:1,D:1):1,(E:1,F:1):1):1);",
+                "((A:1,C:1):1,((B:1,D:1):2,(E:1,F:3):1):1);",
+                "(((A:1,B:1):1,C:1):1,(D:1,(E:2,F):1):1);",
+                "((A:3,B:1):2,(C:1,(D:1,(E:1,F:1):1):1):1);",
+            ],
+            name="wide.nwk",
+        )
+        common = dict(
+            infile=infile,
+            min_freq=0.5,
+            reference=None,
+            reference_format="auto",
+            support_scale="percent",
+            method="greedy",
+            comparison=comparison,
+            branch_length=branch_length,
+            weight_tsv=None,
+        )
+        outputs = []
+        for threshold in (10**9, 1):
+            monkeypatch.setattr("nwkit.consensus.WIDE_SPLIT_MIN_LEAVES", threshold)
+            outfile = str(tmp_path / "wide_{}.nwk".format(threshold))
+            consensus_main(make_args(outfile=outfile, **common))
+            outputs.append(
+                read_tree(outfile, format="auto", quoted_node_names=True, quiet=True)
+            )
+
+        assert outputs[0].write(parser=1) == outputs[1].write(parser=1)
+
     def test_strict_consensus_removes_conflicting_clades(self, tmp_path):
         infile = _write_tree_collection(
             tmp_path,
@@ -212,6 +249,75 @@ class TestConsensusMain:
         assert abs(tree.common_ancestor(["A", "B"]).dist - 2.0) < 1e-6
         assert abs(next(tree.search_nodes(name="A")).dist - 3.0) < 1e-6
 
+    @pytest.mark.parametrize("threads", [1, 2])
+    def test_branch_length_quantiles_are_written_as_node_props(self, tmp_path, threads):
+        # 100 trees exceed the exact sketch capacity and the parallel threshold.
+        infile = _write_tree_collection(
+            tmp_path,
+            [
+                "((A:{0},B:1):{0},(C:1,D:1):1);".format(index + 1)
+                for index in range(100)
+            ],
+            name="quantiles.nwk",
+        )
+        common = dict(
+            infile=infile,
+            min_freq=0.5,
+            reference=None,
+            reference_format="auto",
+            support_scale="percent",
+            method="majority",
+            branch_length="median,q05,q95",
+            weight_tsv=None,
+            threads=threads,
+        )
+        trees = {}
+        for quantile_error in (0.0, 0.01):
+            outfile = str(tmp_path / "quantiles_{}.nwk".format(quantile_error))
+            consensus_main(
+                make_args(outfile=outfile, quantile_error=quantile_error, **common)
+            )
+            trees[quantile_error] = read_tree(
+                outfile, format="auto", quoted_node_names=True, quiet=True
+            )
+
+        exact_node = trees[0.0].common_ancestor(["A", "B"])
+        assert exact_node.dist == 50.0
+        assert float(exact_node.props["branch_length_q05"]) == 5.0
+        assert float(exact_node.props["branch_length_q95"]) == 95.0
+        sketch_node = trees[0.01].common_ancestor(["A", "B"])
+        for key, expected in (("branch_length_q05", 5.0), ("branch_length_q95", 95.0)):
+            assert abs(float(sketch_node.props[key]) - expected) <= 0.01 * expected
+        assert abs(sketch_node.dist - 50.0) <= 0.5
+
+    @pytest.mark.parametrize(
+        ("branch_length", "message"),
+        [
+            ("mean,q05", "can be combined with median only"),
+            ("q150", "Unsupported '--branch-length': q150"),
+            ("q05,q05", "Duplicated '--branch-length' statistic"),
+        ],
+    )
+    def test_rejects_invalid_branch_length_quantiles(
+        self, tmp_path, branch_length, message
+    ):
+        infile = _write_tree_collection(
+            tmp_path, ["((A:1,B:1):1,(C:1,D:1):1);"], name="invalid_quantiles.nwk"
+        )
+        args = make_args(
+            infile=infile,
+            outfile=str(tmp_path / "invalid_quantiles_out.nwk"),
+            min_freq=0.5,
+            reference=None,
+            reference_format="auto",
+            support_scale="percent",
+            method="majority",
+            branch_length=branch_length,
+            weight_tsv=None,
+        )
+        with pytest.raises(ValueError, match=message):
+            consensus_main(args)
+
     def test_extreme_finite_weights_are_normalized_before_aggregation(
         self,
         tmp_path,
@@ -1,10 +1,17 @@
 import csv
 import math
+import random
 
 import pytest
 from ete4 import Tree
 
-from nwkit.dist import _path_distance, dist_main
+from nwkit import dist
+from nwkit.dist import (
+    _blocked_path_distance,
+    _pairwise_path_distance,
+    _path_distance,
+    dist_main,
+)
 from tests.helpers import make_args
 
 
@@ -166,7 +173,73 @@ class TestDistMain:
             dist_main(args)
 
 
+def _random_tree(rng, names):
+    tree = Tree()
+    tree.populate(len(names), names=list(names), dist_fn=rng.random)
+    for node in list(tree.traverse()):
+        if (not node.is_leaf) and (not node.is_root) and rng.random() < 0.2:
+            node.delete()
+    for node in list(tree.traverse()):
+        if (not node.is_root) and rng.random() < 0.1:
+            parent = node.up
+            node.detach()
+            parent.add_child(dist=rng.random()).add_child(node)
+    return tree
+
+
 class TestDistanceMetrics:
+    @pytest.mark.parametrize("topological", [True, False])
+    def test_blocked_path_distance_matches_pairwise_paths(
+        self, monkeypatch, topological
+    ):
+        rng = random.Random(5)
+        for _ in range(40):
+            names = ["T{}".format(index) for index in range(rng.randint(2, 30))]
+            tree1 = _random_tree(rng, names)
+            rng.shuffle(names)
+            tree2 = _random_tree(rng, names)
+            leaf_names = sorted(names)
+            monkeypatch.setattr(dist, "PATH_BLOCK_SIZE", rng.choice([1, 4, 1024]))
+
+            blocked = _blocked_path_distance(tree1, tree2, leaf_names, topological)
+
+            assert blocked == pytest.approx(
+                _pairwise_path_distance(tree1, tree2, leaf_names, topological),
+                rel=1e-12,
+            )
+
+    def test_large_trees_use_parallel_path_blocks(
+        self, monkeypatch, tmp_nwk, tmp_outfile
+    ):
+        names = ["T{}".format(index) for index in range(40)]
+        newick = "({}:1,{}:1)".format(names[0], names[1])
+        for name in names[2:]:
+            newick = "({}:1,{}:1)".format(newick, name)
+        newick2 = newick.replace(
+            "{}:1)".format(names[-1]), "{}:{!r})".format(names[-1], 1.0 + 2.0**-40)
+        )
+        monkeypatch.setattr(dist, "PATH_MATRIX_MAX_TAXA", 8)
+        monkeypatch.setattr(dist, "PATH_BLOCK_SIZE", 16)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("pairwise paths were used")
+
+        monkeypatch.setattr(dist, "_pairwise_path_distance", fail)
+        dist_main(
+            make_args(
+                infile=tmp_nwk(newick + ";", "tree1.nwk"),
+                infile2=tmp_nwk(newick2 + ";", "tree2.nwk"),
+                outfile=tmp_outfile,
+                format2="auto",
+                metric=["path-length"],
+                dist=None,
+                threads=2,
+            )
+        )
+
+        distance = float(_read_tsv(tmp_outfile)[0]["distance"])
+        assert distance == pytest.approx(math.sqrt(39) * 2.0**-40, rel=1e-12)
+
     def test_path_length_falls_back_for_nearly_identical_distance_matrices(self):
         def balanced_newick(names):
             if len(names) == 1:
@@ -197,6 +270,30 @@ class TestDistanceMetrics:
             abs=0.0,
         )
 
+    @pytest.mark.parametrize("comparison", ["rooted", "unrooted"])
+    def test_rf_engines_agree(self, tmp_nwk, tmp_path, comparison):
+        path1 = tmp_nwk("(((A,B),(C,(D,E))),(F,G));", "tree1.nwk")
+        path2 = tmp_nwk("(((A,C),(B,(D,E))),(G,F));", "tree2.nwk")
+        rows_by_engine = dict()
+        for engine in ("linear", "ete"):
+            outfile = str(tmp_path / "{}.tsv".format(engine))
+            dist_main(
+                make_args(
+                    infile=path1,
+                    infile2=path2,
+                    outfile=outfile,
+                    format2="auto",
+                    metric=["rf,normalized-rf"],
+                    dist=None,
+                    comparison=comparison,
+                    rf_engine=engine,
+                )
+            )
+            rows_by_engine[engine] = _read_tsv(outfile)
+
+        assert rows_by_engine["linear"] == rows_by_engine["ete"]
+        assert rows_by_engine["linear"][0]["distance"] == "4"
+
     def test_all_is_default_and_uses_stable_long_form_rows(self, tmp_nwk, tmp_outfile):
         path1 = tmp_nwk("((A:1,B:1):1,(C:1,D:1):1);", "tree1.nwk")
         path2 = tmp_nwk("((A:1,C:1):1,(B:1,D:1):1);", "tree2.nwk")
@@ -544,15 +641,301 @@ class TestDistanceMetrics:
             infile2=path2,
             outfile="-",
             format2="auto",
-            metric=["quartet"],
+            metric=["spr"],
             dist=None,
             comparison="rooted",
         )
 
-        with pytest.raises(ValueError, match="Unsupported metric 'quartet'"):
+        with pytest.raises(ValueError, match="Unsupported metric 'spr'"):
+            dist_main(args)
+
+    def test_triplet_and_quartet_rows_report_their_own_rooting(
+        self, tmp_nwk, tmp_outfile
+    ):
+        path1 = tmp_nwk("(((A,B),C),(D,E));", "tree1.nwk")
+        path2 = tmp_nwk("((A,B),(C,(D,E)));", "tree2.nwk")
+        args = make_args(
+            infile=path1,
+            infile2=path2,
+            outfile=tmp_outfile,
+            format2="auto",
+            metric=["triplet,quartet"],
+            dist=None,
+            comparison="unrooted",
+        )
+
+        dist_main(args)
+
+        rows = {row["metric"]: row for row in _read_tsv(tmp_outfile)}
+        assert (rows["triplet"]["comparison"], rows["triplet"]["distance"]) == (
+            "rooted",
+            "4",
+        )
+        assert rows["triplet"]["max_distance"] == "10"
+        assert rows["quartet"]["comparison"] == "root-independent"
+        assert (rows["quartet"]["distance"], rows["quartet"]["max_distance"]) == (
+            "0",
+            "5",
+        )
+
+    def test_all_excludes_leaf_set_metrics_unless_named(self):
+        assert "quartet" not in dist._parse_metric_values(["all"])
+        assert dist._parse_metric_values(["all,triplet"])[-1] == "triplet"
+
+    def test_triplet_requires_rooted_trees(self, tmp_nwk):
+        path1 = tmp_nwk("(A,B,(C,D));", "tree1.nwk")
+        path2 = tmp_nwk("((A,B),(C,D));", "tree2.nwk")
+        args = make_args(
+            infile=path1,
+            infile2=path2,
+            outfile="-",
+            format2="auto",
+            metric=["triplet"],
+            dist=None,
+            comparison="unrooted",
+        )
+
+        with pytest.raises(ValueError, match="Triplet distance requires rooted"):
             dist_main(args)
 
     def test_metric_and_deprecated_dist_cannot_be_combined(self):
         args = make_args(metric=["rf"], dist="RF")
         with pytest.raises(ValueError, match="either"):
             dist_main(args)
+
+
+class TestDistCollection:
+    TREES = [
+        "((A:1,B:2):1,(C:1,D:3):2);",
+        "((A:1,C:2):1,(B:1,D:1):1);",
+        "(((A:2,B:1):1,C:1):1,D:2);",
+        "((A:1,B:2):1,(C:1,D:3):2);",
+    ]
+
+    def _pairwise_rows(self, tmp_nwk, tmp_path, metric, comparison):
+        rows = []
+        for index1 in range(len(self.TREES)):
+            for index2 in range(index1 + 1, len(self.TREES)):
+                outfile = str(tmp_path / "pair.tsv")
+                dist_main(
+                    make_args(
+                        infile=tmp_nwk(self.TREES[index1], "a.nwk"),
+                        infile2=tmp_nwk(self.TREES[index2], "b.nwk"),
+                        outfile=outfile,
+                        format2="auto",
+                        metric=[metric],
+                        dist=None,
+                        comparison=comparison,
+                    )
+                )
+                rows.extend(_read_tsv(outfile))
+        return rows
+
+    @pytest.mark.parametrize("comparison", ["rooted", "unrooted"])
+    @pytest.mark.parametrize("threads", [1, 2])
+    def test_long_rows_match_pairwise_dist(
+        self, tmp_nwk, tmp_path, tmp_outfile, comparison, threads
+    ):
+        metric = (
+            "rf,weighted-rf,branch-score,path-topological,path-length,triplet,quartet"
+        )
+        collection = tmp_nwk("\n".join(self.TREES) + "\n", "collection.nwk")
+
+        dist_main(
+            make_args(
+                infile="-",
+                infile2=None,
+                collection=collection,
+                outfile=tmp_outfile,
+                metric=[metric],
+                dist=None,
+                comparison=comparison,
+                threads=threads,
+            )
+        )
+
+        rows = _read_tsv(tmp_outfile)
+        assert list(rows[0]) == ["tree1", "tree2", "metric", "comparison"] + [
+            "num_taxa",
+            "distance",
+            "max_distance",
+        ]
+        assert [(row["tree1"], row["tree2"]) for row in rows[:4]] == [("1", "2")] * 4
+        expected = self._pairwise_rows(tmp_nwk, tmp_path, metric, comparison)
+        distances = [float(row.pop("distance")) for row in rows]
+        expected_distances = [float(row.pop("distance")) for row in expected]
+        for row in rows:
+            del row["tree1"], row["tree2"]
+        assert rows == expected
+        assert distances == pytest.approx(expected_distances, rel=1e-12)
+
+    def test_square_matrix_is_symmetric_with_zero_diagonal(self, tmp_nwk, tmp_outfile):
+        collection = tmp_nwk("\n".join(self.TREES) + "\n", "collection.nwk")
+
+        dist_main(
+            make_args(
+                infile="-",
+                infile2=None,
+                collection=collection,
+                outfile=tmp_outfile,
+                metric=["rf"],
+                dist=None,
+                matrix_format="square",
+            )
+        )
+
+        rows = _read_tsv(tmp_outfile)
+        assert list(rows[0]) == ["metric", "tree", "1", "2", "3", "4"]
+        matrix = [[float(row[str(column)]) for column in range(1, 5)] for row in rows]
+        assert matrix[0] == [0.0, 4.0, 2.0, 0.0]
+        assert all(matrix[i][j] == matrix[j][i] for i in range(4) for j in range(4))
+        assert all(matrix[i][i] == 0.0 for i in range(4))
+
+    def test_burnin_and_thin_select_collection_trees(self, tmp_nwk, tmp_outfile):
+        collection = tmp_nwk("\n".join(self.TREES) + "\n", "collection.nwk")
+
+        dist_main(
+            make_args(
+                infile="-",
+                infile2=None,
+                collection=collection,
+                outfile=tmp_outfile,
+                metric=["rf"],
+                dist=None,
+                matrix_format="square",
+                burnin=1,
+                thin=2,
+            )
+        )
+
+        rows = _read_tsv(tmp_outfile)
+        assert list(rows[0]) == ["metric", "tree", "1", "2"]
+        assert [float(rows[0]["2"]), float(rows[1]["1"])] == [4.0, 4.0]
+
+    def test_collection_and_infile2_are_mutually_exclusive(self, tmp_nwk):
+        path = tmp_nwk(self.TREES[0])
+
+        with pytest.raises(ValueError, match="not both"):
+            dist_main(
+                make_args(
+                    infile="-", infile2=path, collection=path, outfile="-", dist=None
+                )
+            )
+
+    def test_collection_trees_must_share_leaves(self, tmp_nwk):
+        collection = tmp_nwk("((A,B),(C,D));\n((A,B),(C,E));\n", "collection.nwk")
+
+        with pytest.raises(ValueError, match="--collection trees 1 and 2"):
+            dist_main(
+                make_args(
+                    infile="-",
+                    infile2=None,
+                    collection=collection,
+                    outfile="-",
+                    metric=["rf"],
+                    dist=None,
+                )
+            )
+
+    def test_topological_paths_do_not_need_branch_lengths(self, tmp_nwk, tmp_outfile):
+        collection = tmp_nwk("((A,B),(C,D));\n((A,C),(B,D));\n", "collection.nwk")
+
+        dist_main(
+            make_args(
+                infile="-",
+                infile2=None,
+                collection=collection,
+                outfile=tmp_outfile,
+                metric=["path-topological"],
+                dist=None,
+            )
+        )
+
+        assert float(_read_tsv(tmp_outfile)[0]["distance"]) == pytest.approx(2.0)
+
+
+class TestDistReference:
+    TREES = TestDistCollection.TREES
+
+    @pytest.mark.parametrize("threads", [1, 2])
+    def test_rows_match_pairwise_dist_in_collection_order(
+        self, tmp_nwk, tmp_path, tmp_outfile, threads, monkeypatch
+    ):
+        monkeypatch.setattr(dist, "REFERENCE_CHUNK_SIZE", 2)
+        metric = "rf,normalized-rf,weighted-rf,branch-score,path-topological,quartet"
+        reference = tmp_nwk(self.TREES[1], "reference.nwk")
+        collection = tmp_nwk("\n".join(self.TREES) + "\n", "collection.nwk")
+
+        dist_main(
+            make_args(
+                infile=reference,
+                infile2=None,
+                collection=collection,
+                outfile=tmp_outfile,
+                metric=[metric],
+                dist=None,
+                comparison="unrooted",
+                threads=threads,
+            )
+        )
+
+        rows = _read_tsv(tmp_outfile)
+        assert list(rows[0])[:2] == ["tree", "metric"]
+        assert [row["tree"] for row in rows] == [
+            str(index) for index in range(1, 5) for _ in range(6)
+        ]
+        for index, tree in enumerate(self.TREES, start=1):
+            outfile = str(tmp_path / "pair.tsv")
+            dist_main(
+                make_args(
+                    infile=reference,
+                    infile2=tmp_nwk(tree, "other.nwk"),
+                    outfile=outfile,
+                    format2="auto",
+                    metric=[metric],
+                    dist=None,
+                    comparison="unrooted",
+                )
+            )
+            expected = _read_tsv(outfile)
+            got = [
+                {key: value for key, value in row.items() if key != "tree"}
+                for row in rows
+                if row["tree"] == str(index)
+            ]
+            assert [float(row.pop("distance")) for row in got] == pytest.approx(
+                [float(row.pop("distance")) for row in expected], rel=1e-12
+            )
+            assert got == expected
+
+    def test_leaf_mismatch_names_the_collection_tree(self, tmp_nwk):
+        reference = tmp_nwk("((A,B),(C,D));", "reference.nwk")
+        collection = tmp_nwk("((A,B),(C,D));\n((A,B),(C,E));\n", "collection.nwk")
+
+        with pytest.raises(ValueError, match="--infile and --collection tree 2"):
+            dist_main(
+                make_args(
+                    infile=reference,
+                    infile2=None,
+                    collection=collection,
+                    outfile="-",
+                    metric=["rf"],
+                    dist=None,
+                )
+            )
+
+    def test_square_matrix_is_rejected(self, tmp_nwk):
+        path = tmp_nwk("((A,B),(C,D));")
+
+        with pytest.raises(ValueError, match="square"):
+            dist_main(
+                make_args(
+                    infile=path,
+                    infile2=None,
+                    collection=path,
+                    outfile="-",
+                    metric=["rf"],
+                    dist=None,
+                    matrix_format="square",
+                )
+            )
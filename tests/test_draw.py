@@ -1,6 +1,8 @@
+import io
 import json
 import math
 import re
+import sys
 from argparse import Namespace
 
 import matplotlib
@@ -516,6 +518,21 @@ class TestDrawMain:
         assert payload["densitree_sample_count"] == 1
         assert payload["densitree_topology_count"] == 1
 
+        draw_main(
+            make_draw_args(
+                infile=str(infile),
+                outfile=str(tmp_path / "subsampled.svg"),
+                image_format="svg",
+                species_overlap_node_plot="no",
+                densitree_trees=str(samples),
+                densitree="all",
+                subsample=2,
+                seed=1,
+                layout_report=str(report),
+            )
+        )
+        assert json.loads(report.read_text())["densitree_sample_count"] == 2
+
         mismatched = tmp_path / "mismatched.nwk"
         mismatched.write_text("((A:1,B:1):1,(C:1,E:1):1);\n")
         with pytest.raises(ValueError, match="different tip set"):
@@ -530,6 +547,42 @@ class TestDrawMain:
                 )
             )
 
+    def test_densitree_reads_nexus_from_stdin(
+        self,
+        monkeypatch,
+        tmp_nwk,
+        tmp_path,
+    ):
+        infile = tmp_nwk("((A:1,B:1):1,(C:1,D:1):1);")
+        monkeypatch.setattr(
+            sys,
+            "stdin",
+            io.StringIO(
+                "#NEXUS\nbegin trees;\n"
+                "  tree gen.0 = [&U] ((A:1,C:1):1,(B:1,D:1):1);\n"
+                "  tree gen.100 = [&U] ((A:1,B:1):1,(C:1,D:1):1);\n"
+                "  tree gen.200 = [&U] ((A:1,C:1):1,(B:1,D:1):1);\nend;\n"
+            ),
+        )
+        report = tmp_path / "stdin.json"
+
+        draw_main(
+            make_draw_args(
+                infile=str(infile),
+                outfile=str(tmp_path / "stdin.svg"),
+                image_format="svg",
+                species_overlap_node_plot="no",
+                densitree_trees="-",
+                densitree="all",
+                posterior_burnin=1,
+                layout_report=str(report),
+            )
+        )
+
+        payload = json.loads(report.read_text())
+        assert payload["densitree_sample_count"] == 2
+        assert payload["densitree_topology_count"] == 2
+
     def test_densitree_sources_are_mutually_exclusive(
         self,
         tmp_nwk,
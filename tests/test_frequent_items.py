@@ -0,0 +1,41 @@
+import random
+from collections import Counter
+
+import pytest
+
+from nwkit.frequent_items import FrequentItemSummary
+
+
+class TestFrequentItemSummary:
+    def test_estimates_are_within_the_reported_error(self):
+        rng = random.Random(7)
+        summary = FrequentItemSummary(capacity=5)
+        truth: Counter[int] = Counter()
+        for _ in range(50):
+            batch = Counter(
+                {
+                    rng.choice([0, 1, 2])
+                    if rng.random() < 0.6
+                    else rng.randrange(1000): 1.0
+                }
+            )
+            batch.update({rng.randrange(1000): 0.5 for _ in range(4)})
+            truth.update(batch)
+            summary.update(batch)
+        estimates = summary.estimates()
+        assert len(estimates) <= 5
+        assert 0.0 < summary.error <= sum(truth.values()) / 6
+        for item, weight in truth.items():
+            assert estimates.get(item, 0.0) <= weight + 1e-12
+            assert weight <= estimates.get(item, 0.0) + summary.error + 1e-12
+
+    def test_small_streams_are_exact(self):
+        summary = FrequentItemSummary(capacity=3)
+        summary.update({"a": 1.0, "b": 2.0})
+        summary.update({"a": 0.5, "c": 1.0})
+        assert summary.estimates() == {"a": 1.5, "b": 2.0, "c": 1.0}
+        assert summary.error == 0.0
+
+    def test_rejects_empty_capacity(self):
+        with pytest.raises(ValueError, match="at least one counter"):
+            FrequentItemSummary(capacity=0)
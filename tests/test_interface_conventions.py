@@ -1,4 +1,5 @@
 import argparse
+import gzip
 import io
 import json
 import re
@@ -516,6 +517,18 @@ def test_specialized_tsv_inputs_support_standard_input(monkeypatch, tmp_path):
     }
 
 
+def test_species_name_tsv_reads_gzip_without_suffix(monkeypatch, tmp_path):
+    data = gzip.compress(b"leaf_name\tspecies_name\nA\tApis mellifera\n")
+    path = tmp_path / "species.tsv"
+    path.write_bytes(data)
+    assert read_species_name_tsv(str(path)) == {"A": "Apis mellifera"}
+
+    monkeypatch.setattr(
+        sys, "stdin", io.TextIOWrapper(io.BufferedReader(io.BytesIO(data)))
+    )
+    assert read_species_name_tsv("-") == {"A": "Apis mellifera"}
+
+
 def test_constrain_validates_standard_input_only_once(monkeypatch):
     monkeypatch.setattr(sys, "stdin", io.StringIO("A_a\nB_b\n"))
     labels, taxid_df = check_input_file(
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from nwkit.quantile_sketch import (
+    EXACT_CAPACITY,
+    WeightedQuantileSketch,
+    weighted_quantile,
+)
+
+
+class TestWeightedQuantileSketch:
+    def test_small_sketches_are_exact(self):
+        sketch = WeightedQuantileSketch(0.01)
+        sketch.extend([(1.0, 1.0), (None, 5.0), (3.0, 1.0), (2.0, 3.0)])
+        assert sketch.is_exact
+        assert sketch.quantile(0.5) == 2.0
+        assert sketch.quantile(0.0) == 1.0
+        assert sketch.quantile(1.0) == 3.0
+        assert WeightedQuantileSketch(0.01).quantile(0.5) is None
+
+    @pytest.mark.parametrize("shift", [0.0, -2.0])
+    def test_merged_sketches_stay_within_relative_error(self, shift):
+        rng = np.random.default_rng(7)
+        values = np.r_[rng.lognormal(0.0, 2.0, 3000) + shift, np.zeros(100)]
+        weights = rng.random(len(values))
+        sketches = []
+        for part in np.array_split(np.arange(len(values)), 5):
+            sketch = WeightedQuantileSketch(0.01)
+            sketch.extend_arrays(values[part], weights[part])
+            sketches.append(sketch)
+        merged = sketches[0]
+        for sketch in sketches[1:]:
+            merged.merge(sketch)
+        assert not merged.is_exact
+        bucket_count = len(merged.positive_buckets) + len(merged.negative_buckets)
+        assert bucket_count < len(values) / 2
+        for quantile in (0.0, 0.05, 0.5, 0.95, 1.0):
+            exact = weighted_quantile(values.tolist(), weights.tolist(), quantile)
+            assert merged.quantile(quantile) == pytest.approx(exact, rel=0.01)
+
+    def test_switches_to_buckets_past_capacity(self):
+        sketch = WeightedQuantileSketch(0.05)
+        sketch.extend((float(value), 1.0) for value in range(1, EXACT_CAPACITY + 1))
+        assert sketch.is_exact
+        sketch.extend([(1e308, 1.0), (float("nan"), 1.0)])
+        assert not sketch.is_exact
+        assert sketch.quantile(1.0) == 1e308
+        assert sketch.quantile(0.5) == pytest.approx(33.0, rel=0.05)
+
+    def test_rejects_invalid_error_bounds(self):
+        with pytest.raises(ValueError, match="quantile-error"):
+            WeightedQuantileSketch(0.0)
@@ -0,0 +1,152 @@
+import random
+from itertools import combinations
+
+import numpy as np
+import pytest
+from ete4 import Tree
+
+from nwkit import quartet
+from nwkit.quartet import quartet_distance, triplet_distance
+
+
+def _random_tree(rng, names):
+    tree = Tree()
+    tree.populate(len(names), names=list(names))
+    for node in list(tree.traverse()):
+        if (not node.is_leaf) and (not node.is_root) and rng.random() < 0.3:
+            node.delete()
+    for node in list(tree.traverse()):
+        if (not node.is_root) and rng.random() < 0.1:
+            parent = node.up
+            node.detach()
+            parent.add_child().add_child(node)
+    while rng.random() < 0.15:
+        root = Tree()
+        root.add_child(tree)
+        tree = root
+    return tree
+
+
+def _triplet_topology(tree, names):
+    top = tree.common_ancestor(list(names))
+    for pair in combinations(names, 2):
+        if tree.common_ancestor(list(pair)) is not top:
+            return frozenset(pair)
+    return None
+
+
+def _quartet_topology(tree, names):
+    a, b, c, d = names
+    sums = {
+        frozenset([frozenset([a, b]), frozenset([c, d])]): None,
+        frozenset([frozenset([a, c]), frozenset([b, d])]): None,
+        frozenset([frozenset([a, d]), frozenset([b, c])]): None,
+    }
+    for split in sums:
+        sums[split] = sum(
+            tree.get_distance(*sorted(cherry), topological=True) for cherry in split
+        )
+    shortest = min(sums.values())
+    topologies = [split for split, value in sums.items() if value == shortest]
+    return topologies[0] if len(topologies) == 1 else None
+
+
+def _brute_force(tree1, tree2, size, topology):
+    names = sorted(tree1.leaf_names())
+    return sum(
+        topology(tree1, subset) != topology(tree2, subset)
+        for subset in combinations(names, size)
+    )
+
+
+@pytest.mark.parametrize(
+    "distance, size, topology",
+    [
+        (triplet_distance, 3, _triplet_topology),
+        (quartet_distance, 4, _quartet_topology),
+    ],
+)
+def test_counts_match_brute_force_with_polytomies(distance, size, topology):
+    rng = random.Random(5)
+    for _ in range(60):
+        names = ["T{}".format(index) for index in range(rng.randint(size, 9))]
+        tree1 = _random_tree(rng, names)
+        rng.shuffle(names)
+        tree2 = _random_tree(rng, names)
+
+        expected = _brute_force(tree1, tree2, size, topology)
+
+        assert distance(tree1, tree2)[0] == expected
+
+
+def _caterpillar(names):
+    newick = names[0]
+    for name in names[1:]:
+        newick = "({},{})".format(newick, name)
+    return Tree(newick + ";")
+
+
+@pytest.mark.parametrize(
+    "distance, size, topology",
+    [
+        (triplet_distance, 3, _triplet_topology),
+        (quartet_distance, 4, _quartet_topology),
+    ],
+)
+def test_caterpillars_match_brute_force(distance, size, topology):
+    names = ["T{}".format(index) for index in range(9)]
+    tree1 = _caterpillar(names)
+    tree2 = _caterpillar(names[::-1])
+
+    for other in (tree1, tree2):
+        expected = _brute_force(tree1, other, size, topology)
+
+        assert distance(tree1, other)[0] == expected
+
+
+def test_small_blocks_and_python_integers_give_the_same_counts(monkeypatch):
+    rng = random.Random(9)
+    names = ["T{}".format(index) for index in range(40)]
+    pairs = list()
+    for _ in range(4):
+        tree1 = _random_tree(rng, names)
+        rng.shuffle(names)
+        pairs.append((tree1, _random_tree(rng, names)))
+    expected = [(triplet_distance(*trees), quartet_distance(*trees)) for trees in pairs]
+
+    monkeypatch.setattr(quartet, "QUARTET_BLOCK_LEAVES", 5)
+    monkeypatch.setattr(quartet, "_INT64_MAX", 0)
+
+    assert [
+        (triplet_distance(*trees), quartet_distance(*trees)) for trees in pairs
+    ] == expected
+
+
+def test_exact_sum_does_not_wrap_around():
+    values = np.full(4, 2**62, dtype=np.int64)
+
+    assert quartet._exact_sum(values) == 2**64
+
+
+def test_quartets_ignore_the_root_and_triplets_do_not():
+    tree1 = Tree("(((A,B),C),(D,E));")
+    tree2 = Tree("((A,B),(C,(D,E)));")
+
+    assert quartet_distance(tree1, tree2) == (0, 5)
+    assert triplet_distance(tree1, tree2) == (4, 10)
+    assert triplet_distance(tree1, Tree("((A,B,C),(D,E));")) == (1, 10)
+
+
+def test_single_child_roots_are_ignored():
+    tree1 = Tree("((a,(b,c),d,e));")
+    tree2 = Tree("(a,(b,c),(d,e));")
+
+    assert quartet_distance(tree1, tree2) == (2, 5)
+    assert quartet_distance(tree2, tree1) == (2, 5)
+    assert quartet_distance(Tree("(((a,(b,c),d,e)));"), tree1) == (0, 5)
+
+
+def test_small_and_mismatched_trees():
+    assert quartet_distance(Tree("(A,(B,C));"), Tree("((A,B),C);")) == (0, 0)
+    with pytest.raises(ValueError, match="Leaf name"):
+        triplet_distance(Tree("((A,B),C);"), Tree("((A,B),D);"))
@@ -542,17 +542,23 @@ class TestRootRefactorValidation:
             tree = make_random_binary_tree(
                 num_leaves=rng.randint(5, 10), rng=rng, leaf_prefix="R"
             )
-            subtree_stats, all_stats = root._collect_leaf_distance_stats(tree)
+            tree_arrays = root._reroot_tree_arrays(tree, "MV")
+            subtree_stats, all_stats = root._collect_leaf_distance_stats(tree_arrays)
+            scale = tree_arrays["branch_length_scale"]
             all_leaves = list(tree.leaves())
-            for node in tree.traverse():
+            for index, node in enumerate(tree_arrays["nodes"]):
                 sub_leaves = list(node.leaves())
-                sub_dists = [tree.get_distance(node, leaf) for leaf in sub_leaves]
-                s_count, s_sum, s_sumsq = subtree_stats[node]
+                sub_dists = [
+                    tree.get_distance(node, leaf) / scale for leaf in sub_leaves
+                ]
+                s_count, s_sum, s_sumsq = (stat[index] for stat in subtree_stats)
                 assert s_count == len(sub_dists)
                 assert s_sum == pytest.approx(sum(sub_dists), abs=1e-9)
                 assert s_sumsq == pytest.approx(sum(d * d for d in sub_dists), abs=1e-9)
-                all_dists = [tree.get_distance(node, leaf) for leaf in all_leaves]
-                a_count, a_sum, a_sumsq = all_stats[node]
+                all_dists = [
+                    tree.get_distance(node, leaf) / scale for leaf in all_leaves
+                ]
+                a_count, a_sum, a_sumsq = (stat[index] for stat in all_stats)
                 assert a_count == len(all_dists)
                 assert a_sum == pytest.approx(sum(all_dists), abs=1e-9)
                 assert a_sumsq == pytest.approx(sum(d * d for d in all_dists), abs=1e-9)
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+from ete4 import Tree
+
+from nwkit.rf import robinson_foulds
+from nwkit.util import is_rooted
+
+
+def _random_tree(rng, names):
+    tree = Tree()
+    tree.populate(len(names), names=list(names))
+    for node in list(tree.traverse()):
+        if (not node.is_leaf) and (not node.is_root) and rng.random() < 0.2:
+            node.delete()
+    for node in list(tree.traverse()):
+        if (not node.is_root) and rng.random() < 0.1:
+            parent = node.up
+            node.detach()
+            parent.add_child().add_child(node)
+    while rng.random() < 0.15:
+        root = Tree()
+        root.add_child(tree)
+        tree = root
+    return tree
+
+
+@pytest.mark.parametrize("unrooted", [False, True])
+def test_linear_engine_matches_ete(unrooted):
+    rng = random.Random(11)
+    for _ in range(200):
+        names = ["T{}".format(index) for index in range(rng.randint(2, 12))]
+        tree1 = _random_tree(rng, names)
+        rng.shuffle(names)
+        tree2 = _random_tree(rng, names)
+        if (not unrooted) and not (is_rooted(tree1) and is_rooted(tree2)):
+            continue
+
+        expected = robinson_foulds(tree1, tree2, unrooted=unrooted, engine="ete")
+
+        assert robinson_foulds(tree1, tree2, unrooted=unrooted) == expected
+
+
+def test_unrooted_walks_skip_single_child_roots():
+    tree1 = Tree("((a,(b,c),d,e));")
+    tree2 = Tree("(a,(b,c),(d,e));")
+
+    for pair in ((tree1, tree2), (tree2, tree1), (tree1, Tree("((((a,b),c),(d,e)));"))):
+        expected = robinson_foulds(*pair, unrooted=True, engine="ete")
+
+        assert robinson_foulds(*pair, unrooted=True) == expected
+
+
+def _caterpillar(names):
+    newick = names[0]
+    for name in names[1:]:
+        newick = "({},{})".format(newick, name)
+    return Tree(newick + ";")
+
+
+def test_caterpillars_differing_in_one_cherry():
+    names = ["T{}".format(index) for index in range(2000)]
+    tree1 = _caterpillar(names)
+    tree2 = _caterpillar([names[0], names[2], names[1]] + names[3:])
+
+    assert robinson_foulds(tree1, tree2) == (2, 2 * 1998)
+    assert robinson_foulds(tree1, tree2, unrooted=True) == (2, 2 * 1997)
+
+
+def test_mismatched_leaves_and_unknown_engine_are_rejected():
+    tree1 = Tree("((A,B),(C,D));")
+    tree2 = Tree("((A,B),(C,E));")
+
+    with pytest.raises(ValueError, match="Leaf name"):
+        robinson_foulds(tree1, tree2)
+    with pytest.raises(ValueError, match="--rf-engine"):
+        robinson_foulds(tree1, tree1, engine="fast")
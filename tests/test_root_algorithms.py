@@ -1,4 +1,5 @@
 import math
+import random
 import time
 
 import pytest
@@ -27,6 +28,34 @@ from tests.root_test_support import (
 )
 
 
+def _random_annotated_tree(rng, num_leaves):
+    nodes = [Tree({"name": "T{}".format(i)}) for i in range(num_leaves)]
+    while len(nodes) > 1:
+        width = min(len(nodes), rng.choice([2, 2, 3]))
+        parent = Tree()
+        for _ in range(width):
+            parent.add_child(nodes.pop(rng.randrange(len(nodes))))
+        if rng.random() < 0.5:
+            parent.support = rng.randint(0, 100)
+        if rng.random() < 0.3:
+            parent.name = "N{}".format(len(nodes))
+        nodes.append(parent)
+    tree = nodes[0]
+    for node in tree.traverse():
+        if not node.is_root:
+            node.dist = rng.uniform(0.1, 3.0)
+    return tree
+
+
+def _tree_profile(tree):
+    return (
+        tree.name,
+        tree.support,
+        None if tree.dist is None else round(tree.dist, 9),
+        tuple(_tree_profile(child) for child in tree.get_children()),
+    )
+
+
 class TestMidpointRooting:
     @pytest.mark.slow
     def test_deep_ladder_does_not_exceed_python_recursion_limit(self):
@@ -112,6 +141,18 @@ class TestMidpointRooting:
             if not node.is_root
         )
 
+    def test_matches_node_based_rooting_on_random_trees(self):
+        rng = random.Random(11)
+        for _ in range(40):
+            tree = _random_annotated_tree(rng, rng.randint(3, 15))
+            expected = root_mod._midpoint_rooting_by_node(tree)
+            assert _tree_profile(midpoint_rooting(tree)) == _tree_profile(expected)
+
+    def test_single_child_nodes_use_node_based_rooting(self):
+        tree = Tree("((A:1.3,(B:2.2)u:0.4):1,(C:3,D:0.5):2);", parser=1)
+        rooted = midpoint_rooting(tree)
+        assert rooted.write(parser=1) == "((C:3,D:0.5):1,(A:1.3,(B:2.2)u:0.4):2);"
+
 
 class TestOutgroupRooting:
     def test_single_outgroup(self):
@@ -434,6 +475,34 @@ class TestMadRooting:
         rooted = mad_rooting(tree)
         assert is_rooted(rooted)
 
+    @pytest.mark.parametrize("seed", range(6))
+    def test_float_engine_matches_exact_root_choice(self, seed):
+        rng = random.Random(seed)
+
+        def random_newick(labels):
+            length = 10 ** rng.uniform(-6.0, 0.0)
+            if len(labels) == 1:
+                return "{}:{!r}".format(labels[0], length)
+            split = rng.randint(1, len(labels) - 1)
+            return "({},{}):{!r}".format(
+                random_newick(labels[:split]), random_newick(labels[split:]), length
+            )
+
+        newick = random_newick(["T{}".format(index) for index in range(40)]) + ";"
+
+        def root_halves(exact):
+            rooted = root_mod._mad_rooting(Tree(newick, parser=1), exact=exact)
+            return {
+                frozenset(child.leaf_names()): float(child.dist)
+                for child in rooted.get_children()
+            }
+
+        fast = root_halves(exact=False)
+        exact = root_halves(exact=True)
+        assert set(fast) == set(exact)
+        for side, dist in exact.items():
+            assert fast[side] == pytest.approx(dist, rel=10**-12)
+
     @pytest.mark.slow
     def test_balanced_320_tip_tree_completes_within_generous_budget(self):
         def balanced_newick(labels, depth=0):
@@ -620,6 +689,38 @@ class TestMvRooting:
             if not node.is_root
         )
 
+    def test_matches_bruteforce_minimum_variance(self):
+        import numpy as np
+
+        rng = random.Random(29)
+        for _ in range(5):
+            tree = _random_annotated_tree(rng, rng.randint(3, 8))
+            rooted = mv_rooting(tree)
+            observed = np.var([rooted.get_distance(rooted, leaf) for leaf in rooted])
+            best = math.inf
+            for node in list(tree.traverse())[1:]:
+                below = set(node.leaf_names())
+                for x in np.linspace(0.0, node.dist, 41):
+                    dists = [
+                        tree.get_distance(node, leaf) + x
+                        if leaf.name in below
+                        else tree.get_distance(node.up, leaf) + node.dist - x
+                        for leaf in tree
+                    ]
+                    best = min(best, np.var(dists))
+            assert observed <= best + 1e-9
+
+    def test_matches_node_based_rooting_on_random_trees(self):
+        rng = random.Random(17)
+        for _ in range(40):
+            tree = _random_annotated_tree(rng, rng.randint(3, 15))
+            expected = root_mod._mv_rooting_by_node(tree)
+            assert _tree_profile(mv_rooting(tree)) == _tree_profile(expected)
+
+    def test_two_leaf_tree_keeps_both_branches(self):
+        rooted = mv_rooting(Tree("(A:1,B:3);", parser=1))
+        assert {leaf.name: leaf.dist for leaf in rooted} == {"A": 2.0, "B": 2.0}
+
 
 class TestRerootAnnotationSafety:
     @pytest.mark.parametrize(
@@ -777,6 +878,65 @@ class TestReconciliationRooting:
         assert "evaluated 5 candidate edge(s)" in stderr
         assert "duplications=0, losses=0" in stderr
 
+    @pytest.mark.parametrize("seed", range(4))
+    def test_rerooting_dp_matches_per_edge_reconciliation(self, seed):
+        from nwkit.clade_index import LcaIndex
+        from nwkit.reconcile import lca_duplication_loss_contribution
+
+        rng = random.Random(seed)
+        species_tree = Tree(
+            "(((S0:1,S1:1):1,(S2:1,S3:1):1):1,((S4:1,S5:1):1,S6:1):1);", parser=1
+        )
+        subtrees = ["G{}:1".format(index) for index in range(16)]
+        while len(subtrees) > 3:
+            first = subtrees.pop(rng.randrange(len(subtrees)))
+            second = subtrees.pop(rng.randrange(len(subtrees)))
+            subtrees.append("({},{}):1".format(first, second))
+        gene_tree = Tree("({});".format(",".join(subtrees)), parser=1)
+        species_by_gene = {
+            str(leaf.name): "S{}".format(rng.randrange(7))
+            for leaf in gene_tree.leaves()
+        }
+        analysis_tree, adjacency = root_mod._reconciliation_rooting_graph(gene_tree)
+        gene_leaves, _, mapping, species_leaf_by_name = (
+            root_mod._reconciliation_rooting_tip_mapping(
+                analysis_tree, species_tree, species_by_gene
+            )
+        )
+        species_lca = LcaIndex(species_tree)
+        species_depth = dict(zip(species_lca.nodes, species_lca.depth, strict=True))
+
+        def reconcile_side(node, previous):
+            if node.is_leaf:
+                return species_leaf_by_name[mapping[str(node.name)]], 0, 0
+            sides = [
+                reconcile_side(neighbor, node)
+                for neighbor in adjacency[node]
+                if neighbor is not previous
+            ]
+            return join(sides)
+
+        def join(sides):
+            (species1, dups1, losses1), (species2, dups2, losses2) = sides
+            mapped = species_lca.common_ancestor(species1, species2)
+            dups, losses = lca_duplication_loss_contribution(
+                mapped, (species1, species2), species_depth
+            )
+            return mapped, dups + dups1 + dups2, losses + losses1 + losses2
+
+        edge_costs = list(
+            root_mod._reconciliation_rooting_edge_costs(
+                adjacency, gene_leaves, mapping, species_leaf_by_name, species_lca
+            )
+        )
+
+        assert len(edge_costs) == 2 * 16 - 3
+        for left, right, _, _, root_message in edge_costs:
+            _, dups, losses = join(
+                [reconcile_side(left, right), reconcile_side(right, left)]
+            )
+            assert (root_message.duplications, root_message.losses) == (dups, losses)
+
     def test_equal_scores_use_a_label_stable_edge(self):
         species_tree = Tree("(A:1,B:1);", parser=1)
         mapping = {name: "A" for name in ["A_g1", "B_g1", "C_g1", "D_g1"]}
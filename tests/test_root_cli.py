@@ -1,9 +1,12 @@
+import io
+import sys
+
 import pytest
 
 from nwkit.clade_mapping import canonical_split
 from nwkit.root import root_main
-from nwkit.util import is_rooted, read_tree
-from tests.helpers import make_args, safe_get_distance
+from nwkit.util import is_rooted, read_tree, read_trees
+from tests.helpers import make_args, safe_get_distance, write_tree_collection
 from tests.root_test_support import (
     install_fake_ncbi,
     install_fake_opentree,
@@ -295,6 +298,96 @@ class TestRootMain:
             frozenset({"C_c_g1", "D_d_g1"}),
         }
 
+    def test_reconciliation_collection_roots_each_gene_tree(self, tmp_nwk, tmp_outfile):
+        gene_path = tmp_nwk(
+            "(A_a_g1:2,B_b_g1:3,(C_c_g1:4,D_d_g1:5):6);\n"
+            "(D_d_g2:2,C_c_g2:3,(B_b_g2:4,A_a_g2:5):6);\n",
+            "genes.nwk",
+        )
+        species_path = tmp_nwk(
+            "((A_a:1,B_b:1):1,(C_c:1,D_d:1):1);",
+            "species.nwk",
+        )
+        args = make_args(
+            infile=gene_path,
+            outfile=tmp_outfile,
+            method="reconciliation",
+            species_tree=species_path,
+            species_tree_format="auto",
+            duplication_cost=1.0,
+            loss_cost=1.0,
+        )
+
+        root_main(args)
+
+        trees = read_trees(tmp_outfile, format="auto", quoted_node_names=True)
+        assert [
+            {frozenset(child.leaf_names()) for child in tree.get_children()}
+            for tree in trees
+        ] == [
+            {frozenset({"A_a_g1", "B_b_g1"}), frozenset({"C_c_g1", "D_d_g1"})},
+            {frozenset({"A_a_g2", "B_b_g2"}), frozenset({"C_c_g2", "D_d_g2"})},
+        ]
+
+    @pytest.mark.parametrize("threads", [1, 2])
+    def test_collection_keeps_input_order(self, tmp_path, threads):
+        trees = [
+            "(T{0}_A:1,T{0}_B:{1},(T{0}_C:2,T{0}_D:1):1);".format(index, index + 4)
+            for index in range(70)
+        ]
+        outfile = str(tmp_path / "rooted.nwk")
+        args = make_args(
+            infile=write_tree_collection(tmp_path, trees),
+            outfile=outfile,
+            method="midpoint",
+            threads=threads,
+        )
+
+        root_main(args)
+
+        rooted = read_trees(outfile, format="auto", quoted_node_names=True)
+        assert [sorted(tree.leaf_names()) for tree in rooted] == [
+            ["T{0}_{1}".format(index, tip) for tip in "ABCD"] for index in range(70)
+        ]
+        assert all(is_rooted(tree) for tree in rooted)
+        assert [
+            {frozenset(child.leaf_names()) for child in tree.get_children()}
+            for tree in rooted
+        ][69] == {frozenset({"T69_B"}), frozenset({"T69_A", "T69_C", "T69_D"})}
+
+    @pytest.mark.parametrize("num_trees", [1, 2])
+    def test_nexus_on_stdin_roots_every_tree(self, monkeypatch, tmp_outfile, num_trees):
+        trees = ["((A:1,B:2):1,(C:1,D:3):1);", "((A:1,C:2):1,(B:1,D:3):1);"]
+        nexus = "#NEXUS\nbegin trees;\n{}end;\n".format(
+            "".join(
+                "  tree t{} = {}\n".format(index, tree)
+                for index, tree in enumerate(trees[:num_trees], start=1)
+            )
+        )
+        monkeypatch.setattr(sys, "stdin", io.StringIO(nexus))
+        args = make_args(infile="-", outfile=tmp_outfile, method="midpoint")
+
+        root_main(args)
+
+        rooted = read_trees(tmp_outfile, format="auto", quoted_node_names=True)
+        assert [
+            {frozenset(child.leaf_names()) for child in tree.get_children()}
+            for tree in rooted
+        ] == [
+            {frozenset({"A", "B"}), frozenset({"C", "D"})},
+            {frozenset({"A", "C"}), frozenset({"B", "D"})},
+        ][:num_trees]
+
+    def test_collection_rejects_nonpositive_threads(self, tmp_path):
+        args = make_args(
+            infile=write_tree_collection(tmp_path, ["(A:1,B:1,C:1);"] * 2),
+            method="midpoint",
+            threads=0,
+        )
+
+        with pytest.raises(ValueError, match="--threads"):
+            root_main(args)
+
     def test_reconciliation_requires_species_tree(self, tmp_nwk):
         gene_path = tmp_nwk("(A_a_g1:1,B_b_g1:1);", "gene.nwk")
         args = make_args(
@@ -0,0 +1,115 @@
+import os
+import socket
+import stat
+import tempfile
+import threading
+import time
+
+import pytest
+
+from nwkit.serve import send_serve_requests, serve_main
+from nwkit.tree_cache import MEMORY_TREE_CACHE
+from tests.helpers import make_args
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets are unavailable"
+)
+
+
+@pytest.fixture
+def server_socket():
+    # Unix socket paths are limited to about 100 bytes, so avoid deep tmp_path names.
+    with tempfile.TemporaryDirectory(prefix="nwkit-serve-") as directory:
+        socket_path = os.path.join(directory, "nwkit.sock")
+        thread = threading.Thread(
+            target=serve_main, args=(make_args(socket=socket_path),), daemon=True
+        )
+        thread.start()
+        deadline = time.monotonic() + 30
+        while not os.path.exists(socket_path):
+            assert thread.is_alive() and time.monotonic() < deadline
+            time.sleep(0.01)
+        yield socket_path
+        if thread.is_alive():
+            send_serve_requests(socket_path, [{"op": "shutdown"}], timeout=30)
+        thread.join(timeout=30)
+        assert not thread.is_alive()
+
+
+def test_run_requests_reuse_parsed_trees(server_socket, tmp_path):
+    tree_path = tmp_path / "tree.nwk"
+    tree_path.write_text("((A:1,B:2):1,(C:3,D:4):1);\n")
+    argv = ["rescale", "--factor", "2", "-i", str(tree_path)]
+
+    first, second = send_serve_requests(
+        server_socket, [{"id": "a", "argv": argv}, {"id": "b", "argv": argv}]
+    )
+
+    assert [first["id"], second["id"]] == ["a", "b"]
+    assert first["exit_status"] == second["exit_status"] == 0
+    assert first["stdout"] == second["stdout"] == "((A:2,B:4):2,(C:6,D:8):2);\n"
+    assert "Number of leaves in input tree = 4" in first["stderr"]
+    assert first["caches"]["parsed_trees"]["misses"] == 1
+    assert second["caches"]["parsed_trees"]["hits"] == 1
+    assert second["elapsed_seconds"] >= 0
+    assert set(second["memory"]) == {"rss_bytes", "max_rss_bytes"}
+
+
+def test_stdin_text_and_failures_are_reported(server_socket):
+    responses = send_serve_requests(
+        server_socket,
+        [
+            {"argv": ["printlabel", "--pattern", "^A"], "stdin": "((A,B),C);"},
+            {"argv": ["printlabel", "--pattern", "^A"]},
+            {"argv": ["info", "--no-such-option"]},
+            {"argv": "info"},
+            {"op": "reload"},
+            {"op": "stats"},
+        ],
+    )
+
+    assert responses[0]["stdout"] == "A\n"
+    assert "Standard input is not available" in responses[1]["error"]
+    assert responses[2]["exit_status"] == 2
+    assert "unrecognized arguments" in responses[2]["error"]
+    assert [response["ok"] for response in responses] == [
+        True,
+        False,
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert responses[5]["requests"] == 3
+    assert responses[5]["failed"] == 2
+
+
+def test_invalid_json_keeps_connection_open(server_socket):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(server_socket)
+        with client.makefile("rwb") as stream:
+            stream.write(b"not json\n")
+            stream.write(b'{"op": "stats", "id": 7}\n')
+            stream.flush()
+            invalid = stream.readline()
+            stats = stream.readline()
+
+    assert b"Invalid request" in invalid
+    assert b'"id": 7' in stats
+
+
+def test_socket_is_private_and_removed_on_shutdown(server_socket):
+    assert stat.S_IMODE(os.stat(server_socket).st_mode) & 0o077 == 0
+
+    send_serve_requests(server_socket, [{"op": "shutdown"}], timeout=30)
+    deadline = time.monotonic() + 30
+    while os.path.exists(server_socket) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not os.path.exists(server_socket)
+    assert not MEMORY_TREE_CACHE.enabled
+
+
+def test_live_socket_is_not_replaced(server_socket):
+    with pytest.raises(ValueError, match="Another server"):
+        serve_main(make_args(socket=server_socket))
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from ete4 import Tree
+
+from nwkit.split_table import (
+    LeafBitsets,
+    SplitTable,
+    SplitTableAccumulator,
+    masks_to_words,
+    merge_split_tables,
+    num_mask_words,
+    words_to_masks,
+)
+from nwkit.util import get_subtree_leaf_bitmasks
+
+
+class TestSplitTable:
+    def test_masks_round_trip_through_words(self):
+        masks = [0, 1, (1 << 64) | 5, (1 << 130) - 1]
+        words = masks_to_words(masks, num_mask_words(130))
+        assert words.shape == (4, 3)
+        assert words_to_masks(words) == masks
+
+    def test_merge_sums_weights_per_split(self):
+        table1 = SplitTable.from_weights({0b011: 1.0, 0b110: 2.0}, 1)
+        table2 = SplitTable.from_weights({0b110: 0.5, 0b101: 4.0}, 1)
+        merged = merge_split_tables([table1, table2])
+        assert merged.weight_by_mask() == {0b011: 1.0, 0b110: 2.5, 0b101: 4.0}
+
+    def test_fingerprint_collisions_keep_splits_apart(self):
+        table1 = SplitTable.from_observations({0b011: [(1.0, 1.0)], 0b110: []}, 1)
+        table2 = SplitTable.from_observations(
+            {0b110: [(None, 1.0)], 0b011: [(3.0, 0.5)]}, 1
+        )
+        for table in (table1, table2):
+            table.fingerprints = np.zeros_like(table.fingerprints)
+        merged = merge_split_tables([table1, table2])
+        assert merged.observations_by_mask() == {
+            0b011: [(1.0, 1.0), (3.0, 0.5)],
+            0b110: [(None, 1.0)],
+        }
+
+    def test_merged_means_are_weighted_without_overflow(self):
+        accumulator = SplitTableAccumulator()
+        assert accumulator.result() is None
+        for mean, weight in ((1e308, 1.0), (1e308, 1.0), (0.0, 0.0), (4e307, 2.0)):
+            accumulator.add(SplitTable.from_means({0b011: (mean, weight)}, 1))
+        mean, weight = accumulator.result().mean_by_mask()[0b011]
+        assert weight == 4.0
+        assert np.isclose(mean, 7e307)
+
+
+class TestLeafBitsets:
+    def test_rows_match_integer_masks_of_every_node(self):
+        tree = Tree("((A,(B,C)),(D,(E,F)G),H);", parser=1)
+        leaf_name_to_bit = {
+            name: 70 - 10 * index for index, name in enumerate("ABCDEFH")
+        }
+        # Unused names pad the mapping to 72 bits, so rows take two words.
+        used_bits = set(leaf_name_to_bit.values())
+        leaf_name_to_bit.update(
+            {"P{}".format(bit): bit for bit in range(72) if bit not in used_bits}
+        )
+        nodes, bitsets = LeafBitsets.from_ete(tree, leaf_name_to_bit)
+        expected = get_subtree_leaf_bitmasks(tree, leaf_name_to_bit)
+        assert bitsets.words.shape == (len(nodes), 2)
+        assert bitsets.masks() == [expected[node] for node in nodes]
+        assert bitsets.counts().tolist() == [
+            len(node) if not node.is_leaf else 1 for node in nodes
+        ]
+        assert bitsets.contains_bit(70).tolist() == [
+            "A" in node.leaf_names() for node in nodes
+        ]
+
+    def test_counts_without_numpy_bitwise_count(self, monkeypatch):
+        masks = [0, 1, (1 << 64) | 5, (1 << 130) - 1, int("10" * 65, 2)]
+        bitsets = LeafBitsets(masks_to_words(masks, num_mask_words(130)), 130)
+        monkeypatch.delattr(np, "bitwise_count", raising=False)
+        assert bitsets.counts().tolist() == [mask.bit_count() for mask in masks]
+
+    def test_missing_leaf_raises_unless_skipped(self):
+        tree = Tree("((A,B),C);", parser=1)
+        with pytest.raises(ValueError, match="not found in reference mapping: C"):
+            LeafBitsets.from_ete(tree, {"A": 0, "B": 1})
+        _, bitsets = LeafBitsets.from_ete(tree, {"A": 0, "B": 1}, missing_leaf_bit=-1)
+        assert bitsets.masks()[0] == 0b11
@@ -0,0 +1,254 @@
+import json as json_lib
+import os
+
+import pytest
+from ete4 import Tree
+
+import nwkit.root as root_mod
+from nwkit.root import taxonomy_rooting
+from nwkit.taxonomy_reference_cache import (
+    cached_taxonomy_lookups,
+    resolve_taxonomy_reference_cache_dir,
+)
+from tests.helpers import make_args
+from tests.root_test_support import install_fake_ncbi, install_fake_timetree
+
+PLANT_AND_PRIMATE_TREE = (
+    "(Homo_sapiens_gene1:1,Pan_troglodytes_gene1:1,"
+    "(Arabidopsis_thaliana_gene1:1,Oryza_sativa_gene1:1):1);"
+)
+OPENTREE_REFERENCE = (
+    "(((Homo_sapiens,Pan_troglodytes),Mus_musculus),"
+    "(Arabidopsis_thaliana,Oryza_sativa));"
+)
+OTT_ID_BY_NAME = {
+    "Homo sapiens": 1,
+    "Pan troglodytes": 2,
+    "Mus musculus": 3,
+    "Arabidopsis thaliana": 4,
+    "Oryza sativa": 5,
+}
+
+
+@pytest.fixture
+def cached_args(tmp_path):
+    return make_args(download_dir=str(tmp_path / "downloads"))
+
+
+def install_local_opentree(monkeypatch, status_code=200):
+    """Answer Open Tree requests from local tables and record each request."""
+    requests_seen = list()
+    name_by_ott_id = {ott_id: name for name, ott_id in OTT_ID_BY_NAME.items()}
+
+    class LocalResponse:
+        headers: dict = {}
+        encoding = "utf-8"
+
+        def __init__(self, payload):
+            self.status_code = status_code
+            self.text = json_lib.dumps(payload)
+
+        def iter_content(self, chunk_size):
+            payload = self.text.encode(self.encoding)
+            for offset in range(0, len(payload), chunk_size):
+                yield payload[offset : offset + chunk_size]
+
+        def close(self):
+            pass
+
+    class LocalSession:
+        def post(self, url, json=None, timeout=None, stream=False):
+            requests_seen.append((url.rsplit("/", 1)[-1], json))
+            if url.endswith("/v3/tnrs/match_names"):
+                results = list()
+                for name in json["names"]:
+                    matches = list()
+                    if name in OTT_ID_BY_NAME:
+                        taxon = {
+                            "ott_id": OTT_ID_BY_NAME[name],
+                            "is_suppressed_from_synth": False,
+                        }
+                        matches.append({"is_approximate_match": False, "taxon": taxon})
+                    results.append({"matches": matches})
+                return LocalResponse({"results": results})
+            if url.endswith("/v3/tree_of_life/induced_subtree"):
+                reference = Tree(OPENTREE_REFERENCE, parser=1)
+                reference.prune(
+                    [
+                        name_by_ott_id[ott_id].replace(" ", "_")
+                        for ott_id in json["ott_ids"]
+                    ]
+                )
+                return LocalResponse({"newick": reference.write(parser=9)})
+            raise AssertionError("Unexpected OpenTree URL: {}".format(url))
+
+    monkeypatch.setattr(root_mod.requests, "Session", LocalSession)
+    return requests_seen
+
+
+def _root_child_leaf_sets(tree):
+    return [set(child.leaf_names()) for child in tree.get_children()]
+
+
+def test_cache_is_disabled_without_download_dir(monkeypatch):
+    requests_seen = install_local_opentree(monkeypatch)
+    args = make_args()
+    assert resolve_taxonomy_reference_cache_dir(args) is None
+    for _ in range(2):
+        taxonomy_rooting(
+            Tree(PLANT_AND_PRIMATE_TREE, parser=1),
+            taxonomy_source="opentree",
+            args=args,
+        )
+    assert len(requests_seen) == 4
+
+
+def test_opentree_rooting_makes_no_requests_after_warm_up(monkeypatch, cached_args):
+    requests_seen = install_local_opentree(monkeypatch)
+    rooted_trees = [
+        taxonomy_rooting(
+            Tree(PLANT_AND_PRIMATE_TREE, parser=1),
+            taxonomy_source="opentree",
+            args=cached_args,
+        )
+        for _ in range(3)
+    ]
+    assert [endpoint for endpoint, _ in requests_seen] == [
+        "match_names",
+        "induced_subtree",
+    ]
+    for rooted in rooted_trees:
+        assert {
+            "Arabidopsis_thaliana_gene1",
+            "Oryza_sativa_gene1",
+        } in _root_child_leaf_sets(rooted)
+
+
+def test_opentree_resolves_only_uncached_names(monkeypatch, cached_args):
+    requests_seen = install_local_opentree(monkeypatch)
+    taxonomy_rooting(
+        Tree(PLANT_AND_PRIMATE_TREE, parser=1),
+        taxonomy_source="opentree",
+        args=cached_args,
+    )
+    tree = Tree(
+        "(Homo_sapiens_gene2:1,(Pan_troglodytes_gene2:1,Mus_musculus_gene2:1):1,"
+        "(Arabidopsis_thaliana_gene2:1,Oryza_sativa_gene2:1):1);",
+        parser=1,
+    )
+    rooted = taxonomy_rooting(tree, taxonomy_source="opentree", args=cached_args)
+    assert requests_seen[2] == (
+        "match_names",
+        {"names": ["Mus musculus"], "do_approximate_matching": False},
+    )
+    assert requests_seen[3] == (
+        "induced_subtree",
+        {"ott_ids": [1, 2, 3, 4, 5], "label_format": "name"},
+    )
+    assert {
+        "Arabidopsis_thaliana_gene2",
+        "Oryza_sativa_gene2",
+    } in _root_child_leaf_sets(rooted)
+
+
+def test_failed_lookups_are_not_cached(monkeypatch, cached_args):
+    install_local_opentree(monkeypatch, status_code=503)
+    with pytest.raises(ValueError, match="TNRS lookup failed"):
+        taxonomy_rooting(
+            Tree(PLANT_AND_PRIMATE_TREE, parser=1),
+            taxonomy_source="opentree",
+            args=cached_args,
+        )
+    requests_seen = install_local_opentree(monkeypatch)
+    taxonomy_rooting(
+        Tree(PLANT_AND_PRIMATE_TREE, parser=1),
+        taxonomy_source="opentree",
+        args=cached_args,
+    )
+    assert len(requests_seen) == 2
+
+
+def test_timetree_guide_tree_is_reused_for_the_same_species_set(
+    monkeypatch, cached_args
+):
+    calls = install_fake_timetree(
+        monkeypatch,
+        upload_html='<div id="prunetree-msg-box"></div>',
+        newick_text="((Homo_sapiens:1,Pan_troglodytes:1):10,(Arabidopsis_thaliana:1,Oryza_sativa:1):20);",
+    )
+    for newick in (
+        PLANT_AND_PRIMATE_TREE,
+        "((Oryza_sativa_gene7:1,Arabidopsis_thaliana_gene7:1):1,"
+        "Pan_troglodytes_gene7:1,Homo_sapiens_gene7:1);",
+    ):
+        taxonomy_rooting(
+            Tree(newick, parser=1), taxonomy_source="timetree", args=cached_args
+        )
+    assert len(calls) == 2
+
+
+def test_ncbi_lineages_are_read_without_opening_the_database(monkeypatch, cached_args):
+    install_fake_ncbi(
+        monkeypatch,
+        name_to_taxid={
+            "Homo sapiens": 9606,
+            "Pan troglodytes": 9598,
+            "Arabidopsis thaliana": 3702,
+            "Oryza sativa": 4530,
+        },
+        lineage_by_taxid={
+            9606: [1, 10, 9606],
+            9598: [1, 10, 9598],
+            3702: [1, 20, 3702],
+            4530: [1, 20, 4530],
+        },
+    )
+    first = taxonomy_rooting(
+        Tree(PLANT_AND_PRIMATE_TREE, parser=1),
+        taxonomy_source="ncbi",
+        args=cached_args,
+    )
+
+    def unavailable_database(args=None):
+        raise AssertionError("The NCBI taxonomy database should not be opened.")
+
+    monkeypatch.setattr(root_mod, "get_ete_ncbitaxa", unavailable_database)
+    second = taxonomy_rooting(
+        Tree(PLANT_AND_PRIMATE_TREE, parser=1),
+        taxonomy_source="ncbi",
+        args=cached_args,
+    )
+    assert _root_child_leaf_sets(first) == _root_child_leaf_sets(second)
+
+
+def test_expired_refreshed_and_corrupt_entries_are_fetched_again(cached_args):
+    fetched = list()
+
+    def fetch(queries):
+        fetched.append(list(queries))
+        return {query: query.upper() for query in queries}
+
+    assert cached_taxonomy_lookups("test", ["a", "b"], fetch, args=cached_args) == {
+        "a": "A",
+        "b": "B",
+    }
+    assert cached_taxonomy_lookups("test", ["b", "a"], fetch, args=cached_args) == {
+        "a": "A",
+        "b": "B",
+    }
+    assert fetched == [["a", "b"]]
+
+    cached_args.taxonomy_cache_max_age_days = 0
+    cached_taxonomy_lookups("test", ["a"], fetch, args=cached_args)
+    cached_args.taxonomy_cache_max_age_days = 30
+    cached_args.refresh_taxonomy_cache = True
+    cached_taxonomy_lookups("test", ["a"], fetch, args=cached_args)
+    cached_args.refresh_taxonomy_cache = False
+    cache_dir = resolve_taxonomy_reference_cache_dir(cached_args)
+    for directory, _, names in os.walk(os.path.join(cache_dir, "test")):
+        for name in names:
+            with open(os.path.join(directory, name), "w") as handle:
+                handle.write("{not json")
+    cached_taxonomy_lookups("test", ["a", "b"], fetch, args=cached_args)
+    assert fetched == [["a", "b"], ["a"], ["a"], ["a", "b"]]
+    assert not os.path.exists(os.path.join(cache_dir, ".test.lock"))
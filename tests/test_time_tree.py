@@ -1,3 +1,5 @@
+import gzip
+
 import numpy as np
 import pytest
 from ete4 import Tree
@@ -98,6 +100,21 @@ def test_read_and_summarize_posterior_reconstructs_dated_tree(tmp_path):
     assert sample.common_ancestor(["A", "B"]).dist == pytest.approx(7.0)
 
 
+def test_posterior_reads_gzip_without_suffix(tmp_path):
+    tree = Tree("((A,B),(C,D));", parser=1)
+    path = tmp_path / "mcmc.txt"
+    path.write_bytes(gzip.compress(b"Gen\tt_n5\tt_n6\tt_n7\n1\t10\t4\t3\n"))
+
+    posterior = read_mcmctree_posterior(path, tree)
+
+    assert posterior.sample_count == 1
+    assert posterior.node_ids == (5, 6, 7)
+
+    path.write_bytes(gzip.compress(b""))
+    with pytest.raises(ValueError, match="posterior file is empty"):
+        read_mcmctree_posterior(path, tree)
+
+
 def test_posterior_rejects_chronologically_invalid_sample(tmp_path):
     tree = Tree("((A,B),(C,D));", parser=1)
     path = tmp_path / "mcmc.txt"
@@ -0,0 +1,173 @@
+import io
+import os
+import pickle
+
+import pytest
+
+from nwkit.cache import cache_main
+from nwkit.tree_cache import (
+    TREE_CACHE_DIR_ENV,
+    TREE_CACHE_MAX_MB_ENV,
+    TREE_CACHE_SUFFIX,
+    _SafeTreeCacheUnpickler,
+    list_tree_cache_entries,
+    prune_tree_cache,
+)
+from nwkit.util import TREE_FORMAT_PROP, read_tree, read_trees
+from tests.helpers import make_args, write_tree_collection
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "tree_cache"
+    monkeypatch.setenv(TREE_CACHE_DIR_ENV, str(path))
+    monkeypatch.delenv(TREE_CACHE_MAX_MB_ENV, raising=False)
+    return str(path)
+
+
+def _node_records(tree):
+    return [
+        (node.name, node.dist, node.support, sorted(node.props.items()))
+        for node in tree.traverse()
+    ]
+
+
+def test_cache_is_disabled_without_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv(TREE_CACHE_DIR_ENV, raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    read_tree("((A:1,B:2)90:1,C:3);", "auto", True, quiet=True)
+
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize(
+    "text,format",
+    [
+        ("((A:1,B:2)90:1,(C:3,D:4)x:2);", "auto"),
+        ("(('a b':1,B:2)0.9:1,C:3);", "auto"),
+        ("((A:1,B:2):1,C:3);", "0"),
+        ("((A:1,B:2)n1:1,C:3)root;", "1"),
+    ],
+)
+def test_cached_tree_matches_parsed_tree(cache_dir, text, format):
+    parsed = read_tree(text, format, True, quiet=True)
+    assert len(list_tree_cache_entries(cache_dir)) == 1
+
+    cached = read_tree(text, format, True, quiet=True)
+
+    assert cached is not parsed
+    assert _node_records(cached) == _node_records(parsed)
+    assert cached.write(parser=parsed.props[TREE_FORMAT_PROP]) == parsed.write(
+        parser=parsed.props[TREE_FORMAT_PROP]
+    )
+    assert [node.up.name for node in cached.descendants()] == [
+        node.up.name for node in parsed.descendants()
+    ]
+    cached_leaves = list(cached.leaves())
+    parsed_leaves = list(parsed.leaves())
+    assert cached.get_distance(
+        cached_leaves[0], cached_leaves[-1]
+    ) == parsed.get_distance(parsed_leaves[0], parsed_leaves[-1])
+
+
+def test_cache_hit_reports_ambiguity_and_format(cache_dir, capsys):
+    text = "((A:1,B:2)1:1,C:3);"
+    read_tree(text, "auto", True)
+    first = capsys.readouterr().err
+
+    read_tree(text, "auto", True)
+
+    assert capsys.readouterr().err == first
+    assert "Warning:" in first
+    with pytest.raises(ValueError):
+        read_tree(text, "auto-strict", True, quiet=True)
+
+
+def test_cached_collection_matches_parsed_collection(cache_dir, tmp_path):
+    infile = write_tree_collection(tmp_path, ["((A,B),C);", "((A,C),B);"])
+    parsed = read_trees(infile, "auto", True, quiet=True)
+
+    cached = read_trees(infile, "auto", True, quiet=True)
+
+    assert [tree.write() for tree in cached] == [tree.write() for tree in parsed]
+    assert len(list_tree_cache_entries(cache_dir)) == 1
+
+
+def test_cache_key_includes_input_options(cache_dir):
+    read_tree("((A:1,B:2)90:1,C:3);", "auto", True, quiet=True)
+    read_tree("((A:1,B:2)90:1,C:3);", "0", True, quiet=True)
+    read_tree("((A:1,B:2)90:1,C:3);", "0", False, quiet=True)
+
+    assert len(list_tree_cache_entries(cache_dir)) == 3
+
+
+def test_prune_removes_least_recently_used_entries(cache_dir):
+    for index, text in enumerate(["(A,B);", "(C,D);", "(E,F);"]):
+        read_tree(text, "auto", True, quiet=True)
+        path = list_tree_cache_entries(cache_dir)[0][0]
+        os.utime(path, (1000 + index, 1000 + index))
+    read_tree("(A,B);", "auto", True, quiet=True)
+    sizes = {path: size for path, size, _ in list_tree_cache_entries(cache_dir)}
+    newest = list_tree_cache_entries(cache_dir)[:2]
+
+    removed = prune_tree_cache(cache_dir, sum(size for _, size, _ in newest))
+
+    assert len(removed) == 1
+    assert [path for path, _, _ in list_tree_cache_entries(cache_dir)] == [
+        path for path, _, _ in newest
+    ]
+    assert removed[0][0] in sizes
+
+
+def test_size_limit_is_applied_on_store(cache_dir, monkeypatch):
+    monkeypatch.setenv(TREE_CACHE_MAX_MB_ENV, "0")
+
+    read_tree("(A,B);", "auto", True, quiet=True)
+
+    assert list_tree_cache_entries(cache_dir) == []
+
+
+def test_corrupt_or_unsafe_entries_are_reparsed(cache_dir):
+    tree = read_tree("(A,B);", "auto", True, quiet=True)
+    path = list_tree_cache_entries(cache_dir)[0][0]
+    with open(path, "wb") as handle:
+        pickle.dump((1, None, [([-1], [os.system])]), handle)
+
+    with open(path, "rb") as handle:
+        with pytest.raises(pickle.UnpicklingError):
+            _SafeTreeCacheUnpickler(io.BytesIO(handle.read())).load()
+    assert read_tree("(A,B);", "auto", True, quiet=True).write() == tree.write()
+
+
+def test_cache_command_lists_and_clears_entries(cache_dir, tmp_path):
+    read_tree("(A,B);", "auto", True, quiet=True)
+    read_tree("(C,D);", "auto", True, quiet=True)
+    listing = str(tmp_path / "listing.tsv")
+    cleared = str(tmp_path / "cleared.tsv")
+
+    cache_main(
+        make_args(cache_dir=None, max_size_mb=None, clear=False, outfile=listing)
+    )
+    cache_main(
+        make_args(cache_dir=cache_dir, max_size_mb=None, clear=True, outfile=cleared)
+    )
+
+    with open(listing) as handle:
+        rows = [line.rstrip("\n").split("\t") for line in handle]
+    assert rows[0] == ["entry", "size_bytes", "last_used", "status"]
+    assert [row[3] for row in rows[1:]] == ["kept", "kept"]
+    assert all(row[0].endswith(TREE_CACHE_SUFFIX) for row in rows[1:])
+    with open(cleared) as handle:
+        assert [line.split("\t")[3].strip() for line in handle][1:] == [
+            "removed",
+            "removed",
+        ]
+    assert list_tree_cache_entries(cache_dir) == []
+
+
+def test_cache_command_requires_directory(monkeypatch):
+    monkeypatch.delenv(TREE_CACHE_DIR_ENV, raising=False)
+
+    with pytest.raises(ValueError, match="--cache-dir"):
+        cache_main(make_args(cache_dir=None, max_size_mb=None, clear=False))
@@ -0,0 +1,132 @@
+import gzip
+import io
+import os
+import pickle
+
+import pytest
+
+from nwkit.consensus import consensus_main
+from nwkit.tree_index import (
+    INDEX_SUFFIX,
+    open_indexed_tree_strings,
+    scan_newick_record_spans,
+)
+from nwkit.util import iter_newick_stream, read_tree
+from tests.helpers import make_args, write_tree_collection
+
+STREAM_TEXTS = (
+    "(A,B);\n(C,D);\n",
+    "  (A,B) ;;\r\n(C,\r\nD);",
+    '(\'a;b\',"c""d;");(E,F);',
+    "((A,B)[x;[y;]z],C);[;]\n(D,E);",
+    "('é;',B); (C,D);",
+    "(A,B)']' ;",
+)
+
+
+def _indexed_records(text):
+    data = text.encode("utf-8")
+    offsets, lengths = scan_newick_record_spans(data)
+    records = []
+    for offset, length in zip(offsets.tolist(), lengths.tolist(), strict=True):
+        record = data[offset : offset + length].decode("utf-8")
+        records.append(record.replace("\r\n", "\n").replace("\r", "\n").strip())
+    return records
+
+
+def _stream_outcome(reader, text):
+    try:
+        return reader(text)
+    except ValueError as exc:
+        return str(exc)
+
+
+@pytest.mark.parametrize(
+    "text",
+    STREAM_TEXTS + ("(A,B);(C,[open", "(A,B);('C,D);", "(A,B);(C,D)", "(A,B);\n \n"),
+)
+def test_record_spans_match_newick_stream(text):
+    def stream_records(value):
+        handle = io.StringIO(value, newline=None)
+        return list(iter_newick_stream(handle, chunk_size=3))
+
+    assert _stream_outcome(_indexed_records, text) == _stream_outcome(
+        stream_records, text
+    )
+
+
+def test_index_is_written_once_and_rebuilt_when_source_changes(tmp_path):
+    infile = write_tree_collection(tmp_path, ["(A,B);", "(C,D);", "(E,F);"])
+    index_path = infile + INDEX_SUFFIX
+
+    records = open_indexed_tree_strings(infile)
+    assert list(records) == ["(A,B);", "(C,D);", "(E,F);"]
+    assert records[1] == "(C,D);"
+    assert list(records[::2]) == ["(A,B);", "(E,F);"]
+    assert list(pickle.loads(pickle.dumps(records[1:]))) == ["(C,D);", "(E,F);"]
+    index_mtime_ns = os.stat(index_path).st_mtime_ns
+
+    assert len(open_indexed_tree_strings(infile)) == 3
+    assert os.stat(index_path).st_mtime_ns == index_mtime_ns
+
+    with open(infile, "a") as handle:
+        handle.write("(G,H);\n")
+    assert list(open_indexed_tree_strings(infile))[-1] == "(G,H);"
+
+
+def test_same_size_rewrite_with_restored_mtime_rebuilds_index(tmp_path):
+    infile = write_tree_collection(tmp_path, ["(A,B);", "(C,D);"])
+    assert list(open_indexed_tree_strings(infile)) == ["(A,B);", "(C,D);"]
+    source_stat = os.stat(infile)
+
+    with open(infile, "w") as handle:
+        handle.write("(A,B,C);\n(D);\n")
+    os.utime(infile, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    assert os.stat(infile).st_size == source_stat.st_size
+
+    assert list(open_indexed_tree_strings(infile)) == ["(A,B,C);", "(D);"]
+
+
+def test_containers_compressed_files_and_stdin_are_not_indexed(tmp_path):
+    nexus = tmp_path / "trees.nex"
+    nexus.write_text("#NEXUS\nbegin trees;\ntree t1 = (A,B);\nend;\n")
+
+    compressed = tmp_path / "trees.nwk.gz"
+    compressed.write_bytes(gzip.compress(b"(A,B);\n(C,D);\n"))
+
+    assert open_indexed_tree_strings(str(nexus)) is None
+    assert open_indexed_tree_strings(str(compressed)) is None
+    assert open_indexed_tree_strings("-") is None
+    assert not os.path.exists(str(nexus) + INDEX_SUFFIX)
+
+
+def test_indexed_threaded_consensus_matches_streaming(tmp_path):
+    trees = [
+        "((A:1,B:2):1,(C:3,D:4):5);",
+        "((A:1,C:1):1,(B:1,D:1):1);",
+        "((A:2,B:1):1,(C:1,D:2):2);",
+    ] * 30
+    infile = write_tree_collection(tmp_path, trees)
+    common = dict(
+        infile=infile,
+        min_freq=0.5,
+        reference=None,
+        reference_format="auto",
+        support_scale="percent",
+        method="greedy",
+        branch_length="mean",
+        weight_tsv=None,
+    )
+    streamed_out = str(tmp_path / "streamed.nwk")
+    indexed_out = str(tmp_path / "indexed.nwk")
+
+    consensus_main(make_args(outfile=streamed_out, threads=1, **common))
+    consensus_main(
+        make_args(outfile=indexed_out, threads=2, collection_index=True, **common)
+    )
+
+    assert os.path.exists(infile + INDEX_SUFFIX)
+    assert (
+        read_tree(indexed_out, "auto", True, quiet=True).write()
+        == read_tree(streamed_out, "auto", True, quiet=True).write()
+    )
@@ -329,7 +329,7 @@ class TestDownloadDirHelpers:
             "nwkit.util._download_ete_taxdump", fake_download_ete_taxdump
         )
         monkeypatch.setattr("nwkit.util._build_ete_taxonomy_database", fake_build)
-        monkeypatch.setattr("nwkit.util.ete4.NCBITaxa", FakeNCBI)
+        monkeypatch.setattr("ete4.NCBITaxa", FakeNCBI)
         ncbi = get_ete_ncbitaxa(args=args)
         assert isinstance(ncbi, FakeNCBI)
         expected_ete_dir = os.path.join(os.path.realpath(explicit_dir), "ete4")
@@ -418,7 +418,7 @@ class TestDownloadDirHelpers:
             "ete4.ncbi_taxonomy.ncbiquery.DEFAULT_TAXADB", str(default_db)
         )
         monkeypatch.setattr("nwkit.util.acquire_exclusive_lock", fake_lock)
-        monkeypatch.setattr("nwkit.util.ete4.NCBITaxa", FakeNCBI)
+        monkeypatch.setattr("ete4.NCBITaxa", FakeNCBI)
         ncbi = get_ete_ncbitaxa(args=make_args(download_dir="auto"))
         assert isinstance(ncbi, FakeNCBI)
         assert calls["args"] == ()
@@ -467,7 +467,7 @@ class TestDownloadDirHelpers:
             "nwkit.util._download_ete_taxdump", fake_download_ete_taxdump
         )
         monkeypatch.setattr("nwkit.util._build_ete_taxonomy_database", fake_build)
-        monkeypatch.setattr("nwkit.util.ete4.NCBITaxa", FakeNCBI)
+        monkeypatch.setattr("ete4.NCBITaxa", FakeNCBI)
         ncbi = get_ete_ncbitaxa(args=args)
         assert isinstance(ncbi, FakeNCBI)
         assert calls["lock_path"] == os.path.join(
@@ -516,7 +516,7 @@ class TestDownloadDirHelpers:
         monkeypatch.setattr(
             "nwkit.util._download_ete_taxdump", fake_download_ete_taxdump
         )
-        monkeypatch.setattr("nwkit.util.ete4.NCBITaxa", FakeNCBI)
+        monkeypatch.setattr("ete4.NCBITaxa", FakeNCBI)
         ncbi = get_ete_ncbitaxa(args=args)
         assert isinstance(ncbi, FakeNCBI)
         assert calls["lock_path"] == os.path.join(
@@ -573,7 +573,7 @@ class TestDownloadDirHelpers:
         monkeypatch.setattr(
             "nwkit.util._download_ete_taxdump", fake_download_ete_taxdump
         )
-        monkeypatch.setattr("nwkit.util.ete4.NCBITaxa", FakeNCBI)
+        monkeypatch.setattr("ete4.NCBITaxa", FakeNCBI)
         ncbi = get_ete_ncbitaxa(args=args)
         assert isinstance(ncbi, FakeNCBI)
         assert calls["lock_path"] == os.path.join(
@@ -7,6 +7,7 @@ from ete4 import Tree
 
 from nwkit import util as util_mod
 from nwkit.util import (
+    TreeSampling,
     _compile_node_placeholder_pattern,
     iter_newick_stream,
     iter_tree_strings,
@@ -99,6 +100,12 @@ class TestReadTree:
         assert split_newick_stream(text) == expected
         assert list(iter_newick_stream(io.StringIO(text), chunk_size=1)) == expected
 
+    def test_newick_collection_parsers_keep_non_ascii_text_across_chunks(self):
+        text = "('Ä;é':1,B\udcff:1);\n(C:1,D:1);\n"
+        expected = ["('Ä;é':1,B\udcff:1);", "(C:1,D:1);"]
+        assert split_newick_stream(text) == expected
+        assert list(iter_newick_stream(io.StringIO(text), chunk_size=2)) == expected
+
     def test_newick_collection_parsers_ignore_semicolons_in_nested_comments(self):
         text = "(A[outer;[inner;comment]]:1,B:1);\n(C:1,D:1);\n"
         expected = [
@@ -194,6 +201,36 @@ class TestReadTree:
         with pytest.raises(ValueError, match="Ambiguous tree format"):
             read_tree(path, format="auto-strict", quoted_node_names=True, quiet=True)
 
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("((A,B),C);", (False, False, False)),
+            ("((A,B)90,C)1.5e2;", (False, True, False)),
+            ("((A,B) X ,C);", (False, False, True)),
+            ("((A,B)[&&NHX:x=1]'n',C);", (True, False, False)),
+            ("(('a)b',B)9[c[d]e],C)X;", (False, True, True)),
+            ("((A,B)[open", (False, False, False)),
+        ],
+    )
+    def test_internal_node_label_kinds_matches_character_scan(self, text, expected):
+        assert util_mod._internal_node_label_kinds(text) == expected
+        assert util_mod._scan_internal_node_label_kinds(text) == expected
+
+    def test_read_tree_auto_parses_well_formed_input_once(self, monkeypatch):
+        parsed_formats = []
+
+        def counting_tree(text, parser):
+            parsed_formats.append(parser)
+            return Tree(text, parser=parser)
+
+        monkeypatch.setattr("ete4.Tree", counting_tree)
+        assert util_mod._read_tree_auto("((A:1,B:1)X:1,C:1);")[0] == 1
+        assert util_mod._read_tree_auto("((A:1,B:1)90:1,C:1);")[0] == 0
+        assert parsed_formats == [1, 0]
+        with pytest.raises(Exception, match="Failed to parse the input tree"):
+            util_mod._read_tree_auto("((A:x,B),C);")
+        assert parsed_formats[2:] == [0, 1]
+
     def test_read_tree_rejects_quoted_names_when_flag_disabled(self, tmp_nwk):
         path = tmp_nwk("('A,B':1,C:2);")
         with pytest.raises(ValueError, match="--quoted-node-names yes"):
@@ -225,6 +262,44 @@ class TestReadTree:
         assert set(tree.leaf_names()) == {"A", "B", "C", "D"}
 
 
+class TestTreeSampling:
+    def test_burnin_thin_and_subsample_select_records_in_input_order(self, tmp_path):
+        path = tmp_path / "trees.nwk"
+        path.write_text("".join("(A{0},B{0});\n".format(index) for index in range(20)))
+        sampling = TreeSampling(burnin=5, thin=2, subsample=4, seed=3)
+
+        records = list(iter_tree_strings(str(path), sampling))
+
+        positions = sampling.positions(20)
+        assert records == ["(A{0},B{0});".format(index) for index in positions]
+        assert len(positions) == 4
+        assert positions == sorted(positions)
+        assert set(positions) <= set(range(5, 20, 2))
+        assert list(iter_tree_strings(str(path), TreeSampling(burnin=18))) == [
+            "(A18,B18);",
+            "(A19,B19);",
+        ]
+
+    def test_subsample_larger_than_the_collection_keeps_every_record(self):
+        assert TreeSampling(thin=3, subsample=10, seed=1).positions(7) == [0, 3, 6]
+
+    def test_from_args_keeps_every_tree_by_default(self):
+        assert TreeSampling.from_args(make_args()) is None
+        assert TreeSampling.from_args(make_args(burnin=0, thin=1)) is None
+
+    @pytest.mark.parametrize(
+        ("options", "message"),
+        [
+            (dict(burnin=-1), "'--burnin' must be zero or greater"),
+            (dict(thin=0), "'--thin' must be at least one"),
+            (dict(subsample=0), "'--subsample' must be at least one"),
+        ],
+    )
+    def test_rejects_invalid_options(self, options, message):
+        with pytest.raises(ValueError, match=message):
+            TreeSampling(**options)
+
+
 class TestWriteTree:
     def test_placeholder_regex_size_is_independent_of_node_count(self):
         prefix = "NWKITNODE0123456789abcdef_"
@@ -450,3 +525,85 @@ class TestWriteTree:
 
         with open(tmp_outfile) as handle:
             assert handle.read() == "existing output"
+
+
+class TestCompressedStreams:
+    TREES = ["((A:1,B:1):1,(C:1,D:1):1);", "((A:1,C:1):1,(B:1,D:1):1);"]
+
+    @staticmethod
+    def _compress(data, compression):
+        if compression == "gzip":
+            import gzip
+
+            return gzip.compress(data)
+        zstandard = pytest.importorskip("zstandard")
+        # Two frames, as written by tools that append to a compressed archive.
+        compressor = zstandard.ZstdCompressor()
+        middle = len(data) // 2
+        return compressor.compress(data[:middle]) + compressor.compress(data[middle:])
+
+    @pytest.mark.parametrize("compression", ["gzip", "zstd"])
+    @pytest.mark.parametrize("name", ["trees.nwk", "trees.nwk.gz", "trees.bin"])
+    def test_compressed_input_is_detected_by_magic_bytes(
+        self, tmp_path, compression, name
+    ):
+        path = tmp_path / name
+        data = ("\r\n".join(self.TREES) + "\r\n").encode("utf-8")
+        path.write_bytes(self._compress(data, compression))
+
+        assert list(iter_tree_strings(str(path))) == self.TREES
+        trees = read_trees(str(path), "auto", True, quiet=True)
+        assert [tree.get_topology_id() for tree in trees] == [
+            Tree(text).get_topology_id() for text in self.TREES
+        ]
+        assert util_mod.read_input_text(str(path)) == "\n".join(self.TREES) + "\n"
+        assert util_mod.read_item_per_line_file(str(path)) == self.TREES
+
+    @pytest.mark.parametrize("compression", ["gzip", "zstd"])
+    def test_compressed_stdin_is_decompressed(self, monkeypatch, compression):
+        data = self._compress("\n".join(self.TREES).encode("utf-8"), compression)
+        stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(data)))
+        monkeypatch.setattr(sys, "stdin", stdin)
+
+        assert list(iter_tree_strings("-")) == self.TREES
+        assert not stdin.closed
+
+    def test_plain_stdin_is_read_directly(self, monkeypatch):
+        stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(b"(A,B);\n")))
+        monkeypatch.setattr(sys, "stdin", stdin)
+
+        assert util_mod.open_input_text("-") is stdin
+        assert util_mod.read_input_text("-") == "(A,B);\n"
+
+    @pytest.mark.parametrize("suffix", [".gz", ".zst", ".GZ"])
+    def test_output_is_compressed_by_suffix(self, tmp_path, suffix):
+        if suffix == ".zst":
+            pytest.importorskip("zstandard")
+        tree = Tree(self.TREES[0], parser=1)
+        outfile = str(tmp_path / ("out.nwk" + suffix))
+
+        write_tree(tree, make_args(outfile=outfile), format="1", quiet=True)
+
+        assert util_mod.is_compressed_file(outfile)
+        reread = read_tree(outfile, format="1", quoted_node_names=True, quiet=True)
+        assert reread.write(parser=1) == tree.write(parser=1)
+
+    def test_fasta_round_trips_through_compressed_files(self, tmp_path):
+        infile = tmp_path / "seqs.fa"
+        infile.write_text(">A\nACGT\n>B\nAC\nGT\n")
+        outfile = str(tmp_path / "seqs.fa.gz")
+
+        records = util_mod.read_seqs(str(infile), "fasta", quiet=True)
+        util_mod.write_seqs(records, outfile, quiet=True)
+
+        assert util_mod.is_compressed_file(outfile)
+        assert util_mod.read_seqs(outfile, "fasta", quiet=True) == records
+
+    def test_missing_zstd_support_is_reported(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(sys.modules, "compression", None)
+        monkeypatch.setitem(sys.modules, "zstandard", None)
+        path = tmp_path / "trees.nwk.zst"
+        path.write_bytes(util_mod.ZSTD_MAGIC + b"\x00" * 8)
+
+        with pytest.raises(RuntimeError, match=r"nwkit\[zstd\]"):
+            util_mod.read_input_text(str(path))
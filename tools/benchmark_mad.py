@@ -0,0 +1,125 @@
+"""Measure MAD rooting run times and check the float engine against exact scoring."""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+from ete4 import Tree
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nwkit.root import _mad_rooting  # noqa: E402
+
+
+def _random_tree(names: list[str], rng: random.Random, decades: float) -> Tree:
+    random.seed(rng.random())
+    tree = Tree()
+    tree.populate(len(names), names=names)
+    for node in tree.traverse():
+        if not node.is_root:
+            node.dist = 10 ** rng.uniform(-decades, 0.0)
+    return tree
+
+
+def _time_rooting(tree: Tree, exact: bool):
+    start = time.perf_counter()
+    with contextlib.redirect_stderr(io.StringIO()):
+        rooted = _mad_rooting(tree, exact=exact)
+    seconds = time.perf_counter() - start
+    return {
+        frozenset(child.leaf_names()): float(child.dist)
+        for child in rooted.get_children()
+    }, seconds
+
+
+def _check_same_root(label: str, fast, exact) -> None:
+    if set(fast) != set(exact) or any(
+        abs(fast[side] - exact[side]) > 10**-12 * abs(exact[side]) for side in exact
+    ):
+        raise RuntimeError(
+            "Engines disagree on {}: {} != {}".format(label, fast, exact)
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default="250,500,1000,2000",
+        help="Comma-separated numbers of tips.",
+    )
+    parser.add_argument(
+        "--decades",
+        type=float,
+        default=3.0,
+        help="Branch lengths are drawn log-uniformly from this many decades below 1.",
+    )
+    parser.add_argument(
+        "--exact-max-tips",
+        type=int,
+        default=2000,
+        help="Largest tree also rooted with exact scoring of every edge.",
+    )
+    parser.add_argument(
+        "--trees",
+        default=None,
+        help="Newick file with one tree per line to check instead of random trees.",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+    args = parser.parse_args()
+    print(
+        "{:<12} {:>8} {:>10} {:>10} {:>9}".format(
+            "tree", "tips", "float s", "exact s", "speed-up"
+        ),
+        flush=True,
+    )
+    if args.trees is not None:
+        with open(args.trees) as handle:
+            trees = [
+                ("line {}".format(number), Tree(line.strip(), parser=1))
+                for number, line in enumerate(handle, start=1)
+                if line.strip()
+            ]
+    else:
+        rng = random.Random(args.seed)
+        trees = [
+            (
+                "random",
+                _random_tree(
+                    ["T{}".format(index) for index in range(num_tips)],
+                    rng,
+                    args.decades,
+                ),
+            )
+            for num_tips in (int(value) for value in args.sizes.split(","))
+        ]
+    for label, tree in trees:
+        num_tips = len(tree)
+        try:
+            fast, fast_seconds = _time_rooting(tree, exact=False)
+        except ValueError as exc:
+            # Both engines share input validation, so a rejected tree is not timed.
+            print("{:<12} {:>8,}   rejected: {}".format(label, num_tips, exc))
+            continue
+        exact_text = speed_up_text = "-"
+        if num_tips <= args.exact_max_tips:
+            exact, exact_seconds = _time_rooting(tree, exact=True)
+            _check_same_root(label, fast, exact)
+            exact_text = "{:.3f}".format(exact_seconds)
+            speed_up_text = "{:.1f}x".format(exact_seconds / fast_seconds)
+        print(
+            "{:<12} {:>8,} {:>10.3f} {:>10} {:>9}".format(
+                label, num_tips, fast_seconds, exact_text, speed_up_text
+            ),
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
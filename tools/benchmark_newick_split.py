@@ -0,0 +1,165 @@
+"""Measure Newick collection splitting throughput on a synthetic collection."""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TextIO
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nwkit.tree_index import build_tree_index  # noqa: E402
+from nwkit.util import iter_newick_stream  # noqa: E402
+
+
+def _legacy_iter_newick_stream(
+    handle: TextIO, chunk_size: int = 1024 * 1024
+) -> Iterator[str]:
+    """Per-character splitter that ``iter_newick_stream`` used to implement."""
+    buffer: list[str] = []
+    quote_char = None
+    possible_closing_quote = False
+    comment_depth = 0
+    while True:
+        chunk = handle.read(chunk_size)
+        if chunk == "":
+            break
+        for char in chunk:
+            if possible_closing_quote:
+                if char == quote_char:
+                    buffer.append(char)
+                    possible_closing_quote = False
+                    continue
+                quote_char = None
+                possible_closing_quote = False
+            buffer.append(char)
+            if quote_char is not None:
+                if char == quote_char:
+                    possible_closing_quote = True
+            elif comment_depth > 0:
+                if char == "[":
+                    comment_depth += 1
+                elif char == "]":
+                    comment_depth -= 1
+            elif char in ("'", '"'):
+                quote_char = char
+            elif char == "[":
+                comment_depth = 1
+            elif char == ";":
+                tree_text = "".join(buffer).strip()
+                if tree_text:
+                    yield tree_text
+                buffer = []
+
+
+def _random_tree(rng: random.Random, num_leaves: int, annotated: bool) -> str:
+    nodes = ["T{}:{:.5f}".format(index, rng.random()) for index in range(num_leaves)]
+    nodes[0] = "'taxon; one':{:.5f}".format(rng.random())
+    while len(nodes) > 1:
+        right = nodes.pop(rng.randrange(len(nodes)))
+        left = nodes.pop(rng.randrange(len(nodes)))
+        comment = "[&prob={:.3f}]".format(rng.random()) if annotated else ""
+        nodes.append("({},{}){}:{:.5f}".format(left, right, comment, rng.random()))
+    return "[&U] " + nodes[0] + ";\n"
+
+
+def write_collection(
+    path: Path, size_bytes: int, num_leaves: int, seed: int, annotated: bool
+) -> int:
+    rng = random.Random(seed)
+    trees = [_random_tree(rng, num_leaves, annotated) for _ in range(64)]
+    written = 0
+    with open(path, "w") as handle:
+        while written < size_bytes:
+            tree = trees[rng.randrange(len(trees))]
+            handle.write(tree)
+            written += len(tree)
+    return written
+
+
+def _time_splitter(splitter, path: Path, limit_bytes: int) -> tuple[int, int, float]:
+    """Return (records, bytes, seconds) for splitting the first ``limit_bytes``."""
+    num_records = 0
+    num_bytes = 0
+    start = time.perf_counter()
+    with open(path) as handle:
+        for record in splitter(handle):
+            num_records += 1
+            num_bytes += len(record) + 1
+            if num_bytes >= limit_bytes:
+                break
+    return num_records, num_bytes, time.perf_counter() - start
+
+
+def _report(label: str, num_records: int, num_bytes: int, seconds: float) -> float:
+    throughput = num_bytes / 1024**2 / seconds
+    print(
+        "{:<28} {:>10,} records {:>9.1f} MiB {:>8.2f} s {:>9.1f} MiB/s".format(
+            label, num_records, num_bytes / 1024**2, seconds, throughput
+        ),
+        flush=True,
+    )
+    return throughput
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--size-mb", type=int, default=1024, help="Synthetic collection size."
+    )
+    parser.add_argument(
+        "--baseline-mb",
+        type=int,
+        default=128,
+        help="Prefix size split with the legacy per-character loop.",
+    )
+    parser.add_argument(
+        "--leaves", type=int, default=64, help="Leaves per synthetic tree."
+    )
+    parser.add_argument(
+        "--annotated",
+        action="store_true",
+        help="Attach a bracket comment to every internal node, as BEAST does.",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "collection.nwk"
+        start = time.perf_counter()
+        size_bytes = write_collection(
+            path, args.size_mb * 1024**2, args.leaves, args.seed, args.annotated
+        )
+        print(
+            "Wrote {:.1f} MiB in {:.1f} s".format(
+                size_bytes / 1024**2, time.perf_counter() - start
+            ),
+            flush=True,
+        )
+        baseline_bytes = min(size_bytes, args.baseline_mb * 1024**2)
+        legacy = _report(
+            "legacy per-character loop",
+            *_time_splitter(_legacy_iter_newick_stream, path, baseline_bytes),
+        )
+        current = _report(
+            "iter_newick_stream",
+            *_time_splitter(iter_newick_stream, path, size_bytes),
+        )
+        start = time.perf_counter()
+        offsets, _ = build_tree_index(str(path), str(path) + ".idx")
+        _report(
+            "build_tree_index (bytes)",
+            len(offsets),
+            os.path.getsize(path),
+            time.perf_counter() - start,
+        )
+        print("Speed-up of iter_newick_stream: {:.1f}x".format(current / legacy))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+"""Measure how triplet and quartet distance run times scale with tree size."""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+from ete4 import Tree
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nwkit.quartet import quartet_distance, triplet_distance  # noqa: E402
+
+
+def _random_tree(names: list[str], rng: random.Random, polytomy: float) -> Tree:
+    random.seed(rng.random())
+    tree = Tree()
+    tree.populate(len(names), names=names)
+    for node in list(tree.traverse()):
+        if (not node.is_leaf) and (not node.is_root) and rng.random() < polytomy:
+            node.delete()
+    return tree
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default="250,500,1000,2000,4000",
+        help="Comma-separated numbers of tips.",
+    )
+    parser.add_argument(
+        "--polytomy",
+        type=float,
+        default=0.0,
+        help="Probability of collapsing each internal edge into a polytomy.",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    print(
+        "{:<9} {:>8} {:>20} {:>20} {:>10} {:>9}".format(
+            "metric", "tips", "distance", "max", "seconds", "exponent"
+        ),
+        flush=True,
+    )
+    previous: dict[str, tuple[int, float]] = {}
+    for num_tips in (int(value) for value in args.sizes.split(",")):
+        names = ["T{}".format(index) for index in range(num_tips)]
+        tree1 = _random_tree(names, rng, args.polytomy)
+        tree2 = _random_tree(names, rng, args.polytomy)
+        for metric, distance in (
+            ("triplet", triplet_distance),
+            ("quartet", quartet_distance),
+        ):
+            start = time.perf_counter()
+            value, max_value = distance(tree1, tree2)
+            seconds = time.perf_counter() - start
+            # Slope of log time against log size since the previous size.
+            exponent_text = "-"
+            if metric in previous:
+                previous_tips, previous_seconds = previous[metric]
+                exponent_text = "{:.2f}".format(
+                    math.log(seconds / previous_seconds)
+                    / math.log(num_tips / previous_tips)
+                )
+            previous[metric] = (num_tips, seconds)
+            print(
+                "{:<9} {:>8,} {:>20,} {:>20,} {:>10.3f} {:>9}".format(
+                    metric, num_tips, value, max_value, seconds, exponent_text
+                ),
+                flush=True,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,172 @@
+"""Time reconciliation rooting and check its edge scores against per-edge reconciliation."""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+from ete4 import Tree
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nwkit.clade_index import LcaIndex  # noqa: E402
+from nwkit.reconcile import lca_duplication_loss_contribution  # noqa: E402
+from nwkit.root import (  # noqa: E402
+    _reconciliation_rooting_edge_costs,
+    _reconciliation_rooting_graph,
+    _reconciliation_rooting_tip_mapping,
+    reconciliation_rooting,
+)
+
+
+def _random_binary_newick(names: list[str], rng: random.Random, degree: int) -> str:
+    subtrees = ["{}:1".format(name) for name in names]
+    while len(subtrees) > degree:
+        first = subtrees.pop(rng.randrange(len(subtrees)))
+        second = subtrees.pop(rng.randrange(len(subtrees)))
+        subtrees.append("({},{}):1".format(first, second))
+    return "({});".format(",".join(subtrees))
+
+
+def _edge_costs_by_reconciliation(adjacency, edges, mapping, species_leaf_by_name):
+    """Return ``(duplications, losses)`` of each edge by a full reconciliation per edge."""
+    species_lca = LcaIndex(next(iter(species_leaf_by_name.values())).root)
+    species_depth = dict(zip(species_lca.nodes, species_lca.depth, strict=True))
+
+    def reconcile_side(start, blocked):
+        order = list()
+        stack = [(start, blocked)]
+        while stack:
+            node, previous = stack.pop()
+            order.append((node, previous))
+            stack.extend(
+                (neighbor, node)
+                for neighbor in adjacency[node]
+                if neighbor is not previous
+            )
+        results = dict()
+        for node, previous in reversed(order):
+            if node.is_leaf:
+                results[node] = (species_leaf_by_name[mapping[str(node.name)]], 0, 0)
+                continue
+            sides = [
+                results[neighbor]
+                for neighbor in adjacency[node]
+                if neighbor is not previous
+            ]
+            results[node] = join(sides)
+        return results[start]
+
+    def join(sides):
+        (species1, dups1, losses1), (species2, dups2, losses2) = sides
+        mapped = species_lca.common_ancestor(species1, species2)
+        dups, losses = lca_duplication_loss_contribution(
+            mapped, (species1, species2), species_depth
+        )
+        return mapped, dups + dups1 + dups2, losses + losses1 + losses2
+
+    return [
+        join([reconcile_side(left, right), reconcile_side(right, left)])[1:]
+        for left, right in edges
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default="500,1000,2000,5000",
+        help="Comma-separated numbers of gene-tree tips.",
+    )
+    parser.add_argument(
+        "--species", type=int, default=500, help="Number of species-tree tips."
+    )
+    parser.add_argument(
+        "--per-edge-max-tips",
+        type=int,
+        default=1000,
+        help="Largest gene tree also scored by a full reconciliation per edge.",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    species_tree = Tree(
+        _random_binary_newick(
+            ["S{}".format(index) for index in range(args.species)], rng, degree=2
+        ),
+        parser=1,
+    )
+    print(
+        "{:>8} {:>10} {:>10} {:>12} {:>9}".format(
+            "tips", "dp s", "rooting s", "per-edge s", "speed-up"
+        ),
+        flush=True,
+    )
+    for num_tips in (int(value) for value in args.sizes.split(",")):
+        gene_tree = Tree(
+            _random_binary_newick(
+                ["G{}".format(index) for index in range(num_tips)], rng, degree=3
+            ),
+            parser=1,
+        )
+        species_by_gene = {
+            str(leaf.name): "S{}".format(rng.randrange(args.species))
+            for leaf in gene_tree.leaves()
+        }
+        start = time.perf_counter()
+        analysis_tree, adjacency = _reconciliation_rooting_graph(gene_tree)
+        gene_leaves, _, mapping, species_leaf_by_name = (
+            _reconciliation_rooting_tip_mapping(
+                analysis_tree, species_tree, species_by_gene
+            )
+        )
+        edge_costs = list(
+            _reconciliation_rooting_edge_costs(
+                adjacency,
+                gene_leaves,
+                mapping,
+                species_leaf_by_name,
+                LcaIndex(species_tree),
+            )
+        )
+        dp_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        with contextlib.redirect_stderr(io.StringIO()):
+            reconciliation_rooting(gene_tree, species_tree, species_by_gene)
+        rooting_seconds = time.perf_counter() - start
+        per_edge_text = speed_up_text = "-"
+        if num_tips <= args.per_edge_max_tips:
+            start = time.perf_counter()
+            expected = _edge_costs_by_reconciliation(
+                adjacency,
+                [(left, right) for left, right, *_ in edge_costs],
+                mapping,
+                species_leaf_by_name,
+            )
+            per_edge_seconds = time.perf_counter() - start
+            observed = [
+                (root_message.duplications, root_message.losses)
+                for *_, root_message in edge_costs
+            ]
+            if observed != expected:
+                raise RuntimeError(
+                    "Rerooting DP disagrees with per-edge reconciliation "
+                    "on a {}-tip gene tree.".format(num_tips)
+                )
+            per_edge_text = "{:.3f}".format(per_edge_seconds)
+            speed_up_text = "{:.0f}x".format(per_edge_seconds / dp_seconds)
+        print(
+            "{:>8,} {:>10.3f} {:>10.3f} {:>12} {:>9}".format(
+                num_tips, dp_seconds, rooting_seconds, per_edge_text, speed_up_text
+            ),
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
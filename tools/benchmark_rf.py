@@ -0,0 +1,112 @@
+"""Measure Robinson-Foulds engine run times on balanced and caterpillar trees."""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+from ete4 import Tree
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nwkit.rf import robinson_foulds  # noqa: E402
+
+
+def _balanced_tree(names: list[str]) -> Tree:
+    tree = Tree()
+    pending = [(tree, names)]
+    while pending:
+        node, clade_names = pending.pop()
+        if len(clade_names) == 1:
+            node.name = clade_names[0]
+            continue
+        midpoint = len(clade_names) // 2
+        pending.append((node.add_child(), clade_names[:midpoint]))
+        pending.append((node.add_child(), clade_names[midpoint:]))
+    return tree
+
+
+def _caterpillar_tree(names: list[str]) -> Tree:
+    tree = Tree()
+    node = tree
+    for name in names[:-2]:
+        node.add_child(name=name)
+        node = node.add_child()
+    node.add_child(name=names[-2])
+    node.add_child(name=names[-1])
+    return tree
+
+
+def _time_engine(tree1: Tree, tree2: Tree, unrooted: bool, engine: str):
+    start = time.perf_counter()
+    result = robinson_foulds(tree1, tree2, unrooted=unrooted, engine=engine)
+    return result, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000,1000000",
+        help="Comma-separated numbers of tips.",
+    )
+    parser.add_argument(
+        "--ete-max-tips",
+        type=int,
+        default=20000,
+        help="Largest tree also timed with ete4 robinson_foulds, whose split "
+        "tables grow with tips times depth.",
+    )
+    parser.add_argument("--unrooted", action="store_true", help="Compare splits.")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    print(
+        "{:<12} {:>10} {:>10} {:>12} {:>12} {:>9}".format(
+            "shape", "tips", "rf", "linear s", "ete s", "speed-up"
+        ),
+        flush=True,
+    )
+    for num_tips in (int(value) for value in args.sizes.split(",")):
+        names = ["T{}".format(index) for index in range(num_tips)]
+        for shape, build in (
+            ("balanced", _balanced_tree),
+            ("caterpillar", _caterpillar_tree),
+        ):
+            shuffled = names[:]
+            # Swap a few labels so that the trees differ in some clusters.
+            for _ in range(10):
+                index1 = rng.randrange(num_tips)
+                index2 = rng.randrange(num_tips)
+                shuffled[index1], shuffled[index2] = shuffled[index2], shuffled[index1]
+            tree1 = build(names)
+            tree2 = build(shuffled)
+            (rf, _), linear_seconds = _time_engine(
+                tree1, tree2, args.unrooted, "linear"
+            )
+            ete_text = speed_up_text = "-"
+            if num_tips <= args.ete_max_tips:
+                (ete_rf, _), ete_seconds = _time_engine(
+                    tree1, tree2, args.unrooted, "ete"
+                )
+                if ete_rf != rf:
+                    raise RuntimeError(
+                        "Engines disagree on {} {}: {} != {}".format(
+                            shape, num_tips, rf, ete_rf
+                        )
+                    )
+                ete_text = "{:.3f}".format(ete_seconds)
+                speed_up_text = "{:.1f}x".format(ete_seconds / linear_seconds)
+            print(
+                "{:<12} {:>10,} {:>10,} {:>12.3f} {:>12} {:>9}".format(
+                    shape, num_tips, rf, linear_seconds, ete_text, speed_up_text
+                ),
+                flush=True,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
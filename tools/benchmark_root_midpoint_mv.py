@@ -0,0 +1,105 @@
+"""Measure midpoint and MV rooting run times against the node-based rooting."""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+from ete4 import Tree
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nwkit.root import (  # noqa: E402
+    _midpoint_rooting_by_node,
+    _mv_rooting_by_node,
+    midpoint_rooting,
+    mv_rooting,
+)
+
+ROOTERS = {
+    "midpoint": (midpoint_rooting, _midpoint_rooting_by_node),
+    "mv": (mv_rooting, _mv_rooting_by_node),
+}
+
+
+def _random_tree(num_tips: int, rng: random.Random) -> Tree:
+    random.seed(rng.random())
+    tree = Tree()
+    tree.populate(num_tips, dist_fn=random.random)
+    return tree
+
+
+def _time_rooting(rooter, tree: Tree):
+    start = time.perf_counter()
+    with contextlib.redirect_stderr(io.StringIO()):
+        rooted = rooter(tree)
+    seconds = time.perf_counter() - start
+    return {
+        frozenset(child.leaf_names()): float(child.dist)
+        for child in rooted.get_children()
+    }, seconds
+
+
+def _check_same_root(label: str, fast, by_node) -> None:
+    if set(fast) != set(by_node) or any(
+        abs(fast[side] - by_node[side]) > 10**-9 * max(1.0, abs(by_node[side]))
+        for side in by_node
+    ):
+        raise RuntimeError(
+            "Rootings disagree on {}: {} != {}".format(label, fast, by_node)
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000",
+        help="Comma-separated numbers of tips.",
+    )
+    parser.add_argument(
+        "--methods",
+        default="midpoint,mv",
+        help="Comma-separated rooting methods: midpoint, mv.",
+    )
+    parser.add_argument(
+        "--node-max-tips",
+        type=int,
+        default=100000,
+        help="Largest tree also rooted with the node-based rooting.",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+    args = parser.parse_args()
+    print(
+        "{:<9} {:>10} {:>10} {:>10} {:>9}".format(
+            "method", "tips", "array s", "node s", "speed-up"
+        ),
+        flush=True,
+    )
+    rng = random.Random(args.seed)
+    for num_tips in (int(value) for value in args.sizes.split(",")):
+        tree = _random_tree(num_tips, rng)
+        for method in args.methods.split(","):
+            rooter, node_rooter = ROOTERS[method]
+            fast, fast_seconds = _time_rooting(rooter, tree)
+            node_text = speed_up_text = "-"
+            if num_tips <= args.node_max_tips:
+                by_node, node_seconds = _time_rooting(node_rooter, tree)
+                _check_same_root("{} {} tips".format(method, num_tips), fast, by_node)
+                node_text = "{:.3f}".format(node_seconds)
+                speed_up_text = "{:.1f}x".format(node_seconds / fast_seconds)
+            print(
+                "{:<9} {:>10,} {:>10.3f} {:>10} {:>9}".format(
+                    method, num_tips, fast_seconds, node_text, speed_up_text
+                ),
+                flush=True,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())